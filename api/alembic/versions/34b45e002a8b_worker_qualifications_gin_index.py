@@ -0,0 +1,35 @@
+"""GIN index on worker_profiles.qualifications
+
+Revision ID: 34b45e002a8b
+Revises: 4652ab6e4cb3
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '34b45e002a8b'
+down_revision = '4652ab6e4cb3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fresh databases get worker_profiles (and this index) from create_all
+    if not sa.inspect(op.get_bind()).has_table("worker_profiles"):
+        return
+    
+    # CONCURRENTLY cannot run inside a transaction, and avoids locking
+    # worker_profiles against writes while the index builds
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_worker_profiles_qualifications_gin "
+            "ON worker_profiles USING gin (qualifications jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_worker_profiles_qualifications_gin")
@@ -0,0 +1,34 @@
+"""Platform counters table
+
+Revision ID: 4652ab6e4cb3
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4652ab6e4cb3'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The app's create_all() may already have created it
+    if sa.inspect(op.get_bind()).has_table("platform_counters"):
+        return
+    op.create_table(
+        "platform_counters",
+        sa.Column("name", sa.String(length=100), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    # Counters are backfilled by the API on first start, or explicitly with:
+    #   python reconcile_counters.py
+
+
+def downgrade() -> None:
+    op.drop_table("platform_counters")
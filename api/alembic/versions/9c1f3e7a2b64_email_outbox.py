@@ -0,0 +1,57 @@
+"""Email outbox table
+
+Revision ID: 9c1f3e7a2b64
+Revises: 34b45e002a8b
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '9c1f3e7a2b64'
+down_revision = '34b45e002a8b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The app's create_all() may already have created it
+    if sa.inspect(op.get_bind()).has_table("email_outbox"):
+        return
+    status = sa.Enum("PENDING", "SENT", "FAILED", name="emailstatus")
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("template", sa.String(length=50), nullable=False),
+        sa.Column("to_email", sa.String(length=255), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("status", status, nullable=False),
+        sa.Column("batch_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("provider_message_id", sa.String(length=100), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_email_outbox_batch_id", "email_outbox", ["batch_id"])
+    op.create_index(
+        "ix_email_outbox_pending_due",
+        "email_outbox",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.create_index(
+        "ix_email_outbox_retry_due",
+        "email_outbox",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'PENDING' AND batch_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("email_outbox")
+    sa.Enum(name="emailstatus").drop(op.get_bind(), checkfirst=True)
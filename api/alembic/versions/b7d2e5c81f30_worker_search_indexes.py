@@ -0,0 +1,48 @@
+"""Worker search indexes
+
+Revision ID: b7d2e5c81f30
+Revises: 9c1f3e7a2b64
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e5c81f30'
+down_revision = '9c1f3e7a2b64'
+branch_labels = None
+depends_on = None
+
+
+# Partial: only complete profiles are searchable
+COMPLETE_PROFILE = "WHERE profile_completion_status = 'COMPLETE'"
+
+INDEXES = {
+    "ix_worker_profiles_search_recent":
+        f"ON worker_profiles (updated_at DESC, id DESC) {COMPLETE_PROFILE}",
+    "ix_worker_profiles_search_city":
+        f"ON worker_profiles (lower(city), updated_at DESC, id DESC) {COMPLETE_PROFILE}",
+    "ix_worker_profiles_search_arrays_gin":
+        "ON worker_profiles USING gin (specializations, languages, available_days, shift_types) "
+        f"{COMPLETE_PROFILE}",
+}
+
+
+def upgrade() -> None:
+    # Fresh databases get worker_profiles (and these indexes) from create_all
+    if not sa.inspect(op.get_bind()).has_table("worker_profiles"):
+        return
+    
+    # CONCURRENTLY cannot run inside a transaction, and avoids locking
+    # worker_profiles against writes while the indexes build
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
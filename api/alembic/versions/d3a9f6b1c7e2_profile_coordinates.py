@@ -0,0 +1,37 @@
+"""Geocoded profile coordinates
+
+Revision ID: d3a9f6b1c7e2
+Revises: b7d2e5c81f30
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a9f6b1c7e2'
+down_revision = 'b7d2e5c81f30'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ("worker_profiles", "care_home_profiles")
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        # Fresh databases get the columns from create_all
+        if not inspector.has_table(table):
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        for name in ("latitude", "longitude"):
+            if name not in columns:
+                op.add_column(table, sa.Column(name, sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, "longitude")
+        op.drop_column(table, "latitude")
@@ -0,0 +1,120 @@
+"""
+Async FastAPI dependencies for authentication and authorization.
+
+Mirror of app.core.dependencies for DB_ASYNC mode. Role and verification
+checks are shared with the sync versions; only user loading differs.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core import dependencies
+from app.core.database import get_async_db
+from app.core.dependencies import security, get_token_claims, check_user_active, role_changed, select_user_with_profiles
+from app.core.principal_cache import Principal, principal_cache
+from app.models.user import User, UserRole
+
+
+async def load_user(db: AsyncSession, user_id: UUID, role: Optional[UserRole]) -> Optional[User]:
+    """
+    Load a user and its profile in one SELECT.
+    
+    The profile must be joined here: lazy loading is not available on an
+    AsyncSession.
+    """
+    result = await db.execute(select_user_with_profiles(user_id, role))
+    user = result.unique().scalar_one_or_none()
+    if role_changed(user, role):
+        query = select_user_with_profiles(user_id).execution_options(populate_existing=True)
+        user = (await db.execute(query)).unique().scalar_one_or_none()
+    return user
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """
+    Dependency to get the current authenticated principal.
+    
+    The in-process cache tier is checked on the loop; Redis lookups run
+    in the threadpool, and the database is only queried on a miss.
+    """
+    user_id, role = get_token_claims(credentials.credentials)
+    
+    principal = principal_cache.get_local(user_id)
+    if principal is None:
+        principal = await run_in_threadpool(principal_cache.get_shared, user_id)
+    if principal is None:
+        user = await load_user(db, user_id, role)
+        if user is not None:
+            principal = Principal.from_user(user)
+            await run_in_threadpool(principal_cache.set, principal)
+    
+    return check_user_active(principal)
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """
+    Dependency to get the current authenticated user.
+    Validates JWT token and returns user (with profile) from database.
+    """
+    user_id, role = get_token_claims(credentials.credentials)
+    
+    user = await load_user(db, user_id, role)
+    
+    return check_user_active(user)
+
+
+async def get_current_verified_user(
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
+    """
+    Dependency to ensure user has verified their email.
+    """
+    return dependencies.get_current_verified_user(current_user)
+
+
+async def get_current_worker(
+    current_user: Principal = Depends(get_current_verified_user),
+) -> Principal:
+    """
+    Dependency to ensure user is a care worker.
+    """
+    return dependencies.get_current_worker(current_user)
+
+
+async def get_current_care_home(
+    current_user: Principal = Depends(get_current_verified_user),
+) -> Principal:
+    """
+    Dependency to ensure user is a care home admin/staff.
+    """
+    return dependencies.get_current_care_home(current_user)
+
+
+async def get_current_admin(
+    current_user: Principal = Depends(get_current_verified_user),
+) -> Principal:
+    """
+    Dependency to ensure user is a platform admin.
+    """
+    return dependencies.get_current_admin(current_user)
+
+
+async def get_current_worker_with_complete_profile(
+    current_user: Principal = Depends(get_current_worker),
+) -> Principal:
+    """
+    Dependency to ensure worker has completed their profile.
+    Used for job board access, applications, etc.
+    """
+    return dependencies.get_current_worker_with_complete_profile(current_user)
@@ -0,0 +1,173 @@
+"""
+Stale-while-revalidate cache backed by Redis.
+
+Entries are shared across all workers through Redis. Once an entry is
+past its TTL, exactly one caller across the deployment (the holder of a
+Redis lock) recomputes it while every other caller keeps getting the
+stale value. If Redis is unavailable the cache falls back to an
+in-process copy with a process-local lock.
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from redis.exceptions import LockError, RedisError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+
+KEY_PREFIX = "vicarity:cache"
+
+# All caches by name (anything with a `stats` dict), for stats reporting
+caches: Dict[str, Any] = {}
+
+
+@dataclass
+class CacheLookup:
+    """Result of a cache read: the value (possibly stale) and what to do next."""
+    value: Any
+    refresh: bool
+    lock: Any = None
+
+
+class StaleWhileRevalidateCache:
+    """A single cached value with SWR semantics and single-flight refresh."""
+    
+    def __init__(self, name: str, ttl: int, stale_ttl: int, lock_timeout: int = 30):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.key = f"{KEY_PREFIX}:{name}"
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "redis_errors": 0}
+        self._local: Optional[Dict[str, Any]] = None
+        self._local_lock = threading.Lock()
+        caches[name] = self
+    
+    # Storage
+    
+    def _read(self, client) -> Optional[Dict[str, Any]]:
+        if client is not None:
+            try:
+                raw = client.get(self.key)
+                return json.loads(raw) if raw else None
+            except RedisError:
+                self.stats["redis_errors"] += 1
+        return self._local
+    
+    def _write(self, value: Any):
+        entry = {"value": value, "fresh_until": time.time() + self.ttl}
+        self._local = entry
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            client.set(self.key, json.dumps(entry), ex=self.ttl + self.stale_ttl)
+        except RedisError:
+            self.stats["redis_errors"] += 1
+    
+    # Single-flight lock
+    
+    def _acquire(self, client):
+        """Try to become the one refresher. Returns a lock handle or None."""
+        if client is not None:
+            try:
+                lock = client.lock(f"{self.key}:lock", timeout=self.lock_timeout, blocking=False)
+                return lock if lock.acquire() else None
+            except RedisError:
+                self.stats["redis_errors"] += 1
+        return self._local_lock if self._local_lock.acquire(blocking=False) else None
+    
+    def _release(self, lock):
+        if lock is None:
+            return
+        try:
+            lock.release()
+        except (LockError, RedisError, RuntimeError):
+            # Lock expired during a slow refresh or Redis went away
+            pass
+    
+    # Read path
+    
+    def lookup(self) -> CacheLookup:
+        """Read the entry and decide whether this caller should refresh it."""
+        client = get_redis()
+        entry = self._read(client)
+        
+        if entry is not None and time.time() < entry["fresh_until"]:
+            self.stats["hits"] += 1
+            return CacheLookup(entry["value"], refresh=False)
+        
+        lock = self._acquire(client)
+        
+        if entry is not None:
+            if lock is None:
+                # Someone else is refreshing: serve stale
+                self.stats["stale_hits"] += 1
+                return CacheLookup(entry["value"], refresh=False)
+            self.stats["refreshes"] += 1
+            return CacheLookup(entry["value"], refresh=True, lock=lock)
+        
+        # Cold miss: nothing to serve, so compute even without the lock
+        self.stats["misses"] += 1
+        return CacheLookup(None, refresh=True, lock=lock)
+    
+    def finish(self, lookup: CacheLookup, value: Any = None, failed: bool = False):
+        """Store a freshly computed value and release the refresh lock."""
+        try:
+            if not failed:
+                self._write(value)
+        finally:
+            self._release(lookup.lock)
+    
+    def get(self, compute: Callable[[], Any]) -> Any:
+        """Return the cached value, recomputing with `compute` when due."""
+        lookup = self.lookup()
+        if not lookup.refresh:
+            return lookup.value
+        
+        try:
+            value = compute()
+        except Exception:
+            self.finish(lookup, failed=True)
+            if lookup.value is not None:
+                return lookup.value
+            raise
+        
+        self.finish(lookup, value)
+        return value
+    
+    async def aget(self, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of get(); Redis calls run in the threadpool."""
+        lookup = await run_in_threadpool(self.lookup)
+        if not lookup.refresh:
+            return lookup.value
+        
+        try:
+            value = await compute()
+        except Exception:
+            await run_in_threadpool(self.finish, lookup, None, True)
+            if lookup.value is not None:
+                return lookup.value
+            raise
+        
+        await run_in_threadpool(self.finish, lookup, value)
+        return value
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters for every cache (this worker process)."""
+    return {name: dict(cache.stats) for name, cache in caches.items()}
+
+
+# Landing page statistics (/public/stats)
+public_stats_cache = StaleWhileRevalidateCache(
+    "public_stats",
+    ttl=settings.PUBLIC_STATS_CACHE_TTL_SECONDS,
+    stale_ttl=settings.PUBLIC_STATS_STALE_TTL_SECONDS,
+)
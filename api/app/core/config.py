@@ -18,10 +18,91 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = ""
     NEON_DATABASE_URL: str = ""
+    DB_ASYNC: bool = False  # Serve routes with asyncpg + AsyncSession instead of psycopg2
+    
+    # Connection pool (per worker process; see app/core/database.py)
+    DB_POOL_MODE: str = "queue"  # "queue", or "null" behind a transaction pooler (PgBouncer, Neon's -pooler host)
+    DB_POOL_SIZE: int = 5  # Connections kept open
+    DB_MAX_OVERFLOW: int = 10  # Extra connections under load, closed when returned
+    DB_POOL_TIMEOUT_SECONDS: float = 30  # Wait for a free connection, then fail the request
+    DB_POOL_RECYCLE_SECONDS: int = -1  # Reconnect connections older than this (-1: never)
+    DB_POOL_PRE_PING: str = "always"  # "always", "idle" (after DB_POOL_PRE_PING_IDLE_SECONDS unused) or "never"
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30
+    DB_POOL_WARMUP: int = 5  # Connections opened at startup, before serving (up to DB_POOL_SIZE)
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Caching
+    PUBLIC_STATS_CACHE_TTL_SECONDS: int = 300  # Fresh for 5 minutes
+    PUBLIC_STATS_STALE_TTL_SECONDS: int = 3600  # Then served stale while one worker refreshes
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: float = 5  # In-process tier; bounds staleness in other workers
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300  # Redis tier; entries are deleted on change
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000  # In-process LRU size per worker
+    
+    # Worker search bitmap index (in-process, one per worker; see app/core/worker_index.py)
+    WORKER_INDEX_ENABLED: bool = False  # Build at startup and answer worker search from memory
+    WORKER_INDEX_REFRESH_SECONDS: float = 1  # How often changed profiles are applied
+    WORKER_INDEX_REBUILD_SECONDS: int = 3600  # Full rebuild, catching changes whose events were lost
+    
+    # Postcode geocoding (index built by ingest_postcodes.py; memory-mapped, shared by workers)
+    POSTCODE_INDEX_PATH: str = "data/postcodes.idx"
+    
+    # Request metrics (Prometheus text at /metrics; workers share totals through files)
+    METRICS_ENABLED: bool = True
+    METRICS_DIR: str = "/tmp/vicarity-metrics"  # Empty: this process's totals only
+    METRICS_FLUSH_SECONDS: float = 5  # How often each worker writes its totals
+    
+    # Logging (JSON lines to stdout from a listener thread; see app/core/request_logging.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" or "text"
+    LOG_SQL: bool = False  # Log every SQL statement (replaces the engine's echo)
+    LOG_SAMPLE_RATE: float = 1.0  # Share of requests given an access line
+    LOG_SAMPLE_RATES: str = "GET /health:0.01,GET /health/live:0.01,GET /health/ready:0.01,GET /metrics:0.01"  # Per-route overrides ("METHOD /route:rate,...")
+    LOG_SLOW_REQUEST_MS: float = 1000  # Slower requests (and 5xx) are always logged
+    
+    # Request profiler (admin-triggered; see app/core/profiler.py)
+    PROFILER_ENABLED: bool = False  # Install the middleware; off, requests pay nothing
+    PROFILER_SAMPLE_RATE: float = 0.0  # Share of requests profiled without a signed X-Profile header
+    PROFILER_INTERVAL_MS: float = 2  # Stack sampling interval
+    PROFILER_DIR: str = "/tmp/vicarity-profiles"  # Shared by the workers
+    PROFILER_MAX_PROFILES: int = 50  # Ring buffer size; the oldest are deleted
+    PROFILER_TOKEN_TTL_SECONDS: int = 900  # Lifetime of X-Profile header values
+    
+    # Memory diagnostics (admin endpoints; see app/core/memory_diagnostics.py)
+    MEMORY_TRACE_FRAMES: int = 10  # Frames kept per traced allocation (more: better "caller" grouping, more overhead)
+    
+    # Health probes (background thread; /health, /health/live and /health/ready answer from the results)
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 5
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2  # Slower answers count as "timeout"
+    HEALTH_EMAIL_PROBE_INTERVAL_SECONDS: float = 60  # The provider rate limits; probe it less often
+    HEALTH_STALE_AFTER_SECONDS: float = 20  # Older database results make the worker not ready
+    
+    # Event loop lag monitor
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_MS: int = 250  # How often the loop is sampled
+    LOOP_LAG_THRESHOLD_MS: int = 100  # Stalls longer than this log the blocking stack
+    
+    # Password hashing (runs on its own bounded executor)
+    PASSWORD_HASH_SCHEME: str = "bcrypt"  # "bcrypt" or "argon2" (needs argon2-cffi); others are rehashed on login
+    BCRYPT_ROUNDS: int = 12  # Work factor (log2); lower-cost hashes are upgraded on login
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST_KIB: int = 65536
+    ARGON2_PARALLELISM: int = 1
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 2  # Concurrent hashes; size to the CPUs available
+    PASSWORD_HASH_MAX_QUEUE: int = 16  # Waiting hashes beyond this get 503
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 5  # Max wait for a worker before 503
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 2  # Retry-After sent with the 503
+    
+    # Rate limiting ("dimension:count/period" items; dimensions: ip, email)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_CLIENT_IP_HEADER: str = ""  # Empty: the socket peer; only set it when a proxy overwrites the header
+    RATE_LIMIT_LOGIN: str = "ip:30/minute,email:5/minute"
+    RATE_LIMIT_REGISTER: str = "ip:10/hour"
+    RATE_LIMIT_PASSWORD_RESET_REQUEST: str = "ip:10/hour,email:3/hour"
+    RATE_LIMIT_RESEND_VERIFICATION: str = "ip:10/hour,email:3/hour"
+    
     # Security
     SECRET_KEY: str = "change-me-in-production"
     ALGORITHM: str = "HS256"
@@ -37,6 +118,17 @@ class Settings(BaseSettings):
     RESEND_API_KEY: str = ""
     FROM_EMAIL: str = "noreply@vicarity.co.uk"
     FROM_NAME: str = "Vicarity"
+    EMAIL_API_URL: str = "https://api.resend.com"
+    
+    # Email outbox sender (send_emails.py)
+    EMAIL_BATCH_SIZE: int = 100  # Emails per provider call (Resend batch maximum)
+    EMAIL_POLL_INTERVAL_SECONDS: float = 1  # Idle wait between outbox polls
+    EMAIL_SEND_TIMEOUT_SECONDS: float = 15
+    EMAIL_CLAIM_LEASE_SECONDS: int = 120  # A claimed batch is retried after this if its sender dies
+    EMAIL_MAX_ATTEMPTS: int = 8  # Then the email is marked failed
+    EMAIL_RETRY_BACKOFF_SECONDS: float = 5  # Doubles with each attempt
+    EMAIL_RETRY_BACKOFF_MAX_SECONDS: float = 900
+    EMAIL_OUTBOX_RETENTION_DAYS: int = 30  # Sent and failed rows are purged after this
     
     # Frontend URLs (for email links)
     FRONTEND_URL: str = "http://localhost:3000"
@@ -47,7 +139,7 @@ class Settings(BaseSettings):
     
     @property
     def db_url(self) -> str:
-        """Get the database URL, preferring NEON_DATABASE_URL."""
+        """Get the database URL: DATABASE_URL, or else NEON_DATABASE_URL."""
         url = self.DATABASE_URL or self.NEON_DATABASE_URL
         # Handle postgres:// vs postgresql://
         if url.startswith("postgres://"):
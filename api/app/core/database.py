@@ -2,26 +2,86 @@
 Database connection and session management.
 """
 
-import os
-from sqlalchemy import create_engine
+import asyncio
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-# Get database URL from environment
-DATABASE_URL = os.getenv("DATABASE_URL", os.getenv("NEON_DATABASE_URL", ""))
+from app.core.config import settings
+from app.core.request_metrics import TimedAsyncAdaptedQueuePool, TimedNullPool, TimedQueuePool, instrument_engine
+
+POOL_MODES = ("queue", "null")
+PRE_PING_POLICIES = ("always", "idle", "never")
+
+if settings.DB_POOL_MODE not in POOL_MODES:
+    raise ValueError(f"DB_POOL_MODE must be one of {', '.join(POOL_MODES)}")
+if settings.DB_POOL_PRE_PING not in PRE_PING_POLICIES:
+    raise ValueError(f"DB_POOL_PRE_PING must be one of {', '.join(PRE_PING_POLICIES)}")
+
+# DATABASE_URL (or NEON_DATABASE_URL), postgres:// fixed up
+DATABASE_URL = settings.db_url
+
+# Behind a transaction pooler every checkout connects to the pooler, which
+# hands out (already open) server connections per transaction
+NULL_POOL = settings.DB_POOL_MODE == "null"
+
+
+def pool_options() -> Dict[str, Any]:
+    """create_engine() pool arguments from the DB_POOL_* settings."""
+    if NULL_POOL:
+        return {"poolclass": TimedNullPool}  # Checkout (connect) time counted in request metrics
+    return {
+        "poolclass": TimedQueuePool,  # Checkout wait counted in request metrics
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",  # Verify connections before using
+    }
+
+
+def ping_idle_connections(sync_engine, idle_seconds: float):
+    """
+    Pre-ping only connections that sat in the pool for over idle_seconds:
+    a round trip saved on busy checkouts, while connections dropped
+    during a quiet spell (server idle timeouts, a suspended Neon compute)
+    are still caught. A failed ping makes the pool reconnect.
+    """
+    @event.listens_for(sync_engine, "checkin")
+    def remember_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+    
+    @event.listens_for(sync_engine, "checkout")
+    def ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at <= idle_seconds:
+            return
+        try:
+            ok = sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            raise exc.DisconnectionError(f"Idle connection failed its ping: {e}") from e
+        if ok is False:
+            raise exc.DisconnectionError("Idle connection failed its ping")
+
+
+def configure_engine(sync_engine, name: str):
+    """The pre-ping policy, request metrics and pool metrics of an engine."""
+    # First: a failed ping retries the checkout before the metrics count it
+    if settings.DB_POOL_PRE_PING == "idle" and not NULL_POOL:
+        ping_idle_connections(sync_engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+    instrument_engine(sync_engine, name)
 
-# Handle Neon's postgres:// vs postgresql://
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
 # Create engine with connection pooling
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=5,
-    max_overflow=10,
-    echo=os.getenv("ENVIRONMENT") == "development",
-)
+engine = create_engine(DATABASE_URL, **pool_options())
+configure_engine(engine, "sync")
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -30,13 +90,154 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def build_async_url(url: str):
+    """
+    Convert a psycopg2-style URL into an asyncpg URL plus connect args.
+    
+    asyncpg rejects libpq-only query parameters such as ``sslmode`` and
+    ``channel_binding`` (both present in Neon connection strings), so
+    ``sslmode`` is translated into asyncpg's ``ssl`` argument and the rest
+    are dropped.
+    """
+    parsed = make_url(url)
+    query = dict(parsed.query)
+    connect_args = {}
+    
+    sslmode = query.pop("sslmode", None)
+    if sslmode and sslmode != "disable":
+        connect_args["ssl"] = sslmode
+    query.pop("channel_binding", None)
+    
+    parsed = parsed.set(drivername="postgresql+asyncpg", query=query)
+    return parsed.render_as_string(hide_password=False), connect_args
+
+
+# Async engine and session factory (only when DB_ASYNC is enabled)
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_ASYNC:
+    _async_url, _async_connect_args = build_async_url(DATABASE_URL)
+    _async_pool_options = pool_options()
+    if NULL_POOL:
+        # A transaction pooler may run each statement on a different server
+        # connection: no statement caches, and prepared statement names that
+        # can't collide with another client's on the same server connection
+        _async_connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+        )
+    else:
+        _async_pool_options["poolclass"] = TimedAsyncAdaptedQueuePool
+    async_engine = create_async_engine(_async_url, connect_args=_async_connect_args, **_async_pool_options)
+    configure_engine(async_engine.sync_engine, "async")
+    # expire_on_commit=False: attributes stay loaded after commit, so
+    # response serialization never triggers an implicit (sync) refresh
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
 def get_db():
     """
     Dependency that provides a database session.
     Ensures session is closed after request.
+    
+    The session is lazy: a pooled connection is only checked out by the
+    first query, so requests rejected before that (e.g. bad tokens in the
+    auth dependencies) never touch the pool. Keep it that way - don't
+    query here.
+    
+    Like the async sessions it doesn't expire objects on commit: a route
+    returning what it just wrote would otherwise SELECT it again while
+    the response is serialized.
     """
-    db = SessionLocal()
+    db = SessionLocal(expire_on_commit=False)
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency that provides an async database session.
+    Only available when DB_ASYNC is enabled.
+    
+    Lazy like get_db(): no connection is checked out until first use.
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database sessions require DB_ASYNC=true")
+    
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _warmup_count(count: int) -> int:
+    return 0 if NULL_POOL else max(0, min(count, settings.DB_POOL_SIZE))
+
+
+def warm_up_pool(count: int = settings.DB_POOL_WARMUP) -> int:
+    """
+    Open up to `count` connections of the sync pool at once and return them
+    to it, so the first requests don't each pay a connection handshake.
+    Blocking: call from a thread. Returns how many are open; raises the
+    first connection error after returning the others.
+    """
+    count = _warmup_count(count)
+    if count == 0:
+        return 0
+    with ThreadPoolExecutor(max_workers=count, thread_name_prefix="db-warmup") as executor:
+        futures = [executor.submit(engine.raw_connection) for _ in range(count)]
+    connections = [future.result() for future in futures if future.exception() is None]
+    for conn in connections:
+        conn.close()  # Back into the pool, still open
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+        raise errors[0]
+    return len(connections)
+
+
+async def warm_up_async_pool(count: int = settings.DB_POOL_WARMUP) -> int:
+    """warm_up_pool() for the async engine."""
+    count = _warmup_count(count)
+    if async_engine is None or count == 0:
+        return 0
+    connections = [async_engine.connect() for _ in range(count)]
+    results = await asyncio.gather(*(conn.start() for conn in connections), return_exceptions=True)
+    opened = [conn for conn, result in zip(connections, results) if not isinstance(result, BaseException)]
+    for conn in opened:
+        await conn.close()  # Back into the pool, still open
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        raise errors[0]
+    return len(opened)
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Connections of each engine's pool. A saturated pool has every
+    connection it may open checked out: the next checkout waits.
+    """
+    engines = {"sync": engine}
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    stats = {}
+    for name, each in engines.items():
+        pool = each.pool
+        stats[name] = {"class": type(pool).__name__}
+        if hasattr(pool, "checkedout"):
+            capacity = pool.size() + pool._max_overflow if pool._max_overflow >= 0 else None
+            stats[name].update(
+                size=pool.size(),
+                max_overflow=pool._max_overflow,
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+                saturated=capacity is not None and pool.checkedout() >= capacity,
+            )
+    return stats
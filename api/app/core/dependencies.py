@@ -2,13 +2,16 @@
 FastAPI dependencies for authentication and authorization.
 """
 
-from typing import Optional
+from typing import Optional, Tuple, Union
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
 
 from app.core.database import get_db
+from app.core.principal_cache import Principal, principal_cache
+from app.core.request_logging import set_request_user
 from app.core.security import decode_token, TokenType
 from app.models.user import User, UserRole
 
@@ -17,15 +20,11 @@ from app.models.user import User, UserRole
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+def get_token_claims(token: str) -> Tuple[UUID, Optional[UserRole]]:
     """
-    Dependency to get the current authenticated user.
-    Validates JWT token and returns user from database.
+    Validate an access token and return the user ID and role it was
+    issued for. Shared by the sync and async authentication dependencies.
     """
-    token = credentials.credentials
     payload = decode_token(token)
     
     if payload is None:
@@ -56,8 +55,55 @@ def get_current_user(
             detail="Invalid user ID in token",
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    set_request_user(user_id)  # For the request's log lines
+    
+    try:
+        role = UserRole(payload.get("role"))
+    except ValueError:
+        role = None  # Only used to pick which profile to load
     
+    return user_id, role
+
+
+def profile_loaders(role: Optional[UserRole] = None) -> list:
+    """
+    Loader options joining a user's profile into the user SELECT.
+    
+    Workers only have a worker profile and care home users a care home
+    profile, so when the role is known only that one is joined; when it
+    isn't (e.g. login by email) both are.
+    """
+    if role == UserRole.WORKER:
+        return [joinedload(User.worker_profile)]
+    if role in (UserRole.CARE_HOME_ADMIN, UserRole.CARE_HOME_STAFF):
+        return [joinedload(User.care_home_profile)]
+    return [joinedload(User.worker_profile), joinedload(User.care_home_profile)]
+
+
+def select_user_with_profiles(user_id: UUID, role: Optional[UserRole] = None):
+    """SELECT for a user with its profile joined (see profile_loaders)."""
+    return select(User).options(*profile_loaders(role)).where(User.id == user_id)
+
+
+def role_changed(user: Optional[User], role: Optional[UserRole]) -> bool:
+    """
+    Whether `user` was loaded for a role it no longer has (the token
+    predates a role change), so the wrong profile may have been joined.
+    """
+    return user is not None and role is not None and user.role != role
+
+
+def load_user(db: Session, user_id: UUID, role: Optional[UserRole]) -> Optional[User]:
+    """Load a user and its profile in one SELECT."""
+    user = db.execute(select_user_with_profiles(user_id, role)).unique().scalar_one_or_none()
+    if role_changed(user, role):
+        query = select_user_with_profiles(user_id).execution_options(populate_existing=True)
+        user = db.execute(query).unique().scalar_one_or_none()
+    return user
+
+
+def check_user_active(user: Optional[Union[User, Principal]]) -> Union[User, Principal]:
+    """Reject missing or deactivated users."""
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -73,9 +119,52 @@ def get_current_user(
     return user
 
 
-def get_current_verified_user(
-    current_user: User = Depends(get_current_user),
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """
+    Dependency to get the current authenticated principal.
+    
+    Served from the principal cache; the database is only queried (user
+    and profile in one SELECT) on a miss. The session is lazy, so a cache
+    hit never checks out a connection.
+    """
+    user_id, role = get_token_claims(credentials.credentials)
+    
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = load_user(db, user_id, role)
+        if user is not None:
+            principal = Principal.from_user(user)
+            principal_cache.set(principal)
+    
+    return check_user_active(principal)
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
 ) -> User:
+    """
+    Dependency to get the current authenticated user.
+    Validates JWT token and returns user (with profiles) from database.
+    The token is checked before the (lazy) session is used, so rejected
+    tokens never check out a connection.
+    
+    For endpoints that need the full user; authorization checks should
+    use get_current_principal instead.
+    """
+    user_id, role = get_token_claims(credentials.credentials)
+    
+    user = load_user(db, user_id, role)
+    
+    return check_user_active(user)
+
+
+def get_current_verified_user(
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
     """
     Dependency to ensure user has verified their email.
     """
@@ -89,8 +178,8 @@ def get_current_verified_user(
 
 
 def get_current_worker(
-    current_user: User = Depends(get_current_verified_user),
-) -> User:
+    current_user: Principal = Depends(get_current_verified_user),
+) -> Principal:
     """
     Dependency to ensure user is a care worker.
     """
@@ -104,8 +193,8 @@ def get_current_worker(
 
 
 def get_current_care_home(
-    current_user: User = Depends(get_current_verified_user),
-) -> User:
+    current_user: Principal = Depends(get_current_verified_user),
+) -> Principal:
     """
     Dependency to ensure user is a care home admin/staff.
     """
@@ -118,24 +207,38 @@ def get_current_care_home(
     return current_user
 
 
+def get_current_admin(
+    current_user: Principal = Depends(get_current_verified_user),
+) -> Principal:
+    """
+    Dependency to ensure user is a platform admin.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access restricted to admins only",
+        )
+    
+    return current_user
+
+
 def get_current_worker_with_complete_profile(
-    current_user: User = Depends(get_current_worker),
-    db: Session = Depends(get_db),
-) -> User:
+    current_user: Principal = Depends(get_current_worker),
+) -> Principal:
     """
     Dependency to ensure worker has completed their profile.
     Used for job board access, applications, etc.
     """
-    if not current_user.worker_profile:
+    if current_user.profile_completion_percentage is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Please complete your profile first",
         )
     
-    if not current_user.worker_profile.is_complete:
+    if not current_user.profile_complete:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Profile {current_user.worker_profile.profile_completion_percentage}% complete. Please finish your profile to access this feature.",
+            detail=f"Profile {current_user.profile_completion_percentage}% complete. Please finish your profile to access this feature.",
         )
     
     return current_user
@@ -0,0 +1,298 @@
+"""
+Email outbox sender.
+
+Runs in its own process (send_emails.py), never in the API workers. Each
+round claims up to EMAIL_BATCH_SIZE due emails, renders them and delivers
+them in one call to the provider's batch endpoint over a keep-alive HTTP
+connection.
+
+Delivery is at-least-once on our side and deduplicated on the provider's:
+
+- claiming a batch assigns it a batch_id and leases it (next_attempt_at
+  moves EMAIL_CLAIM_LEASE_SECONDS ahead) in a short transaction, so
+  concurrent senders skip it (FOR UPDATE SKIP LOCKED) and no lock is held
+  during the HTTP call
+- the batch_id is sent as the Idempotency-Key; a batch is always retried
+  whole under the same key, whether after an error or because its sender
+  died before recording the result
+- retryable failures (network errors, 429, 5xx) back off exponentially
+  (EMAIL_RETRY_BACKOFF_SECONDS, doubling, honouring Retry-After) until
+  EMAIL_MAX_ATTEMPTS; a rejected batch is split so one bad address cannot
+  hold back the others
+"""
+
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.email import render_email
+from app.models.email_outbox import EmailOutbox, EmailStatus
+
+
+logger = logging.getLogger(__name__)
+
+class TransportError(Exception):
+    """A batch was not (or may not have been) delivered."""
+    
+    def __init__(self, message: str, retryable: bool = True, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class ResendTransport:
+    """Resend batch API over a single keep-alive connection."""
+    
+    def __init__(self, api_key: str, base_url: str, timeout: float):
+        self.client = httpx.Client(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=1, max_keepalive_connections=1),
+        )
+    
+    def send_batch(self, messages: List[Dict[str, Any]], idempotency_key: str) -> List[str]:
+        """Send up to 100 emails; returns the provider message IDs in order."""
+        try:
+            response = self.client.post(
+                "/emails/batch",
+                json=messages,
+                headers={"Idempotency-Key": idempotency_key},
+            )
+        except httpx.HTTPError as e:
+            # Includes timeouts: the batch may have gone out, the retry reuses the key
+            raise TransportError(f"{type(e).__name__}: {e}")
+        
+        if response.status_code == 429 or response.status_code == 409 or response.status_code >= 500:
+            retry_after = response.headers.get("Retry-After")
+            raise TransportError(
+                f"HTTP {response.status_code}: {response.text[:200]}",
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        if response.status_code >= 400:
+            raise TransportError(f"HTTP {response.status_code}: {response.text[:200]}", retryable=False)
+        return [item["id"] for item in response.json()["data"]]
+    
+    def close(self):
+        self.client.close()
+
+
+class FakeTransport:
+    """
+    In-memory transport for tests and benchmarks.
+    
+    Behaves like the provider for idempotency: a repeated key returns the
+    original IDs without delivering again. `failures` are raised by the
+    next calls, in order; `latency` simulates the network round trip.
+    """
+    
+    def __init__(self, latency: float = 0, failures: Optional[List[TransportError]] = None):
+        self.latency = latency
+        self.failures = list(failures or [])
+        self.calls = 0
+        self.sent: List[Dict[str, Any]] = []
+        self.batches: Dict[str, List[str]] = {}
+    
+    def send_batch(self, messages: List[Dict[str, Any]], idempotency_key: str) -> List[str]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failures:
+            raise self.failures.pop(0)
+        if idempotency_key not in self.batches:
+            self.sent.extend(messages)
+            self.batches[idempotency_key] = [f"fake-{uuid.uuid4()}" for _ in messages]
+        return self.batches[idempotency_key]
+    
+    def close(self):
+        pass
+
+
+class OutboxSender:
+    """Claims, sends and records batches of outbox emails."""
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        transport,
+        batch_size: int = settings.EMAIL_BATCH_SIZE,
+        lease_seconds: float = settings.EMAIL_CLAIM_LEASE_SECONDS,
+        max_attempts: int = settings.EMAIL_MAX_ATTEMPTS,
+        backoff: float = settings.EMAIL_RETRY_BACKOFF_SECONDS,
+        backoff_max: float = settings.EMAIL_RETRY_BACKOFF_MAX_SECONDS,
+        sender: str = f"{settings.FROM_NAME} <{settings.FROM_EMAIL}>",
+    ):
+        self.session_factory = session_factory
+        self.transport = transport
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.sender = sender
+        self.stats = {"batches": 0, "sent": 0, "retried": 0, "failed": 0}
+    
+    def backoff_seconds(self, attempts: int) -> float:
+        """Delay before the next attempt, after `attempts` attempts."""
+        return min(self.backoff_max, self.backoff * 2 ** (attempts - 1))
+    
+    # Claiming
+    
+    def _claim(self, db: Session):
+        """Lease the next due batch: (batch_id, rows), rows empty if nothing is due."""
+        now = datetime.utcnow()
+        due = (EmailOutbox.status == EmailStatus.PENDING) & (EmailOutbox.next_attempt_at <= now)
+        
+        # Batches that were attempted before are retried whole, under their key
+        batch_id = db.scalar(
+            select(EmailOutbox.batch_id)
+            .where(due, EmailOutbox.batch_id.is_not(None))
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if batch_id is not None:
+            rows = db.scalars(
+                select(EmailOutbox).where(due, EmailOutbox.batch_id == batch_id).with_for_update(skip_locked=True)
+            ).all()
+        else:
+            batch_id = uuid.uuid4()
+            rows = db.scalars(
+                select(EmailOutbox)
+                .where(due, EmailOutbox.batch_id.is_(None))
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+        
+        for row in rows:
+            row.batch_id = batch_id
+            row.attempts += 1
+            row.next_attempt_at = now + timedelta(seconds=self.lease_seconds)
+        return batch_id, rows
+    
+    def _render(self, rows: List[EmailOutbox]):
+        """Provider messages for the claimed rows; rows that fail to render are failed."""
+        ids, attempts, messages = [], [], []
+        for row in rows:
+            try:
+                subject, html = render_email(row.template, row.params or {})
+            except Exception as e:
+                row.status = EmailStatus.FAILED
+                row.last_error = f"Render error: {e}"
+                self.stats["failed"] += 1
+                continue
+            ids.append(row.id)
+            attempts.append(row.attempts)
+            messages.append({"from": self.sender, "to": [row.to_email], "subject": subject, "html": html})
+        return ids, attempts, messages
+    
+    # Recording results
+    
+    def _record_sent(self, db: Session, ids: List[uuid.UUID], provider_ids: List[str]):
+        now = datetime.utcnow()
+        db.execute(update(EmailOutbox), [
+            {"id": id, "status": EmailStatus.SENT, "sent_at": now, "provider_message_id": provider_id, "last_error": None}
+            for id, provider_id in zip(ids, provider_ids)
+        ])
+        self.stats["sent"] += len(ids)
+    
+    def _record_failure(self, db: Session, ids: List[uuid.UUID], attempts: List[int], error: TransportError):
+        now = datetime.utcnow()
+        rows = []
+        for id, attempt in zip(ids, attempts):
+            row = {"id": id, "last_error": str(error)[:1000]}
+            if not error.retryable and len(ids) > 1:
+                # Rejected: retry each email on its own to isolate the bad one(s)
+                row.update(batch_id=uuid.uuid4(), next_attempt_at=now)
+            elif not error.retryable or attempt >= self.max_attempts:
+                row.update(status=EmailStatus.FAILED)
+            else:
+                delay = max(self.backoff_seconds(attempt), error.retry_after or 0)
+                row.update(next_attempt_at=now + timedelta(seconds=delay))
+            rows.append(row)
+        db.execute(update(EmailOutbox), rows)
+        
+        failed = sum(1 for row in rows if row.get("status") == EmailStatus.FAILED)
+        self.stats["failed"] += failed
+        self.stats["retried"] += len(rows) - failed
+    
+    # Sending
+    
+    def send_next_batch(self) -> int:
+        """
+        Claim and send one batch.
+        
+        Returns:
+            Number of emails claimed (0 when nothing is due)
+        """
+        with self.session_factory() as db:
+            batch_id, rows = self._claim(db)
+            if not rows:
+                db.rollback()
+                return 0
+            ids, attempts, messages = self._render(rows)
+            db.commit()
+        
+        if not messages:
+            return len(rows)
+        
+        self.stats["batches"] += 1
+        try:
+            provider_ids = self.transport.send_batch(messages, str(batch_id))
+        except TransportError as e:
+            logger.warning("Email batch %s (%d emails) failed: %s", batch_id, len(messages), e)
+            with self.session_factory() as db:
+                self._record_failure(db, ids, attempts, e)
+                db.commit()
+            return len(rows)
+        
+        with self.session_factory() as db:
+            self._record_sent(db, ids, provider_ids)
+            db.commit()
+        return len(rows)
+    
+    def drain(self) -> int:
+        """Send batches until nothing is due; returns the number of emails claimed."""
+        total = 0
+        while True:
+            claimed = self.send_next_batch()
+            if not claimed:
+                return total
+            total += claimed
+    
+    def purge(self, older_than_days: int = settings.EMAIL_OUTBOX_RETENTION_DAYS) -> int:
+        """Delete sent and failed emails older than the retention period."""
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        with self.session_factory() as db:
+            result = db.execute(
+                delete(EmailOutbox).where(
+                    EmailOutbox.status != EmailStatus.PENDING,
+                    EmailOutbox.created_at < cutoff,
+                )
+            )
+            db.commit()
+        return result.rowcount
+    
+    def run(self, stop: threading.Event, poll_interval: float = settings.EMAIL_POLL_INTERVAL_SECONDS):
+        """Send until `stop` is set, polling the outbox when it is empty."""
+        next_purge = 0.0
+        while not stop.is_set():
+            try:
+                if time.monotonic() >= next_purge:
+                    self.purge()
+                    next_purge = time.monotonic() + 3600
+                # Keep going while batches come back full
+                if self.send_next_batch() >= self.batch_size:
+                    continue
+            except Exception as e:
+                logger.exception("Email sender error")
+            stop.wait(poll_interval)
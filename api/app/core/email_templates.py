@@ -0,0 +1,166 @@
+"""
+Precompiled email templates.
+
+Templates live in app/templates/email: one HTML fragment per email, a
+shared layout and a shared stylesheet. They are loaded and compiled once,
+when this module is imported:
+
+- the layout, stylesheet and settings-derived values ($frontend_url) are
+  substituted up front, so the static text of each email is a handful of
+  prebuilt strings
+- the remaining $placeholders become the template's fields; rendering
+  only HTML-escapes those values and joins them with the static parts
+
+render_many() renders one template for many recipients lazily, so a large
+send never holds every rendered email in memory.
+"""
+
+import html
+import string
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from app.core.config import settings
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+
+@dataclass(frozen=True)
+class EmailTemplateSpec:
+    """An email: its subject and body file, and defaults for empty fields."""
+    subject: str
+    body: str  # File name in TEMPLATE_DIR
+    defaults: Dict[str, str] = field(default_factory=dict)
+
+
+EMAIL_TEMPLATES = {
+    "verification": EmailTemplateSpec(
+        subject="Verify your Vicarity account",
+        body="verification.html",
+        defaults={"first_name": "there"},
+    ),
+    "worker_welcome": EmailTemplateSpec(
+        subject="Welcome to Vicarity, $first_name! Complete your profile to start finding work",
+        body="worker_welcome.html",
+        defaults={"first_name": "there"},
+    ),
+    "care_home_welcome": EmailTemplateSpec(
+        subject="Welcome to Vicarity - Start hiring qualified care staff today",
+        body="care_home_welcome.html",
+        defaults={"contact_name": "there"},
+    ),
+    "password_reset": EmailTemplateSpec(
+        subject="Reset your Vicarity password",
+        body="password_reset.html",
+    ),
+}
+
+
+class CompiledText:
+    """
+    Text compiled to a render function.
+    
+    Static values are substituted while compiling. The remaining static
+    text is split into parts; rendering looks up and escapes each field
+    once and joins the values with the parts, with no per-render parsing.
+    """
+    
+    def __init__(self, source: str, static: Mapping[str, str], escape: bool, defaults: Optional[Mapping[str, str]] = None):
+        parts: List[str] = [""]
+        slots: List[str] = []
+        position = 0
+        for match in string.Template.pattern.finditer(source):
+            parts[-1] += source[position:match.start()]
+            position = match.end()
+            name = match.group("named") or match.group("braced")
+            if match.group("escaped") is not None:
+                parts[-1] += "$"
+            elif name in static:
+                parts[-1] += static[name]
+            elif name:
+                slots.append(name)
+                parts.append("")
+            else:
+                raise ValueError(f"Invalid placeholder at offset {match.start()}")
+        parts[-1] += source[position:]
+        self.parts = tuple(parts)
+        self.slots = tuple(slots)
+        self.fields = tuple(dict.fromkeys(slots))
+        self.render = self._compile(escape, defaults or {})
+    
+    def _compile(self, escape: bool, defaults: Mapping[str, str]) -> Callable[[Mapping[str, Any]], str]:
+        """Build `render(values) -> str` for this text."""
+        parts, slots, fields = self.parts, self.slots, self.fields
+        
+        def render(values: Mapping[str, Any]) -> str:
+            resolved = {}
+            for name in fields:
+                # Missing or empty values fall back to the defaults ("Hi there")
+                value = str(values.get(name) or defaults[name]) if name in defaults else str(values[name])
+                resolved[name] = html.escape(value) if escape else value
+            pieces = [parts[0]]
+            for name, part in zip(slots, parts[1:]):
+                pieces.append(resolved[name])
+                pieces.append(part)
+            return "".join(pieces)
+        
+        return render
+
+
+class CompiledEmail:
+    """A compiled email template: subject and HTML body."""
+    
+    def __init__(self, name: str, spec: EmailTemplateSpec, layout: str, static: Mapping[str, str]):
+        self.name = name
+        body = layout.replace("$content", (TEMPLATE_DIR / spec.body).read_text())
+        self.subject = CompiledText(spec.subject, static, escape=False, defaults=spec.defaults)
+        self.html = CompiledText(body, static, escape=True, defaults=spec.defaults)
+        self.fields = tuple(dict.fromkeys(self.subject.fields + self.html.fields))
+    
+    def render(self, **values: Any) -> Tuple[str, str]:
+        """Render to (subject, html); raises KeyError for a missing field."""
+        return self.subject.render(values), self.html.render(values)
+    
+    def render_many(self, recipients: Iterable[Mapping[str, Any]]) -> Iterator[Tuple[str, str]]:
+        """Render (subject, html) for each recipient's values, lazily."""
+        render_subject, render_html = self.subject.render, self.html.render
+        for values in recipients:
+            yield render_subject(values), render_html(values)
+
+
+class EmailTemplates:
+    """All email templates, compiled from a template directory."""
+    
+    def __init__(self, specs: Mapping[str, EmailTemplateSpec], frontend_url: str):
+        layout = (TEMPLATE_DIR / "layout.html").read_text()
+        # The stylesheet is inlined into the layout once, for every template
+        layout = layout.replace("$stylesheet", (TEMPLATE_DIR / "styles.css").read_text().rstrip())
+        static = {"frontend_url": html.escape(frontend_url.rstrip("/"))}
+        self.templates = {name: CompiledEmail(name, spec, layout, static) for name, spec in specs.items()}
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.templates
+    
+    def __getitem__(self, name: str) -> CompiledEmail:
+        return self.templates[name]
+
+
+# Compiled once per process
+email_templates = EmailTemplates(EMAIL_TEMPLATES, frontend_url=settings.FRONTEND_URL)
+
+
+def render_many(template: str, recipients: Iterable[Mapping[str, Any]]) -> Iterator[Tuple[str, str]]:
+    """
+    Render one template for many recipients.
+    
+    Args:
+        template: Template name (e.g. "worker_welcome")
+        recipients: Field values per recipient, e.g. {"first_name": "Sam"};
+            may itself be a generator (e.g. rows streamed from a query)
+    
+    Yields:
+        (subject, html) per recipient, in order
+    """
+    return email_templates[template].render_many(recipients)
@@ -0,0 +1,246 @@
+"""
+Local postcode geocoding.
+
+Postcode centroids (e.g. the ONS Postcode Directory, about 2.6M rows) are
+ingested once into a compact binary file:
+    
+    header   magic (8 bytes), row count (uint64)
+    keys     normalized postcodes ("SW1A1AA"), 7 bytes each, sorted
+    coords   (latitude, longitude) per key, int32 microdegrees (~0.1 m)
+
+about 15 bytes per postcode, 40 MiB for the whole of the UK. The API maps
+the file read-only: lookups binary search the keys in place (O(log n)
+page touches), and the pages live in the OS page cache, shared by every
+uvicorn worker rather than copied into each process.
+
+Re-ingesting replaces the file atomically; processes already running keep
+the previous file mapped until they are restarted.
+"""
+
+import csv
+import logging
+import math
+import os
+import threading
+from array import array
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VPCGEO1\0"
+HEADER_SIZE = 16
+KEY_SIZE = 7  # Longest UK postcode without its space ("SW1A1AA")
+SCALE = 1_000_000  # Coordinates are stored in microdegrees
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Accepted CSV column names: ONSPD/NSPL use pcds (or pcd), lat, long
+POSTCODE_COLUMNS = ("pcds", "pcd", "postcode")
+LATITUDE_COLUMNS = ("lat", "latitude")
+LONGITUDE_COLUMNS = ("long", "lng", "longitude")
+
+Coordinates = Tuple[float, float]
+
+
+def normalize_postcode(postcode: Optional[str]) -> Optional[str]:
+    """Uppercase a postcode and drop its spaces; None if it cannot be one."""
+    if not postcode:
+        return None
+    normalized = "".join(postcode.split()).upper()
+    if not 5 <= len(normalized) <= KEY_SIZE or not normalized.isascii() or not normalized.isalnum():
+        return None
+    return normalized
+
+
+def _column(header: List[str], names: Sequence[str]) -> int:
+    lowered = [name.strip().lower() for name in header]
+    for name in names:
+        if name in lowered:
+            return lowered.index(name)
+    raise ValueError(f"CSV has no {names[0]} column (accepted: {', '.join(names)})")
+
+
+def read_centroids(lines: Iterable[str]) -> Iterator[Tuple[str, float, float]]:
+    """
+    Yield (normalized postcode, latitude, longitude) from CSV lines.
+    
+    Rows without a usable location are skipped: ONSPD marks those with
+    latitude 99.999999.
+    """
+    reader = csv.reader(lines)
+    header = next(reader)
+    postcode_at = _column(header, POSTCODE_COLUMNS)
+    latitude_at = _column(header, LATITUDE_COLUMNS)
+    longitude_at = _column(header, LONGITUDE_COLUMNS)
+    for row in reader:
+        try:
+            latitude, longitude = float(row[latitude_at]), float(row[longitude_at])
+        except (ValueError, IndexError):
+            continue
+        postcode = normalize_postcode(row[postcode_at])
+        if postcode and -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            yield postcode, latitude, longitude
+
+
+def ingest(csv_path: str, index_path: str) -> int:
+    """
+    Build a postcode index file from a centroid CSV.
+    
+    The file is written next to `index_path` and renamed over it, so
+    readers never see a partial file. Returns the number of postcodes.
+    """
+    keys = bytearray()
+    coords = array("i")
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        for postcode, latitude, longitude in read_centroids(f):
+            keys += postcode.encode().ljust(KEY_SIZE, b"\0")
+            coords.append(round(latitude * SCALE))
+            coords.append(round(longitude * SCALE))
+    
+    key_array = np.frombuffer(bytes(keys), dtype=f"S{KEY_SIZE}")
+    coord_array = np.frombuffer(coords, dtype=np.int32).reshape(-1, 2)
+    # Sorted for binary search; a postcode listed twice keeps its last row
+    order = np.argsort(key_array, kind="stable")
+    key_array, coord_array = key_array[order], coord_array[order]
+    last = np.append(key_array[1:] != key_array[:-1], True)
+    key_array, coord_array = key_array[last], coord_array[last]
+    
+    count = len(key_array)
+    temporary = f"{index_path}.tmp{os.getpid()}"
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    with open(temporary, "wb") as f:
+        f.write(MAGIC + np.uint64(count).tobytes())
+        f.write(key_array.tobytes())
+        f.write(b"\0" * _padding(count))
+        f.write(np.ascontiguousarray(coord_array).tobytes())
+    os.replace(temporary, index_path)
+    return count
+
+
+def _padding(count: int) -> int:
+    """Bytes after the keys that align the coordinates to 4 bytes."""
+    return -(HEADER_SIZE + count * KEY_SIZE) % 4
+
+
+class PostcodeIndex:
+    """Read-only, memory-mapped postcode index (see ingest())."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._keys: Optional[np.ndarray] = None
+        self._coords: Optional[np.ndarray] = None
+        self._opened = False
+        self._lock = threading.Lock()
+    
+    def _open(self):
+        """Map the file on first use; an index without a file finds nothing."""
+        with self._lock:
+            if self._opened:
+                return
+            self._opened = True
+            if not os.path.exists(self.path):
+                logger.warning("Postcode index %s not found; postcodes will not be geocoded", self.path)
+                return
+            # Plain ndarray views of the mapping: np.memmap slices are slow to make
+            data = np.memmap(self.path, dtype=np.uint8, mode="r").view(np.ndarray)
+            if bytes(data[:8]) != MAGIC:
+                raise ValueError(f"{self.path} is not a postcode index")
+            count = int(data[8:HEADER_SIZE].view(np.uint64)[0])
+            coords_at = HEADER_SIZE + count * KEY_SIZE + _padding(count)
+            self._keys = data[HEADER_SIZE:HEADER_SIZE + count * KEY_SIZE].view(f"S{KEY_SIZE}")
+            self._coords = data[coords_at:coords_at + count * 8].view(np.int32).reshape(count, 2)
+    
+    @property
+    def available(self) -> bool:
+        if not self._opened:
+            self._open()
+        return self._keys is not None
+    
+    def __len__(self) -> int:
+        return len(self._keys) if self.available else 0
+    
+    def lookup(self, postcode: Optional[str]) -> Optional[Coordinates]:
+        """(latitude, longitude) of a postcode, or None if it is unknown."""
+        key = normalize_postcode(postcode)
+        if key is None or not self.available:
+            return None
+        key = key.encode()
+        at = int(np.searchsorted(self._keys, key))
+        if at == len(self._keys) or self._keys[at] != key:
+            return None
+        latitude, longitude = self._coords[at].tolist()
+        return latitude / SCALE, longitude / SCALE
+    
+    def lookup_many(self, postcodes: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized lookup: (latitudes, longitudes) as float arrays, NaN
+        for unknown postcodes.
+        """
+        latitudes = np.full(len(postcodes), np.nan)
+        longitudes = np.full(len(postcodes), np.nan)
+        if not len(self) or not len(postcodes):
+            return latitudes, longitudes
+        keys = np.array([(normalize_postcode(p) or "").encode() for p in postcodes], dtype=f"S{KEY_SIZE}")
+        at = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        found = (self._keys[at] == keys) & (keys != b"")
+        coords = self._coords[at[found]]
+        latitudes[found] = coords[:, 0] / SCALE
+        longitudes[found] = coords[:, 1] / SCALE
+        return latitudes, longitudes
+
+
+def haversine_miles(latitude: float, longitude: float, latitudes, longitudes) -> np.ndarray:
+    """Great-circle distances in miles from one point to arrays of points."""
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def within_radius(
+    latitude: float,
+    longitude: float,
+    latitudes,
+    longitudes,
+    radius_miles: Union[float, np.ndarray],
+) -> np.ndarray:
+    """
+    Mask of the points within `radius_miles` of (latitude, longitude).
+    
+    `radius_miles` may be one radius or one per point, e.g. each worker's
+    travel_radius_miles for "workers who would travel to this home".
+    Points with unknown (NaN) coordinates never match.
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    radius_miles = np.asarray(radius_miles, dtype=np.float64)
+    # Cheap bounding box first: a degree of latitude is 69 miles, one of
+    # longitude 69 * cos(latitude) at the far edge of the box
+    # (one scratch buffer: fresh temporaries per step cost more than the math)
+    reach = radius_miles / 69.0
+    edge = min(abs(latitude) + float(np.nanmax(reach, initial=0)), 89.0)
+    offset = np.subtract(latitudes, latitude)
+    near = np.abs(offset, out=offset) <= reach
+    np.subtract(longitudes, longitude, out=offset)
+    near &= np.abs(offset, out=offset) <= reach * (1.01 / math.cos(math.radians(edge)))
+    candidates = np.flatnonzero(near)
+    radii = radius_miles if radius_miles.ndim == 0 else radius_miles[candidates]
+    distances = haversine_miles(latitude, longitude, latitudes[candidates], longitudes[candidates])
+    mask = np.zeros(len(latitudes), dtype=bool)
+    mask[candidates[distances <= radii]] = True
+    return mask
+
+
+def geocode_profile(profile) -> None:
+    """Set a profile's latitude/longitude from its postcode (None if unknown)."""
+    coordinates = postcode_index.lookup(profile.postcode)
+    profile.latitude, profile.longitude = coordinates or (None, None)
+
+
+# Mapped on first lookup, once per process (the pages are shared)
+postcode_index = PostcodeIndex(settings.POSTCODE_INDEX_PATH)
@@ -0,0 +1,215 @@
+"""
+Background health probes.
+
+A thread probes PostgreSQL, Redis and the email provider every
+HEALTH_PROBE_INTERVAL_SECONDS (the provider every
+HEALTH_EMAIL_PROBE_INTERVAL_SECONDS: it rate limits) and keeps the
+latest status and latency of each. /health, /health/live and
+/health/ready answer from these results, so health checks never touch
+the database, Redis or the event loop's time, however often they come.
+
+- each probe runs on a small executor and counts as "timeout" after
+  HEALTH_PROBE_TIMEOUT_SECONDS; a probe still hanging isn't started
+  again until it returns, so an outage can't pile up threads
+- the database is probed over its own single connection, never one
+  from the request pool (which readiness checks for saturation instead)
+- Redis is optional for the API (see redis_client), so it is reported
+  but doesn't affect readiness; neither does the email provider (emails
+  go out from the outbox sender)
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.core.database import DATABASE_URL, NULL_POOL, engine, pool_stats
+from app.core.redis_client import get_redis
+
+
+logger = logging.getLogger(__name__)
+
+
+class HealthProber:
+    """Probes dependencies on a background thread; keeps the latest results."""
+    
+    def __init__(self, interval: float, timeout: float, email_interval: float, stale_after: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.email_interval = email_interval
+        self.stale_after = stale_after
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, Future] = {}
+        self._next_email_probe = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._probe_engine = None
+        self._email_client: Optional[httpx.Client] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    # Probes (blocking; return a status other than "ok", or None)
+    
+    def _probe_database(self) -> Optional[str]:
+        if self._probe_engine is None:
+            connect_args = {}
+            if engine.dialect.name == "postgresql":
+                timeout_ms = int(self.timeout * 1000)
+                connect_args = {"connect_timeout": max(1, round(self.timeout))}
+                if not NULL_POOL:
+                    # Transaction poolers (PgBouncer) reject startup options
+                    connect_args["options"] = f"-c statement_timeout={timeout_ms}"
+            # One connection, kept open between probes
+            self._probe_engine = create_engine(
+                DATABASE_URL, pool_size=1, max_overflow=0, pool_recycle=300, connect_args=connect_args,
+            )
+        with self._probe_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return None
+    
+    def _probe_redis(self) -> Optional[str]:
+        redis_client = get_redis()
+        if redis_client is None:
+            return "disconnected"  # Unreachable at startup; the API runs without it
+        redis_client.ping()
+        return None
+    
+    def _probe_email(self) -> Optional[str]:
+        if not settings.RESEND_API_KEY:
+            return "disabled"
+        if self._email_client is None:
+            self._email_client = httpx.Client(base_url=settings.EMAIL_API_URL, timeout=self.timeout)
+        # Reachability only: unauthenticated, so it doesn't use up the API key's rate limit
+        response = self._email_client.get("/")
+        if response.status_code >= 500:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return None
+    
+    # Running them
+    
+    def _due_probes(self) -> Dict[str, Callable[[], Optional[str]]]:
+        probes = {"database": self._probe_database, "redis": self._probe_redis}
+        now = time.monotonic()
+        if now >= self._next_email_probe:
+            probes["email"] = self._probe_email
+            self._next_email_probe = now + self.email_interval
+        return probes
+    
+    def _record(self, name: str, status: str, latency_ms: Optional[float] = None, error: Optional[str] = None,
+                detail: Optional[str] = None):
+        """Keep a probe's result; `detail` (exception text: hosts, users) is only logged, never served."""
+        result = {
+            "status": status,
+            "latency_ms": round(latency_ms, 2) if latency_ms is not None else None,
+            "error": error,
+            "checked_at": datetime.utcnow().isoformat(),
+            "_monotonic": time.monotonic(),
+        }
+        if status not in ("ok", "disabled") and self._results.get(name, {}).get("status") == "ok":
+            logger.warning("Health probe %s: %s %s", name, status, detail or error or "")
+        self._results = {**self._results, name: result}  # Swapped whole: readers never see it half-updated
+    
+    def probe_once(self):
+        """Run the probes that are due, concurrently; wait for each up to the timeout."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="health-probe")
+        
+        started: Dict[str, Tuple[float, Future]] = {}
+        for name, probe in self._due_probes().items():
+            pending = self._pending.get(name)
+            if pending is not None and not pending.done():
+                self._record(name, "timeout", error="Previous probe still running")
+                continue
+            started[name] = (time.perf_counter(), self._executor.submit(probe))
+            self._pending[name] = started[name][1]
+        
+        deadline = time.perf_counter() + self.timeout
+        for name, (started_at, future) in started.items():
+            try:
+                status = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+            except FutureTimeout:
+                self._record(name, "timeout", error=f"No answer within {self.timeout:g}s")
+            except Exception as e:
+                self._record(name, "error", (time.perf_counter() - started_at) * 1000, type(e).__name__,
+                             detail=f"{type(e).__name__}: {e}")
+            else:
+                self._record(name, status or "ok", (time.perf_counter() - started_at) * 1000)
+    
+    def start(self):
+        """Probe every interval on a background thread (call probe_once() first to be ready at once)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-prober", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=self.timeout + 1)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._probe_engine is not None:
+            self._probe_engine.dispose()
+            self._probe_engine = None
+        if self._email_client is not None:
+            self._email_client.close()
+            self._email_client = None
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.probe_once()
+            except Exception:
+                logger.exception("Health probes failed")
+    
+    # Results
+    
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        """Latest result of each probe, with its age."""
+        now = time.monotonic()
+        return {
+            name: {**{key: value for key, value in result.items() if key != "_monotonic"},
+                   "age_seconds": round(now - result["_monotonic"], 1)}
+            for name, result in self._results.items()
+        }
+    
+    def status(self, name: str) -> Optional[str]:
+        result = self._results.get(name)
+        return result["status"] if result else None
+    
+    def readiness(self) -> Tuple[bool, List[str], Dict[str, Any]]:
+        """
+        (ready, reasons if not, pool stats): ready when the last database
+        probe succeeded recently and the request pool has a free connection.
+        """
+        reasons = []
+        database = self._results.get("database")
+        if database is None:
+            reasons.append("database: not probed yet")
+        elif database["status"] != "ok":
+            reasons.append(f"database: {database['status']}")
+        elif time.monotonic() - database["_monotonic"] > self.stale_after:
+            reasons.append("database: last probe is stale")
+        
+        pools = pool_stats()
+        pool = pools.get("async" if settings.DB_ASYNC else "sync", {})
+        if pool.get("saturated"):
+            reasons.append(f"database pool saturated ({pool['checked_out']} connections checked out)")
+        return not reasons, reasons, pool
+
+
+# Latest dependency status of this worker
+health_prober = HealthProber(
+    interval=settings.HEALTH_PROBE_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+    email_interval=settings.HEALTH_EMAIL_PROBE_INTERVAL_SECONDS,
+    stale_after=settings.HEALTH_STALE_AFTER_SECONDS,
+)
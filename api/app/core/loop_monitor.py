@@ -0,0 +1,116 @@
+"""
+Event loop lag monitor.
+
+A background task sleeps for a fixed interval and records how late it
+wakes up (scheduling delay). A watchdog thread notices when that task
+stops checking in and, while the loop is still blocked, logs the stack of
+the event loop thread - i.e. the coroutine doing blocking work.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Measures event loop scheduling delay and reports blocking code."""
+    
+    def __init__(self, interval: float, threshold: float, window: int = 2400):
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls = 0
+        self._samples = deque(maxlen=window)
+        self._heartbeat = time.monotonic()
+        self._reported_heartbeat: Optional[float] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    def start(self):
+        """Start sampling the running loop. Must be called from the loop."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+    
+    async def stop(self):
+        """Stop sampling and wait for the watchdog to exit."""
+        if self._task is None:
+            return
+        self._stop.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._watchdog.join(timeout=1)
+        self._watchdog = None
+    
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self._samples.append(lag)
+            self._heartbeat = time.monotonic()
+    
+    def _watch(self):
+        while not self._stop.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            stalled_for = time.monotonic() - heartbeat - self.interval
+            if stalled_for <= self.threshold or self._reported_heartbeat == heartbeat:
+                continue
+            
+            # Report each stall once, with the stack captured mid-stall
+            self._reported_heartbeat = heartbeat
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<unavailable>\n"
+            logger.warning(
+                "Event loop blocked for over %.0f ms. Loop thread stack:\n%s",
+                stalled_for * 1000,
+                stack,
+            )
+    
+    def percentiles(self) -> Dict[str, float]:
+        """Lag percentiles (ms) over the recent sample window."""
+        ordered = sorted(self._samples)
+        if not ordered:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "samples": 0, "stalls": self.stalls}
+        
+        def pick(pct: float) -> float:
+            index = min(len(ordered) - 1, int(pct / 100 * len(ordered)))
+            return round(ordered[index] * 1000, 2)
+        
+        return {
+            "p50": pick(50),
+            "p95": pick(95),
+            "p99": pick(99),
+            "max": round(ordered[-1] * 1000, 2),
+            "samples": len(ordered),
+            "stalls": self.stalls,
+        }
+
+
+# Global monitor instance (one per worker process)
+loop_monitor = LoopLagMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_MS / 1000,
+    threshold=settings.LOOP_LAG_THRESHOLD_MS / 1000,
+)
@@ -0,0 +1,138 @@
+"""
+Worker-to-care-home match scoring.
+
+A match score (0-100) is a weighted sum of components, each 0-1:
+
+- qualifications: share of the required qualification codes held
+- distance: closer is better, relative to the worker's travel radius;
+  workers beyond their radius are not matched at all
+- availability: share of the requested days and shift types covered
+- rate: 1 when the offered rate reaches the worker's minimum, falling to
+  0 at RATE_TOLERANCE below it
+- experience: years_experience band
+- specialization: the worker specializes in the care home's type
+
+The components are vectorized: each takes arrays with an entry per
+candidate worker (see WorkerBitmapIndex.match()) and scores them all in
+one pass. With a care home location, workers outside a box around it that
+fits every travel radius are never candidates, so only the few nearby
+ones are scored at all.
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+
+
+WEIGHTS = {
+    "qualifications": 35,
+    "distance": 20,
+    "availability": 15,
+    "rate": 15,
+    "experience": 10,
+    "specialization": 5,
+}
+
+# years_experience bands, in order; the code is the position
+EXPERIENCE_BANDS = ("0-1", "1-3", "3-5", "5+")
+
+# Worker specialization that fits each care home type
+CARE_HOME_SPECIALIZATIONS = {
+    "residential": "elderly",
+    "nursing": "elderly",
+    "dementia": "dementia",
+    "learning_disability": "learning_disability",
+    "mental_health": "mental_health",
+    "physical_disability": "physical_disability",
+    "childrens": "childrens",
+    "domiciliary": "elderly",
+}
+
+DEFAULT_TRAVEL_RADIUS_MILES = 10  # For workers who have not set one
+RATE_TOLERANCE = 0.25  # Offers this far below a worker's minimum score 0
+UNKNOWN = 0.25  # Distance or rate score when either side is not stated
+
+
+
+def experience_code(years_experience: Optional[str]) -> int:
+    """Band position of a years_experience value; -1 if unknown."""
+    try:
+        return EXPERIENCE_BANDS.index(years_experience)
+    except ValueError:
+        return -1
+
+
+# experience_fit() by code + 1: unknown, then each band
+EXPERIENCE_FIT = np.array([0, *np.linspace(0, 1, len(EXPERIENCE_BANDS))], dtype=np.float32)
+
+
+def experience_fit(codes: np.ndarray) -> np.ndarray:
+    """0 for the lowest band up to 1 for the highest; 0 if unknown."""
+    return EXPERIENCE_FIT[codes + 1]
+
+
+def rate_fit(offered: Optional[int], rate_min: np.ndarray) -> np.ndarray:
+    """How well an offered rate (pence) meets each worker's minimum (-1 if not stated)."""
+    if offered is None:
+        return np.ones(len(rate_min), dtype=np.float32)
+    fit = rate_min.astype(np.float32)
+    # 1 - shortfall / RATE_TOLERANCE, in place
+    np.divide(np.float32(offered), np.maximum(fit, 1, out=fit), out=fit)
+    fit -= 1 - RATE_TOLERANCE
+    fit *= np.float32(1 / RATE_TOLERANCE)
+    np.clip(fit, 0, 1, out=fit)
+    fit[rate_min < 0] = UNKNOWN
+    return fit
+
+
+def nearby(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray, miles: float) -> np.ndarray:
+    """
+    Mask of the workers in a box reaching `miles` around a point (a cheap
+    superset of those within `miles`), and of those without a location.
+    """
+    reach = np.float32(miles / 69.0)  # Miles per degree of latitude
+    edge = min(abs(latitude) + float(reach), 89.0)
+    # One scratch buffer: fresh temporaries cost more than the arithmetic
+    offset = np.subtract(latitudes, np.float32(latitude))
+    mask = np.abs(offset, out=offset) <= reach
+    np.subtract(longitudes, np.float32(longitude), out=offset)
+    mask &= np.abs(offset, out=offset) <= reach * np.float32(1.01 / math.cos(math.radians(edge)))
+    mask |= np.isnan(latitudes)
+    return mask
+
+
+def travel_radius(radius: np.ndarray) -> np.ndarray:
+    """Workers' travel radius in miles, with the default where unset (NaN)."""
+    return np.where(np.isnan(radius), DEFAULT_TRAVEL_RADIUS_MILES, radius)
+
+
+def distance_fit(miles: np.ndarray, radius: np.ndarray) -> np.ndarray:
+    """
+    1 next door down to 0.5 at the worker's travel radius; -inf beyond it
+    (excluded). UNKNOWN without a location.
+    """
+    ratio = miles / np.maximum(travel_radius(radius), 0.5)
+    fit = np.where(ratio > 1, -np.inf, 1 - ratio * 0.5)
+    fit[np.isnan(miles)] = UNKNOWN
+    return fit
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest finite scores, best first."""
+    if k <= 0 or not len(scores):
+        return np.zeros(0, dtype=np.int64)
+    # Partitioning every score is the slowest step: guess a cut from a
+    # sample that leaves a few times k above it, and use all finite scores
+    # only if it leaves too few
+    sample = scores[::max(1, len(scores) // (100 * k))]
+    keep = min(len(sample), 4 * k * len(sample) // len(scores) + 4)
+    cut = np.partition(sample, len(sample) - keep)[len(sample) - keep]
+    candidates = np.flatnonzero(scores >= cut) if np.isfinite(cut) else np.zeros(0, dtype=np.int64)
+    if len(candidates) < k:
+        candidates = np.flatnonzero(np.isfinite(scores))
+        k = min(k, len(candidates))
+        if not k:
+            return candidates
+    best = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+    return best[np.argsort(-scores[best], kind="stable")]
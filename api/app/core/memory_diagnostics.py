@@ -0,0 +1,209 @@
+"""
+Memory diagnostics for one worker process, served by the admin router.
+
+- RSS and peak RSS, garbage collector counts
+- tracemalloc: tracing starts when an admin takes a baseline snapshot
+  (or at startup with PYTHONTRACEMALLOC=<frames>); the top allocation
+  sites, and their growth since the baseline, are grouped by module
+  ("app.routers.auth", "sqlalchemy.orm.identity", "pydantic.main"...)
+  or by the app code that caused them
+- SQLAlchemy: live sessions and their identity map sizes, pool stats,
+  and live ORM instances per model
+
+Each uvicorn worker has its own heap, so every report carries the pid it
+came from, and a diff compares against that worker's own baseline.
+Scanning the heap (sessions, ORM instances) walks every object the
+garbage collector tracks: call from a thread, and not in a loop.
+"""
+
+import gc
+import linecache
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import Base, pool_stats
+
+
+# Allocations made by the diagnostics themselves and the import system
+IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+GROUP_BY = ("module", "caller")
+
+
+@lru_cache(maxsize=4096)
+def module_name(filename: str) -> str:
+    """Dotted module name of a source file, from the sys.path entry it is under."""
+    best = ""
+    for entry in sys.path:
+        entry = os.path.abspath(entry or ".") + os.sep
+        if filename.startswith(entry) and len(entry) > len(best):
+            best = entry
+    if not best:
+        return filename
+    name = os.path.splitext(filename[len(best):])[0].replace(os.sep, ".")
+    return name[:-len(".__init__")] if name.endswith(".__init__") else name
+
+
+def _proc_status() -> Dict[str, int]:
+    """VmRSS and VmHWM (peak) in bytes, from /proc (Linux)."""
+    values = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    values[key] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return values
+
+
+class MemoryDiagnostics:
+    """tracemalloc baseline and heap reports for this process."""
+    
+    def __init__(self, frames: int):
+        self.frames = frames
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._baseline_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+    
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(IGNORED_TRACES)
+    
+    def take_baseline(self) -> Dict[str, Any]:
+        """Start tracing if needed and keep a snapshot to diff against."""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+            self._baseline = self._snapshot()
+            self._baseline_at = datetime.utcnow()
+        return self.tracing_status()
+    
+    def stop(self) -> Dict[str, Any]:
+        """Stop tracing (it costs memory and CPU on every allocation) and drop the baseline."""
+        with self._lock:
+            tracemalloc.stop()
+            self._baseline = None
+            self._baseline_at = None
+        return self.tracing_status()
+    
+    def tracing_status(self) -> Dict[str, Any]:
+        traced, peak = tracemalloc.get_traced_memory()
+        return {
+            "pid": os.getpid(),
+            "tracing": tracemalloc.is_tracing(),
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_bytes": traced,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+            "baseline_at": self._baseline_at.isoformat() if self._baseline_at else None,
+        }
+    
+    def summary(self) -> Dict[str, Any]:
+        """RSS, GC, tracing status, sessions, pools and live ORM instances."""
+        proc = _proc_status()
+        return {
+            "pid": os.getpid(),
+            "rss_bytes": proc.get("VmRSS"),
+            "peak_rss_bytes": proc.get("VmHWM"),
+            "gc": {"counts": gc.get_count(), "objects": len(gc.get_objects()), "garbage": len(gc.garbage)},
+            "tracemalloc": self.tracing_status(),
+            "pools": pool_stats(),
+            **heap_stats(),
+        }
+    
+    def top(self, limit: int = 20, group_by: str = "module", depth: int = 3) -> Dict[str, Any]:
+        """Largest allocation sites of the current heap, grouped."""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing; take a baseline snapshot first")
+        snapshot = self._snapshot()
+        key = "lineno" if group_by == "module" else "traceback"
+        groups = _group(((stat.traceback, stat.size, stat.count) for stat in snapshot.statistics(key)), group_by, depth)
+        return {**self.tracing_status(), "groups": groups[:limit]}
+    
+    def diff(self, limit: int = 20, group_by: str = "module", depth: int = 3) -> Dict[str, Any]:
+        """Growth since the baseline snapshot, grouped (largest growth first)."""
+        with self._lock:
+            baseline = self._baseline
+        if baseline is None:
+            raise RuntimeError("No baseline snapshot in this worker; take one first")
+        snapshot = self._snapshot()
+        key = "lineno" if group_by == "module" else "traceback"
+        groups = _group(
+            ((stat.traceback, stat.size_diff, stat.count_diff) for stat in snapshot.compare_to(baseline, key)),
+            group_by, depth,
+        )
+        return {**self.tracing_status(), "groups": groups[:limit]}
+
+
+def _caller(traceback) -> tracemalloc.Frame:
+    """Innermost frame in the app's own code, or the innermost frame."""
+    for frame in traceback:
+        module = module_name(frame.filename)
+        if module == "main" or module.startswith("app."):
+            return frame
+    return traceback[0]
+
+
+def _group(stats, group_by: str, depth: int) -> List[Dict[str, Any]]:
+    """Sum (traceback, size, count) by module, keeping each group's largest sites."""
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}")
+    groups: Dict[str, Dict[str, Any]] = {}
+    for traceback, size, count in stats:
+        frame = traceback[0] if group_by == "module" else _caller(traceback)
+        module = module_name(frame.filename)
+        name = ".".join(module.split(".")[:depth])
+        group = groups.setdefault(name, {"module": name, "size_bytes": 0, "count": 0, "sites": Counter()})
+        group["size_bytes"] += size
+        group["count"] += count
+        group["sites"][f"{module}:{frame.lineno}"] += size
+    
+    result = sorted(groups.values(), key=lambda group: group["size_bytes"], reverse=True)
+    for group in result:
+        group["sites"] = [{"site": site, "size_bytes": size} for site, size in group["sites"].most_common(3)]
+    return result
+
+
+def heap_stats() -> Dict[str, Any]:
+    """Live sessions (with identity map sizes) and ORM instances per model, from one heap scan."""
+    models: Counter = Counter()
+    sessions = []
+    for obj in gc.get_objects():
+        if isinstance(obj, Base):
+            models[type(obj).__name__] += 1
+        elif isinstance(obj, Session):
+            sessions.append(obj)
+    
+    identity_maps = sorted(
+        ({"identity_map": len(session.identity_map), "new": len(session.new), "dirty": len(session.dirty),
+          "in_transaction": session.in_transaction()} for session in sessions),
+        key=lambda session: session["identity_map"], reverse=True,
+    )
+    return {
+        "sessions": {
+            "live": len(sessions),
+            "identity_map_total": sum(session["identity_map"] for session in identity_maps),
+            "largest": identity_maps[:5],
+        },
+        "orm_instances": dict(models.most_common()),
+    }
+
+
+# Baseline snapshot of this worker
+memory_diagnostics = MemoryDiagnostics(settings.MEMORY_TRACE_FRAMES)
@@ -0,0 +1,37 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Listings are ordered by a unique key, e.g. (updated_at DESC, id DESC), and
+the next page starts strictly after the last row of the previous one. Unlike
+OFFSET, a page costs the same however deep it is, and rows inserted or
+updated meanwhile do not shift the pages a client is walking.
+
+Cursors are opaque to clients: the key of the last row, base64url encoded.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(updated_at: datetime, id: UUID) -> str:
+    """Cursor pointing just after the row with this (updated_at, id) key."""
+    raw = f"{updated_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor from encode_cursor(); raises 400 if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        updated_at, id = raw.split("|")
+        return datetime.fromisoformat(updated_at), UUID(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
@@ -0,0 +1,193 @@
+"""
+Password hashing on a dedicated, bounded executor.
+
+bcrypt is deliberately CPU-heavy. Run inline (or on Starlette's shared
+threadpool) a burst of logins occupies every worker thread and starves
+unrelated requests. Instead, hashes run on their own small thread or
+process pool (PASSWORD_HASH_EXECUTOR / PASSWORD_HASH_WORKERS) behind
+admission control:
+
+- at most PASSWORD_HASH_MAX_QUEUE hashes may wait for a worker; beyond
+  that requests are rejected immediately
+- a queued hash that has not started within
+  PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS is cancelled
+
+Both cases raise 503 with Retry-After. Queue depth, queue wait and hash
+latency are tracked for sizing the pool and the bcrypt cost.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+from app.core.security import hash_password, verify_password, verify_and_update_password
+
+
+HASH = "hash"
+VERIFY = "verify"
+VERIFY_AND_UPDATE = "verify_and_update"
+
+
+def _run(operation: str, *args):
+    """Executor task: (started, finished, result), timed in the worker."""
+    started = time.time()
+    if operation == HASH:
+        result = hash_password(*args)
+    elif operation == VERIFY_AND_UPDATE:
+        result = verify_and_update_password(*args)
+    else:
+        result = verify_password(*args)
+    return started, time.time(), result
+
+
+class PasswordHasher:
+    """Bounded executor for password hashing and verification."""
+    
+    def __init__(self, executor: str, workers: int, max_queue: int, queue_timeout: float, retry_after: int):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor}")
+        self.executor_type = executor
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.queue_wait_ms = Histogram()
+        self.latency_ms = {HASH: Histogram(), VERIFY: Histogram()}
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+    
+    def _get_executor(self):
+        # Created on first use, so worker processes fork from a fully started app
+        with self._lock:
+            if self._executor is None:
+                if self.executor_type == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+    
+    def _busy(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests right now. Please try again shortly.",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+    
+    # Submission
+    
+    def _submit(self, operation: str, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise self._busy()
+        
+        with self._lock:
+            self.in_flight += 1
+        submitted = time.time()
+        try:
+            future = self._get_executor().submit(_run, operation, *args)
+        except Exception:
+            self._finish()
+            raise
+        future.add_done_callback(lambda done: self._record(done, operation, submitted))
+        return future
+    
+    def _finish(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+    
+    def _record(self, future: Future, operation: str, submitted: float):
+        self._finish()
+        if future.cancelled() or future.exception() is not None:
+            return
+        started, finished, _ = future.result()
+        self.queue_wait_ms.observe((started - submitted) * 1000)
+        self.latency_ms[HASH if operation == HASH else VERIFY].observe((finished - started) * 1000)
+    
+    # Waiting (a job that already started is always allowed to finish)
+    
+    def _wait(self, future: Future):
+        try:
+            return future.result(timeout=self.queue_timeout)[2]
+        except TimeoutError:
+            if future.cancel():
+                with self._lock:
+                    self.timed_out += 1
+                raise self._busy()
+            return future.result()[2]
+    
+    async def _await(self, future: Future):
+        wrapped = asyncio.wrap_future(future)
+        done, _ = await asyncio.wait({wrapped}, timeout=self.queue_timeout)
+        if not done and future.cancel():
+            with self._lock:
+                self.timed_out += 1
+            raise self._busy()
+        return (await wrapped)[2]
+    
+    # Public API
+    
+    def hash(self, password: str) -> str:
+        """Hash a password (blocks the calling thread, not the pool)."""
+        return self._wait(self._submit(HASH, password))
+    
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password (blocks the calling thread, not the pool)."""
+        return self._wait(self._submit(VERIFY, plain_password, hashed_password))
+    
+    def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password, returning a new hash if the stored one is outdated."""
+        return self._wait(self._submit(VERIFY_AND_UPDATE, plain_password, hashed_password))
+    
+    async def ahash(self, password: str) -> str:
+        """Hash a password without blocking the event loop."""
+        return await self._await(self._submit(HASH, password))
+    
+    async def averify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop."""
+        return await self._await(self._submit(VERIFY, plain_password, hashed_password))
+    
+    async def averify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Async variant of verify_and_update()."""
+        return await self._await(self._submit(VERIFY_AND_UPDATE, plain_password, hashed_password))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Queue state and latency histograms (this worker process)."""
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.workers),
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "hash_ms": self.latency_ms[HASH].snapshot(),
+            "verify_ms": self.latency_ms[VERIFY].snapshot(),
+        }
+    
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Global hasher (one executor per worker process)
+password_hasher = PasswordHasher(
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
@@ -0,0 +1,271 @@
+"""
+Principal cache for authenticated requests.
+
+The authentication dependencies only need a handful of fields about the
+caller (role, active and verified flags, profile completion). Those are
+cached as a Principal in two tiers so most requests never query users:
+
+- an in-process LRU with a short TTL (no I/O at all on a hit)
+- Redis, shared by every worker
+
+A Session listener collects the users whose principal fields changed in a
+flush and deletes their entries once the transaction commits. Deleted
+Redis entries are replaced by a short-lived tombstone, so a request that
+read the old row just before the commit cannot put it back. The
+in-process tier of *other* workers cannot be reached; its TTL
+(PRINCIPAL_CACHE_LOCAL_TTL_SECONDS) bounds how long they may act on a
+stale principal, e.g. after a deactivation.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional, Set
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.cache import KEY_PREFIX, caches
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.models.user import User, UserRole
+from app.models.worker_profile import WorkerProfile
+from app.models.care_home_profile import CareHomeProfile
+
+
+# User columns copied into a Principal; changing any of them invalidates it
+PRINCIPAL_USER_FIELDS = ("email", "role", "is_active", "email_verified")
+
+# How long an invalidated Redis entry refuses to be refilled
+TOMBSTONE = "-"
+TOMBSTONE_SECONDS = 10
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller, as seen by the authorization dependencies."""
+    id: UUID
+    email: str
+    role: UserRole
+    is_active: bool
+    email_verified: bool
+    profile_complete: Optional[bool] = None
+    profile_completion_percentage: Optional[int] = None  # None: no profile
+    
+    @property
+    def is_worker(self) -> bool:
+        return self.role == UserRole.WORKER
+    
+    @property
+    def is_care_home(self) -> bool:
+        return self.role in [UserRole.CARE_HOME_ADMIN, UserRole.CARE_HOME_STAFF]
+    
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Snapshot a user whose profiles are already loaded."""
+        profile_complete = None
+        percentage = None
+        
+        if user.is_worker and user.worker_profile:
+            profile_complete = user.worker_profile.is_complete
+            percentage = user.worker_profile.profile_completion_percentage
+        elif user.is_worker:
+            profile_complete = False
+        elif user.is_care_home and user.care_home_profile:
+            profile_complete = True  # Care homes don't need 100% profile
+            percentage = int(user.care_home_profile.profile_completion_percentage or 0)
+        
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+            email_verified=user.email_verified,
+            profile_complete=profile_complete,
+            profile_completion_percentage=percentage,
+        )
+    
+    def to_json(self) -> str:
+        return json.dumps({
+            "id": str(self.id),
+            "email": self.email,
+            "role": self.role.value,
+            "is_active": self.is_active,
+            "email_verified": self.email_verified,
+            "profile_complete": self.profile_complete,
+            "profile_completion_percentage": self.profile_completion_percentage,
+        })
+    
+    @classmethod
+    def from_json(cls, raw: str) -> "Principal":
+        data = json.loads(raw)
+        data["id"] = UUID(data["id"])
+        data["role"] = UserRole(data["role"])
+        return cls(**data)
+
+
+class PrincipalCache:
+    """Two-tier (in-process LRU + Redis) cache of principals by user ID."""
+    
+    def __init__(self, name: str, local_ttl: float, ttl: int, max_entries: int):
+        self.name = name
+        self.local_ttl = local_ttl
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "shared_hits": 0, "misses": 0, "invalidations": 0, "redis_errors": 0}
+        self._local: "OrderedDict[UUID, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        caches[name] = self
+    
+    def _key(self, user_id: UUID) -> str:
+        return f"{KEY_PREFIX}:principal:{user_id}"
+    
+    # In-process tier
+    
+    def get_local(self, user_id: UUID) -> Optional[Principal]:
+        """Look up the in-process tier only (never blocks on I/O)."""
+        with self._lock:
+            entry = self._local.get(user_id)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._local[user_id]
+                return None
+            self._local.move_to_end(user_id)
+        self.stats["hits"] += 1
+        return principal
+    
+    def _store_local(self, principal: Principal):
+        with self._lock:
+            self._local[principal.id] = (principal, time.monotonic() + self.local_ttl)
+            self._local.move_to_end(principal.id)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+    
+    # Shared tier
+    
+    def get_shared(self, user_id: UUID) -> Optional[Principal]:
+        """Look up Redis, filling the in-process tier on a hit."""
+        client = get_redis()
+        raw = None
+        if client is not None:
+            try:
+                raw = client.get(self._key(user_id))
+            except RedisError:
+                self.stats["redis_errors"] += 1
+        
+        if not raw or raw == TOMBSTONE:
+            self.stats["misses"] += 1
+            return None
+        
+        principal = Principal.from_json(raw)
+        self.stats["shared_hits"] += 1
+        self._store_local(principal)
+        return principal
+    
+    def get(self, user_id: UUID) -> Optional[Principal]:
+        """Look up both tiers."""
+        return self.get_local(user_id) or self.get_shared(user_id)
+    
+    def set(self, principal: Principal):
+        """Cache a principal freshly loaded from the database."""
+        self._store_local(principal)
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            # NX: never overwrite a tombstone left by a concurrent invalidation
+            client.set(self._key(principal.id), principal.to_json(), ex=self.ttl, nx=True)
+        except RedisError:
+            self.stats["redis_errors"] += 1
+    
+    # Invalidation
+    
+    def invalidate_local(self, user_ids: Iterable[UUID]):
+        with self._lock:
+            for user_id in user_ids:
+                self._local.pop(user_id, None)
+    
+    def invalidate_shared(self, user_ids: Iterable[UUID]):
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for user_id in user_ids:
+                pipe.set(self._key(user_id), TOMBSTONE, ex=TOMBSTONE_SECONDS)
+            pipe.execute()
+        except RedisError:
+            self.stats["redis_errors"] += 1
+    
+    def invalidate(self, user_ids: Iterable[UUID], shared: bool = True):
+        """Drop cached principals for these users (from Redis too if `shared`)."""
+        user_ids = list(user_ids)
+        self.stats["invalidations"] += len(user_ids)
+        self.invalidate_local(user_ids)
+        if shared:
+            self.invalidate_shared(user_ids)
+
+
+def changed_principals(session: Session) -> Set[UUID]:
+    """IDs of users whose cached principal is affected by a pending flush."""
+    user_ids = set()
+    
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            if obj in session.dirty and not any(
+                inspect(obj).attrs[field].history.has_changes() for field in PRINCIPAL_USER_FIELDS
+            ):
+                continue  # e.g. last_login_at or token columns only
+            user_ids.add(obj.id)
+        elif isinstance(obj, (WorkerProfile, CareHomeProfile)):
+            if obj in session.dirty and not session.is_modified(obj):
+                continue
+            user_ids.add(obj.user_id)
+    
+    user_ids.discard(None)
+    return user_ids
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_principals(session: Session, flush_context):
+    user_ids = changed_principals(session)
+    if user_ids:
+        session.info.setdefault("changed_principals", set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_principals(session: Session):
+    user_ids = session.info.pop("changed_principals", None)
+    if not user_ids:
+        return
+    
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        principal_cache.invalidate(user_ids)
+        return
+    
+    # AsyncSession commits run on the event loop: keep Redis off it
+    principal_cache.invalidate(user_ids, shared=False)
+    loop.run_in_executor(None, principal_cache.invalidate_shared, user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_principals(session: Session):
+    session.info.pop("changed_principals", None)
+
+
+# Authenticated principals (get_current_principal)
+principal_cache = PrincipalCache(
+    "principals",
+    local_ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,364 @@
+"""
+On-demand profiler for single requests.
+
+With PROFILER_ENABLED, ProfileMiddleware profiles a request end to end
+when it carries a valid signed X-Profile header (minted by an admin,
+see profile_token()) or is picked by PROFILER_SAMPLE_RATE. Disabled, the
+middleware isn't installed at all, so requests pay nothing.
+
+A profiled request is sampled every PROFILER_INTERVAL_MS by one shared
+thread, which takes wall-clock stacks wherever the request is:
+
+- on the event loop thread, while its coroutine is running
+- on threadpool threads running its sync dependencies and route (their
+  context carries the active profile)
+- otherwise, its suspended await chain (waiting on asyncpg, a thread...)
+
+SQL and Redis calls are annotated as synthetic frames ("[sql] SELECT
+...", "[redis] GET"), so database and cache time stand out in the
+flamegraph. Results are collapsed stacks plus the request's timings and
+SQL, kept as the newest PROFILER_MAX_PROFILES JSON files in PROFILER_DIR
+(shared by the workers) and served by the admin router.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.request_metrics import current_timings, route_name
+
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_PATTERN = re.compile(r"[0-9a-f]{16}")
+
+# DBAPI calls of SQLAlchemy's dialects (the SQL text is a local)
+SQL_FRAMES = {
+    "do_execute": "statement",
+    "do_executemany": "statement",
+    "do_execute_no_params": "statement",
+    "_prepare_and_execute": "operation",  # asyncpg adapter, under greenlet_spawn
+    "_executemany": "operation",
+}
+
+
+def profile_token(expires_at: Optional[int] = None) -> str:
+    """Value for the X-Profile header, valid until `expires_at` (epoch seconds)."""
+    if expires_at is None:
+        expires_at = int(time.time()) + settings.PROFILER_TOKEN_TTL_SECONDS
+    signature = hmac.new(settings.SECRET_KEY.encode(), f"profile:{expires_at}".encode(), hashlib.sha256)
+    return f"{expires_at}.{signature.hexdigest()}"
+
+
+def verify_profile_token(value: str) -> bool:
+    """Whether an X-Profile header value is correctly signed and unexpired."""
+    expires_at, _, _ = value.partition(".")
+    if not expires_at.isdigit() or int(expires_at) < time.time():
+        return False
+    return hmac.compare_digest(value, profile_token(int(expires_at)))
+
+
+_active: ContextVar[Optional["Profile"]] = ContextVar("active_profile", default=None)
+
+
+def _label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+def _clean(text: str, limit: int = 60) -> str:
+    """One line, no ';' (the collapsed stack separator)."""
+    text = " ".join(str(text).split()).replace(";", ",")
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def _annotation(frame) -> Optional[str]:
+    """Synthetic frame for SQL and Redis calls."""
+    name = frame.f_code.co_name
+    module = frame.f_globals.get("__name__", "")
+    if name in SQL_FRAMES and module.startswith("sqlalchemy"):
+        return f"[sql] {_clean(frame.f_locals.get(SQL_FRAMES[name], ''))}"
+    if name == "execute_command" and (module.startswith("redis") or module == "app.core.request_metrics"):
+        args = frame.f_locals.get("args") or ("?",)
+        return f"[redis] {_clean(args[0], 20)}"
+    if name == "execute" and module == "redis.client":
+        return "[redis] pipeline"
+    return None
+
+
+def _frames(frames) -> List[str]:
+    """Labels for frames (root first), with SQL and Redis annotations."""
+    labels = []
+    annotated = set()
+    for frame in frames:
+        labels.append(_label(frame))
+        annotation = _annotation(frame)
+        if annotation and annotation[:6] not in annotated:
+            annotated.add(annotation[:6])  # Outermost SQL / Redis frame only
+            labels.append(annotation)
+    return labels
+
+
+def _thread_stack(frame, stop) -> List:
+    """Frames from just above `stop` (exclusive) to the leaf; [] if `stop` isn't on this stack."""
+    frames = []
+    while frame is not None:
+        if stop(frame):
+            return frames[::-1]
+        frames.append(frame)
+        frame = frame.f_back
+    return []
+
+
+def _await_chain(coro) -> List:
+    """Frames of a suspended coroutine and everything it awaits."""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+
+class Profile:
+    """Samples of one request."""
+    
+    def __init__(self, scope, trigger: str, interval_ms: float):
+        self.id = uuid.uuid4().hex[:16]
+        self.scope = scope
+        self.trigger = trigger
+        self.interval_ms = interval_ms
+        self.started_at = datetime.utcnow()
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self.loop_thread_id = threading.get_ident()
+        self.task = asyncio.current_task()
+        self.anchor = None  # The middleware's frame; the request's code runs above it
+    
+    def _in_context(self, frame) -> bool:
+        # Threadpool threads run the request's code via context.run(...)
+        while frame is not None:
+            if frame.f_code.co_name == "run":
+                context = frame.f_locals.get("context")
+                if isinstance(context, contextvars.Context):
+                    return context.get(_active) is self
+            frame = frame.f_back
+        return False
+    
+    def sample(self, thread_frames: Dict[int, Any]):
+        """Record where the request is right now (called from the sampler thread)."""
+        root = [route_name(self.scope)]
+        found = False
+        for thread_id, frame in thread_frames.items():
+            if thread_id == self.loop_thread_id:
+                frames = _thread_stack(frame, lambda f: f is self.anchor)
+                prefix = root
+            elif self._in_context(frame):
+                frames = _thread_stack(frame, lambda f: f.f_code.co_name == "run" and "context" in f.f_code.co_varnames)
+                prefix = root + ["[threadpool]"]
+            else:
+                continue
+            if frames:
+                self.stacks[";".join(prefix + _frames(frames))] += 1
+                found = True
+        
+        if not found and self.task is not None:
+            # Suspended: where it is waiting
+            frames = _await_chain(self.task.get_coro())
+            for index, frame in enumerate(frames):
+                if frame is self.anchor:
+                    frames = frames[index + 1:]
+                    break
+            self.stacks[";".join(root + _frames(frames) + ["[await]"])] += 1
+        self.samples += 1
+    
+    def collapsed(self) -> str:
+        """Collapsed stacks ("frame;frame;frame count" lines) for flamegraph.pl / speedscope."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+    
+    def to_dict(self, status: int, duration_ms: float) -> Dict[str, Any]:
+        timings = current_timings()
+        return {
+            "id": self.id,
+            "route": route_name(self.scope),
+            "path": self.scope["path"],
+            "status": status,
+            "trigger": self.trigger,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(duration_ms, 2),
+            "interval_ms": self.interval_ms,
+            "samples": self.samples,
+            "sql_statements": timings.sql_statements if timings else None,
+            "sql_ms": round(timings.sql_ms, 2) if timings else None,
+            "redis_ms": round(timings.redis_ms, 2) if timings else None,
+            "statements": [" ".join(sql.split()) for sql in (timings.statements or [])] if timings else [],
+            "collapsed": self.collapsed(),
+        }
+
+
+class StackSampler:
+    """One thread sampling every active profile; idle while there are none."""
+    
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000
+        self._profiles: Dict[str, Profile] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def add(self, profile: Profile):
+        with self._lock:
+            self._profiles[profile.id] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+            self._wake.set()
+    
+    def remove(self, profile: Profile):
+        with self._lock:
+            self._profiles.pop(profile.id, None)
+    
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            self._wake.wait()
+            with self._lock:
+                profiles = list(self._profiles.values())
+                if not profiles:
+                    self._wake.clear()
+                    continue
+            frames = sys._current_frames()
+            frames.pop(own_id, None)
+            for profile in profiles:
+                profile.sample(frames)
+            del frames
+            time.sleep(self.interval)
+
+
+class ProfileStore:
+    """
+    The newest profiles, as JSON files in a directory shared by the
+    workers; older ones are deleted (a ring buffer on local disk).
+    """
+    
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = directory
+        self.max_profiles = max_profiles
+    
+    def _paths(self) -> List[str]:
+        try:
+            names = sorted(name for name in os.listdir(self.directory) if name.endswith(".json"))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, name) for name in names]
+    
+    def save(self, profile: Dict[str, Any]):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{time.time_ns():020d}-{profile['id']}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(profile, f)
+        os.replace(path + ".tmp", path)
+        for old in self._paths()[:-self.max_profiles]:
+            try:
+                os.remove(old)
+            except FileNotFoundError:
+                pass  # Pruned by another worker
+    
+    def list(self) -> List[Dict[str, Any]]:
+        """Summaries, newest first."""
+        summaries = []
+        for path in reversed(self._paths()):
+            try:
+                with open(path) as f:
+                    profile = json.load(f)
+            except (FileNotFoundError, ValueError):
+                continue
+            profile.pop("collapsed")
+            profile.pop("statements")
+            summaries.append(profile)
+        return summaries
+    
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        if not PROFILE_ID_PATTERN.fullmatch(profile_id):
+            return None
+        for path in self._paths():
+            if path.endswith(f"-{profile_id}.json"):
+                try:
+                    with open(path) as f:
+                        return json.load(f)
+                except FileNotFoundError:
+                    return None
+        return None
+
+
+class ProfileMiddleware:
+    """
+    ASGI middleware profiling requests with a signed X-Profile header or
+    picked by the sample rate. Sits inside MetricsMiddleware (added before
+    it) to report the request's SQL and Redis timings.
+    """
+    
+    def __init__(self, app, sample_rate: float = settings.PROFILER_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+    
+    def trigger(self, scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return "header" if verify_profile_token(value.decode("latin-1")) else None
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+    
+    async def __call__(self, scope, receive, send):
+        trigger = self.trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+        
+        profile = Profile(scope, trigger, stack_sampler.interval * 1000)
+        profile.anchor = sys._getframe()
+        timings = current_timings()
+        if timings is not None and timings.statements is None:
+            timings.statements = []
+        status = 500  # Unless a response starts
+        
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile.id.encode())]
+            await send(message)
+        
+        token = _active.set(profile)
+        stack_sampler.add(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            stack_sampler.remove(profile)
+            _active.reset(token)
+            result = profile.to_dict(status, duration_ms)
+            await asyncio.get_running_loop().run_in_executor(None, profile_store.save, result)
+
+
+# Shared sampler thread (one per worker process, started by the first profile)
+stack_sampler = StackSampler(settings.PROFILER_INTERVAL_MS)
+
+# Profiles of every worker of this host
+profile_store = ProfileStore(settings.PROFILER_DIR, settings.PROFILER_MAX_PROFILES)
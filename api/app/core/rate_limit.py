@@ -0,0 +1,232 @@
+"""
+Rate limiting for abuse-prone endpoints (login, registration, emails).
+
+Limits use GCRA (generic cell rate algorithm), a sliding-window
+equivalent that stores a single timestamp per key: "N requests per
+period" admits a burst of N, then one request every period / N.
+
+A policy combines several limits, e.g. per client IP and per email
+address. All of a request's keys are checked and updated in one atomic
+Lua call - one Redis round trip - and a denied request consumes nothing.
+If Redis is unavailable the same algorithm runs in-process, so limits
+still apply (per worker process rather than globally).
+
+Policies are configured per route in settings (RATE_LIMIT_*) as
+"dimension:count/period" items, e.g. "ip:20/minute,email:5/minute".
+"""
+
+import hashlib
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from redis.exceptions import RedisError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+
+KEY_PREFIX = "vicarity:ratelimit"
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# KEYS: one per limit. ARGV: per key, emission interval and tolerance (ms).
+# Returns 0 if allowed (all keys updated), else the wait in ms (nothing updated).
+GCRA_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local wait = 0
+local tats = {}
+for i, key in ipairs(KEYS) do
+    local interval = tonumber(ARGV[2 * i - 1])
+    local tolerance = tonumber(ARGV[2 * i])
+    local tat = tonumber(redis.call('GET', key)) or now
+    if tat < now then
+        tat = now
+    end
+    if tat - tolerance > now then
+        wait = math.max(wait, tat - tolerance - now)
+    end
+    tats[i] = tat + interval
+end
+if wait > 0 then
+    return wait
+end
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, tats[i], 'PX', tats[i] - now)
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    """At most `count` requests per `period` seconds for one dimension."""
+    dimension: str  # "ip" or "email"
+    count: int
+    period: int
+    
+    @property
+    def interval_ms(self) -> int:
+        return max(1, int(self.period * 1000 / self.count))
+    
+    @property
+    def tolerance_ms(self) -> int:
+        return self.period * 1000 - self.interval_ms
+
+
+def parse_policy(spec: str) -> List[Limit]:
+    """Parse "ip:20/minute,email:5/minute" into limits."""
+    limits = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        dimension, rate = item.split(":")
+        count, period = rate.split("/")
+        limits.append(Limit(dimension.strip(), int(count), PERIODS[period.strip()]))
+    return limits
+
+
+def _key(policy: str, dimension: str, value: str) -> str:
+    # Hashed so email addresses never appear in Redis key names
+    digest = hashlib.sha256(value.strip().lower().encode()).hexdigest()[:24]
+    return f"{KEY_PREFIX}:{policy}:{dimension}:{digest}"
+
+
+class LocalGCRA:
+    """In-process GCRA state, used while Redis is unavailable."""
+    
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._tats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def check(self, keys: List[Tuple[str, Limit]]) -> float:
+        """Same contract as the Lua script: 0 if allowed, else wait in ms."""
+        now = time.time() * 1000
+        with self._lock:
+            wait = 0.0
+            updates = {}
+            for key, limit in keys:
+                tat = max(self._tats.get(key, now), now)
+                if tat - limit.tolerance_ms > now:
+                    wait = max(wait, tat - limit.tolerance_ms - now)
+                updates[key] = tat + limit.interval_ms
+            if wait > 0:
+                return wait
+            
+            if len(self._tats) >= self.max_keys:
+                # Drop keys whose window has fully elapsed
+                self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+            self._tats.update(updates)
+            return 0
+
+
+class RateLimiter:
+    """Per-route rate limit policies backed by Redis (or in-process GCRA)."""
+    
+    def __init__(self, policies: Dict[str, List[Limit]], enabled: bool = True):
+        self.policies = policies
+        self.enabled = enabled
+        self.local = LocalGCRA()
+        self.stats = {"allowed": 0, "limited": 0, "local_checks": 0, "redis_errors": 0}
+        self._script = None
+    
+    def _keys(self, policy: str, values: Dict[str, Optional[str]]) -> List[Tuple[str, Limit]]:
+        return [
+            (_key(policy, limit.dimension, values[limit.dimension]), limit)
+            for limit in self.policies[policy]
+            if values.get(limit.dimension)
+        ]
+    
+    def _check_redis(self, client, keys: List[Tuple[str, Limit]]) -> float:
+        if self._script is None or self._script.registered_client is not client:
+            self._script = client.register_script(GCRA_SCRIPT)
+        args = []
+        for _, limit in keys:
+            args += [limit.interval_ms, limit.tolerance_ms]
+        return float(self._script(keys=[key for key, _ in keys], args=args))
+    
+    def check(self, policy: str, **values: Optional[str]) -> float:
+        """
+        Count a request against a policy.
+        
+        Args:
+            policy: Policy name (e.g. "login")
+            values: Value per dimension, e.g. ip="1.2.3.4", email="a@b.com";
+                dimensions without a value are skipped
+        
+        Returns:
+            0 if allowed, otherwise seconds until the request would be allowed
+        """
+        if not self.enabled:
+            return 0
+        keys = self._keys(policy, values)
+        if not keys:
+            return 0
+        
+        client = get_redis()
+        wait_ms = None
+        if client is not None:
+            try:
+                wait_ms = self._check_redis(client, keys)
+            except RedisError:
+                self.stats["redis_errors"] += 1
+        if wait_ms is None:
+            self.stats["local_checks"] += 1
+            wait_ms = self.local.check(keys)
+        
+        if wait_ms > 0:
+            self.stats["limited"] += 1
+            return wait_ms / 1000
+        self.stats["allowed"] += 1
+        return 0
+    
+    def _too_many(self, retry_after: float) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests. Please try again later.",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+    
+    def hit(self, policy: str, **values: Optional[str]):
+        """Count a request and raise 429 (with Retry-After) if it is over the limit."""
+        retry_after = self.check(policy, **values)
+        if retry_after:
+            raise self._too_many(retry_after)
+    
+    async def ahit(self, policy: str, **values: Optional[str]):
+        """Async variant of hit(); the Redis call runs in the threadpool."""
+        retry_after = await run_in_threadpool(self.check, policy, **values)
+        if retry_after:
+            raise self._too_many(retry_after)
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Dependency returning the client's IP address.
+    
+    The socket peer by default. Behind nginx the peer is the proxy, so
+    production sets RATE_LIMIT_CLIENT_IP_HEADER=X-Real-IP, which nginx
+    overwrites; anywhere clients can reach the API directly they could set
+    it themselves, so it is not trusted unless configured.
+    """
+    if settings.RATE_LIMIT_CLIENT_IP_HEADER:
+        forwarded = request.headers.get(settings.RATE_LIMIT_CLIENT_IP_HEADER)
+        if forwarded:
+            return forwarded.strip()
+    return request.client.host if request.client else "unknown"
+
+
+# Global limiter with the per-route policies
+rate_limiter = RateLimiter(
+    policies={
+        "login": parse_policy(settings.RATE_LIMIT_LOGIN),
+        "register": parse_policy(settings.RATE_LIMIT_REGISTER),
+        "password_reset_request": parse_policy(settings.RATE_LIMIT_PASSWORD_RESET_REQUEST),
+        "resend_verification": parse_policy(settings.RATE_LIMIT_RESEND_VERIFICATION),
+    },
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
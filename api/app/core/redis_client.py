@@ -0,0 +1,56 @@
+"""
+Shared Redis connection.
+
+Connected once at startup by the application lifespan. Code that uses
+Redis must treat it as optional: get_redis() returns None when Redis was
+unreachable at startup.
+"""
+
+import logging
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.request_metrics import TimedRedis
+
+
+logger = logging.getLogger(__name__)
+
+# Redis connection (one client per worker process; redis-py pools internally)
+redis_client: Optional[redis.Redis] = None
+
+
+def connect_redis() -> Optional[redis.Redis]:
+    """Connect to Redis, leaving the client unset if it is unreachable."""
+    global redis_client
+    
+    try:
+        client = TimedRedis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+        )
+        client.ping()
+        redis_client = client
+        logger.info("Redis connected")
+    except Exception as e:
+        logger.warning("Redis connection failed: %s", e)
+        redis_client = None
+    
+    return redis_client
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """Return the shared Redis client, or None if Redis is unavailable."""
+    return redis_client
+
+
+def close_redis():
+    """Close the shared Redis client."""
+    global redis_client
+    
+    if redis_client:
+        redis_client.close()
+        redis_client = None
@@ -0,0 +1,266 @@
+"""
+Structured logging: JSON lines written by a listener thread.
+
+configure_logging() puts a QueueHandler on the root logger, so code that
+logs (request threads, the event loop) only appends to an in-memory
+queue; formatting and writing to stdout happen on one QueueListener
+thread. Lines carry the request they were logged from - its ID (taken
+from nginx's X-Request-ID, or generated), route template and
+authenticated user ID.
+
+RequestLogMiddleware writes one access line per request with its status,
+latency and the SQL, pool and Redis timings collected by request_metrics.
+High-volume routes can be sampled (LOG_SAMPLE_RATES); errors and slow
+requests are always logged.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, TextIO
+
+from app.core.config import settings
+from app.core.request_metrics import current_timings, route_name
+
+
+access_logger = logging.getLogger("app.access")
+
+# Request fields copied onto every record logged while serving a request
+CONTEXT_FIELDS = ("request_id", "route", "user_id")
+
+# Extra fields of access lines
+ACCESS_FIELDS = (
+    "method", "path", "status", "duration_ms",
+    "sql_statements", "sql_ms", "pool_wait_ms", "redis_calls", "redis_ms",
+)
+
+# Accepted incoming request IDs (nginx's $request_id is 32 hex digits)
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._-]{1,128}")
+
+
+class RequestContext:
+    """The request a log record was emitted from."""
+    
+    __slots__ = ("request_id", "scope", "user_id")
+    
+    def __init__(self, request_id: str, scope):
+        self.request_id = request_id
+        self.scope = scope
+        self.user_id: Optional[str] = None  # Set by the authentication dependencies
+    
+    @property
+    def route(self) -> str:
+        return route_name(self.scope)
+
+
+# A mutable object, so a user ID set in a threadpool dependency is seen by the middleware
+_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    """ID of the request being served, or None outside requests."""
+    context = _context.get()
+    return context.request_id if context else None
+
+
+def set_request_user(user_id) -> None:
+    """Record the authenticated user for the request being served."""
+    context = _context.get()
+    if context is not None:
+        context.user_id = str(user_id)
+
+
+class RequestContextFilter(logging.Filter):
+    """Copy the current request's fields onto records (in the logging thread)."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, getattr(context, field) if context else None)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; None fields are left out."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS + ACCESS_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+
+
+class _Enqueue(QueueHandler):
+    """
+    QueueHandler that keeps the message and traceback as separate fields
+    (the stock prepare() folds the traceback into the message).
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[QueueHandler] = None
+
+
+@atexit.register
+def _flush_at_exit():
+    stop_logging()
+
+
+def configure_logging(stream: Optional[TextIO] = None):
+    """
+    Send all logging through a queue to one stdout writer thread.
+    Safe to call again (e.g. by tests, with another stream).
+    """
+    global _listener, _handler
+    stop_logging()
+    
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+    
+    log_queue = queue.SimpleQueue()
+    _handler = _Enqueue(log_queue)
+    _handler.addFilter(RequestContextFilter())
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel(settings.LOG_LEVEL)
+    # Every statement, through the queue (instead of the engine's echo)
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO if settings.LOG_SQL else logging.WARNING)
+
+
+def stop_logging():
+    """Write out queued lines and stop the listener thread."""
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse "GET /health:0.01,GET /metrics:0" into {route: rate}."""
+    rates = {}
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        route, _, rate = part.rpartition(":")
+        rates[route.strip()] = float(rate)
+    return rates
+
+
+class RequestLogMiddleware:
+    """
+    ASGI middleware setting the request context and writing access lines.
+    
+    Must sit inside MetricsMiddleware (added before it), which owns the
+    request's SQL and Redis timings.
+    """
+    
+    def __init__(
+        self,
+        app,
+        sample_rate: float = settings.LOG_SAMPLE_RATE,
+        sample_rates: str = settings.LOG_SAMPLE_RATES,
+        slow_ms: float = settings.LOG_SLOW_REQUEST_MS,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.sample_rates = parse_sample_rates(sample_rates)
+        self.slow_ms = slow_ms
+    
+    def sampled(self, route: str, status: int, duration_ms: float) -> bool:
+        """Whether to log this request: errors and slow ones always are."""
+        if status >= 500 or duration_ms >= self.slow_ms:
+            return True
+        rate = self.sample_rates.get(route, self.sample_rate)
+        return rate >= 1 or random.random() < rate
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or not REQUEST_ID_PATTERN.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+        
+        context = RequestContext(request_id, scope)
+        token = _context.set(context)
+        status = 500  # Unless a response starts
+        
+        async def send_with_request_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode())]
+            await send(message)
+        
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if self.sampled(context.route, status, duration_ms):
+                self.log(scope, status, duration_ms)
+            _context.reset(token)
+    
+    def log(self, scope, status: int, duration_ms: float):
+        fields = {"method": scope["method"], "path": scope["path"], "status": status, "duration_ms": round(duration_ms, 2)}
+        timings = current_timings()
+        if timings is not None:
+            fields.update(
+                sql_statements=timings.sql_statements,
+                sql_ms=round(timings.sql_ms, 2),
+                pool_wait_ms=round(timings.pool_wait_ms, 2),
+                redis_calls=timings.redis_calls,
+                redis_ms=round(timings.redis_ms, 2),
+            )
+        
+        if status >= 500:
+            level = logging.ERROR
+        elif duration_ms >= self.slow_ms:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+        access_logger.log(level, "%s %s %s", scope["method"], scope["path"], status, extra=fields)
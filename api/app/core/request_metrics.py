@@ -0,0 +1,513 @@
+"""
+Per-route request metrics: latency, SQL statements and time, pool
+checkout wait and Redis time, served in Prometheus text format at
+/metrics.
+
+MetricsMiddleware puts a RequestTimings for each HTTP request in a
+context variable. The SQLAlchemy cursor hooks, the pools' connect() and
+the Redis client add to it from whichever thread does the work (context
+variables follow the request into the threadpool and into SQLAlchemy's
+async greenlets). When the request ends it is recorded against its route
+template (e.g. GET /worker/profile), which keeps label cardinality
+bounded.
+
+The instrumented engines' pools are measured as a whole (requests and
+background work): checkouts, checkout wait, new connections (each one a
+TLS handshake with a remote database), timeouts, and connections checked
+out and in overflow right now.
+
+Each uvicorn worker keeps its own totals and writes them to
+METRICS_DIR/<master pid>/<worker pid>.json every METRICS_FLUSH_SECONDS.
+/metrics merges the files of every worker of the same server - exited
+ones too, so counters never go backwards (their gauges are left out) -
+whichever worker serves it.
+"""
+
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+from redis.client import Pipeline
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import DEFAULT_LATENCY_BUCKETS_MS, Histogram
+
+
+# SQL statements per request
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Pool checkout wait (mostly well under a millisecond; connecting takes a round trip or more)
+POOL_WAIT_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 30000)
+
+
+class RequestTimings:
+    """Database and Redis work done while serving one request."""
+    
+    __slots__ = ("sql_statements", "sql_ms", "pool_wait_ms", "redis_calls", "redis_ms", "statements")
+    
+    def __init__(self):
+        self.sql_statements = 0
+        self.sql_ms = 0.0
+        self.pool_wait_ms = 0.0
+        self.redis_calls = 0
+        self.redis_ms = 0.0
+        self.statements: Optional[List[str]] = None  # SQL text, only kept by capture_requests()
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+# Lists collecting finished requests, while capture_requests() is active
+_captures: List[List[Tuple[str, RequestTimings]]] = []
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Timings of the request being served, or None outside requests."""
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    started = conn.info.pop("query_started", None)
+    if timings is None or started is None:
+        return
+    timings.sql_statements += 1
+    timings.sql_ms += (time.perf_counter() - started) * 1000
+    if timings.statements is not None:
+        timings.statements.append(statement)
+
+
+class PoolStats:
+    """Checkouts of one engine's pool, in this process."""
+    
+    def __init__(self, engine):
+        self.engine = engine
+        self.wait = Histogram(POOL_WAIT_BUCKETS_MS)
+        self.connects = 0
+        self.timeouts = 0
+        self.checked_out = 0
+        self._lock = threading.Lock()
+    
+    def count(self, field: str, delta: int = 1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + delta)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.engine.pool
+        gauges = {"checked_out": self.checked_out}
+        if isinstance(pool, QueuePool):
+            gauges.update(size=pool.size(), overflow=max(0, pool.overflow()), max_overflow=pool._max_overflow)
+        wait = self.wait.snapshot()
+        return {"checkouts": wait["count"], "connects": self.connects, "timeouts": self.timeouts,
+                "wait_ms": wait, "gauges": gauges}
+
+
+# Pools of the instrumented engines, by name ("sync", "async")
+pool_metrics: Dict[str, PoolStats] = {}
+
+
+def instrument_engine(engine, name: str):
+    """
+    Count and time the statements run on an engine (a sync Engine;
+    async_engine.sync_engine), and measure its pool as `name`.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    
+    stats = pool_metrics[name] = PoolStats(engine)
+    if isinstance(engine.pool, TimedCheckout):
+        engine.pool.metrics_name = name
+    # Pool events of an engine carry over to the pools that replace it (engine.dispose())
+    event.listen(engine, "connect", lambda dbapi_connection, record: stats.count("connects"))
+    event.listen(engine, "checkout", lambda dbapi_connection, record, proxy: stats.count("checked_out"))
+    event.listen(engine, "checkin", lambda dbapi_connection, record: stats.count("checked_out", -1))
+
+
+class TimedCheckout:
+    """
+    Pool mixin: time spent getting a connection (waiting, connecting,
+    pre-ping), added to the request's timings and the pool's stats.
+    """
+    
+    metrics_name: Optional[str] = None  # Set by instrument_engine()
+    
+    def connect(self):
+        timings = _current.get()
+        stats = pool_metrics.get(self.metrics_name)
+        if timings is None and stats is None:
+            return super().connect()
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            if stats is not None:
+                stats.count("timeouts")
+            raise
+        finally:
+            wait_ms = (time.perf_counter() - started) * 1000
+            if timings is not None:
+                timings.pool_wait_ms += wait_ms
+            if stats is not None:
+                stats.wait.observe(wait_ms)
+    
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+class TimedQueuePool(TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(TimedCheckout, NullPool):
+    """No pooling: every checkout connects (to a transaction pooler that pools)."""
+
+
+class TimedRedis(redis.Redis):
+    """Redis client that adds each command's round trip to the current request."""
+    
+    def execute_command(self, *args, **options):
+        timings = _current.get()
+        if timings is None:
+            return super().execute_command(*args, **options)
+        started = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            timings.redis_calls += 1
+            timings.redis_ms += (time.perf_counter() - started) * 1000
+    
+    def pipeline(self, transaction=True, shard_hint=None) -> "TimedPipeline":
+        return TimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class TimedPipeline(Pipeline):
+    """Pipeline counted as one call (one round trip) when executed."""
+    
+    def execute(self, raise_on_error=True):
+        timings = _current.get()
+        if timings is None:
+            return super().execute(raise_on_error)
+        started = time.perf_counter()
+        try:
+            return super().execute(raise_on_error)
+        finally:
+            timings.redis_calls += 1
+            timings.redis_ms += (time.perf_counter() - started) * 1000
+
+
+class RouteStats:
+    """Totals for one route."""
+    
+    def __init__(self):
+        self.duration = Histogram(DEFAULT_LATENCY_BUCKETS_MS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.requests: Dict[str, int] = {}  # By status code
+        self.sql_ms = 0.0
+        self.pool_wait_ms = 0.0
+        self.redis_calls = 0
+        self.redis_ms = 0.0
+        self._lock = threading.Lock()
+    
+    def record(self, status: int, duration_ms: float, timings: RequestTimings):
+        self.duration.observe(duration_ms)
+        self.statements.observe(timings.sql_statements)
+        with self._lock:
+            self.requests[str(status)] = self.requests.get(str(status), 0) + 1
+            self.sql_ms += timings.sql_ms
+            self.pool_wait_ms += timings.pool_wait_ms
+            self.redis_calls += timings.redis_calls
+            self.redis_ms += timings.redis_ms
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            totals = {
+                "requests": dict(self.requests),
+                "sql_ms": self.sql_ms,
+                "pool_wait_ms": self.pool_wait_ms,
+                "redis_calls": self.redis_calls,
+                "redis_ms": self.redis_ms,
+            }
+        totals["duration_ms"] = self.duration.snapshot()
+        totals["sql_statements"] = self.statements.snapshot()
+        return totals
+
+
+def merge(into: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, Any]:
+    """Add one snapshot's numbers into another (nested dicts of counts and sums)."""
+    for key, value in other.items():
+        if isinstance(value, dict):
+            merge(into.setdefault(key, {}), value)
+        else:
+            into[key] = into.get(key, 0) + value
+    return into
+
+
+def _process_group() -> int:
+    """The uvicorn master's pid for its workers; this process's own otherwise."""
+    parent = multiprocessing.parent_process()
+    return parent.pid if parent is not None else os.getpid()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class RequestMetrics:
+    """Per-route totals of this process, shared with sibling workers through files."""
+    
+    def __init__(self, directory: str, flush_interval: float):
+        self.directory = os.path.join(directory, str(_process_group())) if directory else ""
+        self.flush_interval = flush_interval
+        self._routes: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    def record(self, route: str, status: int, duration_ms: float, timings: RequestTimings):
+        stats = self._routes.get(route)
+        if stats is None:
+            with self._lock:
+                stats = self._routes.setdefault(route, RouteStats())
+        stats.record(status, duration_ms, timings)
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """This process's totals: by route, and by pool."""
+        return {
+            "routes": {route: stats.snapshot() for route, stats in list(self._routes.items())},
+            "pools": {name: stats.snapshot() for name, stats in pool_metrics.items()},
+        }
+    
+    def flush(self):
+        """Write this process's totals for sibling workers to read."""
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(f"{path}.tmp", path)
+    
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Totals of every worker of this server (this one's current, the others' last flush)."""
+        if not self.directory:
+            return self.snapshot()
+        self.flush()
+        totals = {"routes": {}, "pools": {}}
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    worker = json.load(f)
+            except (OSError, ValueError):
+                continue  # Replaced or removed while reading
+            pid = name[:-len(".json")]
+            if pid.isdigit() and not _alive(int(pid)):
+                for pool in worker.get("pools", {}).values():
+                    pool.pop("gauges", None)  # Connections of an exited worker are gone
+            merge(totals, worker)
+        return totals
+    
+    def start(self):
+        """Remove files of servers that have exited, then flush periodically."""
+        if not self.directory or self._thread is not None:
+            return
+        parent = os.path.dirname(self.directory)
+        if os.path.isdir(parent):
+            for name in os.listdir(parent):
+                if name.isdigit() and os.path.join(parent, name) != self.directory and not _alive(int(name)):
+                    shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="request-metrics-flush", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        self.flush()
+    
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError:
+                pass  # Retried next interval
+    
+    def exposition(self) -> str:
+        """All workers' totals in Prometheus text format."""
+        return render(self.collect())
+
+
+def _labels(route: Optional[str], **extra) -> str:
+    labels = {}
+    if route is not None:
+        method, _, path = route.partition(" ")
+        labels = {"method": method, "route": path}
+    labels.update(extra)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+def _number(value) -> str:
+    """Full precision: counters must keep moving by small steps however large they get."""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def _histogram(lines: List[str], name: str, route: Optional[str], snapshot: Dict[str, Any], scale: float = 1, **extra):
+    for bound, count in snapshot["buckets"].items():
+        le = bound if bound == "+Inf" else f"{float(bound) * scale:g}"
+        lines.append(f"{name}_bucket{_labels(route, **extra, le=le)} {count}")
+    lines.append(f"{name}_sum{_labels(route, **extra)} {_number(snapshot['sum'] * scale)}")
+    lines.append(f"{name}_count{_labels(route, **extra)} {snapshot['count']}")
+
+
+def render(snapshot: Dict[str, Dict[str, Any]]) -> str:
+    """Prometheus text exposition of per-route and per-pool totals."""
+    lines = []
+    
+    def family(name: str, kind: str, help_text: str):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+    
+    ordered = sorted(snapshot["routes"].items())
+    family("vicarity_http_requests_total", "counter", "Requests by route and status code.")
+    for route, totals in ordered:
+        for status, count in sorted(totals["requests"].items()):
+            lines.append(f"vicarity_http_requests_total{_labels(route, status=status)} {count}")
+    family("vicarity_http_request_duration_seconds", "histogram", "Request latency.")
+    for route, totals in ordered:
+        _histogram(lines, "vicarity_http_request_duration_seconds", route, totals["duration_ms"], scale=0.001)
+    family("vicarity_http_request_sql_statements", "histogram", "SQL statements run per request.")
+    for route, totals in ordered:
+        _histogram(lines, "vicarity_http_request_sql_statements", route, totals["sql_statements"])
+    for name, key, help_text, scale in (
+        ("vicarity_http_request_sql_seconds_total", "sql_ms", "Time spent executing SQL.", 0.001),
+        ("vicarity_http_request_pool_wait_seconds_total", "pool_wait_ms",
+         "Time spent getting a pooled database connection.", 0.001),
+        ("vicarity_http_request_redis_calls_total", "redis_calls", "Redis round trips.", 1),
+        ("vicarity_http_request_redis_seconds_total", "redis_ms", "Time spent waiting on Redis.", 0.001),
+    ):
+        family(name, "counter", help_text)
+        for route, totals in ordered:
+            lines.append(f"{name}{_labels(route)} {_number(totals[key] * scale)}")
+    
+    pools = sorted(snapshot["pools"].items())
+    family("vicarity_db_pool_checkout_wait_seconds", "histogram", "Time to get a connection from the pool (all checkouts).")
+    for pool, stats in pools:
+        _histogram(lines, "vicarity_db_pool_checkout_wait_seconds", None, stats["wait_ms"], scale=0.001, pool=pool)
+    for name, key, help_text in (
+        ("vicarity_db_pool_checkouts_total", "checkouts", "Checkouts from the pool (timed out ones included)."),
+        ("vicarity_db_pool_connects_total", "connects", "Database connections opened (each a connection handshake)."),
+        ("vicarity_db_pool_timeouts_total", "timeouts", "Checkouts that gave up waiting for a connection."),
+    ):
+        family(name, "counter", help_text)
+        for pool, stats in pools:
+            lines.append(f"{name}{_labels(None, pool=pool)} {stats[key]}")
+    for name, key, help_text in (
+        ("vicarity_db_pool_checked_out", "checked_out", "Connections checked out now."),
+        ("vicarity_db_pool_overflow", "overflow", "Overflow connections open now (beyond the pool size)."),
+        ("vicarity_db_pool_size", "size", "Connections the pool keeps open."),
+        ("vicarity_db_pool_max_overflow", "max_overflow", "Overflow connections the pool may open."),
+    ):
+        family(name, "gauge", help_text)
+        for pool, stats in pools:
+            if key in stats.get("gauges", {}):
+                lines.append(f"{name}{_labels(None, pool=pool)} {stats['gauges'][key]}")
+    return "\n".join(lines) + "\n"
+
+
+def route_name(scope) -> str:
+    """Method and route template of a handled request ("unmatched" if no route matched)."""
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', None) or 'unmatched'}"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording each HTTP request's latency and timings."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        timings = RequestTimings()
+        if _captures:
+            timings.statements = []
+        token = _current.set(timings)
+        status = 500  # Unless a response starts
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current.reset(token)
+            route = route_name(scope)
+            request_metrics.record(route, status, (time.perf_counter() - started) * 1000, timings)
+            for captured in _captures:
+                captured.append((route, timings))
+
+
+@contextmanager
+def capture_requests():
+    """Collect (route, timings) of every request finishing in the block, with its SQL text."""
+    captured: List[Tuple[str, RequestTimings]] = []
+    _captures.append(captured)
+    try:
+        yield captured
+    finally:
+        _captures.remove(captured)
+
+
+@contextmanager
+def query_budget(expected: int):
+    """
+    Test helper: the requests made in the block must run exactly
+    `expected` SQL statements in total. The failure lists them.
+    """
+    with capture_requests() as captured:
+        yield captured
+    statements = [(route, sql) for route, timings in captured for sql in timings.statements]
+    assert len(statements) == expected, (
+        f"expected {expected} SQL statements, ran {len(statements)}:\n"
+        + "\n".join(f"  [{route}] {' '.join(sql.split())}" for route, sql in statements)
+    )
+
+
+# Global registry (one per worker process)
+request_metrics = RequestMetrics(settings.METRICS_DIR, settings.METRICS_FLUSH_SECONDS)
@@ -4,7 +4,7 @@ Security utilities - JWT tokens, password hashing, email verification.
 
 import os
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from uuid import UUID
 
 from jose import jwt, JWTError
@@ -13,8 +13,37 @@ from passlib.context import CryptContext
 from app.core.config import settings
 
 
+def build_password_context(
+    scheme: str = settings.PASSWORD_HASH_SCHEME,
+    bcrypt_rounds: int = settings.BCRYPT_ROUNDS,
+    argon2_time_cost: int = settings.ARGON2_TIME_COST,
+    argon2_memory_cost_kib: int = settings.ARGON2_MEMORY_COST_KIB,
+    argon2_parallelism: int = settings.ARGON2_PARALLELISM,
+) -> CryptContext:
+    """
+    Build the password hashing context.
+    
+    New hashes use `scheme` at the configured cost. Hashes made with the
+    other scheme, or with a lower bcrypt cost or different argon2
+    parameters, still verify but are reported as needing an update.
+    """
+    if scheme not in ("bcrypt", "argon2"):
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+    
+    return CryptContext(
+        schemes=["bcrypt", "argon2"],
+        default=scheme,
+        deprecated="auto",
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost_kib,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = build_password_context()
 
 
 # Token types
@@ -30,6 +59,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored hash is outdated.
+    
+    Returns:
+        (valid, new_hash) - new_hash is None unless the caller should store it
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def hash_password(password: str) -> str:
     """Hash a password for storage."""
     return pwd_context.hash(password)
@@ -0,0 +1,773 @@
+"""
+In-memory bitmap index of searchable workers.
+
+Worker search combines containment filters on arrays and JSONB
+(qualifications, specializations, days, shifts...) that Postgres can only
+answer by intersecting GIN results or walking an index and discarding
+rows. This index answers them in memory instead:
+
+- every searchable worker (complete profile, active user) gets a dense
+  ordinal; freed ordinals are reused
+- each attribute value ("languages" = "polish") has a bitmap over the
+  ordinals, stored as packed uint64 words (1M workers: 125 KB a bitmap),
+  so AND / OR of filters are a few vectorized word operations
+- single-valued columns that are compared rather than matched (updated_at,
+  hourly rates, city, location) are plain NumPy arrays indexed by ordinal
+
+A search evaluates the filter bitmaps, applies the column filters and the
+keyset cursor to the surviving ordinals, and returns the IDs of one page;
+only that page is loaded from Postgres. Matching (see app/core/matching.py)
+scores every worker from the same bitmaps and columns.
+
+The index is built in the background at startup and kept current by
+WorkerIndexUpdater: a Session listener collects the users whose worker
+profile (or active flag) changed in each commit, and the updater reloads
+just those rows. Changes are published on a Redis channel so every
+worker process applies them, and the index is rebuilt periodically to
+catch anything missed (e.g. while Redis was down).
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+from redis.exceptions import RedisError
+from sqlalchemy import event, func, inspect, literal_column, select, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import KEY_PREFIX, caches
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.geocoding import haversine_miles
+from app.core.matching import (
+    CARE_HOME_SPECIALIZATIONS, DEFAULT_TRAVEL_RADIUS_MILES, WEIGHTS, distance_fit, experience_code, experience_fit,
+    nearby, rate_fit, top_k,
+)
+from app.core.redis_client import get_redis
+from app.models.user import User
+from app.models.worker_profile import COMPLETE_PROFILE, WorkerProfile
+
+
+logger = logging.getLogger(__name__)
+
+# Attributes with one bitmap per value
+BITMAP_ATTRIBUTES = ("dbs_status", "qualifications", "specializations", "languages", "available_days", "shift_types")
+
+# Separates list values read by load_workers()
+DELIMITER = "\x1f"
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+# Profile changes are published here for the other worker processes
+CHANNEL = f"{KEY_PREFIX}:worker_index"
+
+
+class Filter:
+    """A bitmap filter expression; combine with & (AND) and | (OR)."""
+    
+    def __and__(self, other: "Filter") -> "Filter":
+        return And((self, other))
+    
+    def __or__(self, other: "Filter") -> "Filter":
+        return Or((self, other))
+
+
+class Term(Filter):
+    """Workers whose `attribute` includes `value`."""
+    
+    def __init__(self, attribute: str, value: str):
+        if attribute not in BITMAP_ATTRIBUTES:
+            raise ValueError(f"{attribute} is not indexed")
+        self.attribute = attribute
+        self.value = value
+
+
+class And(Filter):
+    """Workers matching every filter (all workers if there are none)."""
+    
+    def __init__(self, filters: Iterable[Filter]):
+        self.filters = tuple(filters)
+
+
+class Or(Filter):
+    """Workers matching any of the filters."""
+    
+    def __init__(self, filters: Iterable[Filter]):
+        self.filters = tuple(filters)
+
+
+def search_filter(filters) -> Filter:
+    """
+    The bitmap filter for WorkerSearchFilters: any of the DBS statuses,
+    all of the values of each list filter.
+    """
+    terms: List[Filter] = []
+    if filters.dbs_status:
+        terms.append(Or(Term("dbs_status", status) for status in filters.dbs_status))
+    for attribute in BITMAP_ATTRIBUTES[1:]:
+        terms.extend(Term(attribute, value) for value in getattr(filters, attribute) or ())
+    return And(terms)
+
+
+def _words(capacity: int) -> np.ndarray:
+    return np.zeros(capacity // 64, dtype=np.uint64)
+
+
+def _bitmap(ordinals: np.ndarray, capacity: int) -> np.ndarray:
+    """Packed bitmap of `capacity` bits with `ordinals` set."""
+    bits = np.zeros(capacity, dtype=bool)
+    bits[ordinals] = True
+    return np.packbits(bits, bitorder="little").view(np.uint64)
+
+
+# Bits set in each byte value
+POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+# Searches matching at most this many workers (before the column filters)
+# sort all of them; broader ones walk the workers newest first
+EXTRACT_MAX_MATCHES = 20000
+
+
+def _popcount(words: np.ndarray) -> int:
+    return int(POPCOUNT[words.view(np.uint8)].sum(dtype=np.int64))
+
+
+def _has(words: np.ndarray, ordinals: np.ndarray) -> np.ndarray:
+    """Mask of the `ordinals` set in a packed bitmap."""
+    return (words[ordinals >> 6] >> (ordinals & 63).astype(np.uint64)) & np.uint64(1) == 1
+
+
+def _bits(words: np.ndarray) -> np.ndarray:
+    """One uint8 (0 or 1) per bit of a packed bitmap."""
+    return np.unpackbits(words.view(np.uint8), bitorder="little")
+
+
+def _ordinals(words: np.ndarray) -> np.ndarray:
+    """Ordinals of the set bits of a packed bitmap, ascending."""
+    nonzero = np.flatnonzero(words)
+    bits = np.unpackbits(words[nonzero].view(np.uint8), bitorder="little").reshape(-1, 64)
+    rows, offsets = np.nonzero(bits)
+    return nonzero[rows] * 64 + offsets
+
+
+# Everything load() replaces
+INDEX_STATE = (
+    "_capacity", "_size", "_free", "_ids", "_user_ids", "_updated_at", "_rate_min", "_rate_max",
+    "_city", "_cities", "_experience", "_latitude", "_longitude", "_travel_radius", "_live", "_keys", "_bitmaps", "_sorted_user_ids", "_sorted_ordinals", "_recent",
+    "_recency", "_recency_at", "_moved", "_changed",
+)
+
+
+# Arrays with an entry per ordinal
+COLUMNS = (
+    "_ids", "_user_ids", "_updated_at", "_rate_min", "_rate_max", "_city",
+    "_experience", "_latitude", "_longitude", "_travel_radius", "_moved",
+)
+
+
+def _uuid(raw: bytes) -> UUID:
+    # NumPy "S" items drop trailing NUL bytes
+    return UUID(bytes=bytes(raw).ljust(16, b"\0"))
+
+
+def _raw(id) -> bytes:
+    """16-byte form of a UUID (rows from load_workers() already have it)."""
+    return id.bytes if isinstance(id, UUID) else id
+
+
+class WorkerBitmapIndex:
+    """Bitmaps and columns over a dense ordinal per searchable worker."""
+    
+    def __init__(self, name: str, capacity: int = 1024):
+        self.name = name
+        self.ready = False
+        self.stats = {"workers": 0, "loads": 0, "upserts": 0, "removals": 0, "searches": 0, "matches": 0}
+        self._lock = threading.Lock()
+        self._reset(capacity)
+        caches[name] = self
+    
+    def _reset(self, capacity: int):
+        capacity = max(64, -(-capacity // 64) * 64)  # Whole words
+        self._capacity = capacity
+        self._size = 0  # Ordinals handed out so far
+        self._free: List[int] = []
+        self._ids = np.zeros(capacity, dtype="S16")  # Profile UUID bytes
+        self._user_ids = np.zeros(capacity, dtype="S16")
+        self._updated_at = np.zeros(capacity, dtype=np.int64)  # Microseconds since the epoch
+        self._rate_min = np.full(capacity, -1, dtype=np.int32)  # Pence; -1 when not stated
+        self._rate_max = np.full(capacity, -1, dtype=np.int32)
+        self._city = np.full(capacity, -1, dtype=np.int32)  # Code in _cities
+        self._cities: Dict[str, int] = {}
+        # Match scoring: years_experience band (-1 unknown); location and radius (NaN unknown)
+        self._experience = np.full(capacity, -1, dtype=np.int8)
+        self._latitude = np.full(capacity, np.nan, dtype=np.float32)
+        self._longitude = np.full(capacity, np.nan, dtype=np.float32)
+        self._travel_radius = np.full(capacity, np.nan, dtype=np.float32)
+        self._live = _words(capacity)
+        # One row of words per attribute value: clearing a worker is one column write
+        self._keys: Dict[Tuple[str, str], int] = {}
+        self._bitmaps = np.zeros((0, capacity // 64), dtype=np.uint64)
+        # User ID -> ordinal: sorted at load, plus a dict of ordinals assigned since
+        self._sorted_user_ids = np.zeros(0, dtype="S16")
+        self._sorted_ordinals = np.zeros(0, dtype=np.int64)
+        self._recent: Dict[bytes, int] = {}
+        # Ordinals newest first as of load (and their updated_at), for walking;
+        # ordinals changed or added since are flagged and searched separately
+        self._recency = np.zeros(0, dtype=np.int64)
+        self._recency_at = np.zeros(0, dtype=np.int64)
+        self._moved = np.zeros(capacity, dtype=bool)
+        self._changed: Set[int] = set()
+    
+    # Loading
+    
+    def load(self, rows: Iterable[dict]):
+        """Replace the contents with `rows` (see load_workers()), built column-wise."""
+        fresh = WorkerBitmapIndex.__new__(WorkerBitmapIndex)
+        fresh._reset(1024)
+        
+        # Ordinals per attribute value, turned into bitmaps once all are known
+        members: Dict[Tuple[str, str], array] = {}
+        size = 0
+        for row in rows:
+            if size == fresh._capacity:
+                fresh._grow()
+            fresh._set_columns(size, row)
+            for attribute in BITMAP_ATTRIBUTES:
+                for value in fresh._values(row, attribute):
+                    ordinals = members.get((attribute, value))
+                    if ordinals is None:
+                        ordinals = members[(attribute, value)] = array("i")
+                    ordinals.append(size)
+            size += 1
+        
+        fresh._size = size
+        fresh._live = _bitmap(np.arange(size), fresh._capacity)
+        fresh._keys = {key: row for row, key in enumerate(members)}
+        fresh._bitmaps = np.zeros((len(members), fresh._capacity // 64), dtype=np.uint64)
+        for row, ordinals in enumerate(members.values()):
+            fresh._bitmaps[row] = _bitmap(np.frombuffer(ordinals, dtype=np.int32), fresh._capacity)
+        fresh._sorted_ordinals = np.argsort(fresh._user_ids[:size], kind="stable")
+        fresh._sorted_user_ids = fresh._user_ids[fresh._sorted_ordinals]
+        fresh._recency = np.lexsort((fresh._ids[:size], fresh._updated_at[:size]))[::-1].copy()
+        fresh._recency_at = fresh._updated_at[fresh._recency]
+        
+        with self._lock:
+            for attr in INDEX_STATE:
+                setattr(self, attr, getattr(fresh, attr))
+            self.stats["workers"] = size
+            self.stats["loads"] += 1
+            self.ready = True
+    
+    @staticmethod
+    def _values(row: dict, attribute: str) -> Iterable[str]:
+        value = row[attribute]
+        if attribute == "dbs_status":
+            return (value,)
+        return set(value or ())
+    
+    def _set_columns(self, ordinal: int, row: dict):
+        self._ids[ordinal] = _raw(row["id"])
+        self._user_ids[ordinal] = _raw(row["user_id"])
+        self._updated_at[ordinal] = (row["updated_at"] - EPOCH) // MICROSECOND
+        self._rate_min[ordinal] = -1 if row["hourly_rate_min"] is None else row["hourly_rate_min"]
+        self._rate_max[ordinal] = -1 if row["hourly_rate_max"] is None else row["hourly_rate_max"]
+        city = (row["city"] or "").lower()
+        self._city[ordinal] = self._cities.setdefault(city, len(self._cities))
+        self._experience[ordinal] = experience_code(row["years_experience"])
+        self._latitude[ordinal] = np.nan if row["latitude"] is None else row["latitude"]
+        self._longitude[ordinal] = np.nan if row["longitude"] is None else row["longitude"]
+        self._travel_radius[ordinal] = np.nan if row["travel_radius_miles"] is None else row["travel_radius_miles"]
+    
+    # Incremental updates
+    
+    def _find(self, user_ids: List[bytes]) -> Dict[bytes, int]:
+        """Ordinals of these users' workers, by raw user ID."""
+        found = {user_id: self._recent[user_id] for user_id in user_ids if user_id in self._recent}
+        if not len(self._sorted_user_ids):
+            return found
+        keys = np.array(user_ids, dtype="S16")
+        positions = np.minimum(np.searchsorted(self._sorted_user_ids, keys), len(self._sorted_user_ids) - 1)
+        ordinals = self._sorted_ordinals[positions]
+        # Removed ordinals have a blank user ID; reused ones a different one
+        hits = (self._sorted_user_ids[positions] == keys) & (self._user_ids[ordinals] == keys)
+        for user_id, ordinal in zip(np.array(user_ids, dtype=object)[hits], ordinals[hits]):
+            found[user_id] = int(ordinal)
+        return found
+    
+    def _clear(self, ordinal: int):
+        word, bit = ordinal >> 6, np.uint64(1 << (ordinal & 63))
+        self._bitmaps[:, word] &= ~bit
+        self._live[word] &= ~bit
+    
+    def _grow(self):
+        capacity = self._capacity * 2
+        for attr in COLUMNS:
+            column = getattr(self, attr)
+            blank = {"i": -1, "f": np.nan}.get(column.dtype.kind)
+            grown = np.zeros(capacity, column.dtype) if blank is None else np.full(capacity, blank, column.dtype)
+            grown[:self._capacity] = column
+            setattr(self, attr, grown)
+        added = self._capacity // 64
+        self._live = np.concatenate([self._live, _words(self._capacity)])
+        self._bitmaps = np.pad(self._bitmaps, ((0, 0), (0, added)))
+        self._capacity = capacity
+    
+    def _key(self, key: Tuple[str, str]) -> int:
+        """Bitmap row of an attribute value, added if new."""
+        row = self._keys.get(key)
+        if row is None:
+            row = self._keys[key] = len(self._keys)
+            self._bitmaps = np.vstack([self._bitmaps, _words(self._capacity)])
+        return row
+    
+    def upsert(self, rows: Iterable[dict]):
+        """Add or update searchable workers."""
+        rows = list(rows)
+        with self._lock:
+            ordinals = self._find([_raw(row["user_id"]) for row in rows])
+            for row in rows:
+                ordinal = ordinals.get(_raw(row["user_id"]))
+                if ordinal is not None:
+                    self._clear(ordinal)
+                else:
+                    if self._free:
+                        ordinal = self._free.pop()
+                    else:
+                        if self._size == self._capacity:
+                            self._grow()
+                        ordinal = self._size
+                        self._size += 1
+                    self._recent[_raw(row["user_id"])] = ordinal
+                self._moved[ordinal] = True
+                self._changed.add(ordinal)
+                
+                self._set_columns(ordinal, row)
+                keys = [
+                    self._key((attribute, value))
+                    for attribute in BITMAP_ATTRIBUTES for value in self._values(row, attribute)
+                ]
+                word, bit = ordinal >> 6, np.uint64(1 << (ordinal & 63))
+                self._bitmaps[keys, word] |= bit
+                self._live[word] |= bit
+            self.stats["upserts"] += len(rows)
+            self.stats["workers"] = self._size - len(self._free)
+    
+    def remove(self, user_ids: Iterable):
+        """Drop these users' workers (UUIDs or raw IDs), if present."""
+        with self._lock:
+            for user_id, ordinal in self._find([_raw(user_id) for user_id in user_ids]).items():
+                self._clear(ordinal)
+                self._ids[ordinal] = self._user_ids[ordinal] = b""
+                self._recent.pop(user_id, None)
+                self._changed.discard(ordinal)
+                self._free.append(ordinal)
+                self.stats["removals"] += 1
+            self.stats["workers"] = self._size - len(self._free)
+    
+    # Queries
+    
+    def _evaluate(self, filter: Filter) -> np.ndarray:
+        """Bitmap of a filter expression (a new array)."""
+        if isinstance(filter, Term):
+            row = self._keys.get((filter.attribute, filter.value))
+            return self._bitmaps[row].copy() if row is not None else _words(self._capacity)
+        if isinstance(filter, And):
+            if not filter.filters:
+                return self._live.copy()
+            result = self._evaluate(filter.filters[0])
+            for other in filter.filters[1:]:
+                np.bitwise_and(result, self._evaluate(other), out=result)
+            return result
+        if isinstance(filter, Or):
+            result = _words(self._capacity)
+            for other in filter.filters:
+                np.bitwise_or(result, self._evaluate(other), out=result)
+            return result
+        raise TypeError(f"Unsupported filter {filter!r}")
+    
+    def count(self, filter: Filter) -> int:
+        """Number of workers matching a filter."""
+        with self._lock:
+            words = self._evaluate(filter) & self._live
+        return _popcount(words)
+    
+    def _keep(self, ordinals: np.ndarray, filters, after) -> np.ndarray:
+        """Mask of `ordinals` passing the column filters and the cursor."""
+        keep = np.ones(len(ordinals), dtype=bool)
+        if filters.city:
+            keep &= self._city[ordinals] == self._cities.get(filters.city.lower(), -2)
+        # Rates overlap the worker's range; unstated rates never match
+        if filters.hourly_rate_max is not None:
+            rate_min = self._rate_min[ordinals]
+            keep &= (rate_min >= 0) & (rate_min <= filters.hourly_rate_max)
+        if filters.hourly_rate_min is not None:
+            rate_max = self._rate_max[ordinals]
+            keep &= (rate_max >= 0) & (rate_max >= filters.hourly_rate_min)
+        if after is not None:
+            after_at, after_id = after
+            updated_at = self._updated_at[ordinals]
+            keep &= (updated_at < after_at) | ((updated_at == after_at) & (self._ids[ordinals] < after_id))
+        return keep
+    
+    def _walk(self, words: np.ndarray, filters, after, wanted: int) -> np.ndarray:
+        """
+        The first `wanted` matches in load-time recency order, plus every
+        match among workers changed since (whose position there is stale).
+        """
+        start = 0
+        if after is not None:
+            start = int(np.searchsorted(-self._recency_at, -after[0]))
+        found = []
+        chunk = 1024
+        while start < len(self._recency) and sum(map(len, found)) < wanted:
+            ordinals = self._recency[start:start + chunk]
+            ordinals = ordinals[~self._moved[ordinals] & _has(words, ordinals)]
+            found.append(ordinals[self._keep(ordinals, filters, after)])
+            start += chunk
+            chunk *= 2  # Sparse matches: scan further each round
+        
+        changed = np.fromiter(self._changed, dtype=np.int64, count=len(self._changed))
+        changed = changed[_has(words, changed)]
+        found.append(changed[self._keep(changed, filters, after)])
+        return np.concatenate(found)
+    
+    def search(self, filters, limit: int, after: Optional[Tuple[datetime, UUID]] = None):
+        """
+        One page of worker search (WorkerSearchFilters), in the order of
+        worker_search_query(): newest first by (updated_at, id), after the
+        cursor key `after`.
+        
+        Selective filters extract every match from the bitmap; broad ones
+        walk the workers newest first and stop at a page, as Postgres walks
+        its (updated_at, id) index.
+        
+        Returns:
+            (profile IDs of the page, key of its last row if there are more)
+        """
+        if after is not None:
+            after = ((after[0] - EPOCH) // MICROSECOND, after[1].bytes)
+        
+        with self._lock:
+            self.stats["searches"] += 1
+            words = self._evaluate(search_filter(filters))
+            np.bitwise_and(words, self._live, out=words)
+            if _popcount(words) <= EXTRACT_MAX_MATCHES:
+                ordinals = _ordinals(words)
+                ordinals = ordinals[self._keep(ordinals, filters, after)]
+            else:
+                ordinals = self._walk(words, filters, after, limit + 1)
+            updated_at = self._updated_at[ordinals]
+            
+            # Only the newest limit + 1 need sorting; ties at the cut are kept
+            if len(ordinals) > limit + 1:
+                cut = np.partition(updated_at, len(updated_at) - limit - 1)[len(updated_at) - limit - 1]
+                top = updated_at >= cut
+                ordinals, updated_at = ordinals[top], updated_at[top]
+            ids = self._ids[ordinals]
+            order = np.lexsort((ids, updated_at))[::-1][:limit + 1]
+            page = [_uuid(id) for id in ids[order[:limit]]]
+            
+            next_key = None
+            if len(order) > limit:
+                last = order[limit - 1]
+                next_key = (EPOCH + int(updated_at[last]) * MICROSECOND, page[-1])
+        return page, next_key
+    
+    def _coverage(self, attribute: str, values: Optional[List[str]], ordinals: np.ndarray) -> Optional[np.ndarray]:
+        """Share of `values` each of `ordinals` has (None if there are no values)."""
+        values = set(values or ())
+        if not values:
+            return None
+        held = np.zeros(len(ordinals), dtype=np.uint8)
+        for value in values:
+            row = self._keys.get((attribute, value))
+            if row is not None:
+                held += _bits(self._bitmaps[row])[ordinals]
+        return held * np.float32(1 / len(values))
+    
+    def match(self, criteria, limit: int) -> List[Tuple[UUID, float, Optional[float]]]:
+        """
+        The workers best matching a care home (WorkerMatchCriteria), scored
+        as described in app/core/matching.py.
+        
+        Returns:
+            Up to `limit` (profile ID, score 0-100, miles away or None),
+            best first
+        """
+        located = criteria.latitude is not None and criteria.longitude is not None
+        with self._lock:
+            self.stats["matches"] += 1
+            candidates = _bits(self._live).view(bool)
+            if located:
+                # Nobody travels further than the longest radius
+                longest = max(float(np.nanmax(self._travel_radius[:self._size], initial=0)), DEFAULT_TRAVEL_RADIUS_MILES)
+                candidates &= nearby(criteria.latitude, criteria.longitude, self._latitude, self._longitude, longest)
+            ordinals = np.flatnonzero(candidates)
+            
+            components = {
+                "qualifications": self._coverage("qualifications", criteria.qualifications, ordinals),
+                "rate": rate_fit(criteria.hourly_rate, self._rate_min[ordinals]),
+                "experience": experience_fit(self._experience[ordinals]),
+            }
+            availability = [
+                coverage for coverage in (
+                    self._coverage("available_days", criteria.available_days, ordinals),
+                    self._coverage("shift_types", criteria.shift_types, ordinals),
+                ) if coverage is not None
+            ]
+            if availability:
+                components["availability"] = sum(availability) * np.float32(1 / len(availability))
+            specialization = CARE_HOME_SPECIALIZATIONS.get(criteria.care_home_type)
+            if specialization:
+                components["specialization"] = self._coverage("specializations", [specialization], ordinals)
+            miles = None
+            if located:
+                miles = haversine_miles(criteria.latitude, criteria.longitude, self._latitude[ordinals], self._longitude[ordinals])
+                components["distance"] = distance_fit(miles, self._travel_radius[ordinals])
+            
+            # Criteria not given score full marks for everyone
+            scores = np.full(len(ordinals), sum(WEIGHTS.values()), dtype=np.float32)
+            for name, component in components.items():
+                if component is not None:
+                    scores += (component - 1) * np.float32(WEIGHTS[name])
+            
+            best = top_k(scores, limit)
+            return [
+                (
+                    _uuid(self._ids[ordinals[at]]),
+                    round(float(scores[at]), 1),
+                    None if miles is None or np.isnan(miles[at]) else round(float(miles[at]), 1),
+                )
+                for at in best
+            ]
+    
+    def memory(self) -> Dict[str, int]:
+        """Bytes held by the bitmaps and the columns."""
+        with self._lock:
+            columns = sum(getattr(self, attr).nbytes for attr in (
+                *COLUMNS, "_sorted_user_ids", "_sorted_ordinals", "_recency", "_recency_at",
+            ))
+            return {
+                "bitmaps": self._live.nbytes + self._bitmaps.nbytes,
+                "bitmap_count": len(self._keys) + 1,
+                "columns": columns,
+            }
+
+
+def load_workers(db: Session, user_ids: Optional[Iterable[UUID]] = None):
+    """
+    Searchable workers as index rows: all of them, or those of `user_ids`.
+    
+    IDs are read as their 16 raw bytes and each list (array column, or the
+    codes in the qualifications JSONB) as one delimited string: both are
+    far cheaper than the driver's UUID, array and JSON parsing. Rows are
+    streamed in batches.
+    """
+    code = func.jsonb_path_query(WorkerProfile.qualifications, "$[*].code").column_valued("code")
+    qualifications = select(func.string_agg(code.op("#>>")(literal_column("'{}'")), DELIMITER))
+    lists = {
+        "qualifications": qualifications.scalar_subquery(),
+        **{attribute: func.array_to_string(getattr(WorkerProfile, attribute), DELIMITER) for attribute in BITMAP_ATTRIBUTES[2:]},
+    }
+    query = (
+        select(
+            func.uuid_send(WorkerProfile.id).label("id"),
+            func.uuid_send(WorkerProfile.user_id).label("user_id"),
+            WorkerProfile.updated_at,
+            WorkerProfile.dbs_status,
+            WorkerProfile.hourly_rate_min,
+            WorkerProfile.hourly_rate_max,
+            WorkerProfile.city,
+            WorkerProfile.years_experience,
+            WorkerProfile.travel_radius_miles,
+            WorkerProfile.latitude,
+            WorkerProfile.longitude,
+            *(value.label(attribute) for attribute, value in lists.items()),
+        )
+        .join(User, User.id == WorkerProfile.user_id)
+        .where(text(COMPLETE_PROFILE), User.is_active == True)
+        .execution_options(yield_per=10000)
+    )
+    if user_ids is not None:
+        query = query.where(WorkerProfile.user_id.in_(list(user_ids)))
+    
+    result = db.execute(query)
+    keys = tuple(result.keys())
+    for row in result:
+        row = dict(zip(keys, row))
+        row["id"], row["user_id"] = bytes(row["id"]), bytes(row["user_id"])
+        row["dbs_status"] = row["dbs_status"].value
+        for attribute in lists:
+            row[attribute] = row[attribute].split(DELIMITER) if row[attribute] else []
+        yield row
+
+
+class WorkerIndexUpdater:
+    """Builds the index and keeps it current from profile change events."""
+    
+    def __init__(self, index: WorkerBitmapIndex, session_factory, refresh_interval: float, rebuild_interval: float):
+        self.index = index
+        self.session_factory = session_factory
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.origin = uuid.uuid4().hex  # Skips our own messages on the channel
+        self._pending: Set[UUID] = set()
+        self._pending_lock = threading.Lock()
+        self._pubsub = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    def start(self):
+        """Build the index and follow changes, on a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="worker-index", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._close_pubsub()
+    
+    def notify(self, user_ids: Iterable[UUID]):
+        """Queue users whose searchable profile may have changed (no I/O)."""
+        if self._thread is None:
+            return
+        with self._pending_lock:
+            self._pending.update(user_ids)
+    
+    def rebuild(self):
+        with self.session_factory() as db:
+            self.index.load(load_workers(db))
+    
+    def refresh(self, user_ids: Set[UUID]):
+        """Reload these users' rows: upsert the searchable ones, drop the rest."""
+        with self.session_factory() as db:
+            rows = list(load_workers(db, user_ids))
+        self.index.upsert(rows)
+        self.index.remove({user_id.bytes for user_id in user_ids} - {row["user_id"] for row in rows})
+    
+    # Redis channel
+    
+    def _publish(self, user_ids: Set[UUID]):
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            client.publish(CHANNEL, json.dumps({"origin": self.origin, "users": [str(u) for u in user_ids]}))
+        except RedisError as e:
+            logger.warning("Worker index: publish failed: %s", e)
+    
+    def _receive(self, timeout: float) -> Set[UUID]:
+        """User IDs published by other processes, waiting up to `timeout`."""
+        client = get_redis()
+        if client is None:
+            self._stop.wait(timeout)
+            return set()
+        
+        user_ids = set()
+        try:
+            if self._pubsub is None:
+                self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+                self._pubsub.subscribe(CHANNEL)
+            message = self._pubsub.get_message(timeout=timeout)
+            while message is not None:
+                data = json.loads(message["data"])
+                if data["origin"] != self.origin:
+                    user_ids.update(UUID(u) for u in data["users"])
+                message = self._pubsub.get_message(timeout=0)
+        except RedisError as e:
+            # Missed changes are caught by the next rebuild
+            logger.warning("Worker index: channel error: %s", e)
+            self._close_pubsub()
+            self._stop.wait(timeout)
+        return user_ids
+    
+    def _close_pubsub(self):
+        if self._pubsub is not None:
+            try:
+                self._pubsub.close()
+            except RedisError:
+                pass
+            self._pubsub = None
+    
+    def _run(self):
+        rebuild_at = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                if time.monotonic() >= rebuild_at:
+                    self.rebuild()
+                    rebuild_at = time.monotonic() + self.rebuild_interval
+                
+                user_ids = self._receive(self.refresh_interval)
+                with self._pending_lock:
+                    local, self._pending = self._pending, set()
+                if local:
+                    self._publish(local)
+                if local or user_ids:
+                    self.refresh(local | user_ids)
+            except Exception:
+                logger.exception("Worker index update failed")
+                self._stop.wait(self.refresh_interval)
+
+
+def changed_workers(session: Session) -> Set[UUID]:
+    """IDs of users whose searchable worker profile is affected by a pending flush."""
+    user_ids = set()
+    
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, WorkerProfile):
+            if obj in session.dirty and not session.is_modified(obj):
+                continue
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, User) and obj.is_worker:
+            if obj in session.dirty and not inspect(obj).attrs.is_active.history.has_changes():
+                continue
+            user_ids.add(obj.id)
+    
+    user_ids.discard(None)
+    return user_ids
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_workers(session: Session, flush_context):
+    if worker_index_updater._thread is None:
+        return
+    user_ids = changed_workers(session)
+    if user_ids:
+        session.info.setdefault("changed_workers", set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_changed_workers(session: Session):
+    user_ids = session.info.pop("changed_workers", None)
+    if user_ids:
+        worker_index_updater.notify(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_workers(session: Session):
+    session.info.pop("changed_workers", None)
+
+
+# Searchable workers (GET /care-home/workers/search when WORKER_INDEX_ENABLED)
+worker_index = WorkerBitmapIndex("worker_index")
+
+# Started by the application lifespan when WORKER_INDEX_ENABLED
+worker_index_updater = WorkerIndexUpdater(
+    worker_index,
+    SessionLocal,
+    refresh_interval=settings.WORKER_INDEX_REFRESH_SECONDS,
+    rebuild_interval=settings.WORKER_INDEX_REBUILD_SECONDS,
+)
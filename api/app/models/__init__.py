@@ -2,6 +2,8 @@ from .user import User, UserRole
 from .worker_profile import WorkerProfile, ProfileCompletionStatus, DBSStatus
 from .care_home_profile import CareHomeProfile, CareHomeType, VerificationStatus
 from .qualification import Qualification, QualificationCategory
+from .platform_counter import PlatformCounter, CounterName
+from .email_outbox import EmailOutbox, EmailStatus
 
 __all__ = [
     "User",
@@ -14,4 +16,8 @@ __all__ = [
     "VerificationStatus",
     "Qualification",
     "QualificationCategory",
+    "PlatformCounter",
+    "CounterName",
+    "EmailOutbox",
+    "EmailStatus",
 ]
@@ -5,7 +5,7 @@ Care Home profile model - care home business specific data.
 import enum
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, Enum, ForeignKey, Text
+from sqlalchemy import Column, String, Float, Boolean, DateTime, Enum, ForeignKey, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -66,6 +66,8 @@ class CareHomeProfile(Base):
     city = Column(String(100), nullable=True)
     county = Column(String(100), nullable=True)
     postcode = Column(String(20), nullable=True)
+    latitude = Column(Float, nullable=True)  # Geocoded from postcode on update
+    longitude = Column(Float, nullable=True)
     
     # Additional Info
     website = Column(String(255), nullable=True)
@@ -0,0 +1,71 @@
+"""
+Email outbox model - transactional emails waiting to be delivered.
+
+Routes never call the email provider. They add an outbox row in the same
+transaction as the change that triggers the email (registration, password
+reset, ...), so an email is queued if and only if that change commits.
+The sender process (send_emails.py) delivers queued rows in batches.
+"""
+
+import enum
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Enum, JSON, Text, Index, Uuid
+
+from app.core.database import Base
+
+
+class EmailStatus(str, enum.Enum):
+    """Delivery status."""
+    PENDING = "pending"  # Queued, or claimed by a sender (see next_attempt_at)
+    SENT = "sent"
+    FAILED = "failed"  # Permanently rejected, or out of attempts
+
+
+class EmailOutbox(Base):
+    """
+    A queued transactional email.
+    
+    Emails are stored as a template name plus parameters and rendered by
+    the sender. A sender claims due rows by assigning a batch_id and
+    pushing next_attempt_at forward (a lease); if it dies mid-batch the
+    rows become due again with the same batch_id, which doubles as the
+    provider idempotency key, so a batch that did go out is not sent twice.
+    """
+    __tablename__ = "email_outbox"
+    
+    # Generic Uuid/JSON types (native on PostgreSQL) so tests can use SQLite
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    template = Column(String(50), nullable=False)
+    to_email = Column(String(255), nullable=False)
+    params = Column(JSON, nullable=False, default=dict)
+    
+    # Delivery state
+    status = Column(Enum(EmailStatus), nullable=False, default=EmailStatus.PENDING)
+    batch_id = Column(Uuid, nullable=True, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    provider_message_id = Column(String(100), nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # The sender's claim queries: due pending rows, oldest first, with
+        # batches being retried (few) indexed apart from the new backlog
+        Index(
+            "ix_email_outbox_pending_due",
+            "next_attempt_at",
+            postgresql_where=(status == EmailStatus.PENDING),
+        ),
+        Index(
+            "ix_email_outbox_retry_due",
+            "next_attempt_at",
+            postgresql_where=(status == EmailStatus.PENDING) & (batch_id.is_not(None)),
+        ),
+    )
+    
+    def __repr__(self):
+        return f"<EmailOutbox {self.template} to {self.to_email} ({self.status.value})>"
@@ -0,0 +1,309 @@
+"""
+Platform counter model - incrementally maintained platform statistics.
+
+Counters are kept in step with users and profiles by a flush listener that
+writes the deltas in the same transaction as the change itself, so
+/public/stats can read a handful of rows instead of scanning tables.
+reconcile_counters() recomputes them from the source tables to repair
+drift (e.g. rows changed by raw SQL or ON DELETE CASCADE).
+"""
+
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import BigInteger, Column, DateTime, String, Date, cast, event, func, inspect, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.user import User, UserRole
+from app.models.worker_profile import WorkerProfile
+from app.models.care_home_profile import CareHomeProfile, VerificationStatus
+
+
+class CounterName:
+    """Counter names."""
+    WORKERS = "workers"  # Active users with the worker role
+    CARE_HOMES = "care_homes"  # Active care home admins
+    WORKER_PROFILES = "worker_profiles"
+    WORKER_COMPLETION_SUM = "worker_completion_sum"  # For the average completion
+    COMPLETED_PROFILES = "completed_profiles"
+    VERIFIED_CARE_HOMES = "verified_care_homes"
+    WORKER_SIGNUPS_PREFIX = "worker_signups:"  # Daily buckets, e.g. worker_signups:2026-01-31
+    
+    @classmethod
+    def worker_signups(cls, day: date) -> str:
+        return f"{cls.WORKER_SIGNUPS_PREFIX}{day.isoformat()}"
+
+
+# Days of signup buckets summed for recent_signups_7d (today included)
+RECENT_SIGNUP_DAYS = 7
+
+
+class PlatformCounter(Base):
+    """
+    A single named counter.
+    
+    One row per counter; values only change through delta upserts
+    (value = value + delta) or reconciliation.
+    """
+    __tablename__ = "platform_counters"
+    
+    name = Column(String(100), primary_key=True)
+    value = Column(BigInteger, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<PlatformCounter {self.name}={self.value}>"
+
+
+def _values(obj, attr: str):
+    """(previous, current) value of an attribute in the pending flush."""
+    history = inspect(obj).attrs[attr].history
+    current = getattr(obj, attr)
+    if history.deleted:
+        return history.deleted[0], current
+    return current, current
+
+
+def _user_counts(role, is_active) -> Counter:
+    counts = Counter()
+    if is_active and role == UserRole.WORKER:
+        counts[CounterName.WORKERS] += 1
+    elif is_active and role == UserRole.CARE_HOME_ADMIN:
+        counts[CounterName.CARE_HOMES] += 1
+    return counts
+
+
+def _worker_profile_counts(percentage) -> Counter:
+    percentage = percentage or 0
+    return Counter({
+        CounterName.WORKER_PROFILES: 1,
+        CounterName.WORKER_COMPLETION_SUM: percentage,
+        CounterName.COMPLETED_PROFILES: 1 if percentage == 100 else 0,
+    })
+
+
+def _care_home_profile_counts(verification_status) -> Counter:
+    return Counter({
+        CounterName.VERIFIED_CARE_HOMES: 1 if verification_status == VerificationStatus.VERIFIED else 0,
+    })
+
+
+def _subtract(after: Counter, before: Counter) -> Counter:
+    delta = Counter(after)
+    delta.subtract(before)
+    return delta
+
+
+def counter_deltas(session: Session) -> Counter:
+    """Counter changes implied by the objects in a pending flush."""
+    deltas = Counter()
+    
+    for obj in session.new:
+        if isinstance(obj, User):
+            deltas.update(_user_counts(obj.role, obj.is_active))
+            if obj.role == UserRole.WORKER:
+                signup_day = (obj.created_at or datetime.utcnow()).date()
+                deltas[CounterName.worker_signups(signup_day)] += 1
+        elif isinstance(obj, WorkerProfile):
+            deltas.update(_worker_profile_counts(obj.profile_completion_percentage))
+        elif isinstance(obj, CareHomeProfile):
+            deltas.update(_care_home_profile_counts(obj.verification_status))
+    
+    for obj in session.dirty:
+        if not session.is_modified(obj):
+            continue
+        if isinstance(obj, User):
+            role_before, role_after = _values(obj, "role")
+            active_before, active_after = _values(obj, "is_active")
+            deltas.update(_subtract(
+                _user_counts(role_after, active_after),
+                _user_counts(role_before, active_before),
+            ))
+        elif isinstance(obj, WorkerProfile):
+            before, after = _values(obj, "profile_completion_percentage")
+            deltas.update(_subtract(_worker_profile_counts(after), _worker_profile_counts(before)))
+        elif isinstance(obj, CareHomeProfile):
+            before, after = _values(obj, "verification_status")
+            deltas.update(_subtract(_care_home_profile_counts(after), _care_home_profile_counts(before)))
+    
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            role_before, _ = _values(obj, "role")
+            active_before, _ = _values(obj, "is_active")
+            deltas.subtract(_user_counts(role_before, active_before))
+        elif isinstance(obj, WorkerProfile):
+            before, _ = _values(obj, "profile_completion_percentage")
+            deltas.subtract(_worker_profile_counts(before))
+        elif isinstance(obj, CareHomeProfile):
+            before, _ = _values(obj, "verification_status")
+            deltas.subtract(_care_home_profile_counts(before))
+    
+    return Counter({name: delta for name, delta in deltas.items() if delta})
+
+
+def _upsert(dialect_name: str, add: bool):
+    """INSERT ... ON CONFLICT statement that adds to (or sets) a counter."""
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    stmt = insert(PlatformCounter)
+    new_value = PlatformCounter.value + stmt.excluded.value if add else stmt.excluded.value
+    return stmt.on_conflict_do_update(
+        index_elements=[PlatformCounter.name],
+        set_={"value": new_value, "updated_at": stmt.excluded.updated_at},
+    )
+
+
+def apply_deltas(connection, deltas: Dict[str, int]):
+    """Add deltas to counters on the given connection (caller's transaction)."""
+    if not deltas:
+        return
+    now = datetime.utcnow()
+    # Sorted so concurrent transactions lock counter rows in the same order
+    rows = [{"name": name, "value": deltas[name], "updated_at": now} for name in sorted(deltas)]
+    connection.execute(_upsert(connection.dialect.name, add=True), rows)
+
+
+# Attributes the counters depend on must know their previous value even when
+# they are assigned while expired (e.g. after a commit), so make SQLAlchemy
+# load it on assignment.
+for _attribute in (
+    User.role,
+    User.is_active,
+    WorkerProfile.profile_completion_percentage,
+    CareHomeProfile.verification_status,
+):
+    event.listen(_attribute, "set", lambda target, value, oldvalue, initiator: value, active_history=True, retval=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_counters(session: Session, flush_context):
+    """Write counter deltas in the same transaction as the flushed changes."""
+    deltas = counter_deltas(session)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def stats_counter_names(today: Optional[date] = None) -> List[str]:
+    """All counters read by /public/stats."""
+    today = today or datetime.utcnow().date()
+    return [
+        CounterName.WORKERS,
+        CounterName.CARE_HOMES,
+        CounterName.WORKER_PROFILES,
+        CounterName.WORKER_COMPLETION_SUM,
+        CounterName.COMPLETED_PROFILES,
+        CounterName.VERIFIED_CARE_HOMES,
+    ] + [
+        CounterName.worker_signups(today - timedelta(days=offset))
+        for offset in range(RECENT_SIGNUP_DAYS)
+    ]
+
+
+def read_counters(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """Read counters by name; missing counters are 0."""
+    names = list(names)
+    rows = db.execute(
+        select(PlatformCounter.name, PlatformCounter.value).where(PlatformCounter.name.in_(names))
+    ).all()
+    values = dict.fromkeys(names, 0)
+    values.update({name: value for name, value in rows})
+    return values
+
+
+def compute_true_counters(db: Session, signup_days: int = 30) -> Dict[str, int]:
+    """Recompute every counter from the source tables (full scans)."""
+    values = {}
+    
+    user_counts = db.execute(
+        select(User.role, func.count())
+        .where(User.is_active == True, User.role.in_([UserRole.WORKER, UserRole.CARE_HOME_ADMIN]))
+        .group_by(User.role)
+    ).all()
+    by_role = dict(user_counts)
+    values[CounterName.WORKERS] = by_role.get(UserRole.WORKER, 0)
+    values[CounterName.CARE_HOMES] = by_role.get(UserRole.CARE_HOME_ADMIN, 0)
+    
+    profiles, completion_sum, completed = db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(WorkerProfile.profile_completion_percentage), 0),
+            func.count().filter(WorkerProfile.profile_completion_percentage == 100),
+        ).select_from(WorkerProfile)
+    ).one()
+    values[CounterName.WORKER_PROFILES] = profiles
+    values[CounterName.WORKER_COMPLETION_SUM] = int(completion_sum)
+    values[CounterName.COMPLETED_PROFILES] = completed
+    
+    values[CounterName.VERIFIED_CARE_HOMES] = db.scalar(
+        select(func.count()).select_from(CareHomeProfile)
+        .where(CareHomeProfile.verification_status == VerificationStatus.VERIFIED)
+    )
+    
+    # Signup buckets for the recent window (older buckets are never read)
+    first_day = datetime.utcnow().date() - timedelta(days=signup_days - 1)
+    for offset in range(signup_days):
+        values[CounterName.worker_signups(first_day + timedelta(days=offset))] = 0
+    signup_day = cast(User.created_at, Date)
+    signups = db.execute(
+        select(signup_day, func.count())
+        .where(User.role == UserRole.WORKER, User.created_at >= datetime.combine(first_day, datetime.min.time()))
+        .group_by(signup_day)
+    ).all()
+    for day, count in signups:
+        if isinstance(day, str):  # SQLite returns dates as text
+            day = date.fromisoformat(day)
+        values[CounterName.worker_signups(day)] = count
+    
+    return values
+
+
+def reconcile_counters(db: Session, repair: bool = True) -> Dict[str, Dict[str, int]]:
+    """
+    Compare counters with the source tables and (optionally) repair drift.
+    
+    On PostgreSQL the counters table is locked for the duration, so
+    concurrent registrations wait instead of racing the recount.
+    
+    Args:
+        db: SQLAlchemy database session
+        repair: Write the recomputed values back
+    
+    Returns:
+        Drifted counters: {name: {"stored": x, "actual": y}}
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE platform_counters IN SHARE ROW EXCLUSIVE MODE"))
+    
+    actual = compute_true_counters(db)
+    stored = read_counters(db, actual.keys())
+    drift = {
+        name: {"stored": stored[name], "actual": value}
+        for name, value in actual.items()
+        if stored[name] != value
+    }
+    
+    if repair and drift:
+        now = datetime.utcnow()
+        rows = [{"name": name, "value": actual[name], "updated_at": now} for name in sorted(drift)]
+        db.connection().execute(_upsert(db.get_bind().dialect.name, add=False), rows)
+    
+    if repair:
+        db.commit()
+    else:
+        db.rollback()
+    return drift
+
+
+def ensure_counters_initialized(db: Session) -> bool:
+    """
+    Backfill the counters the first time they are used.
+    
+    Returns:
+        True if counters were backfilled
+    """
+    if db.scalar(select(func.count()).select_from(PlatformCounter)):
+        return False
+    reconcile_counters(db)
+    return True
@@ -5,7 +5,7 @@ Worker profile model - care worker specific data.
 import enum
 import uuid
 from datetime import datetime, date
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Date, Enum, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Date, Enum, ForeignKey, Text, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
 from sqlalchemy.orm import relationship
 
@@ -30,6 +30,11 @@ class DBSStatus(str, enum.Enum):
     EXPIRED = "expired"
 
 
+# Predicate of the partial search indexes. Queries must repeat it as SQL
+# (not a bound parameter) for the planner to match them to the indexes.
+COMPLETE_PROFILE = "profile_completion_status = 'COMPLETE'"
+
+
 class WorkerProfile(Base):
     """
     Worker profile with all care worker specific information.
@@ -38,7 +43,40 @@ class WorkerProfile(Base):
     Profile completion percentage determines access.
     """
     __tablename__ = "worker_profiles"
-
+    __table_args__ = (
+        # Containment lookups on qualification codes (qualifications @> '[{"code": ...}]')
+        Index(
+            "ix_worker_profiles_qualifications_gin",
+            "qualifications",
+            postgresql_using="gin",
+            postgresql_ops={"qualifications": "jsonb_path_ops"},
+        ),
+        # Worker search (complete profiles only): newest first, keyset paginated
+        Index(
+            "ix_worker_profiles_search_recent",
+            text("updated_at DESC"),
+            text("id DESC"),
+            postgresql_where=text(COMPLETE_PROFILE),
+        ),
+        Index(
+            "ix_worker_profiles_search_city",
+            func.lower(text("city")),
+            text("updated_at DESC"),
+            text("id DESC"),
+            postgresql_where=text(COMPLETE_PROFILE),
+        ),
+        # Containment filters on the skill and availability arrays (col @> ARRAY[...])
+        Index(
+            "ix_worker_profiles_search_arrays_gin",
+            "specializations",
+            "languages",
+            "available_days",
+            "shift_types",
+            postgresql_using="gin",
+            postgresql_where=text(COMPLETE_PROFILE),
+        ),
+    )
+    
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False)
     
@@ -61,6 +99,8 @@ class WorkerProfile(Base):
     address_line_2 = Column(String(255), nullable=True)
     city = Column(String(100), nullable=True)
     postcode = Column(String(20), nullable=True)
+    latitude = Column(Float, nullable=True)  # Geocoded from postcode on update
+    longitude = Column(Float, nullable=True)
     
     # Qualifications (Step 2 - 30%)
     dbs_status = Column(Enum(DBSStatus), default=DBSStatus.NOT_CHECKED, nullable=False)
@@ -99,7 +139,7 @@ class WorkerProfile(Base):
     
     # Relationships
     user = relationship("User", back_populates="worker_profile")
-
+    
     def __repr__(self):
         return f"<WorkerProfile {self.first_name} {self.last_name}>"
     
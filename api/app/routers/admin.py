@@ -0,0 +1,153 @@
+"""
+Admin router - diagnostics for platform admins.
+
+Request profiles: an admin mints an X-Profile header value, sends it
+with the requests to profile, then fetches the collapsed stacks by the
+X-Profile-ID each response carries (see app/core/profiler.py).
+
+Memory: RSS, sessions, pools and ORM instances, and tracemalloc reports
+(see app/core/memory_diagnostics.py). Each worker process answers for
+itself; reports carry its pid.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.dependencies import get_current_admin
+from app.core.memory_diagnostics import memory_diagnostics
+from app.core.principal_cache import Principal
+from app.core.profiler import profile_store, profile_token
+
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_profiler():
+    """Shared by the sync and async routers."""
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiler is disabled")
+
+
+def build_profile_token() -> Dict[str, Any]:
+    require_profiler()
+    value = profile_token()
+    expires_at = int(value.split(".", 1)[0])
+    return {
+        "header": "X-Profile",
+        "value": value,
+        "expires_at": datetime.utcfromtimestamp(expires_at).isoformat(),
+    }
+
+
+def find_profile(profile_id: str) -> Dict[str, Any]:
+    """A stored profile, or 404 (reads files: call from a thread)."""
+    require_profiler()
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return profile
+
+
+def memory_report(report: Callable[..., Dict[str, Any]], **options) -> Dict[str, Any]:
+    """Run a memory report (blocking: call from a thread); 409 if tracing isn't set up for it."""
+    try:
+        return report(**options)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Stored profile summaries, newest first (reads files: call from a thread)."""
+    require_profiler()
+    return profile_store.list()
+
+
+@router.post("/profiles/token")
+def create_profile_token(_: Principal = Depends(get_current_admin)) -> Dict[str, Any]:
+    """
+    Mint an X-Profile header value (valid PROFILER_TOKEN_TTL_SECONDS).
+    Requests carrying it are profiled and answer with an X-Profile-ID.
+    """
+    return build_profile_token()
+
+
+@router.get("/profiles")
+def get_profiles(_: Principal = Depends(get_current_admin)) -> List[Dict[str, Any]]:
+    """
+    The newest profiles (route, status, latency, SQL time, samples).
+    """
+    return list_profiles()
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, _: Principal = Depends(get_current_admin)) -> Dict[str, Any]:
+    """
+    One profile: timings, SQL statements and collapsed stacks.
+    """
+    return find_profile(profile_id)
+
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+def get_profile_collapsed(profile_id: str, _: Principal = Depends(get_current_admin)):
+    """
+    Collapsed stacks only, for flamegraph.pl or speedscope.
+    """
+    return PlainTextResponse(find_profile(profile_id)["collapsed"])
+
+
+@router.get("/memory")
+def get_memory(_: Principal = Depends(get_current_admin)) -> Dict[str, Any]:
+    """
+    This worker's RSS, GC and tracemalloc status, live sessions with their
+    identity map sizes, pool stats and live ORM instances per model.
+    Scans the heap: expect tens of milliseconds on a large worker.
+    """
+    return memory_report(memory_diagnostics.summary)
+
+
+@router.post("/memory/snapshot")
+def take_memory_snapshot(_: Principal = Depends(get_current_admin)) -> Dict[str, Any]:
+    """
+    Start tracemalloc in this worker (if needed) and keep a baseline
+    snapshot for /admin/memory/diff.
+    """
+    return memory_report(memory_diagnostics.take_baseline)
+
+
+@router.delete("/memory/snapshot")
+def stop_memory_tracing(_: Principal = Depends(get_current_admin)) -> Dict[str, Any]:
+    """
+    Stop tracemalloc in this worker and drop its baseline.
+    """
+    return memory_report(memory_diagnostics.stop)
+
+
+@router.get("/memory/top")
+def get_memory_top(
+    limit: int = Query(20, ge=1, le=200),
+    group_by: Literal["module", "caller"] = "module",
+    depth: int = Query(3, ge=1, le=8),
+    _: Principal = Depends(get_current_admin),
+) -> Dict[str, Any]:
+    """
+    Largest traced allocations, grouped by the module that made them
+    ("module") or by the app code that caused them ("caller").
+    """
+    return memory_report(memory_diagnostics.top, limit=limit, group_by=group_by, depth=depth)
+
+
+@router.get("/memory/diff")
+def get_memory_diff(
+    limit: int = Query(20, ge=1, le=200),
+    group_by: Literal["module", "caller"] = "module",
+    depth: int = Query(3, ge=1, le=8),
+    _: Principal = Depends(get_current_admin),
+) -> Dict[str, Any]:
+    """
+    Growth since this worker's baseline snapshot, largest first.
+    """
+    return memory_report(memory_diagnostics.diff, limit=limit, group_by=group_by, depth=depth)
@@ -0,0 +1 @@
+# Async API Routers (DB_ASYNC mode)
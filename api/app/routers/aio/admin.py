@@ -0,0 +1,105 @@
+"""
+Admin router (async) - diagnostics for platform admins.
+"""
+
+from typing import Any, Dict, List, Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.core.async_dependencies import get_current_admin
+from app.core.memory_diagnostics import memory_diagnostics
+from app.core.principal_cache import Principal
+from app.routers.admin import build_profile_token, find_profile, list_profiles, memory_report
+
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.post("/profiles/token")
+async def create_profile_token(_: Principal = Depends(get_current_admin)) -> Dict[str, Any]:
+    """
+    Mint an X-Profile header value (valid PROFILER_TOKEN_TTL_SECONDS).
+    Requests carrying it are profiled and answer with an X-Profile-ID.
+    """
+    return build_profile_token()
+
+
+@router.get("/profiles")
+async def get_profiles(_: Principal = Depends(get_current_admin)) -> List[Dict[str, Any]]:
+    """
+    The newest profiles (route, status, latency, SQL time, samples).
+    """
+    return await run_in_threadpool(list_profiles)
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, _: Principal = Depends(get_current_admin)) -> Dict[str, Any]:
+    """
+    One profile: timings, SQL statements and collapsed stacks.
+    """
+    return await run_in_threadpool(find_profile, profile_id)
+
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+async def get_profile_collapsed(profile_id: str, _: Principal = Depends(get_current_admin)):
+    """
+    Collapsed stacks only, for flamegraph.pl or speedscope.
+    """
+    profile = await run_in_threadpool(find_profile, profile_id)
+    return PlainTextResponse(profile["collapsed"])
+
+
+@router.get("/memory")
+async def get_memory(_: Principal = Depends(get_current_admin)) -> Dict[str, Any]:
+    """
+    This worker's RSS, GC and tracemalloc status, live sessions with their
+    identity map sizes, pool stats and live ORM instances per model.
+    Scans the heap: expect tens of milliseconds on a large worker.
+    """
+    return await run_in_threadpool(memory_report, memory_diagnostics.summary)
+
+
+@router.post("/memory/snapshot")
+async def take_memory_snapshot(_: Principal = Depends(get_current_admin)) -> Dict[str, Any]:
+    """
+    Start tracemalloc in this worker (if needed) and keep a baseline
+    snapshot for /admin/memory/diff.
+    """
+    return await run_in_threadpool(memory_report, memory_diagnostics.take_baseline)
+
+
+@router.delete("/memory/snapshot")
+async def stop_memory_tracing(_: Principal = Depends(get_current_admin)) -> Dict[str, Any]:
+    """
+    Stop tracemalloc in this worker and drop its baseline.
+    """
+    return await run_in_threadpool(memory_report, memory_diagnostics.stop)
+
+
+@router.get("/memory/top")
+async def get_memory_top(
+    limit: int = Query(20, ge=1, le=200),
+    group_by: Literal["module", "caller"] = "module",
+    depth: int = Query(3, ge=1, le=8),
+    _: Principal = Depends(get_current_admin),
+) -> Dict[str, Any]:
+    """
+    Largest traced allocations, grouped by the module that made them
+    ("module") or by the app code that caused them ("caller").
+    """
+    return await run_in_threadpool(memory_report, memory_diagnostics.top, limit=limit, group_by=group_by, depth=depth)
+
+
+@router.get("/memory/diff")
+async def get_memory_diff(
+    limit: int = Query(20, ge=1, le=200),
+    group_by: Literal["module", "caller"] = "module",
+    depth: int = Query(3, ge=1, le=8),
+    _: Principal = Depends(get_current_admin),
+) -> Dict[str, Any]:
+    """
+    Growth since this worker's baseline snapshot, largest first.
+    """
+    return await run_in_threadpool(memory_report, memory_diagnostics.diff, limit=limit, group_by=group_by, depth=depth)
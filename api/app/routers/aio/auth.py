@@ -0,0 +1,407 @@
+"""
+Authentication router (async) - registration, login, verification, password reset.
+
+Same endpoints and responses as app.routers.auth, served from an
+AsyncSession. bcrypt runs on the password hashing executor, never on
+the event loop; emails are queued to the outbox in the same transaction.
+"""
+
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.core.async_dependencies import get_current_user
+from app.core.dependencies import profile_loaders
+from app.core.password_hashing import password_hasher
+from app.core.rate_limit import rate_limiter, get_client_ip
+from app.core.security import (
+    validate_password_strength,
+    create_access_token,
+    create_refresh_token,
+    create_email_verification_token,
+    create_password_reset_token,
+    verify_token,
+    TokenType,
+)
+from app.core.email import (
+    queue_verification_email,
+    queue_worker_welcome_email,
+    queue_care_home_welcome_email,
+    queue_password_reset_email,
+)
+from app.models.user import User, UserRole
+from app.models.worker_profile import WorkerProfile, ProfileCompletionStatus
+from app.models.care_home_profile import CareHomeProfile, VerificationStatus
+from app.routers.auth import build_current_user_response
+from app.schemas.auth import (
+    RegisterRequest,
+    RegisterResponse,
+    LoginRequest,
+    LoginResponse,
+    VerifyEmailRequest,
+    VerifyEmailResponse,
+    RefreshTokenRequest,
+    RefreshTokenResponse,
+    PasswordResetRequest,
+    PasswordResetConfirm,
+)
+from app.schemas.user import CurrentUserResponse
+
+
+router = APIRouter(prefix="/auth", tags=["authentication"])
+
+
+@router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
+async def register(request: RegisterRequest, client_ip: str = Depends(get_client_ip), db: AsyncSession = Depends(get_async_db)):
+    """
+    Register a new user (care worker or care home).
+    
+    Creates user account and associated profile.
+    Sends verification email.
+    """
+    # Throttle before any hashing, lookups or emails
+    await rate_limiter.ahit("register", ip=client_ip)
+    
+    # Validate password strength
+    is_valid, error_msg = validate_password_strength(request.password)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_msg,
+        )
+    
+    # Check if email already exists
+    existing_user = await db.scalar(select(User.id).where(User.email == request.email))
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+    
+    # Determine user role from user_type
+    if request.user_type == "worker":
+        role = UserRole.WORKER
+    elif request.user_type == "care_home":
+        role = UserRole.CARE_HOME_ADMIN
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid user type. Must be 'worker' or 'care_home'",
+        )
+    
+    # Create user
+    user = User(
+        email=request.email,
+        password_hash=await password_hasher.ahash(request.password),
+        role=role,
+        email_verified=False,
+    )
+    
+    db.add(user)
+    await db.flush()  # Get user.id
+    
+    # Create associated profile
+    if role == UserRole.WORKER:
+        profile = WorkerProfile(
+            user_id=user.id,
+            profile_completion_status=ProfileCompletionStatus.NOT_STARTED,
+            profile_completion_percentage=0,
+            current_step=1,
+        )
+        db.add(profile)
+    else:
+        profile = CareHomeProfile(
+            user_id=user.id,
+            verification_status=VerificationStatus.PENDING,
+            profile_completion_percentage="0",
+        )
+        db.add(profile)
+    
+    # Generate verification token
+    verification_token = create_email_verification_token(user.id, user.email)
+    user.email_verification_token = verification_token
+    user.email_verification_sent_at = datetime.utcnow()
+    
+    # Queue verification email (sent only if the registration commits)
+    queue_verification_email(db, user.email, verification_token)
+    
+    await db.commit()
+    
+    return RegisterResponse(
+        user_id=user.id,
+        email=user.email,
+        message="Verification email sent. Please check your inbox.",
+    )
+
+
+@router.post("/login", response_model=LoginResponse)
+async def login(request: LoginRequest, client_ip: str = Depends(get_client_ip), db: AsyncSession = Depends(get_async_db)):
+    """
+    Login user and return JWT tokens.
+    
+    Returns access token, refresh token, and user info for smart routing.
+    """
+    # Throttle before any hashing, lookups or emails
+    await rate_limiter.ahit("login", ip=client_ip, email=request.email)
+    
+    # Find user by email (with profile, for profile_complete)
+    result = await db.execute(select(User).options(*profile_loaders()).where(User.email == request.email))
+    user = result.unique().scalar_one_or_none()
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+        )
+    
+    # Verify password (and rehash it if the scheme or cost has changed)
+    is_valid, upgraded_hash = await password_hasher.averify_and_update(request.password, user.password_hash)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+        )
+    
+    # Check if account is active
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is inactive. Please contact support.",
+        )
+    
+    # Update last login (and the upgraded hash, in the same commit)
+    if upgraded_hash:
+        user.password_hash = upgraded_hash
+    user.last_login_at = datetime.utcnow()
+    await db.commit()
+    
+    # Create tokens
+    access_token = create_access_token(user.id, user.role.value)
+    refresh_token = create_refresh_token(user.id)
+    
+    # Determine profile completion for workers
+    profile_complete = None
+    if user.role == UserRole.WORKER:
+        if user.worker_profile:
+            profile_complete = user.worker_profile.is_complete
+        else:
+            profile_complete = False
+    
+    return LoginResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        user_id=user.id,
+        user_type=user.role.value,
+        email_verified=user.email_verified,
+        profile_complete=profile_complete,
+    )
+
+
+@router.post("/verify-email", response_model=VerifyEmailResponse)
+async def verify_email(request: VerifyEmailRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Verify user's email address using verification token.
+    
+    Returns smart redirect based on user role:
+    - Worker: /complete-profile (if not complete) or /dashboard/worker
+    - Care Home: /dashboard/care-home
+    """
+    # Verify token
+    payload = verify_token(request.token, TokenType.EMAIL_VERIFICATION)
+    
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired verification token",
+        )
+    
+    user_id = payload.get("sub")
+    email = payload.get("email")
+    
+    # Find user
+    result = await db.execute(
+        select(User).options(*profile_loaders()).where(User.id == user_id, User.email == email)
+    )
+    user = result.unique().scalar_one_or_none()
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    
+    if user.email_verified:
+        # Already verified, just return redirect
+        redirect_to = "/dashboard/worker" if user.is_worker else "/dashboard/care-home"
+        return VerifyEmailResponse(
+            success=True,
+            message="Email already verified",
+            redirect_to=redirect_to,
+        )
+    
+    # Mark email as verified
+    user.email_verified = True
+    user.email_verification_token = None
+    
+    # Queue welcome email based on role
+    if user.role == UserRole.WORKER:
+        first_name = user.worker_profile.first_name if user.worker_profile and user.worker_profile.first_name else None
+        queue_worker_welcome_email(db, user.email, first_name or "there")
+        redirect_to = "/complete-profile"
+    else:
+        contact_name = user.care_home_profile.contact_name if user.care_home_profile and user.care_home_profile.contact_name else "there"
+        queue_care_home_welcome_email(db, user.email, contact_name)
+        redirect_to = "/dashboard/care-home"
+    
+    await db.commit()
+    
+    return VerifyEmailResponse(
+        success=True,
+        message="Email verified successfully!",
+        redirect_to=redirect_to,
+    )
+
+
+@router.post("/refresh", response_model=RefreshTokenResponse)
+async def refresh_access_token(request: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get a new access token using refresh token.
+    """
+    # Verify refresh token
+    payload = verify_token(request.refresh_token, TokenType.REFRESH)
+    
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+        )
+    
+    user_id = payload.get("sub")
+    
+    # Find user
+    user = await db.scalar(select(User).where(User.id == user_id))
+    
+    if not user or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found or inactive",
+        )
+    
+    # Create new access token
+    access_token = create_access_token(user.id, user.role.value)
+    
+    return RefreshTokenResponse(access_token=access_token)
+
+
+@router.get("/me", response_model=CurrentUserResponse)
+async def get_current_user_info(current_user: User = Depends(get_current_user)):
+    """
+    Get current authenticated user's information.
+    
+    Includes profile data and completion status for smart routing.
+    """
+    return build_current_user_response(current_user)
+
+
+@router.post("/password-reset-request")
+async def request_password_reset(request: PasswordResetRequest, client_ip: str = Depends(get_client_ip), db: AsyncSession = Depends(get_async_db)):
+    """
+    Request a password reset email.
+    
+    Always returns success (don't leak if email exists).
+    """
+    # Throttle before any lookups or emails
+    await rate_limiter.ahit("password_reset_request", ip=client_ip, email=request.email)
+    
+    user = await db.scalar(select(User).where(User.email == request.email))
+    
+    if user and user.is_active:
+        # Generate reset token
+        reset_token = create_password_reset_token(user.id, user.email)
+        user.password_reset_token = reset_token
+        user.password_reset_sent_at = datetime.utcnow()
+        
+        # Queue reset email
+        queue_password_reset_email(db, user.email, reset_token)
+        await db.commit()
+    
+    # Always return success to prevent email enumeration
+    return {
+        "message": "If that email exists, a password reset link has been sent"
+    }
+
+
+@router.post("/password-reset-confirm")
+async def confirm_password_reset(request: PasswordResetConfirm, db: AsyncSession = Depends(get_async_db)):
+    """
+    Confirm password reset with token and set new password.
+    """
+    # Validate new password strength
+    is_valid, error_msg = validate_password_strength(request.new_password)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_msg,
+        )
+    
+    # Verify reset token
+    payload = verify_token(request.token, TokenType.PASSWORD_RESET)
+    
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired reset token",
+        )
+    
+    user_id = payload.get("sub")
+    
+    # Find user
+    user = await db.scalar(select(User).where(User.id == user_id))
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    
+    # Update password
+    user.password_hash = await password_hasher.ahash(request.new_password)
+    user.password_reset_token = None
+    user.password_reset_sent_at = None
+    await db.commit()
+    
+    return {"message": "Password reset successful. You can now login with your new password."}
+
+
+@router.post("/resend-verification")
+async def resend_verification_email(email: str, client_ip: str = Depends(get_client_ip), db: AsyncSession = Depends(get_async_db)):
+    """
+    Resend verification email.
+    """
+    # Throttle before any lookups or emails
+    await rate_limiter.ahit("resend_verification", ip=client_ip, email=email)
+    
+    user = await db.scalar(select(User).where(User.email == email))
+    
+    if not user:
+        # Don't leak if email exists
+        return {"message": "If that email exists and is not verified, a new verification email has been sent"}
+    
+    if user.email_verified:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already verified",
+        )
+    
+    # Generate new token
+    verification_token = create_email_verification_token(user.id, user.email)
+    user.email_verification_token = verification_token
+    user.email_verification_sent_at = datetime.utcnow()
+    
+    # Queue email
+    queue_verification_email(db, user.email, verification_token)
+    await db.commit()
+    
+    return {"message": "Verification email sent"}
@@ -0,0 +1,141 @@
+"""
+Care home router (async) - profile management, worker search and matching.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import get_async_db
+from app.core.async_dependencies import get_current_care_home
+from app.core.geocoding import geocode_profile
+from app.core.pagination import decode_cursor
+from app.core.principal_cache import Principal
+from app.core.worker_index import worker_index
+from app.models.care_home_profile import CareHomeProfile
+from app.routers.care_home import (
+    build_indexed_search_response,
+    build_worker_match_response,
+    build_worker_search_response,
+    care_home_match_criteria,
+    worker_match_criteria,
+    worker_profiles_query,
+    worker_search_filters,
+    worker_search_query,
+)
+from app.schemas.care_home import CareHomeProfileUpdate, CareHomeProfileResponse
+from app.schemas.worker import WorkerMatchCriteria, WorkerMatchResponse, WorkerSearchFilters, WorkerSearchResponse
+
+
+router = APIRouter(prefix="/care-home", tags=["care-home-profile"])
+
+
+@router.get("/profile", response_model=CareHomeProfileResponse)
+async def get_care_home_profile(
+    current_user: Principal = Depends(get_current_care_home),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get current care home's profile.
+    """
+    profile = await db.scalar(select(CareHomeProfile).where(CareHomeProfile.user_id == current_user.id))
+    
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Care home profile not found",
+        )
+    
+    return profile
+
+
+@router.put("/profile", response_model=CareHomeProfileResponse)
+async def update_care_home_profile(
+    update_data: CareHomeProfileUpdate,
+    current_user: Principal = Depends(get_current_care_home),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update care home profile.
+    
+    Automatically recalculates completion percentage.
+    """
+    profile = await db.scalar(select(CareHomeProfile).where(CareHomeProfile.user_id == current_user.id))
+    
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Care home profile not found",
+        )
+    
+    # Update fields that were provided
+    update_dict = update_data.model_dump(exclude_unset=True)
+    
+    for field, value in update_dict.items():
+        if hasattr(profile, field):
+            setattr(profile, field, value)
+    
+    # Coordinates follow the postcode (for travel radius matching)
+    if "postcode" in update_dict:
+        geocode_profile(profile)
+    
+    # Recalculate completion percentage
+    profile.profile_completion_percentage = str(profile.calculate_completion_percentage())
+    
+    await db.commit()  # The flushed UPDATE wrote every column: no refresh
+    
+    return profile
+
+
+@router.get("/workers/search", response_model=WorkerSearchResponse)
+async def search_workers(
+    filters: WorkerSearchFilters = Depends(worker_search_filters),
+    current_user: Principal = Depends(get_current_care_home),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Search complete worker profiles.
+    
+    Filters combine with AND; results are newest first. Pass next_cursor
+    back as `cursor` for the next page (null on the last page).
+    
+    Answered by the in-memory worker index when it is enabled and built
+    (only the page is loaded from the database), otherwise by SQL.
+    """
+    if worker_index.ready:
+        after = decode_cursor(filters.cursor) if filters.cursor else None
+        # Milliseconds of NumPy work on large result sets: off the event loop
+        ids, next_key = await run_in_threadpool(worker_index.search, filters, filters.limit, after)
+        profiles = (await db.scalars(worker_profiles_query(ids))).all() if ids else []
+        return build_indexed_search_response(ids, next_key, profiles)
+    
+    profiles = (await db.scalars(worker_search_query(filters))).all()
+    return build_worker_search_response(profiles, filters.limit)
+
+
+@router.get("/workers/matches", response_model=WorkerMatchResponse)
+async def match_workers(
+    criteria: WorkerMatchCriteria = Depends(worker_match_criteria),
+    current_user: Principal = Depends(get_current_care_home),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Workers ranked by how well they fit this care home.
+    
+    Scores (0-100) combine the required qualifications, distance against
+    each worker's travel radius (from the care home's postcode), requested
+    days and shifts, the offered rate, experience and the care home type.
+    Workers beyond their travel radius are left out.
+    
+    Scored by the in-memory worker index (WORKER_INDEX_ENABLED); 503
+    until it is built.
+    """
+    profile = await db.scalar(select(CareHomeProfile).where(CareHomeProfile.user_id == current_user.id))
+    criteria = care_home_match_criteria(criteria, profile)
+    
+    # Scores every worker: off the event loop
+    matches = await run_in_threadpool(worker_index.match, criteria, criteria.limit)
+    ids = [id for id, _, _ in matches]
+    profiles = (await db.scalars(worker_profiles_query(ids))).all() if ids else []
+    return build_worker_match_response(matches, profiles)
@@ -0,0 +1,60 @@
+"""
+Public API endpoints (async) - No authentication required
+Used for landing page stats, public information, etc.
+"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Dict, Any
+
+from app.core.cache import public_stats_cache
+from app.core.database import get_async_db
+from app.models.platform_counter import read_counters, stats_counter_names
+from app.routers.public import (
+    build_public_stats,
+    build_qualifications_response,
+    qualification_worker_counts_query,
+)
+
+router = APIRouter(prefix="/public", tags=["public"])
+
+
+async def compute_public_stats(db: AsyncSession) -> Dict[str, Any]:
+    """
+    Compute landing page statistics from the platform counters.
+    Single indexed read, independent of table sizes.
+    """
+    return build_public_stats(await db.run_sync(read_counters, stats_counter_names()))
+
+
+@router.get("/stats")
+async def get_public_stats(db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
+    """
+    Get public statistics for landing page.
+    
+    Cached in Redis (PUBLIC_STATS_CACHE_TTL_SECONDS, default 5 minutes).
+    After expiry one worker recomputes while others serve the stale value.
+    """
+    return await public_stats_cache.aget(lambda: compute_public_stats(db))
+
+
+@router.get("/qualifications")
+async def get_qualifications(db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
+    """
+    Get all active qualifications with worker counts.
+    Used for landing page qualifications showcase.
+    """
+    result = await db.execute(qualification_worker_counts_query())
+    return build_qualifications_response(result.all())
+
+
+@router.get("/health")
+async def public_health_check():
+    """
+    Public health check endpoint
+    """
+    return {
+        "status": "healthy",
+        "service": "public_api",
+        "timestamp": datetime.utcnow().isoformat()
+    }
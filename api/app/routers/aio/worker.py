@@ -0,0 +1,75 @@
+"""
+Worker profile router (async) - profile completion and management.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.core.async_dependencies import get_current_worker
+from app.core.geocoding import geocode_profile
+from app.core.principal_cache import Principal
+from app.models.worker_profile import WorkerProfile
+from app.schemas.worker import WorkerProfileUpdate, WorkerProfileResponse
+
+
+router = APIRouter(prefix="/worker", tags=["worker-profile"])
+
+
+@router.get("/profile", response_model=WorkerProfileResponse)
+async def get_worker_profile(
+    current_user: Principal = Depends(get_current_worker),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get current worker's profile.
+    """
+    profile = await db.scalar(select(WorkerProfile).where(WorkerProfile.user_id == current_user.id))
+    
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Worker profile not found",
+        )
+    
+    return profile
+
+
+@router.put("/profile", response_model=WorkerProfileResponse)
+async def update_worker_profile(
+    update_data: WorkerProfileUpdate,
+    current_user: Principal = Depends(get_current_worker),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update worker profile.
+    
+    Can update any fields. Automatically recalculates completion percentage.
+    Used for profile wizard (step-by-step) and profile editing.
+    """
+    profile = await db.scalar(select(WorkerProfile).where(WorkerProfile.user_id == current_user.id))
+    
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Worker profile not found",
+        )
+    
+    # Update fields that were provided
+    update_dict = update_data.model_dump(exclude_unset=True)
+    
+    for field, value in update_dict.items():
+        if hasattr(profile, field):
+            setattr(profile, field, value)
+    
+    # Coordinates follow the postcode (for travel radius matching)
+    if "postcode" in update_dict:
+        geocode_profile(profile)
+    
+    # Recalculate completion
+    profile.update_completion_status()
+    
+    await db.commit()  # The flushed UPDATE wrote every column: no refresh
+    
+    return profile
@@ -5,13 +5,14 @@ Authentication router - registration, login, verification, password reset.
 from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, profile_loaders
+from app.core.password_hashing import password_hasher
+from app.core.rate_limit import rate_limiter, get_client_ip
 from app.core.security import (
-    hash_password,
-    verify_password,
     validate_password_strength,
     create_access_token,
     create_refresh_token,
@@ -21,10 +22,10 @@ from app.core.security import (
     TokenType,
 )
 from app.core.email import (
-    send_verification_email,
-    send_worker_welcome_email,
-    send_care_home_welcome_email,
-    send_password_reset_email,
+    queue_verification_email,
+    queue_worker_welcome_email,
+    queue_care_home_welcome_email,
+    queue_password_reset_email,
 )
 from app.models.user import User, UserRole
 from app.models.worker_profile import WorkerProfile, ProfileCompletionStatus
@@ -48,13 +49,16 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
 @router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
-def register(request: RegisterRequest, db: Session = Depends(get_db)):
+def register(request: RegisterRequest, client_ip: str = Depends(get_client_ip), db: Session = Depends(get_db)):
     """
     Register a new user (care worker or care home).
     
     Creates user account and associated profile.
     Sends verification email.
     """
+    # Throttle before any hashing, lookups or emails
+    rate_limiter.hit("register", ip=client_ip)
+    
     # Validate password strength
     is_valid, error_msg = validate_password_strength(request.password)
     if not is_valid:
@@ -85,7 +89,7 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
     # Create user
     user = User(
         email=request.email,
-        password_hash=hash_password(request.password),
+        password_hash=password_hasher.hash(request.password),
         role=role,
         email_verified=False,
     )
@@ -115,10 +119,10 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
     user.email_verification_token = verification_token
     user.email_verification_sent_at = datetime.utcnow()
     
-    db.commit()
+    # Queue verification email (sent only if the registration commits)
+    queue_verification_email(db, user.email, verification_token)
     
-    # Send verification email
-    send_verification_email(user.email, verification_token)
+    db.commit()
     
     return RegisterResponse(
         user_id=user.id,
@@ -128,14 +132,18 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+def login(request: LoginRequest, client_ip: str = Depends(get_client_ip), db: Session = Depends(get_db)):
     """
     Login user and return JWT tokens.
     
     Returns access token, refresh token, and user info for smart routing.
     """
-    # Find user by email
-    user = db.query(User).filter(User.email == request.email).first()
+    # Throttle before any hashing, lookups or emails
+    rate_limiter.hit("login", ip=client_ip, email=request.email)
+    
+    # Find user by email (with profile, for profile_complete)
+    query = select(User).options(*profile_loaders()).where(User.email == request.email)
+    user = db.execute(query).unique().scalar_one_or_none()
     
     if not user:
         raise HTTPException(
@@ -143,8 +151,9 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
             detail="Incorrect email or password",
         )
     
-    # Verify password
-    if not verify_password(request.password, user.password_hash):
+    # Verify password (and rehash it if the scheme or cost has changed)
+    is_valid, upgraded_hash = password_hasher.verify_and_update(request.password, user.password_hash)
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -157,7 +166,9 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
             detail="Account is inactive. Please contact support.",
         )
     
-    # Update last login
+    # Update last login (and the upgraded hash, in the same commit)
+    if upgraded_hash:
+        user.password_hash = upgraded_hash
     user.last_login_at = datetime.utcnow()
     db.commit()
     
@@ -204,8 +215,9 @@ def verify_email(request: VerifyEmailRequest, db: Session = Depends(get_db)):
     user_id = payload.get("sub")
     email = payload.get("email")
     
-    # Find user
-    user = db.query(User).filter(User.id == user_id, User.email == email).first()
+    # Find user (with profile, for the welcome email)
+    query = select(User).options(*profile_loaders()).where(User.id == user_id, User.email == email)
+    user = db.execute(query).unique().scalar_one_or_none()
     
     if not user:
         raise HTTPException(
@@ -225,18 +237,19 @@ def verify_email(request: VerifyEmailRequest, db: Session = Depends(get_db)):
     # Mark email as verified
     user.email_verified = True
     user.email_verification_token = None
-    db.commit()
     
-    # Send welcome email based on role
+    # Queue welcome email based on role
     if user.role == UserRole.WORKER:
         first_name = user.worker_profile.first_name if user.worker_profile and user.worker_profile.first_name else None
-        send_worker_welcome_email(user.email, first_name or "there")
+        queue_worker_welcome_email(db, user.email, first_name or "there")
         redirect_to = "/complete-profile"
     else:
         contact_name = user.care_home_profile.contact_name if user.care_home_profile and user.care_home_profile.contact_name else "there"
-        send_care_home_welcome_email(user.email, contact_name)
+        queue_care_home_welcome_email(db, user.email, contact_name)
         redirect_to = "/dashboard/care-home"
     
+    db.commit()
+    
     return VerifyEmailResponse(
         success=True,
         message="Email verified successfully!",
@@ -275,17 +288,11 @@ def refresh_access_token(request: RefreshTokenRequest, db: Session = Depends(get
     return RefreshTokenResponse(access_token=access_token)
 
 
-@router.get("/me", response_model=CurrentUserResponse)
-def get_current_user_info(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def build_current_user_response(current_user: User) -> CurrentUserResponse:
     """
-    Get current authenticated user's information.
-    
-    Includes profile data and completion status for smart routing.
+    Build the /auth/me payload from a user and its loaded profile.
+    Shared by the sync and async routers.
     """
-    # Build response
     response_data = {
         "id": current_user.id,
         "email": current_user.email,
@@ -321,13 +328,29 @@ def get_current_user_info(
     return CurrentUserResponse(**response_data)
 
 
+@router.get("/me", response_model=CurrentUserResponse)
+def get_current_user_info(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get current authenticated user's information.
+    
+    Includes profile data and completion status for smart routing.
+    """
+    return build_current_user_response(current_user)
+
+
 @router.post("/password-reset-request")
-def request_password_reset(request: PasswordResetRequest, db: Session = Depends(get_db)):
+def request_password_reset(request: PasswordResetRequest, client_ip: str = Depends(get_client_ip), db: Session = Depends(get_db)):
     """
     Request a password reset email.
     
     Always returns success (don't leak if email exists).
     """
+    # Throttle before any lookups or emails
+    rate_limiter.hit("password_reset_request", ip=client_ip, email=request.email)
+    
     user = db.query(User).filter(User.email == request.email).first()
     
     if user and user.is_active:
@@ -335,10 +358,10 @@ def request_password_reset(request: PasswordResetRequest, db: Session = Depends(
         reset_token = create_password_reset_token(user.id, user.email)
         user.password_reset_token = reset_token
         user.password_reset_sent_at = datetime.utcnow()
-        db.commit()
         
-        # Send reset email
-        send_password_reset_email(user.email, reset_token)
+        # Queue reset email
+        queue_password_reset_email(db, user.email, reset_token)
+        db.commit()
     
     # Always return success to prevent email enumeration
     return {
@@ -380,7 +403,7 @@ def confirm_password_reset(request: PasswordResetConfirm, db: Session = Depends(
         )
     
     # Update password
-    user.password_hash = hash_password(request.new_password)
+    user.password_hash = password_hasher.hash(request.new_password)
     user.password_reset_token = None
     user.password_reset_sent_at = None
     db.commit()
@@ -389,10 +412,13 @@ def confirm_password_reset(request: PasswordResetConfirm, db: Session = Depends(
 
 
 @router.post("/resend-verification")
-def resend_verification_email(email: str, db: Session = Depends(get_db)):
+def resend_verification_email(email: str, client_ip: str = Depends(get_client_ip), db: Session = Depends(get_db)):
     """
     Resend verification email.
     """
+    # Throttle before any lookups or emails
+    rate_limiter.hit("resend_verification", ip=client_ip, email=email)
+    
     user = db.query(User).filter(User.email == email).first()
     
     if not user:
@@ -409,9 +435,9 @@ def resend_verification_email(email: str, db: Session = Depends(get_db)):
     verification_token = create_email_verification_token(user.id, user.email)
     user.email_verification_token = verification_token
     user.email_verification_sent_at = datetime.utcnow()
-    db.commit()
     
-    # Send email
-    send_verification_email(user.email, verification_token)
+    # Queue email
+    queue_verification_email(db, user.email, verification_token)
+    db.commit()
     
     return {"message": "Verification email sent"}
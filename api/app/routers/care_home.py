@@ -1,15 +1,27 @@
 """
-Care home profile router - profile management.
+Care home router - profile management, worker search and matching.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, select, text, tuple_
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_care_home
-from app.models.user import User
+from app.core.geocoding import geocode_profile
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.principal_cache import Principal
+from app.core.worker_index import worker_index
 from app.models.care_home_profile import CareHomeProfile
+from app.models.user import User
+from app.models.worker_profile import COMPLETE_PROFILE, DBSStatus, WorkerProfile
 from app.schemas.care_home import CareHomeProfileUpdate, CareHomeProfileResponse
+from app.schemas.worker import (
+    WorkerMatchCriteria, WorkerMatchResponse, WorkerMatchResult, WorkerSearchFilters, WorkerSearchResponse, WorkerSearchResult,
+)
 
 
 router = APIRouter(prefix="/care-home", tags=["care-home-profile"])
@@ -17,25 +29,27 @@ router = APIRouter(prefix="/care-home", tags=["care-home-profile"])
 
 @router.get("/profile", response_model=CareHomeProfileResponse)
 def get_care_home_profile(
-    current_user: User = Depends(get_current_care_home),
+    current_user: Principal = Depends(get_current_care_home),
     db: Session = Depends(get_db)
 ):
     """
     Get current care home's profile.
     """
-    if not current_user.care_home_profile:
+    profile = db.query(CareHomeProfile).filter(CareHomeProfile.user_id == current_user.id).first()
+    
+    if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Care home profile not found",
         )
     
-    return current_user.care_home_profile
+    return profile
 
 
 @router.put("/profile", response_model=CareHomeProfileResponse)
 def update_care_home_profile(
     update_data: CareHomeProfileUpdate,
-    current_user: User = Depends(get_current_care_home),
+    current_user: Principal = Depends(get_current_care_home),
     db: Session = Depends(get_db)
 ):
     """
@@ -43,7 +57,7 @@ def update_care_home_profile(
     
     Automatically recalculates completion percentage.
     """
-    profile = current_user.care_home_profile
+    profile = db.query(CareHomeProfile).filter(CareHomeProfile.user_id == current_user.id).first()
     
     if not profile:
         raise HTTPException(
@@ -58,10 +72,229 @@ def update_care_home_profile(
         if hasattr(profile, field):
             setattr(profile, field, value)
     
+    # Coordinates follow the postcode (for travel radius matching)
+    if "postcode" in update_dict:
+        geocode_profile(profile)
+    
     # Recalculate completion percentage
     profile.profile_completion_percentage = str(profile.calculate_completion_percentage())
     
-    db.commit()
-    db.refresh(profile)
+    db.commit()  # The flushed UPDATE wrote every column: no refresh
     
     return profile
+
+
+def worker_search_filters(
+    dbs_status: Optional[List[DBSStatus]] = Query(None, description="Any of these DBS statuses"),
+    qualifications: Optional[List[str]] = Query(None, description="Holds all of these qualification codes"),
+    specializations: Optional[List[str]] = Query(None),
+    languages: Optional[List[str]] = Query(None),
+    available_days: Optional[List[str]] = Query(None),
+    shift_types: Optional[List[str]] = Query(None),
+    hourly_rate_min: Optional[int] = Query(None, ge=0, description="Budget in pence"),
+    hourly_rate_max: Optional[int] = Query(None, ge=0, description="Budget in pence"),
+    city: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+) -> WorkerSearchFilters:
+    """Worker search query parameters (list filters repeat: ?languages=en&languages=pl)."""
+    return WorkerSearchFilters(
+        dbs_status=[s.value for s in dbs_status] if dbs_status else None,
+        qualifications=qualifications,
+        specializations=specializations,
+        languages=languages,
+        available_days=available_days,
+        shift_types=shift_types,
+        hourly_rate_min=hourly_rate_min,
+        hourly_rate_max=hourly_rate_max,
+        city=city,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+def worker_search_query(filters: WorkerSearchFilters):
+    """
+    One page of complete worker profiles matching the filters.
+    
+    Newest profiles first, ordered by (updated_at, id) and paginated by
+    keyset: the cursor is the key of the previous page's last row, so every
+    page is a short index range scan however deep the client goes. One
+    extra row is fetched to tell whether there is a next page.
+    
+    Every filter has an index (see WorkerProfile.__table_args__):
+    - the partial btree on (updated_at, id) serves the ordering, the cursor
+      and the low-selectivity filters (DBS status, rate) as it is walked
+    - city uses the (lower(city), updated_at, id) btree
+    - array filters are containment (@>, all of the given values) on the
+      multi-column GIN; qualification codes use the qualifications GIN
+    
+    Rates overlap the worker's own range: a worker asking £12-£15/h matches
+    a £10-£13/h budget. Workers without a stated rate don't match a rate
+    filter.
+    """
+    query = (
+        select(WorkerProfile)
+        .join(User, User.id == WorkerProfile.user_id)
+        .where(text(COMPLETE_PROFILE), User.is_active == True)
+    )
+    
+    if filters.dbs_status:
+        query = query.where(WorkerProfile.dbs_status.in_([DBSStatus(s) for s in filters.dbs_status]))
+    if filters.qualifications:
+        query = query.where(WorkerProfile.qualifications.contains([{"code": code} for code in filters.qualifications]))
+    for column in ("specializations", "languages", "available_days", "shift_types"):
+        values = getattr(filters, column)
+        if values:
+            query = query.where(getattr(WorkerProfile, column).contains(values))
+    if filters.hourly_rate_max is not None:
+        query = query.where(WorkerProfile.hourly_rate_min <= filters.hourly_rate_max)
+    if filters.hourly_rate_min is not None:
+        query = query.where(WorkerProfile.hourly_rate_max >= filters.hourly_rate_min)
+    if filters.city:
+        query = query.where(func.lower(WorkerProfile.city) == filters.city.lower())
+    
+    if filters.cursor:
+        updated_at, id = decode_cursor(filters.cursor)
+        query = query.where(tuple_(WorkerProfile.updated_at, WorkerProfile.id) < tuple_(updated_at, id))
+    
+    return (
+        query
+        .order_by(WorkerProfile.updated_at.desc(), WorkerProfile.id.desc())
+        .limit(filters.limit + 1)
+    )
+
+
+def worker_profiles_query(ids: List[UUID]):
+    """Complete profiles with these IDs (a page found by the worker index)."""
+    return (
+        select(WorkerProfile)
+        .join(User, User.id == WorkerProfile.user_id)
+        .where(WorkerProfile.id.in_(ids), text(COMPLETE_PROFILE), User.is_active == True)
+    )
+
+
+def build_indexed_search_response(ids: List[UUID], next_key, profiles: List[WorkerProfile]) -> WorkerSearchResponse:
+    """
+    Page of results found by the worker index, in its order. Profiles
+    changed since the index last saw them (no longer complete or active)
+    are left out. Shared by the sync and async routers.
+    """
+    by_id = {profile.id: profile for profile in profiles}
+    return WorkerSearchResponse(
+        results=[by_id[id] for id in ids if id in by_id],
+        next_cursor=encode_cursor(*next_key) if next_key else None,
+    )
+
+
+def build_worker_search_response(profiles: List[WorkerProfile], limit: int) -> WorkerSearchResponse:
+    """Page of results from worker_search_query() rows. Shared by the sync and async routers."""
+    next_cursor = None
+    if len(profiles) > limit:
+        profiles = profiles[:limit]
+        next_cursor = encode_cursor(profiles[-1].updated_at, profiles[-1].id)
+    
+    return WorkerSearchResponse(results=profiles, next_cursor=next_cursor)
+
+
+@router.get("/workers/search", response_model=WorkerSearchResponse)
+def search_workers(
+    filters: WorkerSearchFilters = Depends(worker_search_filters),
+    current_user: Principal = Depends(get_current_care_home),
+    db: Session = Depends(get_db)
+):
+    """
+    Search complete worker profiles.
+    
+    Filters combine with AND; results are newest first. Pass next_cursor
+    back as `cursor` for the next page (null on the last page).
+    
+    Answered by the in-memory worker index when it is enabled and built
+    (only the page is loaded from the database), otherwise by SQL.
+    """
+    if worker_index.ready:
+        after = decode_cursor(filters.cursor) if filters.cursor else None
+        ids, next_key = worker_index.search(filters, filters.limit, after)
+        profiles = db.scalars(worker_profiles_query(ids)).all() if ids else []
+        return build_indexed_search_response(ids, next_key, profiles)
+    
+    profiles = db.scalars(worker_search_query(filters)).all()
+    return build_worker_search_response(profiles, filters.limit)
+
+
+def worker_match_criteria(
+    qualifications: Optional[List[str]] = Query(None, description="Required qualification codes"),
+    available_days: Optional[List[str]] = Query(None),
+    shift_types: Optional[List[str]] = Query(None),
+    hourly_rate: Optional[int] = Query(None, ge=0, description="Offered rate in pence"),
+    limit: int = Query(20, ge=1, le=100),
+) -> WorkerMatchCriteria:
+    """Worker match query parameters; the care home's own details are added from its profile."""
+    return WorkerMatchCriteria(
+        qualifications=qualifications,
+        available_days=available_days,
+        shift_types=shift_types,
+        hourly_rate=hourly_rate,
+        limit=limit,
+    )
+
+
+def care_home_match_criteria(criteria: WorkerMatchCriteria, profile: Optional[CareHomeProfile]) -> WorkerMatchCriteria:
+    """
+    Complete match criteria with the care home's type and location.
+    Raises 503 while the worker index is not built, 404 without a profile.
+    """
+    if not worker_index.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Worker matching is not available yet",
+        )
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Care home profile not found",
+        )
+    return criteria.model_copy(update={
+        "care_home_type": profile.care_home_type.value if profile.care_home_type else None,
+        "latitude": profile.latitude,
+        "longitude": profile.longitude,
+    })
+
+
+def build_worker_match_response(matches, profiles: List[WorkerProfile]) -> WorkerMatchResponse:
+    """Matches from the worker index, best first, with their profiles. Shared by the sync and async routers."""
+    by_id = {profile.id: profile for profile in profiles}
+    return WorkerMatchResponse(results=[
+        WorkerMatchResult(
+            **WorkerSearchResult.model_validate(by_id[id]).model_dump(),
+            score=score,
+            distance_miles=miles,
+        )
+        for id, score, miles in matches if id in by_id
+    ])
+
+
+@router.get("/workers/matches", response_model=WorkerMatchResponse)
+def match_workers(
+    criteria: WorkerMatchCriteria = Depends(worker_match_criteria),
+    current_user: Principal = Depends(get_current_care_home),
+    db: Session = Depends(get_db)
+):
+    """
+    Workers ranked by how well they fit this care home.
+    
+    Scores (0-100) combine the required qualifications, distance against
+    each worker's travel radius (from the care home's postcode), requested
+    days and shifts, the offered rate, experience and the care home type.
+    Workers beyond their travel radius are left out.
+    
+    Scored by the in-memory worker index (WORKER_INDEX_ENABLED); 503
+    until it is built.
+    """
+    profile = db.query(CareHomeProfile).filter(CareHomeProfile.user_id == current_user.id).first()
+    criteria = care_home_match_criteria(criteria, profile)
+    
+    matches = worker_index.match(criteria, criteria.limit)
+    ids = [id for id, _, _ in matches]
+    profiles = db.scalars(worker_profiles_query(ids)).all() if ids else []
+    return build_worker_match_response(matches, profiles)
@@ -4,60 +4,38 @@ Used for landing page stats, public information, etc.
 """
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timedelta
+from sqlalchemy import func, select, true
+from datetime import datetime
 from typing import Dict, Any
 
+from app.core.cache import public_stats_cache
 from app.core.database import get_db
-from app.models.user import User, UserRole
 from app.models.worker_profile import WorkerProfile
-from app.models.care_home_profile import CareHomeProfile
 from app.models.qualification import Qualification
+from app.models.platform_counter import CounterName, read_counters, stats_counter_names
 
 router = APIRouter(prefix="/public", tags=["public"])
 
 
-@router.get("/stats")
-async def get_public_stats(db: Session = Depends(get_db)) -> Dict[str, Any]:
+def build_public_stats(counters: Dict[str, int]) -> Dict[str, Any]:
     """
-    Get public statistics for landing page.
-    Returns real-time counts from database.
-    Cached for 5 minutes to reduce load.
+    Build the /public/stats payload from platform counters.
+    Shared by the sync and async routers.
     """
+    worker_count = counters[CounterName.WORKERS]
+    care_home_count = counters[CounterName.CARE_HOMES]
+    completed_profiles = counters[CounterName.COMPLETED_PROFILES]
+    verified_care_homes = counters[CounterName.VERIFIED_CARE_HOMES]
     
-    # Count active workers (registered users with worker role)
-    worker_count = db.query(User).filter(
-        User.role == UserRole.WORKER,
-        User.is_active == True
-    ).count()
-    
-    # Count care homes (registered users with care_home_admin role)
-    care_home_count = db.query(User).filter(
-        User.role == UserRole.CARE_HOME_ADMIN,
-        User.is_active == True
-    ).count()
-    
-    # Count completed worker profiles (profile completion = 100%)
-    completed_profiles = db.query(WorkerProfile).filter(
-        WorkerProfile.profile_completion_percentage == 100
-    ).count()
-    
-    # Count verified care homes
-    verified_care_homes = db.query(CareHomeProfile).filter(
-        CareHomeProfile.verification_status == "verified"
-    ).count()
+    # Average worker profile completion
+    profile_count = counters[CounterName.WORKER_PROFILES]
+    avg_completion = counters[CounterName.WORKER_COMPLETION_SUM] / profile_count if profile_count else 0
     
-    # Calculate average worker profile completion
-    avg_completion = db.query(
-        func.avg(WorkerProfile.profile_completion_percentage)
-    ).scalar() or 0
-    
-    # Get recent user registrations (last 7 days)
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    recent_workers = db.query(User).filter(
-        User.role == UserRole.WORKER,
-        User.created_at >= week_ago
-    ).count()
+    # Worker registrations over the last 7 daily buckets
+    recent_workers = sum(
+        value for name, value in counters.items()
+        if name.startswith(CounterName.WORKER_SIGNUPS_PREFIX)
+    )
     
     return {
         "total_workers": worker_count,
@@ -78,27 +56,70 @@ async def get_public_stats(db: Session = Depends(get_db)) -> Dict[str, Any]:
     }
 
 
-@router.get("/qualifications")
-async def get_qualifications(db: Session = Depends(get_db)) -> Dict[str, Any]:
+def compute_public_stats(db: Session) -> Dict[str, Any]:
     """
-    Get all active qualifications with worker counts.
-    Used for landing page qualifications showcase.
+    Compute landing page statistics from the platform counters.
+    Single indexed read, independent of table sizes.
     """
+    return build_public_stats(read_counters(db, stats_counter_names()))
+
+
+@router.get("/stats")
+def get_public_stats(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Get public statistics for landing page.
     
-    # Get all active qualifications, ordered by display_order
-    qualifications = db.query(Qualification).filter(
-        Qualification.is_active == True
-    ).order_by(Qualification.display_order).all()
+    Cached in Redis (PUBLIC_STATS_CACHE_TTL_SECONDS, default 5 minutes).
+    After expiry one worker recomputes while others serve the stale value.
     
-    result = []
-    for qual in qualifications:
-        # Count workers with this qualification
-        # WorkerProfile.qualifications is JSONB array of qualification IDs
-        worker_count = db.query(WorkerProfile).filter(
-            func.jsonb_exists(WorkerProfile.qualifications, str(qual.id))
-        ).count()
-        
-        result.append({
+    Plain def: the queries are blocking, so FastAPI runs this in the
+    threadpool instead of on the event loop (async version in routers.aio).
+    """
+    return public_stats_cache.get(lambda: compute_public_stats(db))
+
+
+def qualification_worker_counts_query():
+    """
+    Active qualifications with the number of workers holding each one.
+    
+    WorkerProfile.qualifications is a JSONB array of objects keyed by
+    code ([{"code": "FIRST_AID_LVL3", ...}]). Each profile's codes are
+    de-duplicated in a LATERAL subquery and counted in one hash aggregate
+    (cheaper than count(DISTINCT id), which has to sort every element),
+    then joined to the qualifications list - a single query regardless of
+    how many qualifications are active.
+    """
+    element = func.jsonb_array_elements(WorkerProfile.qualifications).table_valued("value").alias("element")
+    codes = (
+        select(element.c.value.op("->>")("code").label("code"))
+        .distinct()
+        .lateral("codes")
+    )
+    
+    worker_counts = (
+        select(codes.c.code, func.count().label("worker_count"))
+        .select_from(WorkerProfile)
+        .join(codes, true())
+        .where(func.jsonb_typeof(WorkerProfile.qualifications) == "array")
+        .group_by(codes.c.code)
+        .subquery()
+    )
+    
+    return (
+        select(Qualification, func.coalesce(worker_counts.c.worker_count, 0))
+        .outerjoin(worker_counts, worker_counts.c.code == Qualification.code)
+        .where(Qualification.is_active == True)
+        .order_by(Qualification.display_order)
+    )
+
+
+def build_qualifications_response(rows) -> Dict[str, Any]:
+    """
+    Build the /public/qualifications payload from (qualification, count) rows.
+    Shared by the sync and async routers.
+    """
+    result = [
+        {
             "id": str(qual.id),
             "code": qual.code,
             "name": qual.name,
@@ -107,7 +128,9 @@ async def get_qualifications(db: Session = Depends(get_db)) -> Dict[str, Any]:
             "is_mandatory": qual.is_mandatory,
             "worker_count": worker_count,
             "display_order": qual.display_order,
-        })
+        }
+        for qual, worker_count in rows
+    ]
     
     return {
         "qualifications": result,
@@ -116,6 +139,15 @@ async def get_qualifications(db: Session = Depends(get_db)) -> Dict[str, Any]:
     }
 
 
+@router.get("/qualifications")
+def get_qualifications(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Get all active qualifications with worker counts.
+    Used for landing page qualifications showcase.
+    """
+    return build_qualifications_response(db.execute(qualification_worker_counts_query()).all())
+
+
 @router.get("/health")
 async def public_health_check():
     """
@@ -7,7 +7,8 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_worker
-from app.models.user import User
+from app.core.geocoding import geocode_profile
+from app.core.principal_cache import Principal
 from app.models.worker_profile import WorkerProfile
 from app.schemas.worker import WorkerProfileUpdate, WorkerProfileResponse
 
@@ -17,25 +18,27 @@ router = APIRouter(prefix="/worker", tags=["worker-profile"])
 
 @router.get("/profile", response_model=WorkerProfileResponse)
 def get_worker_profile(
-    current_user: User = Depends(get_current_worker),
+    current_user: Principal = Depends(get_current_worker),
     db: Session = Depends(get_db)
 ):
     """
     Get current worker's profile.
     """
-    if not current_user.worker_profile:
+    profile = db.query(WorkerProfile).filter(WorkerProfile.user_id == current_user.id).first()
+    
+    if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Worker profile not found",
         )
     
-    return current_user.worker_profile
+    return profile
 
 
 @router.put("/profile", response_model=WorkerProfileResponse)
 def update_worker_profile(
     update_data: WorkerProfileUpdate,
-    current_user: User = Depends(get_current_worker),
+    current_user: Principal = Depends(get_current_worker),
     db: Session = Depends(get_db)
 ):
     """
@@ -44,7 +47,7 @@ def update_worker_profile(
     Can update any fields. Automatically recalculates completion percentage.
     Used for profile wizard (step-by-step) and profile editing.
     """
-    profile = current_user.worker_profile
+    profile = db.query(WorkerProfile).filter(WorkerProfile.user_id == current_user.id).first()
     
     if not profile:
         raise HTTPException(
@@ -59,10 +62,13 @@ def update_worker_profile(
         if hasattr(profile, field):
             setattr(profile, field, value)
     
+    # Coordinates follow the postcode (for travel radius matching)
+    if "postcode" in update_dict:
+        geocode_profile(profile)
+    
     # Recalculate completion
     profile.update_completion_status()
     
-    db.commit()
-    db.refresh(profile)
+    db.commit()  # The flushed UPDATE wrote every column: no refresh
     
     return profile
@@ -5,7 +5,7 @@ Worker profile schemas.
 from typing import Optional, List, Dict, Any
 from datetime import date
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 
 class WorkerProfileUpdate(BaseModel):
@@ -82,3 +82,90 @@ class WorkerProfileResponse(BaseModel):
     hourly_rate_max: Optional[int]
     
     model_config = {"from_attributes": True}
+
+
+class WorkerSearchFilters(BaseModel):
+    """Worker search criteria (GET /care-home/workers/search)."""
+    dbs_status: Optional[List[str]] = None  # Any of
+    qualifications: Optional[List[str]] = None  # Qualification codes; all of
+    specializations: Optional[List[str]] = None  # All of
+    languages: Optional[List[str]] = None  # All of
+    available_days: Optional[List[str]] = None  # All of
+    shift_types: Optional[List[str]] = None  # All of
+    hourly_rate_min: Optional[int] = None  # Budget in pence; overlaps the worker's range
+    hourly_rate_max: Optional[int] = None
+    city: Optional[str] = None  # Case-insensitive
+    cursor: Optional[str] = None
+    limit: int = 20
+
+
+class WorkerSearchResult(BaseModel):
+    """A worker as shown to care homes (no contact or document details)."""
+    id: UUID
+    first_name: Optional[str]
+    last_name: Optional[str]
+    profile_picture_url: Optional[str]
+    city: Optional[str]
+    
+    # Qualifications
+    dbs_status: str
+    dbs_expiry_date: Optional[date]
+    qualifications: List[Dict[str, Any]]
+    
+    # Skills
+    years_experience: Optional[str]
+    specializations: List[str]
+    languages: List[str]
+    bio: Optional[str]
+    
+    # Availability
+    available_days: List[str]
+    shift_types: List[str]
+    travel_radius_miles: Optional[int]
+    hourly_rate_min: Optional[int]
+    hourly_rate_max: Optional[int]
+    willing_to_travel: bool
+    has_own_transport: bool
+    
+    model_config = {"from_attributes": True}
+    
+    @field_validator("qualifications", mode="before")
+    @classmethod
+    def strip_documents(cls, qualifications: Optional[List[Any]]) -> List[Dict[str, Any]]:
+        # Older rows may hold bare codes or nulls instead of objects
+        result = []
+        for q in qualifications or []:
+            if isinstance(q, str):
+                result.append({"code": q, "expiry_date": None})
+            elif isinstance(q, dict):
+                result.append({"code": q.get("code"), "expiry_date": q.get("expiry_date")})
+        return result
+
+
+class WorkerSearchResponse(BaseModel):
+    """A page of search results; pass next_cursor back for the next page."""
+    results: List[WorkerSearchResult]
+    next_cursor: Optional[str] = None
+
+
+class WorkerMatchCriteria(BaseModel):
+    """What a care home is looking for (GET /care-home/workers/matches)."""
+    care_home_type: Optional[str] = None  # From the care home's profile
+    latitude: Optional[float] = None  # The care home's location
+    longitude: Optional[float] = None
+    qualifications: Optional[List[str]] = None  # Required qualification codes
+    available_days: Optional[List[str]] = None
+    shift_types: Optional[List[str]] = None
+    hourly_rate: Optional[int] = None  # Offered, in pence
+    limit: int = 20
+
+
+class WorkerMatchResult(WorkerSearchResult):
+    """A candidate worker, with how well they match (0-100)."""
+    score: float
+    distance_miles: Optional[float] = None
+
+
+class WorkerMatchResponse(BaseModel):
+    """Best matching workers, best first."""
+    results: List[WorkerMatchResult]
@@ -0,0 +1 @@
+# Benchmarks (run from api/: python -m benchmarks.<name>)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+Side-by-side load benchmark of sync (psycopg2) vs async (asyncpg) mode.
+
+Starts the API once per mode with uvicorn, then drives POST /auth/login
+and GET /auth/me with a fixed number of concurrent clients and reports
+throughput and latency percentiles for each.
+
+Usage (from api/, against a disposable Postgres):
+    DATABASE_URL=postgresql://... python -m benchmarks.db_modes
+    DATABASE_URL=postgresql://... python -m benchmarks.db_modes --concurrency 200 --duration 20 --workers 2
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+BENCH_EMAIL = "bench-db-modes@vicarity.co.uk"
+BENCH_PASSWORD = "BenchPassw0rd"
+
+
+def ensure_bench_user():
+    """Create a verified worker to log in as (idempotent)."""
+    from app.core.database import SessionLocal, engine, Base
+    from app.core.security import hash_password
+    from app.models import User, UserRole, WorkerProfile
+    
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.email == BENCH_EMAIL).first():
+            return
+        user = User(
+            email=BENCH_EMAIL,
+            password_hash=hash_password(BENCH_PASSWORD),
+            role=UserRole.WORKER,
+            email_verified=True,
+        )
+        db.add(user)
+        db.flush()
+        db.add(WorkerProfile(user_id=user.id))
+        db.commit()
+    finally:
+        db.close()
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def drive(client, method, path, duration, concurrency, **kwargs):
+    """Hammer one endpoint for `duration` seconds; return (count, errors, latencies)."""
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                errors += 1
+    
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(latencies), errors, latencies
+
+
+async def run_mode(base_url, args):
+    """Run the login and /auth/me phases against a running server."""
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        credentials = {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+        response = await client.post("/auth/login", json=credentials)
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        
+        results = {}
+        results["login"] = await drive(
+            client, "POST", "/auth/login", args.duration, args.concurrency, json=credentials
+        )
+        results["me"] = await drive(
+            client, "GET", "/auth/me", args.duration, args.concurrency, headers=headers
+        )
+        return results
+
+
+def start_server(mode, port, workers):
+    """Start uvicorn in the given mode and wait until it answers."""
+    env = dict(os.environ, DB_ASYNC="true" if mode == "async" else "false")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/status").status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{mode} server did not start on port {port}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per endpoint")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn workers (production uses 2)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    
+    if not os.getenv("DATABASE_URL"):
+        print("DATABASE_URL must point at a disposable Postgres database")
+        return 1
+    
+    ensure_bench_user()
+    
+    report = {}
+    for mode in ("sync", "async"):
+        process = start_server(mode, args.port, args.workers)
+        try:
+            report[mode] = asyncio.run(run_mode(f"http://127.0.0.1:{args.port}", args))
+        finally:
+            process.terminate()
+            process.wait()
+    
+    print(f"\nconcurrency={args.concurrency} duration={args.duration}s workers={args.workers}\n")
+    print(f"{'endpoint':<12}{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for endpoint in ("login", "me"):
+        for mode in ("sync", "async"):
+            count, errors, latencies = report[mode][endpoint]
+            print(
+                f"{endpoint:<12}{mode:<8}{count / args.duration:>10.1f}"
+                f"{percentile(latencies, 50):>10.1f}{percentile(latencies, 95):>10.1f}"
+                f"{percentile(latencies, 99):>10.1f}{errors:>8}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Throughput benchmark for the email outbox sender (emails per second).
+
+Queues emails into a scratch schema (bench_email_outbox, dropped
+afterwards) and drains them with OutboxSender at several batch sizes.
+The provider is either the in-memory fake transport with a simulated
+round trip, or a local HTTP server speaking the Resend batch API through
+the real ResendTransport (keep-alive httpx client).
+
+Usage (from api/):
+    DATABASE_URL=postgresql://... python -m benchmarks.email_outbox
+    DATABASE_URL=postgresql://... python -m benchmarks.email_outbox --http --emails 5000
+    DATABASE_URL=postgresql://... python -m benchmarks.email_outbox --batch-sizes 1,100 --latency-ms 80
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import engine
+from app.core.email import queue_verification_email
+from app.core.email_sender import FakeTransport, OutboxSender, ResendTransport
+from app.models.email_outbox import EmailOutbox
+
+SCHEMA = "bench_email_outbox"
+
+
+class FakeResendHandler(BaseHTTPRequestHandler):
+    """POST /emails/batch with a fixed delay; keeps connections alive."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body are written separately
+    latency = 0.0
+    connections = 0
+    
+    def setup(self):
+        super().setup()
+        FakeResendHandler.connections += 1
+    
+    def do_POST(self):
+        messages = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.latency)
+        body = json.dumps({"data": [{"id": str(uuid.uuid4())} for _ in messages]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def queue(session_factory, count: int):
+    with session_factory() as db:
+        for i in range(count):
+            queue_verification_email(db, f"bench{i}@example.com", f"token-{i}")
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark email outbox throughput")
+    parser.add_argument("--emails", type=int, default=2000)
+    parser.add_argument("--batch-sizes", default="1,10,100")
+    parser.add_argument("--latency-ms", type=float, default=50, help="simulated provider round trip")
+    parser.add_argument("--http", action="store_true", help="send over HTTP to a local fake Resend server")
+    args = parser.parse_args()
+    
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    latency = args.latency_ms / 1000
+    
+    server = None
+    if args.http:
+        FakeResendHandler.latency = latency
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeResendHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.commit()
+    bench_engine = engine.execution_options(schema_translate_map={None: SCHEMA})
+    EmailOutbox.__table__.create(bench_engine)
+    session_factory = sessionmaker(bind=bench_engine)
+    
+    results = []
+    try:
+        for batch_size in batch_sizes:
+            with bench_engine.begin() as conn:
+                conn.execute(EmailOutbox.__table__.delete())
+            queue(session_factory, args.emails)
+            
+            if server:
+                FakeResendHandler.connections = 0
+                transport = ResendTransport("re_bench", f"http://127.0.0.1:{server.server_port}", timeout=30)
+            else:
+                transport = FakeTransport(latency=latency)
+            sender = OutboxSender(session_factory, transport, batch_size=batch_size)
+            
+            started = time.perf_counter()
+            sent = sender.drain()
+            elapsed = time.perf_counter() - started
+            transport.close()
+            
+            connections = FakeResendHandler.connections if server else None
+            results.append((batch_size, sent, elapsed, sender.stats["batches"], connections))
+    finally:
+        if server:
+            server.shutdown()
+        with engine.connect() as conn:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            conn.commit()
+    
+    transport_name = "HTTP (keep-alive)" if server else "fake"
+    print(f"\n{args.emails:,} emails, {transport_name} transport, {args.latency_ms:g} ms per provider call")
+    print(f"{'batch':>7}{'calls':>8}{'seconds':>10}{'emails/s':>12}" + (f"{'conns':>8}" if server else ""))
+    for batch_size, sent, elapsed, batches, connections in results:
+        line = f"{batch_size:>7}{batches:>8}{elapsed:>10.2f}{sent / elapsed:>12,.0f}"
+        if server:
+            line += f"{connections:>8}"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for email rendering.
+
+Compares the previous f-string email functions (kept below, verbatim, for
+comparison) with the precompiled templates in app.core.email_templates:
+one render at a time, and render_many() over a stream of recipients.
+No database or network needed.
+
+Usage (from api/):
+    python -m benchmarks.email_render
+    python -m benchmarks.email_render --number 20000 --recipients 100000
+"""
+
+import argparse
+import sys
+import time
+import timeit
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.core.email_templates import email_templates, render_many
+
+
+def legacy_verification_email(verification_token: str, first_name: Optional[str] = None) -> Tuple[str, str]:
+    """Previous verification email: the whole document rebuilt per call."""
+    verification_link = f"{settings.FRONTEND_URL}/verify-email?token={verification_token}"
+    
+    name = first_name if first_name else "there"
+    
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
+            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+            .header {{ background: linear-gradient(135deg, #86a890 0%, #86a890 100%); color: white; padding: 30px; text-align: center; border-radius: 8px 8px 0 0; }}
+            .content {{ background: #ffffff; padding: 40px; border: 1px solid #e0e0e0; border-top: none; border-radius: 0 0 8px 8px; }}
+            .button {{ display: inline-block; background: #86a890; color: white; padding: 14px 32px; text-decoration: none; border-radius: 6px; font-weight: 600; margin: 20px 0; }}
+            .button:hover {{ background: #6f8a77; }}
+            .footer {{ text-align: center; padding: 20px; color: #666; font-size: 14px; }}
+            .warning {{ background: #fff3cd; border-left: 4px solid #ffc107; padding: 12px; margin: 20px 0; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>Welcome to Vicarity!</h1>
+            </div>
+            <div class="content">
+                <p>Hi {name},</p>
+                <p>Thank you for registering with Vicarity. We're excited to have you join our care community.</p>
+                <p>Please verify your email address by clicking the button below:</p>
+                <p style="text-align: center;">
+                    <a href="{verification_link}" class="button">Verify Email Address</a>
+                </p>
+                <div class="warning">
+                    <strong>⏰ This link expires in 24 hours</strong>
+                </div>
+                <p>If the button doesn't work, copy and paste this link into your browser:</p>
+                <p style="word-break: break-all; color: #666; font-size: 14px;">{verification_link}</p>
+                <p>If you didn't create an account with Vicarity, you can safely ignore this email.</p>
+            </div>
+            <div class="footer">
+                <p>Vicarity - Connecting Care Workers with Care Homes</p>
+                <p>Need help? Contact us at support@vicarity.co.uk</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    
+    subject = "Verify your Vicarity account"
+    return subject, html_content
+
+
+def legacy_worker_welcome_email(first_name: str) -> Tuple[str, str]:
+    """Previous worker welcome email: the whole document rebuilt per call."""
+    
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
+            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+            .header {{ background: linear-gradient(135deg, #86a890 0%, #86a890 100%); color: white; padding: 30px; text-align: center; border-radius: 8px 8px 0 0; }}
+            .content {{ background: #ffffff; padding: 40px; border: 1px solid #e0e0e0; border-top: none; border-radius: 0 0 8px 8px; }}
+            .button {{ display: inline-block; background: #86a890; color: white; padding: 14px 32px; text-decoration: none; border-radius: 6px; font-weight: 600; margin: 20px 0; }}
+            .steps {{ background: #f8f9fa; padding: 20px; border-radius: 6px; margin: 20px 0; }}
+            .step {{ margin: 15px 0; padding-left: 30px; position: relative; }}
+            .step:before {{ content: "✓"; position: absolute; left: 0; color: #86a890; font-weight: bold; }}
+            .footer {{ text-align: center; padding: 20px; color: #666; font-size: 14px; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>🎉 Welcome to Vicarity, {first_name}!</h1>
+            </div>
+            <div class="content">
+                <p>Your email has been verified successfully!</p>
+                <p>Now let's complete your profile so you can start finding flexible care work.</p>
+                
+                <div class="steps">
+                    <h3>Complete Your Profile in 4 Easy Steps:</h3>
+                    <div class="step"><strong>Personal Details</strong> - Your name, contact info, and photo</div>
+                    <div class="step"><strong>Qualifications</strong> - DBS, certifications, and training</div>
+                    <div class="step"><strong>Skills & Experience</strong> - Your specializations and background</div>
+                    <div class="step"><strong>Availability</strong> - When you're available and your preferences</div>
+                </div>
+                
+                <p style="text-align: center;">
+                    <a href="{settings.FRONTEND_URL}/complete-profile" class="button">Complete Your Profile</a>
+                </p>
+                
+                <p><strong>Timeline:</strong> Most care workers complete their profile in 10-15 minutes and start receiving shift offers within 24 hours!</p>
+            </div>
+            <div class="footer">
+                <p>Questions? We're here to help at support@vicarity.co.uk</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    
+    subject = f"Welcome to Vicarity, {first_name}! Complete your profile to start finding work"
+    return subject, html_content
+
+
+def per_render_us(run, number: int) -> float:
+    """Best of 5 runs, in microseconds per call."""
+    return min(timeit.repeat(run, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark email rendering")
+    parser.add_argument("--number", type=int, default=10000, help="renders per timing run")
+    parser.add_argument("--recipients", type=int, default=50000, help="recipients for render_many")
+    args = parser.parse_args()
+    
+    token = "eyJhbGciOiJIUzI1NiJ9." + "x" * 150  # JWT-sized
+    verification = email_templates["verification"]
+    worker_welcome = email_templates["worker_welcome"]
+    cases = [
+        ("verification", "f-string (before)", lambda: legacy_verification_email(token, "Sam")),
+        ("verification", "compiled (after)", lambda: verification.render(verification_token=token, first_name="Sam")),
+        ("worker_welcome", "f-string (before)", lambda: legacy_worker_welcome_email("Sam")),
+        ("worker_welcome", "compiled (after)", lambda: worker_welcome.render(first_name="Sam")),
+    ]
+    
+    print(f"{'template':<16}{'implementation':<20}{'us/render':>12}")
+    for template, label, run in cases:
+        print(f"{template:<16}{label:<20}{per_render_us(run, args.number):>12.2f}")
+    
+    recipients = ({"verification_token": token, "first_name": f"Worker {i}"} for i in range(args.recipients))
+    started = time.perf_counter()
+    total_bytes = sum(len(html) for _, html in render_many("verification", recipients))
+    elapsed = time.perf_counter() - started
+    print(f"\nrender_many: {args.recipients:,} verification emails in {elapsed:.2f}s "
+          f"({args.recipients / elapsed:,.0f}/s, {total_bytes / args.recipients / 1024:.1f} KB each)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+"""
+Synthetic data generator: bulk-loads realistic users, worker profiles and
+care home profiles with COPY, at 10k/100k/1M users.
+
+Rows are generated in Python in batches and streamed with COPY FROM
+STDIN in one transaction, then the platform counters are reconciled
+(COPY bypasses the flush listener that maintains them). About 90% of the
+users are workers, at every stage of the profile wizard; the rest are
+care home admins. Every generated user is verified and shares one
+password (PASSWORD), so the load test can log in as any of them.
+
+Generated users have emails starting with the prefix (default
+"synthetic-"); --replace deletes those first, leaving other users alone.
+
+Usage (from api/, against a disposable Postgres):
+    DATABASE_URL=postgresql://... python -m benchmarks.generate_data --size 10k
+    DATABASE_URL=postgresql://... python -m benchmarks.generate_data --size 1M --replace
+"""
+
+import argparse
+import io
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal, engine, Base
+from app.core.security import hash_password
+from app.models.care_home_profile import CareHomeProfile
+from app.models.platform_counter import reconcile_counters
+from app.models.qualification import seed_qualifications
+from app.models.worker_profile import DBSStatus, WorkerProfile
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+PASSWORD = "SyntheticPassw0rd"
+BATCH = 20_000  # Users generated and copied at a time
+CARE_HOME_SHARE = 0.1
+
+# City, latitude, longitude, outward code and weight (rough population)
+CITIES = [
+    ("London", 51.507, -0.128, "SE1", 30), ("Birmingham", 52.486, -1.890, "B1", 8),
+    ("Manchester", 53.480, -2.242, "M1", 7), ("Leeds", 53.797, -1.549, "LS1", 6),
+    ("Glasgow", 55.864, -4.252, "G1", 5), ("Sheffield", 53.381, -1.470, "S1", 4),
+    ("Liverpool", 53.408, -2.991, "L1", 4), ("Bristol", 51.454, -2.588, "BS1", 4),
+    ("Edinburgh", 55.953, -3.189, "EH1", 4), ("Cardiff", 51.481, -3.179, "CF10", 3),
+    ("Leicester", 52.637, -1.139, "LE1", 3), ("Nottingham", 52.954, -1.158, "NG1", 3),
+    ("Newcastle", 54.978, -1.618, "NE1", 3), ("Hull", 53.745, -0.337, "HU1", 2),
+    ("Plymouth", 50.376, -4.143, "PL1", 2), ("York", 53.960, -1.082, "YO1", 2),
+    ("Norwich", 52.630, 1.297, "NR1", 2), ("Exeter", 50.718, -3.534, "EX1", 1),
+    ("Lancaster", 54.047, -2.801, "LA1", 1), ("Aberdeen", 57.150, -2.094, "AB10", 1),
+]
+CITY_WEIGHTS = [city[4] for city in CITIES]
+
+FIRST_NAMES = ["Olivia", "Amelia", "Isla", "Ava", "Mia", "Grace", "Sophia", "Oliver", "George", "Noah",
+               "Arthur", "Muhammad", "Leo", "Harry", "Priya", "Anna", "Maria", "Joseph", "Chidi", "Aisha"]
+LAST_NAMES = ["Smith", "Jones", "Taylor", "Brown", "Williams", "Wilson", "Johnson", "Davies", "Patel",
+              "Wright", "Walker", "Khan", "Kowalski", "Nowak", "Okafor", "Evans", "Thomas", "Roberts"]
+# Qualification codes with the share of workers holding each
+QUALIFICATIONS = {
+    "CARE_CERTIFICATE": 0.7, "MOVING_HANDLING": 0.6, "SAFEGUARDING_ADULTS": 0.55, "INFECTION_CONTROL": 0.5,
+    "BASIC_LIFE_SUPPORT": 0.45, "FIRE_SAFETY": 0.4, "HEALTH_SAFETY": 0.4, "FOOD_HYGIENE": 0.35,
+    "DEMENTIA_AWARENESS": 0.35, "MEDICATION_ADMIN": 0.3, "FIRST_AID_LVL3": 0.25, "NVQ_LVL2": 0.25,
+    "NVQ_LVL3": 0.15, "END_OF_LIFE": 0.1, "DIABETES_CARE": 0.08, "CATHETER_CARE": 0.06,
+    "PEG_FEEDING": 0.03, "NURSING_DEGREE": 0.02,
+}
+SPECIALIZATIONS = ["elderly", "dementia", "palliative", "mental_health", "learning_disability", "physical_disability"]
+LANGUAGES = [("english", 0.97), ("polish", 0.06), ("romanian", 0.05), ("urdu", 0.04), ("punjabi", 0.03),
+             ("tagalog", 0.03), ("yoruba", 0.02), ("gujarati", 0.01)]
+SOFT_SKILLS = ["communication", "empathy", "patience", "teamwork", "reliability", "problem_solving"]
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+SHIFT_TYPES = ["day", "night", "twilight", "weekend"]
+DBS_STATUSES = ["ENHANCED"] * 6 + ["STANDARD", "BASIC", "PENDING", "EXPIRED"]
+CARE_HOME_TYPES = ["RESIDENTIAL"] * 4 + ["NURSING"] * 3 + ["DEMENTIA"] * 2 + [
+    "LEARNING_DISABILITY", "MENTAL_HEALTH", "PHYSICAL_DISABILITY", "DOMICILIARY",
+]
+VERIFICATION_STATUSES = ["VERIFIED"] * 5 + ["PENDING"] * 3 + ["IN_REVIEW", "REJECTED"]
+
+USER_COLUMNS = ("id", "email", "password_hash", "role", "email_verified", "is_active",
+                "last_login_at", "created_at", "updated_at")
+WORKER_COLUMNS = (
+    "id", "user_id", "profile_completion_status", "profile_completion_percentage", "current_step",
+    "first_name", "last_name", "phone", "date_of_birth", "address_line_1", "city", "postcode",
+    "latitude", "longitude", "dbs_status", "dbs_certificate_number", "dbs_issue_date", "dbs_expiry_date",
+    "qualifications", "years_experience", "specializations", "languages", "soft_skills", "bio",
+    "available_days", "shift_types", "travel_radius_miles", "hourly_rate_min", "hourly_rate_max",
+    "willing_to_travel", "has_own_transport", "right_to_work_status", "created_at", "updated_at",
+)
+CARE_HOME_COLUMNS = (
+    "id", "user_id", "business_name", "cqc_provider_id", "cqc_location_id", "cqc_rating", "care_home_type",
+    "contact_name", "contact_title", "phone", "address_line_1", "city", "postcode", "latitude", "longitude",
+    "description", "number_of_beds", "verification_status", "verified_at", "profile_completion_percentage",
+    "created_at", "updated_at",
+)
+
+
+def copy_value(value) -> str:
+    """A value in COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, list):
+        value = "{" + ",".join(value) + "}"  # Arrays of plain words need no quoting
+    elif isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    value = str(value)
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_rows(cursor, table: str, columns, rows):
+    """COPY rows (tuples in column order) into a table."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def place(rng: random.Random):
+    """(city, postcode, latitude, longitude) near a weighted city."""
+    city, latitude, longitude, outward, _ = rng.choices(CITIES, CITY_WEIGHTS)[0]
+    postcode = f"{outward} {rng.randrange(10)}{rng.choice('ABDEFGHJLNPQRSTUWXYZ')}{rng.choice('ABDEFGHJLNPQRSTUWXYZ')}"
+    return city, postcode, round(latitude + rng.gauss(0, 0.08), 6), round(longitude + rng.gauss(0, 0.12), 6)
+
+
+def worker_profile(rng: random.Random, user_id: uuid.UUID, created_at: datetime) -> tuple:
+    """A worker profile at a random wizard step (most complete)."""
+    steps = rng.choices([0, 1, 2, 3, 4], [10, 8, 7, 5, 70])[0]
+    fields = dict.fromkeys(WORKER_COLUMNS)
+    fields.update(
+        id=uuid.UUID(int=rng.getrandbits(128), version=4), user_id=user_id, current_step=min(steps + 1, 4),
+        qualifications=[], specializations=[], languages=[], soft_skills=[], available_days=[], shift_types=[],
+        dbs_status="NOT_CHECKED", willing_to_travel=True, has_own_transport=rng.random() < 0.55,
+        created_at=created_at, updated_at=created_at + timedelta(minutes=rng.randrange(60 * 24 * 30)),
+    )
+    if steps >= 1:
+        city, postcode, latitude, longitude = place(rng)
+        fields.update(
+            first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+            phone=f"07{rng.randrange(10**9):09d}",
+            date_of_birth=date(1960, 1, 1) + timedelta(days=rng.randrange(365 * 44)),
+            address_line_1=f"{rng.randrange(1, 200)} {rng.choice(LAST_NAMES)} Road",
+            city=city, postcode=postcode, latitude=latitude, longitude=longitude,
+        )
+    if steps >= 2:
+        issued = date(2020, 1, 1) + timedelta(days=rng.randrange(365 * 6))
+        fields.update(
+            dbs_status=rng.choice(DBS_STATUSES), dbs_certificate_number=f"{rng.randrange(10**12):012d}",
+            dbs_issue_date=issued, dbs_expiry_date=issued + timedelta(days=365 * 3),
+            qualifications=[
+                {"code": code, "expiry_date": (issued + timedelta(days=rng.randrange(365 * 3))).isoformat()}
+                for code, share in QUALIFICATIONS.items() if rng.random() < share
+            ] or [{"code": "CARE_CERTIFICATE", "expiry_date": None}],
+        )
+    if steps >= 3:
+        fields.update(
+            years_experience=rng.choice(["0-1", "1-3", "1-3", "3-5", "3-5", "5+"]),
+            specializations=rng.sample(SPECIALIZATIONS, rng.randrange(1, 4)),
+            languages=[language for language, share in LANGUAGES if rng.random() < share] or ["english"],
+            soft_skills=rng.sample(SOFT_SKILLS, rng.randrange(2, 5)),
+            bio="Experienced and compassionate carer. " * rng.randrange(1, 6),
+        )
+    if steps >= 4:
+        rate_min = rng.choice([1050, 1100, 1150, 1200, 1250, 1300, 1400, 1500])
+        fields.update(
+            available_days=sorted(rng.sample(DAYS, rng.randrange(2, 8)), key=DAYS.index),
+            shift_types=rng.sample(SHIFT_TYPES, rng.randrange(1, 4)),
+            travel_radius_miles=rng.choice([5, 10, 10, 15, 20, 25, 50]),
+            hourly_rate_min=rate_min, hourly_rate_max=rate_min + rng.choice([100, 200, 300, 500]),
+            right_to_work_status=rng.choice(["british_citizen", "settled_status", "visa"]),
+        )
+    # The model's own calculation, so percentages match what the API would store
+    percentage = WorkerProfile.calculate_completion_percentage(SimpleNamespace(
+        **dict(fields, dbs_status=DBSStatus[fields["dbs_status"]]),
+    ))
+    fields["qualifications"] = json.dumps(fields["qualifications"])
+    fields["profile_completion_percentage"] = percentage
+    fields["profile_completion_status"] = (
+        "NOT_STARTED" if percentage == 0 else "COMPLETE" if percentage == 100 else "IN_PROGRESS"
+    )
+    return tuple(fields[column] for column in WORKER_COLUMNS)
+
+
+def care_home_profile(rng: random.Random, user_id: uuid.UUID, created_at: datetime) -> tuple:
+    """A care home profile, mostly filled in."""
+    city, postcode, latitude, longitude = place(rng)
+    name = f"{rng.choice(LAST_NAMES)} {rng.choice(['House', 'Lodge', 'Court', 'Manor', 'Gardens'])}"
+    verification_status = rng.choice(VERIFICATION_STATUSES)
+    fields = dict(
+        id=uuid.UUID(int=rng.getrandbits(128), version=4), user_id=user_id, business_name=name,
+        cqc_provider_id=f"1-{rng.randrange(10**9):09d}", cqc_location_id=f"1-{rng.randrange(10**9):09d}",
+        cqc_rating=rng.choice(["Outstanding", "Good", "Good", "Good", "Requires Improvement", None]),
+        care_home_type=rng.choice(CARE_HOME_TYPES),
+        contact_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        contact_title=rng.choice(["Registered Manager", "Deputy Manager", "Owner"]),
+        phone=f"01{rng.randrange(10**9):09d}", address_line_1=f"{rng.randrange(1, 300)} High Street",
+        city=city, postcode=postcode, latitude=latitude, longitude=longitude,
+        description=None if rng.random() < 0.3 else f"{name} is a friendly care home in {city}.",
+        number_of_beds=rng.choice(["1-20", "20-50", "50-100", "100+"]),
+        verification_status=verification_status,
+        verified_at=created_at + timedelta(days=3) if verification_status == "VERIFIED" else None,
+        created_at=created_at, updated_at=created_at + timedelta(minutes=rng.randrange(60 * 24 * 30)),
+    )
+    fields["profile_completion_percentage"] = str(CareHomeProfile.calculate_completion_percentage(
+        SimpleNamespace(**fields)
+    ))
+    return tuple(fields[column] for column in CARE_HOME_COLUMNS)
+
+
+def generate(cursor, size: int, prefix: str = "synthetic-", seed: int = 1):
+    """COPY `size` users and their profiles, BATCH users at a time; returns (workers, care homes)."""
+    rng = random.Random(seed)
+    password_hash = hash_password(PASSWORD)
+    now = datetime.utcnow().replace(microsecond=0)
+    worker_count = care_home_count = 0
+    for start in range(0, size, BATCH):
+        users, workers, care_homes = [], [], []
+        for i in range(start, min(start + BATCH, size)):
+            user_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            # Signups over the last two years, more of them recently
+            created_at = now - timedelta(minutes=int(rng.triangular(0, 60 * 24 * 730, 0)))
+            is_worker = rng.random() >= CARE_HOME_SHARE
+            last_login_at = created_at + timedelta(minutes=rng.randrange(60 * 24)) if rng.random() < 0.8 else None
+            users.append((
+                user_id, f"{prefix}{i:07d}@vicarity.co.uk", password_hash,
+                "WORKER" if is_worker else "CARE_HOME_ADMIN", True, rng.random() >= 0.01,
+                last_login_at, created_at, created_at,
+            ))
+            if is_worker:
+                workers.append(worker_profile(rng, user_id, created_at))
+            else:
+                care_homes.append(care_home_profile(rng, user_id, created_at))
+        
+        # Users first: the profiles reference them
+        copy_rows(cursor, "users", USER_COLUMNS, users)
+        copy_rows(cursor, "worker_profiles", WORKER_COLUMNS, workers)
+        copy_rows(cursor, "care_home_profiles", CARE_HOME_COLUMNS, care_homes)
+        worker_count += len(workers)
+        care_home_count += len(care_homes)
+    return worker_count, care_home_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load synthetic users and profiles with COPY")
+    parser.add_argument("--size", choices=SIZES, default="10k", help="number of users")
+    parser.add_argument("--prefix", default="synthetic-", help="email prefix of generated users")
+    parser.add_argument("--replace", action="store_true", help="delete previously generated users first")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print(f"Vicarity synthetic data ({args.size} users)")
+    print("=" * 60)
+    
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        seed_qualifications(db)
+        connection = db.connection().connection  # Raw psycopg2 connection for COPY
+        with connection.cursor() as cursor:
+            if args.replace:
+                cursor.execute("DELETE FROM users WHERE email LIKE %s", (args.prefix.replace("_", "\\_") + "%",))
+                print(f"\n🗑️  Deleted {cursor.rowcount:,} previously generated users")
+            started = time.perf_counter()
+            workers, care_homes = generate(cursor, SIZES[args.size], args.prefix, args.seed)
+        db.commit()
+        print(f"\n✅ Loaded {workers:,} workers and {care_homes:,} care homes "
+              f"in {time.perf_counter() - started:.1f}s")
+        
+        db.execute(text("ANALYZE users; ANALYZE worker_profiles; ANALYZE care_home_profiles"))
+        drift = reconcile_counters(db)
+        print(f"✅ Reconciled {len(drift)} platform counters")
+        print(f"\nEvery generated user's password is {PASSWORD!r}")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Error generating data: {e}")
+        db.rollback()
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
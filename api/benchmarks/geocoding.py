@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+"""
+Benchmark for the local postcode geocoder (app/core/geocoding.py).
+
+Generates an ONSPD-style centroid CSV (or uses a real one), then reports:
+- ingest time, index file size and the ingest's peak RSS
+- memory of processes using the index: anonymous (private) RSS stays
+  flat, while the mapped pages are file-backed and shared between them
+- single and batched lookup latency, and the radius filter over workers
+
+Needs no database. RSS figures come from /proc (Linux).
+
+Usage (from api/):
+    python -m benchmarks.geocoding
+    python -m benchmarks.geocoding --rows 500000 --workers 4
+    python -m benchmarks.geocoding --csv ONSPD_MAY_2026_UK.csv
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from app.core.geocoding import PostcodeIndex, ingest, within_radius
+
+LETTERS = np.array(list("ABDEFGHJLNPQRSTUWXYZ"))  # Inward unit letters
+
+
+def generate_csv(path: str, rows: int, seed: int = 1):
+    """Write `rows` unique postcodes across Great Britain, ONSPD columns."""
+    rng = np.random.default_rng(seed)
+    # Postcodes from a dense sequence: area, district, sector, unit
+    sequence = rng.permutation(rows)
+    units = len(LETTERS) ** 2
+    unit, sequence = sequence % units, sequence // units
+    sector, sequence = sequence % 10, sequence // 10
+    district, area = sequence % 99 + 1, sequence // 99
+    latitudes = rng.uniform(50.0, 58.6, rows).round(6)
+    longitudes = rng.uniform(-5.7, 1.7, rows).round(6)
+    with open(path, "w") as f:
+        f.write("pcd,pcd2,pcds,dointr,doterm,ctry,lat,long\n")
+        for i in range(rows):
+            outward = f"{chr(65 + area[i] // 26)}{chr(65 + area[i] % 26)}{district[i]}"
+            inward = f"{sector[i]}{LETTERS[unit[i] // len(LETTERS)]}{LETTERS[unit[i] % len(LETTERS)]}"
+            f.write(f"{outward:<4}{inward},{outward:<5}{inward},{outward} {inward},198001,,E92000001,"
+                    f"{latitudes[i]},{longitudes[i]}\n")
+
+
+def memory() -> dict:
+    """Resident memory of this process in MiB: total, private (anon), file-backed, proportional."""
+    values = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in ("VmRSS", "RssAnon", "RssFile"):
+                values[name] = int(value.split()[0]) / 1024
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                values["Pss"] = int(line.split()[1]) / 1024
+    return values
+
+
+def ingest_child(csv_path: str, index_path: str, results):
+    started = time.perf_counter()
+    count = ingest(csv_path, index_path)
+    results.put((count, time.perf_counter() - started, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def worker_child(index_path: str, postcodes, barrier, results):
+    """A process answering lookups: memory before, after a full warm-up, and with peers running."""
+    before = memory()
+    index = PostcodeIndex(index_path)
+    for postcode in postcodes:
+        index.lookup(postcode)
+    # Touch every page, as a long-running worker eventually does
+    index._keys.view(np.uint8).sum(dtype=np.uint64), index._coords.sum(dtype=np.int64)
+    barrier.wait()  # All workers hold the mapping
+    results.put((before, memory()))
+    barrier.wait()
+
+
+def percentile(samples, q):
+    return sorted(samples)[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the postcode geocoder")
+    parser.add_argument("--csv", help="centroid CSV to ingest (default: generate one)")
+    parser.add_argument("--rows", type=int, default=2_600_000, help="postcodes to generate")
+    parser.add_argument("--workers", type=int, default=4, help="processes sharing the index")
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--radius-workers", type=int, default=500_000)
+    args = parser.parse_args()
+    
+    scratch = tempfile.mkdtemp(prefix="bench_geocoding_")
+    csv_path = args.csv or os.path.join(scratch, "postcodes.csv")
+    index_path = os.path.join(scratch, "postcodes.idx")
+    context = multiprocessing.get_context("spawn")
+    try:
+        if not args.csv:
+            started = time.perf_counter()
+            generate_csv(csv_path, args.rows)
+            print(f"Generated {args.rows:,} postcodes in {time.perf_counter() - started:.1f}s")
+        
+        # Ingest in its own process, so its peak RSS is not this one's
+        results = context.Queue()
+        child = context.Process(target=ingest_child, args=(csv_path, index_path, results))
+        child.start()
+        count, ingest_seconds, ingest_peak = results.get()
+        child.join()
+        csv_size = os.path.getsize(csv_path) / 2**20
+        index_size = os.path.getsize(index_path) / 2**20
+        print(f"\nIngest: {count:,} postcodes in {ingest_seconds:.1f}s, peak RSS {ingest_peak:.0f} MiB")
+        print(f"Index file: {index_size:.1f} MiB ({csv_size:.0f} MiB CSV, "
+              f"{index_size * 2**20 / count:.1f} bytes per postcode)")
+        
+        index = PostcodeIndex(index_path)
+        rng = np.random.default_rng(2)
+        picks = rng.integers(0, len(index), args.lookups)
+        keys = index._keys[picks]
+        postcodes = [f"{key[:-3].decode()} {key[-3:].decode().lower()}" for key in keys]
+        
+        # Processes sharing the mapping
+        barrier = context.Barrier(args.workers)
+        results = context.Queue()
+        children = [
+            context.Process(target=worker_child, args=(index_path, postcodes[:1000], barrier, results))
+            for _ in range(args.workers)
+        ]
+        for child in children:
+            child.start()
+        measured = [results.get() for _ in children]
+        for child in children:
+            child.join()
+        print(f"\n{args.workers} processes with the whole index paged in (MiB per process)")
+        print(f"{'':>12}{'RSS':>10}{'private':>10}{'file':>10}{'PSS':>10}")
+        for label, at in (("before", 0), ("after", 1)):
+            print(f"{label:>12}" + "".join(
+                f"{statistics.mean(m[at][name] for m in measured):>10.1f}"
+                for name in ("VmRSS", "RssAnon", "RssFile", "Pss")
+            ))
+        
+        # Lookup latency
+        timings = []
+        for postcode in postcodes:
+            started = time.perf_counter_ns()
+            index.lookup(postcode)
+            timings.append(time.perf_counter_ns() - started)
+        misses = []
+        for postcode in ("ZZ99 9ZZ", "QQ1 1QQ") * 5000:
+            started = time.perf_counter_ns()
+            index.lookup(postcode)
+            misses.append(time.perf_counter_ns() - started)
+        started = time.perf_counter()
+        for at in range(0, len(postcodes), 1000):
+            index.lookup_many(postcodes[at:at + 1000])
+        batched = (time.perf_counter() - started) / len(postcodes) * 1e9
+        print(f"\nLookup µs: p50 {percentile(timings, 0.5) / 1000:.1f}  p99 {percentile(timings, 0.99) / 1000:.1f}"
+              f"  miss p50 {percentile(misses, 0.5) / 1000:.1f}  batched (1,000) {batched / 1000:.2f} per postcode")
+        
+        # Workers within their travel radius of a home
+        latitudes, longitudes = index.lookup_many(postcodes[:1000])
+        picks = rng.integers(0, 1000, args.radius_workers)
+        latitudes, longitudes = latitudes[picks], longitudes[picks]
+        radii = rng.choice([5, 10, 15, 25, 50], args.radius_workers).astype(np.float64)
+        timings = []
+        for i in range(20):
+            started = time.perf_counter()
+            matched = within_radius(53.96, -1.08, latitudes, longitudes, radii)
+            timings.append(time.perf_counter() - started)
+        print(f"Radius filter over {args.radius_workers:,} workers: {statistics.median(timings) * 1000:.1f} ms "
+              f"({int(matched.sum()):,} within their travel radius of York)")
+    finally:
+        for name in os.listdir(scratch):
+            os.remove(os.path.join(scratch, name))
+        os.rmdir(scratch)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
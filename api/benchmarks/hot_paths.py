@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+"""
+Micro-benchmarks of the CPU work done per request, with stored baselines.
+
+Times the hot functions behind auth and profile requests: JWT tokens,
+password verification at each bcrypt cost (and argon2 when argon2-cffi
+is installed), password strength checks, profile completion, Pydantic
+validation and serialization of the profile and /auth/me payloads, and
+email rendering. Each is run in batches sized to about 0.2s; the best
+batch is reported, as time per call.
+
+`save` stores the results in benchmarks/baselines/hot_paths.json (commit
+it); `check` reruns them and exits 1 if any is slower than its baseline
+by more than --threshold. Baselines are only comparable on the machine
+they were saved on, so save them on the CI runner that checks them.
+
+No database is needed, but the models are imported, so DATABASE_URL must
+be set: any PostgreSQL URL will do, as nothing connects to it.
+
+Usage (from api/):
+    DATABASE_URL=postgresql://localhost/unused python -m benchmarks.hot_paths
+    DATABASE_URL=postgresql://localhost/unused python -m benchmarks.hot_paths save
+    DATABASE_URL=postgresql://localhost/unused python -m benchmarks.hot_paths check --threshold 0.25
+    DATABASE_URL=postgresql://localhost/unused python -m benchmarks.hot_paths run --only token
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+import uuid
+from datetime import datetime
+
+from app.core.email_templates import email_templates
+from app.core.security import (
+    TokenType, build_password_context, create_access_token, decode_token, validate_password_strength,
+    verify_token,
+)
+from app.models import CareHomeProfile, User, UserRole, WorkerProfile
+from app.models.care_home_profile import CareHomeType, VerificationStatus
+from app.models.worker_profile import DBSStatus, ProfileCompletionStatus
+from app.routers.auth import build_current_user_response
+from app.schemas.worker import WorkerProfileResponse, WorkerProfileUpdate
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "hot_paths.json")
+BCRYPT_COSTS = (10, 11, 12, 13)
+PASSWORD = "BenchPassw0rd"
+
+# Profile wizard PUT bodies, as the frontend sends them
+WIZARD_UPDATE = {
+    "first_name": "Amelia", "last_name": "Okafor", "phone": "07700900123", "date_of_birth": "1990-05-17",
+    "city": "York", "postcode": "YO1 7HH", "dbs_status": "enhanced",
+    "qualifications": [{"code": code, "expiry_date": "2027-03-01"} for code in
+                       ("CARE_CERTIFICATE", "MOVING_HANDLING", "FIRST_AID_LVL3", "MEDICATION_ADMIN")],
+    "years_experience": "3-5", "specializations": ["elderly", "dementia"], "languages": ["english", "polish"],
+    "bio": "Experienced and compassionate carer. " * 4,
+    "available_days": ["mon", "tue", "wed", "sat"], "shift_types": ["day", "night"],
+    "travel_radius_miles": 15, "hourly_rate_min": 1150, "hourly_rate_max": 1400,
+}
+
+# name -> function returning the callable to time (setup runs once, untimed)
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def worker() -> User:
+    """A verified worker with a complete profile (transient; no session)."""
+    user = User(id=uuid.uuid4(), email="amelia@vicarity.co.uk", role=UserRole.WORKER,
+                email_verified=True, is_active=True)
+    update = WorkerProfileUpdate(**WIZARD_UPDATE).model_dump(exclude_unset=True)
+    user.worker_profile = WorkerProfile(
+        id=uuid.uuid4(), user_id=user.id, current_step=4, **dict(update, dbs_status=DBSStatus.ENHANCED),
+    )
+    user.worker_profile.update_completion_status()
+    assert user.worker_profile.profile_completion_status == ProfileCompletionStatus.COMPLETE
+    return user
+
+
+def care_home() -> CareHomeProfile:
+    return CareHomeProfile(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), business_name="Minster Court", contact_name="Priya Patel",
+        phone="01904000000", address_line_1="1 High Street", city="York", postcode="YO1 7HH",
+        care_home_type=CareHomeType.RESIDENTIAL, description=None,
+        verification_status=VerificationStatus.VERIFIED, profile_completion_percentage="88",
+    )
+
+
+@benchmark("token: create_access_token")
+def _create_access_token():
+    user_id = uuid.uuid4()
+    return lambda: create_access_token(user_id, "worker")
+
+
+@benchmark("token: decode_token")
+def _decode_token():
+    token = create_access_token(uuid.uuid4(), "worker")
+    return lambda: decode_token(token)
+
+
+@benchmark("token: verify_token")
+def _verify_token():
+    token = create_access_token(uuid.uuid4(), "worker")
+    return lambda: verify_token(token, TokenType.ACCESS)
+
+
+def _verify_password(**options):
+    context = build_password_context(**options)
+    hashed = context.hash(PASSWORD)
+    return lambda: context.verify(PASSWORD, hashed)
+
+
+for _rounds in BCRYPT_COSTS:
+    benchmark(f"password: verify bcrypt rounds={_rounds}")(
+        lambda rounds=_rounds: _verify_password(scheme="bcrypt", bcrypt_rounds=rounds)
+    )
+
+try:
+    import argon2  # noqa: F401 (optional: PASSWORD_HASH_SCHEME=argon2)
+except ImportError:
+    pass
+else:
+    benchmark("password: verify argon2 (configured)")(lambda: _verify_password(scheme="argon2"))
+
+
+@benchmark("password: validate_password_strength")
+def _validate_password_strength():
+    # The last check decides, so every check runs
+    return lambda: validate_password_strength("correcthorsebatteryStaple9")
+
+
+@benchmark("profile: worker completion percentage")
+def _worker_completion():
+    profile = worker().worker_profile
+    return profile.calculate_completion_percentage
+
+
+@benchmark("profile: care home completion percentage")
+def _care_home_completion():
+    return care_home().calculate_completion_percentage
+
+
+@benchmark("schema: validate WorkerProfileUpdate")
+def _validate_worker_update():
+    body = json.dumps(WIZARD_UPDATE)
+    return lambda: WorkerProfileUpdate.model_validate_json(body)
+
+
+@benchmark("schema: serialize WorkerProfileResponse")
+def _serialize_worker_profile():
+    profile = worker().worker_profile
+    return lambda: WorkerProfileResponse.model_validate(profile).model_dump_json()
+
+
+@benchmark("schema: serialize CurrentUserResponse")
+def _serialize_current_user():
+    user = worker()
+    return lambda: build_current_user_response(user).model_dump_json()
+
+
+@benchmark("email: render verification")
+def _render_verification():
+    template = email_templates["verification"]
+    token = create_access_token(uuid.uuid4(), "worker")
+    return lambda: template.render(verification_token=token, first_name="Amelia")
+
+
+@benchmark("email: render worker welcome")
+def _render_worker_welcome():
+    template = email_templates["worker_welcome"]
+    return lambda: template.render(first_name="Amelia <script>")
+
+
+def measure(function, repeat: int) -> float:
+    """Best time per call in microseconds, over `repeat` batches of about 0.2s."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def run(names, repeat: int) -> dict:
+    results = {}
+    for name in names:
+        results[name] = round(measure(BENCHMARKS[name](), repeat), 3)
+        print(f"{name:<48}{results[name]:>14,.2f} µs")
+    return results
+
+
+def machine() -> dict:
+    """What the timings depend on besides the code."""
+    cpu = platform.machine()
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu = next(line.split(":", 1)[1].strip() for line in f if line.startswith("model name"))
+    except (OSError, StopIteration):
+        pass
+    return {"python": platform.python_version(), "cpu": cpu, "cpus": os.cpu_count()}
+
+
+def load_baseline():
+    try:
+        with open(BASELINE_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def check(results: dict, baseline: dict, threshold: float) -> int:
+    """Compare results with the baseline; returns the number of regressions."""
+    regressions = 0
+    print(f"\n{'benchmark':<48}{'baseline µs':>14}{'now µs':>14}{'change':>9}")
+    for name, value in results.items():
+        expected = baseline["results"].get(name)
+        if expected is None:
+            print(f"{name:<48}{'-':>14}{value:>14,.2f}{'new':>9}")
+            continue
+        change = value / expected - 1
+        regressed = change > threshold
+        regressions += regressed
+        print(f"{name:<48}{expected:>14,.2f}{value:>14,.2f}{change:>+9.0%}" + ("  ❌" if regressed else ""))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of per-request CPU work")
+    parser.add_argument("command", nargs="?", choices=["run", "save", "check"], default="run")
+    parser.add_argument("--only", help="run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="batches per benchmark (best one counts)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown for check (0.25 = 25%%)")
+    args = parser.parse_args()
+    
+    names = [name for name in BENCHMARKS if not args.only or args.only in name]
+    baseline = load_baseline()
+    if args.command == "check":
+        if baseline is None:
+            print(f"❌ No baseline at {BASELINE_PATH}; run `save` first")
+            return 2
+        if baseline["machine"] != machine():
+            print(f"⚠️  Baseline saved on {baseline['machine']}; this is {machine()}")
+    
+    print("=" * 62)
+    print(f"Hot path micro-benchmarks (best of {args.repeat} batches)")
+    print("=" * 62)
+    results = run(names, args.repeat)
+    
+    if args.command == "save":
+        if baseline and args.only:
+            results = dict(baseline["results"], **results)
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({"saved_at": datetime.utcnow().isoformat(timespec="seconds"), "machine": machine(),
+                       "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"\n✅ Baseline saved to {BASELINE_PATH}")
+    elif args.command == "check":
+        regressions = check(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {regressions} benchmark(s) more than {args.threshold:.0%} slower than the baseline")
+            return 1
+        print(f"\n✅ No benchmark more than {args.threshold:.0%} slower than the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
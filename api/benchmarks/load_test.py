@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+"""
+End-to-end load test of the signup journey.
+
+Starts the API with uvicorn (rate limiting off) against the local
+Postgres and Redis, then has each virtual user repeat the flow a new user
+goes through: register -> verify email -> login -> profile wizard PUTs
+(four steps for workers, two for care homes) -> /auth/me -> /public/stats.
+Load the database first with benchmarks.generate_data to test at scale.
+Passwords are hashed for real (BCRYPT_ROUNDS etc. apply), so register and
+login are CPU bound and shed load with 503 when the hash queue is full.
+
+While the load runs, pg_stat_activity is sampled for the API's
+connections: busy ones (running a query or inside a transaction) are the
+pool's checked-out connections, against a capacity of (pool_size +
+max_overflow) per uvicorn worker.
+
+Prints a table and writes a machine-readable JSON report: per-endpoint
+throughput, p50/p95/p99 latency and errors, flow counts and pool
+saturation.
+
+Usage (from api/, against a disposable Postgres):
+    DATABASE_URL=postgresql://... python -m benchmarks.load_test
+    DATABASE_URL=postgresql://... python -m benchmarks.load_test --users 100 --duration 60 --mode async
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import httpx
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.core.security import create_email_verification_token
+from benchmarks.db_modes import percentile, start_server
+from benchmarks.generate_data import FIRST_NAMES, LAST_NAMES, QUALIFICATIONS, SPECIALIZATIONS, place
+
+PASSWORD = "LoadTestPassw0rd"
+CARE_HOME_SHARE = 0.1
+
+# The API's connections to this database, busy ones being checked out of a pool
+POOL_QUERY = text("""
+    SELECT count(*) FILTER (WHERE state <> 'idle'), count(*)
+    FROM pg_stat_activity
+    WHERE datname = current_database() AND backend_type = 'client backend' AND pid <> pg_backend_pid()
+""")
+
+
+def worker_wizard(rng: random.Random):
+    """Profile wizard steps of a worker, one PUT body each."""
+    city, postcode, _, _ = place(rng)
+    rate_min = rng.choice([1050, 1100, 1200, 1300])
+    return [
+        {
+            "first_name": rng.choice(FIRST_NAMES), "last_name": rng.choice(LAST_NAMES),
+            "phone": f"07{rng.randrange(10**9):09d}", "date_of_birth": "1990-05-17",
+            "address_line_1": "1 High Street", "city": city, "postcode": postcode,
+        },
+        {
+            "dbs_status": "enhanced",
+            "qualifications": [{"code": code} for code in rng.sample(sorted(QUALIFICATIONS), 4)],
+        },
+        {
+            "years_experience": rng.choice(["0-1", "1-3", "3-5", "5+"]),
+            "specializations": rng.sample(SPECIALIZATIONS, 2), "languages": ["english"],
+            "bio": "Experienced and compassionate carer.",
+        },
+        {
+            "available_days": ["mon", "tue", "sat"], "shift_types": ["day", "night"],
+            "travel_radius_miles": 15, "hourly_rate_min": rate_min, "hourly_rate_max": rate_min + 200,
+        },
+    ]
+
+
+def care_home_wizard(rng: random.Random):
+    """Profile steps of a care home, one PUT body each."""
+    city, postcode, _, _ = place(rng)
+    return [
+        {
+            "business_name": f"{rng.choice(LAST_NAMES)} House", "care_home_type": "residential",
+            "contact_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "phone": f"01{rng.randrange(10**9):09d}",
+        },
+        {
+            "address_line_1": "2 High Street", "city": city, "postcode": postcode,
+            "description": "A friendly residential home.",
+        },
+    ]
+
+
+class Recorder:
+    """Latency and status of every request, by endpoint."""
+    
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+    
+    async def request(self, client, name, method, path, **kwargs):
+        """Send a request; returns the response, or None on an error status."""
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            response, status = None, type(e).__name__
+        self.latencies[name].append((time.perf_counter() - started) * 1000)
+        self.statuses[name][status] += 1
+        return response if response is not None and response.status_code < 400 else None
+
+
+async def flow(client, recorder: Recorder, rng: random.Random, email: str) -> bool:
+    """One new user's journey; False if a step failed (the rest are skipped)."""
+    care_home = rng.random() < CARE_HOME_SHARE
+    credentials = {"email": email, "password": PASSWORD}
+    response = await recorder.request(
+        client, "POST /auth/register", "POST", "/auth/register",
+        json=dict(credentials, user_type="care_home" if care_home else "worker"),
+    )
+    if response is None:
+        return False
+    
+    # The token the verification email would carry
+    token = create_email_verification_token(uuid.UUID(response.json()["user_id"]), email)
+    if await recorder.request(client, "POST /auth/verify-email", "POST", "/auth/verify-email", json={"token": token}) is None:
+        return False
+    
+    response = await recorder.request(client, "POST /auth/login", "POST", "/auth/login", json=credentials)
+    if response is None:
+        return False
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    
+    path = "/care-home/profile" if care_home else "/worker/profile"
+    for step in care_home_wizard(rng) if care_home else worker_wizard(rng):
+        if await recorder.request(client, f"PUT {path}", "PUT", path, json=step, headers=headers) is None:
+            return False
+    
+    if await recorder.request(client, "GET /auth/me", "GET", "/auth/me", headers=headers) is None:
+        return False
+    return await recorder.request(client, "GET /public/stats", "GET", "/public/stats") is not None
+
+
+async def run_load(base_url: str, args) -> dict:
+    """Run the flows with `args.users` virtual users for `args.duration` seconds."""
+    recorder = Recorder()
+    outcomes = Counter()
+    run = uuid.uuid4().hex[:8]
+    deadline = time.perf_counter() + args.duration
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    
+    async def virtual_user(number: int):
+        rng = random.Random(f"{run}-{number}")
+        iteration = 0
+        while time.perf_counter() < deadline:
+            email = f"load-{run}-{number}-{iteration}@vicarity.co.uk"
+            outcomes["completed" if await flow(client, recorder, rng, email) else "failed"] += 1
+            iteration += 1
+    
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_user(number) for number in range(args.users)))
+        elapsed = time.perf_counter() - started
+    
+    endpoints = {}
+    for name, latencies in recorder.latencies.items():
+        statuses = recorder.statuses[name]
+        endpoints[name] = {
+            "requests": len(latencies),
+            "errors": sum(count for status, count in statuses.items() if not (isinstance(status, int) and status < 400)),
+            "throughput_rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "max_ms": round(max(latencies), 1),
+            "statuses": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        }
+    return {
+        "elapsed_seconds": round(elapsed, 1),
+        "flows": {"completed": outcomes["completed"], "failed": outcomes["failed"],
+                  "per_second": round(outcomes["completed"] / elapsed, 1)},
+        "endpoints": endpoints,
+    }
+
+
+class PoolSampler(threading.Thread):
+    """Samples the API's busy and open database connections until stopped."""
+    
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+    
+    def run(self):
+        with engine.connect() as conn:
+            while not self._stop_event.wait(self.interval):
+                self.samples.append(tuple(conn.execute(POOL_QUERY).one()))
+                conn.rollback()  # Each sample in a fresh snapshot
+    
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+    
+    def report(self, capacity: int) -> dict:
+        busy = [sample[0] for sample in self.samples] or [0]
+        return {
+            "capacity": capacity,
+            "samples": len(self.samples),
+            "busy_mean": round(sum(busy) / len(busy), 1),
+            "busy_p95": percentile(busy, 95),
+            "busy_max": max(busy),
+            "open_max": max((sample[1] for sample in self.samples), default=0),
+            "saturation_mean": round(sum(busy) / len(busy) / capacity, 3),
+            "saturated_share": round(sum(1 for b in busy if b >= capacity) / len(busy), 3),
+        }
+
+
+def dataset_size() -> dict:
+    """Row counts the run started with."""
+    with engine.connect() as conn:
+        return {
+            table: conn.scalar(text(f"SELECT count(*) FROM {table}"))
+            for table in ("users", "worker_profiles", "care_home_profiles")
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load test of the signup journey")
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to start new flows for")
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn workers (production uses 2)")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--sample-interval", type=float, default=0.1, help="seconds between pool samples")
+    parser.add_argument("--report", default="load_test_report.json", help="JSON report path")
+    args = parser.parse_args()
+    
+    if not os.getenv("DATABASE_URL"):
+        print("DATABASE_URL must point at a disposable Postgres database")
+        return 1
+    
+    # Every virtual user registers from the same address
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    dataset = dataset_size()
+    capacity = args.workers * (engine.pool.size() + engine.pool._max_overflow)
+    
+    started_at = datetime.utcnow().isoformat()
+    process = start_server(args.mode, args.port, args.workers)
+    sampler = PoolSampler(args.sample_interval)
+    try:
+        sampler.start()
+        result = asyncio.run(run_load(f"http://127.0.0.1:{args.port}", args))
+    finally:
+        sampler.stop()
+        process.terminate()
+        process.wait()
+    
+    report = {
+        "started_at": started_at,
+        "config": {"mode": args.mode, "users": args.users, "duration": args.duration, "workers": args.workers},
+        "dataset": dataset,
+        **result,
+        "pool": sampler.report(capacity),
+    }
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"\n{args.mode} mode, {args.users} users, {args.workers} workers, "
+          f"{dataset['users']:,} users in the database\n")
+    print(f"{'endpoint':<26}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for name, endpoint in report["endpoints"].items():
+        print(f"{name:<26}{endpoint['throughput_rps']:>9.1f}{endpoint['p50_ms']:>9.1f}"
+              f"{endpoint['p95_ms']:>9.1f}{endpoint['p99_ms']:>9.1f}{endpoint['errors']:>8}")
+    flows, pool = report["flows"], report["pool"]
+    print(f"\nFlows: {flows['completed']:,} completed ({flows['per_second']}/s), {flows['failed']:,} failed")
+    print(f"Pool: {pool['busy_mean']} of {pool['capacity']} connections busy on average, "
+          f"{pool['busy_max']} at most; saturated {pool['saturated_share']:.0%} of the time")
+    print(f"\nReport written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Benchmark for worker match scoring (WorkerBitmapIndex.match()).
+
+Builds the worker index in memory from generated workers (no database)
+and times top-k matching for a few care home requests, plus the
+incremental updates that keep the snapshot current.
+
+Usage (from api/):
+    python -m benchmarks.matching
+    python -m benchmarks.matching --workers 1000000 --top 100
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from app.core.worker_index import WorkerBitmapIndex
+from app.schemas.worker import WorkerMatchCriteria
+
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+QUALIFICATIONS = ["CARE_CERT", "FIRST_AID_LVL3", "MOVING_HANDLING", "MEDICATION", "NVQ_LVL2", "NVQ_LVL3", "PEG_FEEDING"]
+
+# Care homes: York, with more or fewer requirements
+REQUESTS = {
+    "location only": {"latitude": 53.96, "longitude": -1.08},
+    "typical": {
+        "care_home_type": "dementia", "latitude": 53.96, "longitude": -1.08,
+        "qualifications": ["CARE_CERT", "FIRST_AID_LVL3"], "hourly_rate": 1150,
+    },
+    "everything": {
+        "care_home_type": "nursing", "latitude": 53.96, "longitude": -1.08,
+        "qualifications": ["CARE_CERT", "MEDICATION", "NVQ_LVL3", "PEG_FEEDING"],
+        "available_days": ["sat", "sun"], "shift_types": ["night"], "hourly_rate": 1300,
+    },
+    "no location": {"qualifications": ["NVQ_LVL2"], "shift_types": ["day"], "hourly_rate": 1100},
+}
+
+
+def workers(count: int, seed: int = 1):
+    """Workers spread over England, most within 150 miles of York."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        rate_min = rng.choice([None, 1050, 1100, 1150, 1200, 1300])
+        yield {
+            "id": uuid.UUID(int=rng.getrandbits(128)),
+            "user_id": uuid.UUID(int=rng.getrandbits(128)),
+            "updated_at": datetime(2026, 1, 1) + timedelta(seconds=rng.randrange(10**7)),
+            "dbs_status": rng.choice(["enhanced", "standard", "basic"]),
+            "qualifications": rng.sample(QUALIFICATIONS, rng.randrange(len(QUALIFICATIONS))),
+            "specializations": rng.sample(["elderly", "dementia", "palliative", "mental_health"], rng.randrange(3)),
+            "languages": ["english"],
+            "available_days": rng.sample(DAYS, rng.randrange(1, 8)),
+            "shift_types": rng.sample(["day", "night", "twilight"], rng.randrange(1, 4)),
+            "hourly_rate_min": rate_min,
+            "hourly_rate_max": rate_min and rate_min + 300,
+            "city": None,
+            "years_experience": rng.choice(["0-1", "1-3", "3-5", "5+", None]),
+            "travel_radius_miles": rng.choice([5, 10, 15, 25, None]),
+            "latitude": None if rng.random() < 0.1 else rng.uniform(51.5, 55.0),
+            "longitude": rng.uniform(-3.0, 0.0),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark worker match scoring")
+    parser.add_argument("--workers", type=int, default=500_000)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    
+    rows = list(workers(args.workers))
+    index = WorkerBitmapIndex("bench_matching")
+    started = time.perf_counter()
+    index.load(rows)
+    print(f"Snapshot of {args.workers:,} workers built in {time.perf_counter() - started:.1f}s")
+    
+    print(f"\n{'top ' + str(args.top):<20}{'p50 ms':>10}{'p99 ms':>10}{'best':>8}{'matched':>10}")
+    for name, criteria in REQUESTS.items():
+        criteria = WorkerMatchCriteria(**criteria)
+        index.match(criteria, args.top)  # Warm up
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            matches = index.match(criteria, args.top)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        print(f"{name:<20}{statistics.median(timings):>10.1f}{timings[int(len(timings) * 0.99)]:>10.1f}"
+              f"{matches[0][1] if matches else 0:>8.1f}{len(matches):>10}")
+    
+    # Incremental updates: changed profiles, then removed workers
+    changed = [dict(row, hourly_rate_min=900, updated_at=datetime(2026, 6, 1)) for row in rows[:100]]
+    started = time.perf_counter()
+    index.upsert(changed)
+    upserted = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    index.remove([row["user_id"] for row in rows[100:200]])
+    removed = (time.perf_counter() - started) * 1000
+    print(f"\nUpsert of 100 changed workers: {upserted:.1f} ms; removal of 100: {removed:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Password hashing cost benchmark.
+
+Reports verify latency (p50/p99) for each bcrypt cost and argon2
+parameter set on this machine, plus the verifies per second one CPU can
+sustain - use it to pick BCRYPT_ROUNDS / ARGON2_* for the deployment's CPU
+limit. No database needed.
+
+Usage (from api/):
+    python -m benchmarks.password_cost
+    python -m benchmarks.password_cost --bcrypt-rounds 10,11,12 --argon2 2:19456:1,3:65536:1
+    taskset -c 0 python -m benchmarks.password_cost   # pin to one CPU, like a 1-CPU container
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from app.core.security import build_password_context
+from benchmarks.db_modes import percentile
+
+PASSWORD = "BenchPassw0rd"
+
+
+def measure(context, samples: int):
+    """Verify latencies (ms) for one context."""
+    hashed = context.hash(PASSWORD)
+    context.verify(PASSWORD, hashed)  # Warm-up
+    
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify(PASSWORD, hashed)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def parse_argon2(spec: str):
+    """time_cost:memory_kib:parallelism"""
+    time_cost, memory_kib, parallelism = (int(part) for part in spec.split(":"))
+    return time_cost, memory_kib, parallelism
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark password verify latency per cost setting")
+    parser.add_argument("--bcrypt-rounds", default="10,11,12,13", help="comma-separated bcrypt costs")
+    parser.add_argument("--argon2", default="", help="comma-separated time:memory_kib:parallelism sets")
+    parser.add_argument("--samples", type=int, default=30, help="verifies per setting")
+    args = parser.parse_args()
+    
+    settings_to_test = [
+        (f"bcrypt rounds={rounds}", dict(scheme="bcrypt", bcrypt_rounds=int(rounds)))
+        for rounds in args.bcrypt_rounds.split(",") if rounds
+    ]
+    for spec in filter(None, args.argon2.split(",")):
+        time_cost, memory_kib, parallelism = parse_argon2(spec)
+        settings_to_test.append((
+            f"argon2 t={time_cost} m={memory_kib} p={parallelism}",
+            dict(scheme="argon2", argon2_time_cost=time_cost,
+                 argon2_memory_cost_kib=memory_kib, argon2_parallelism=parallelism),
+        ))
+    
+    print("=" * 72)
+    print(f"Password verify latency ({args.samples} samples per setting)")
+    print("=" * 72)
+    print(f"{'setting':<34}{'p50 ms':>9}{'p99 ms':>9}{'mean ms':>9}{'verifies/s/cpu':>16}")
+    
+    for label, options in settings_to_test:
+        try:
+            latencies = measure(build_password_context(**options), args.samples)
+        except Exception as e:
+            print(f"{label:<34}  ❌ {e}")
+            continue
+        p50 = percentile(latencies, 50)
+        print(
+            f"{label:<34}{p50:>9.1f}{percentile(latencies, 99):>9.1f}"
+            f"{statistics.mean(latencies):>9.1f}{1000 / p50:>16.1f}"
+        )
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
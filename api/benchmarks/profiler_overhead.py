@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Cost of the request profiler per request.
+
+Drives a FastAPI app in-process (no sockets) through MetricsMiddleware,
+as in production, in three setups:
+
+- disabled: PROFILER_ENABLED=false, the middleware isn't installed
+- idle: installed, no X-Profile header and a sample rate of 0
+- profiling: every request profiled (sampler thread, stacks, saved JSON)
+
+for an async route and a sync route (threadpool), each doing --work-ms
+of CPU work (default none, leaving the fixed cost per request). The best of --repeat rounds is reported, as time
+per request and overhead over disabled. Disabled runs exactly the stack
+the app runs without the profiler, so it is the baseline by construction.
+
+Usage (from api/):
+    DATABASE_URL=postgresql://localhost/unused python -m benchmarks.profiler_overhead
+    DATABASE_URL=postgresql://localhost/unused python -m benchmarks.profiler_overhead --requests 500 --work-ms 5
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+
+from fastapi import FastAPI
+
+from app.core import profiler
+from app.core.profiler import ProfileMiddleware
+from app.core.request_metrics import MetricsMiddleware
+
+
+def make_app(work_ms: float) -> FastAPI:
+    app = FastAPI()
+    
+    def work():
+        deadline = time.perf_counter() + work_ms / 1000
+        while time.perf_counter() < deadline:
+            pass
+    
+    @app.get("/async")
+    async def async_route():
+        work()
+        return {"status": "ok"}
+    
+    @app.get("/sync")
+    def sync_route():
+        work()
+        return {"status": "ok"}
+    
+    return app
+
+
+async def drive(app, path: str, requests: int) -> float:
+    """Mean seconds per request."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        pass
+    
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=1000, help="requests per round")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds; the best is reported")
+    parser.add_argument("--work-ms", type=float, default=0.0, help="CPU work per request")
+    args = parser.parse_args()
+    
+    app = make_app(args.work_ms)
+    setups = {
+        "disabled": MetricsMiddleware(app),
+        "idle": MetricsMiddleware(ProfileMiddleware(app, sample_rate=0.0)),
+        "profiling": MetricsMiddleware(ProfileMiddleware(app, sample_rate=1.0)),
+    }
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as profile_dir:
+        profiler.profile_store.directory = profile_dir
+        for path in ("/async", "/sync"):
+            for name, stack in setups.items():
+                asyncio.run(drive(stack, path, 20))  # Warm up
+            # Setups take turns within each round, so machine noise hits them alike
+            for _ in range(args.repeat):
+                for name, stack in setups.items():
+                    seconds = asyncio.run(drive(stack, path, args.requests))
+                    results[path, name] = min(seconds, results.get((path, name), seconds))
+    
+    print("\n" + "=" * 60)
+    print(f"Profiler overhead ({args.requests} requests x {args.repeat}, {args.work_ms:g} ms work each)")
+    print("=" * 60)
+    print(f"{'route':<10}{'setup':<12}{'us/request':>12}{'overhead us':>13}{'overhead':>10}")
+    for (path, name), seconds in results.items():
+        baseline = results[path, "disabled"]
+        overhead = seconds - baseline
+        print(f"{path:<10}{name:<12}{seconds * 1e6:>12.1f}{overhead * 1e6:>13.1f}{overhead / baseline:>10.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
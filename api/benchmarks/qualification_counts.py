@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Benchmark for /public/qualifications worker counts.
+
+Compares the previous per-qualification COUNT (N+1, one scan per
+qualification) with the single jsonb_array_elements GROUP BY query, and
+shows per-code containment counts served by the GIN (jsonb_path_ops)
+index for reference.
+
+Data is generated server-side into a scratch schema (bench_qualifications)
+which is dropped afterwards, so it never touches application tables.
+
+Usage (from api/):
+    DATABASE_URL=postgresql://... python -m benchmarks.qualification_counts
+    DATABASE_URL=postgresql://... python -m benchmarks.qualification_counts --sizes 100000 --repeat 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from sqlalchemy import func, select, text
+
+from app.core.database import engine, Base
+from app.models.qualification import Qualification, SEED_QUALIFICATIONS
+from app.models.worker_profile import WorkerProfile
+from app.routers.public import qualification_worker_counts_query
+
+SCHEMA = "bench_qualifications"
+
+
+def populate(conn, size: int):
+    """Insert `size` workers, each holding roughly a quarter of the codes."""
+    conn.execute(text("TRUNCATE worker_profiles, users, qualifications CASCADE"))
+    conn.execute(
+        Qualification.__table__.insert(),
+        [dict(q, category=q["category"].name) for q in SEED_QUALIFICATIONS],
+    )
+    conn.execute(text("""
+        INSERT INTO users (id, email, password_hash, role, email_verified, is_active, created_at, updated_at)
+        SELECT gen_random_uuid(), 'bench' || g || '@example.com', 'x', 'WORKER', true, true, now(), now()
+        FROM generate_series(1, :size) AS g
+    """), {"size": size})
+    conn.execute(text("""
+        INSERT INTO worker_profiles (
+            id, user_id, profile_completion_status, profile_completion_percentage, current_step,
+            dbs_status, qualifications, specializations, languages, soft_skills,
+            available_days, shift_types, willing_to_travel, has_own_transport, created_at, updated_at
+        )
+        SELECT
+            gen_random_uuid(), u.id, 'IN_PROGRESS', 50, 2, 'ENHANCED',
+            (
+                SELECT coalesce(jsonb_agg(jsonb_build_object('code', q.code, 'expiry_date', '2027-01-01')), '[]')
+                FROM qualifications q
+                WHERE abs(hashtext(u.email || q.code)) % 4 = 0
+            ),
+            '{}', '{}', '{}', '{}', '{}', true, false, now(), now()
+        FROM users u
+    """))
+    conn.execute(text("ANALYZE"))
+
+
+def time_query(conn, run, repeat: int) -> float:
+    """Median wall time (ms) of `run(conn)` over `repeat` runs."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(conn)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def n_plus_one_by_id(conn):
+    """Previous implementation: one jsonb_exists COUNT per qualification."""
+    for qual_id in conn.execute(select(Qualification.id).where(Qualification.is_active == True)).scalars():
+        conn.execute(
+            select(func.count()).select_from(WorkerProfile)
+            .where(func.jsonb_exists(WorkerProfile.qualifications, str(qual_id)))
+        ).scalar()
+
+
+def containment_per_code(conn):
+    """One GIN-backed containment COUNT per qualification code."""
+    for code in conn.execute(select(Qualification.code).where(Qualification.is_active == True)).scalars():
+        conn.execute(
+            select(func.count()).select_from(WorkerProfile)
+            .where(WorkerProfile.qualifications.contains([{"code": code}]))
+        ).scalar()
+
+
+def single_group_by(conn):
+    """Current implementation: one set-based query."""
+    conn.execute(qualification_worker_counts_query()).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark qualification worker counts")
+    parser.add_argument("--sizes", default="100000,1000000", help="comma-separated worker counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    sizes = [int(size) for size in args.sizes.split(",")]
+    strategies = [
+        ("N+1 jsonb_exists (before)", n_plus_one_by_id),
+        ("N+1 @> with GIN index", containment_per_code),
+        ("single GROUP BY (after)", single_group_by),
+    ]
+    
+    results = []
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        # Tables are created in the scratch schema explicitly (create_all would
+        # otherwise find the public ones); search_path resolves every query there
+        Base.metadata.create_all(bind=conn.execution_options(schema_translate_map={None: SCHEMA}))
+        conn.execute(text(f"SET search_path TO {SCHEMA}"))
+        conn.commit()
+        
+        try:
+            for size in sizes:
+                started = time.perf_counter()
+                populate(conn, size)
+                conn.commit()
+                print(f"Generated {size:,} worker profiles in {time.perf_counter() - started:.1f}s")
+                
+                for label, run in strategies:
+                    results.append((size, label, time_query(conn, run, args.repeat)))
+        finally:
+            conn.rollback()
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            conn.commit()
+    
+    print(f"\n{'workers':>10}  {'strategy':<28}{'median ms':>12}")
+    for size, label, elapsed in results:
+        print(f"{size:>10,}  {label:<28}{elapsed:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
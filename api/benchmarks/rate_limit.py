@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Rate limiter latency benchmark.
+
+Measures the cost of one limiter check (the login policy: IP + email in a
+single Lua round trip) against Redis at REDIS_URL, and against the
+in-process fallback. Run next to the production Redis to check the
+< 1 ms p99 budget.
+
+Usage (from api/):
+    REDIS_URL=redis://localhost:6379/0 python -m benchmarks.rate_limit
+    python -m benchmarks.rate_limit --checks 20000 --threads 8
+"""
+
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core import rate_limit
+from app.core.redis_client import connect_redis, close_redis
+from app.core.rate_limit import RateLimiter, parse_policy
+from benchmarks.db_modes import percentile
+
+
+def run_checks(limiter: RateLimiter, checks: int):
+    """Latencies (ms) of `checks` login checks from random clients."""
+    latencies = []
+    for _ in range(checks):
+        ip = f"10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(0, 255)}"
+        email = f"user{random.randint(0, 100000)}@vicarity.co.uk"
+        started = time.perf_counter()
+        limiter.check("login", ip=ip, email=email)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def report(label: str, latencies):
+    print(
+        f"{label:<28}{percentile(latencies, 50):>9.3f}{percentile(latencies, 99):>9.3f}"
+        f"{max(latencies):>9.3f}{len(latencies):>10}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rate limiter check latency")
+    parser.add_argument("--checks", type=int, default=10000, help="checks per thread")
+    parser.add_argument("--threads", type=int, default=4, help="concurrent threads for the second run")
+    args = parser.parse_args()
+    
+    limiter = RateLimiter({"login": parse_policy("ip:30/minute,email:5/minute")})
+    
+    backends = [("in-process", None)]
+    client = connect_redis()
+    if client is not None:
+        backends.insert(0, ("redis", client))
+    else:
+        print("⚠️  Redis unreachable, measuring the in-process fallback only")
+    
+    print("=" * 64)
+    print("Rate limiter check latency (login policy: ip + email)")
+    print("=" * 64)
+    print(f"{'backend':<28}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'checks':>10}")
+    
+    for name, backend in backends:
+        rate_limit.get_redis = lambda backend=backend: backend
+        run_checks(limiter, 200)  # Warm-up (script load, connection)
+        report(f"{name}, 1 thread", run_checks(limiter, args.checks))
+        
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            results = pool.map(run_checks, [limiter] * args.threads, [args.checks] * args.threads)
+            report(f"{name}, {args.threads} threads", [ms for batch in results for ms in batch])
+    
+    if client is not None:
+        for key in client.scan_iter(f"{rate_limit.KEY_PREFIX}:login:*", count=1000):
+            client.delete(key)
+    close_redis()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
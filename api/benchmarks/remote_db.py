@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+"""
+Latency of the profile-bearing routes against a remote database.
+
+Puts a TCP proxy in front of Postgres that holds every chunk for half of
+the given round trip time in each direction (default 20 ms, about a Neon
+database in a nearby region), starts the API against the proxy and times
+login, /auth/me and the profile GET/PUT routes one request at a time, so
+every SQL round trip a route makes shows up in its latency. Statements
+per request are read back from the server's /metrics.
+
+Run it on two checkouts to compare them; the rest of the request (bcrypt
+for login, pool pre-ping) is the same on both.
+
+Usage (from api/, against a disposable Postgres):
+    DATABASE_URL=postgresql://... python -m benchmarks.remote_db
+    DATABASE_URL=postgresql://... python -m benchmarks.remote_db --rtt 40 --requests 50 --mode async
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+from benchmarks.db_modes import percentile, start_server
+
+PASSWORD = "RemotePassw0rd"
+ACCOUNTS = {
+    "worker": "bench-remote-worker@vicarity.co.uk",
+    "care_home": "bench-remote-care-home@vicarity.co.uk",
+}
+
+
+class LatencyProxy:
+    """TCP proxy adding a fixed delay to each direction, on its own event loop thread."""
+    
+    def __init__(self, upstream, delay: float):
+        self.upstream = upstream  # (host, port), or a Unix socket path
+        self.delay = delay
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+    
+    def start(self) -> int:
+        threading.Thread(target=self._run, daemon=True).start()
+        self._started.wait()
+        return self.port
+    
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self._started.set()
+        self._loop.run_forever()
+    
+    async def _handle(self, client_reader, client_writer):
+        if isinstance(self.upstream, str):
+            upstream_reader, upstream_writer = await asyncio.open_unix_connection(self.upstream)
+        else:
+            upstream_reader, upstream_writer = await asyncio.open_connection(*self.upstream)
+        await asyncio.gather(
+            self._pipe(client_reader, upstream_writer),
+            self._pipe(upstream_reader, client_writer),
+            return_exceptions=True,
+        )
+    
+    async def _pipe(self, reader, writer):
+        """Forward chunks in order, each no earlier than `delay` after it arrived."""
+        queue = asyncio.Queue()
+        
+        async def forward():
+            while True:
+                due, data = await queue.get()
+                if data is None:
+                    break
+                wait = due - self._loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                writer.write(data)
+                await writer.drain()
+            writer.close()
+        
+        sender = asyncio.create_task(forward())
+        try:
+            while data := await reader.read(65536):
+                queue.put_nowait((self._loop.time() + self.delay, data))
+        finally:
+            queue.put_nowait((0, None))
+            await sender
+
+
+def proxied_url(url: str, delay: float) -> str:
+    """Start a LatencyProxy in front of the database in `url`; return the URL to use instead."""
+    from sqlalchemy.engine import make_url
+    
+    parsed = make_url(url)
+    query = dict(parsed.query)
+    socket_dir = query.pop("host", None)
+    port = parsed.port or 5432
+    if socket_dir:
+        upstream = os.path.join(socket_dir, f".s.PGSQL.{port}")
+    else:
+        upstream = (parsed.host or "localhost", port)
+    
+    proxy_port = LatencyProxy(upstream, delay).start()
+    return parsed.set(host="127.0.0.1", port=proxy_port, query=query).render_as_string(hide_password=False)
+
+
+def ensure_accounts():
+    """Verified worker and care home accounts to log in as (idempotent)."""
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.password_hashing import password_hasher
+    from app.models import CareHomeProfile, User, UserRole, WorkerProfile
+    
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        for user_type, email in ACCOUNTS.items():
+            if db.query(User).filter(User.email == email).first():
+                continue
+            worker = user_type == "worker"
+            user = User(
+                email=email,
+                password_hash=password_hasher.hash(PASSWORD),
+                role=UserRole.WORKER if worker else UserRole.CARE_HOME_ADMIN,
+                email_verified=True,
+            )
+            db.add(user)
+            db.flush()
+            db.add(WorkerProfile(user_id=user.id) if worker else
+                   CareHomeProfile(user_id=user.id, profile_completion_percentage="0"))
+        db.commit()
+    engine.dispose()
+
+
+def run(base_url: str, requests: int):
+    """Time each route `requests` times, sequentially; returns {route: [ms, ...]}."""
+    latencies = {}
+    
+    def timed(name, method, path, **kwargs):
+        start = time.perf_counter()
+        response = client.request(method, path, **kwargs)
+        latencies.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        return response
+    
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        for user_type, email in ACCOUNTS.items():
+            profile_path = "/worker/profile" if user_type == "worker" else "/care-home/profile"
+            field = "first_name" if user_type == "worker" else "business_name"
+            login = {"email": email, "password": PASSWORD}
+            headers = {"Authorization": f"Bearer {client.post('/auth/login', json=login).json()['access_token']}"}
+            client.get(profile_path, headers=headers)  # Warm the principal cache
+            
+            for i in range(requests):
+                timed("POST /auth/login", "POST", "/auth/login", json=login)
+                timed("GET /auth/me", "GET", "/auth/me", headers=headers)
+                timed(f"GET {profile_path}", "GET", profile_path, headers=headers)
+                timed(f"PUT {profile_path}", "PUT", profile_path, headers=headers, json={field: f"Bench {i}"})
+        
+        metrics = client.get("/metrics").text
+    
+    statements = {}
+    for route in latencies:
+        method, path = route.split(" ", 1)
+        labels = f'{{method="{method}",route="{path}"}}'
+        total, count = (
+            float(re.search(rf"^vicarity_http_request_sql_statements_{kind}{re.escape(labels)} (\S+)$", metrics, re.M).group(1))
+            for kind in ("sum", "count")
+        )
+        statements[route] = total / count if count else 0.0
+    return latencies, statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rtt", type=float, default=20.0, help="simulated round trip time in ms")
+    parser.add_argument("--requests", type=int, default=30, help="requests per route and account")
+    parser.add_argument("--mode", choices=("sync", "async"), default="sync")
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+    
+    if not os.getenv("DATABASE_URL"):
+        print("DATABASE_URL must point at a disposable Postgres database")
+        return 1
+    
+    ensure_accounts()
+    os.environ["DATABASE_URL"] = proxied_url(os.environ["DATABASE_URL"], args.rtt / 2000)
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    
+    with tempfile.TemporaryDirectory() as metrics_dir:
+        os.environ["METRICS_DIR"] = metrics_dir
+        process = start_server(args.mode, args.port, workers=1)
+        try:
+            latencies, statements = run(f"http://127.0.0.1:{args.port}", args.requests)
+        finally:
+            process.terminate()
+            process.wait()
+    
+    print("\n" + "=" * 60)
+    print(f"Routes over a {args.rtt:g} ms RTT database ({args.mode}, {args.requests} x 2 accounts)")
+    print("=" * 60)
+    print(f"{'route':<26}{'SQL/req':>8}{'p50 ms':>9}{'p95 ms':>9}")
+    for route, samples in latencies.items():
+        print(f"{route:<26}{statements[route]:>8.1f}{percentile(samples, 50):>9.1f}{percentile(samples, 95):>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
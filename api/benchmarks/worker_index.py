@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Build time, memory and query latency of the in-memory worker index.
+
+Generates worker profiles into a scratch schema (bench_worker_search,
+shared with benchmarks.worker_search and dropped afterwards), loads them
+into a WorkerBitmapIndex, then compares each search from
+benchmarks.worker_search answered by the index (IDs of one page) with the
+same search in SQL, and times bitmap-only AND / OR counts and
+incremental updates.
+
+Usage (from api/):
+    DATABASE_URL=postgresql://... python -m benchmarks.worker_index
+    DATABASE_URL=postgresql://... python -m benchmarks.worker_index --size 100000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.database import engine, Base
+from app.core.pagination import decode_cursor
+from app.core.worker_index import Term, WorkerBitmapIndex, load_workers, search_filter
+from app.schemas.worker import WorkerSearchFilters
+from app.routers.care_home import worker_search_query
+from benchmarks.worker_search import SCHEMA, SEARCHES, populate, search_filters
+
+COUNTS = {
+    "enhanced AND polish": Term("dbs_status", "enhanced") & Term("languages", "polish"),
+    "(night OR twilight) AND sat AND dementia": (
+        (Term("shift_types", "night") | Term("shift_types", "twilight"))
+        & Term("available_days", "sat") & Term("specializations", "dementia")
+    ),
+    "3 qualifications": search_filter(WorkerSearchFilters(qualifications=["MOVING_HANDLING", "FIRE_SAFETY", "NVQ_LVL3"])),
+}
+
+
+def median_ms(run, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the worker bitmap index")
+    parser.add_argument("--size", type=int, default=1_000_000, help="worker profiles to generate")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        Base.metadata.create_all(bind=conn.execution_options(schema_translate_map={None: SCHEMA}))
+        conn.execute(text(f"SET search_path TO {SCHEMA}"))
+        conn.commit()
+        
+        try:
+            started = time.perf_counter()
+            populate(conn, args.size)
+            conn.commit()
+            print(f"Generated {args.size:,} worker profiles in {time.perf_counter() - started:.1f}s\n")
+            
+            db = Session(bind=conn)
+            started = time.perf_counter()
+            rows = list(load_workers(db))
+            fetched = time.perf_counter() - started
+            
+            index = WorkerBitmapIndex("bench_worker_index")
+            started = time.perf_counter()
+            index.load(rows)
+            built = time.perf_counter() - started
+            memory = index.memory()
+            
+            # Again under tracemalloc (much slower) for the transient peak
+            tracemalloc.start()
+            WorkerBitmapIndex("bench_worker_index_traced").load(rows)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            print(f"Searchable workers: {index.stats['workers']:,}")
+            print(f"Fetch from Postgres: {fetched:.1f}s   build: {built:.1f}s")
+            print(f"Memory: {memory['bitmap_count']} bitmaps {memory['bitmaps'] / 2**20:.1f} MiB, "
+                  f"columns {memory['columns'] / 2**20:.1f} MiB, build peak {peak / 2**20:.0f} MiB\n")
+            
+            print(f"{'search':<32}{'index ms':>10}{'SQL ms':>10}  same page")
+            for label, search in SEARCHES.items():
+                filters = search_filters(conn, search)
+                query = worker_search_query(filters)
+                after = decode_cursor(filters.cursor) if filters.cursor else None
+                
+                indexed = lambda: index.search(filters, filters.limit, after)
+                sql_ms = median_ms(lambda: conn.execute(query).all(), max(3, args.repeat // 4))
+                index_ms = median_ms(indexed, args.repeat)
+                same = indexed()[0] == [row.id for row in conn.execute(query).all()[:filters.limit]]
+                print(f"{label:<32}{index_ms:>10.2f}{sql_ms:>10.2f}  {'yes' if same else 'NO'}")
+            
+            print(f"\n{'bitmap count':<44}{'ms':>8}{'workers':>10}")
+            for label, expression in COUNTS.items():
+                elapsed = median_ms(lambda: index.count(expression), args.repeat)
+                print(f"{label:<44}{elapsed:>8.3f}{index.count(expression):>10,}")
+            
+            changed = [dict(row, languages=["english", "welsh"]) for row in rows[:100]]
+            elapsed = median_ms(lambda: index.upsert(changed), 5)
+            print(f"\nUpsert of 100 changed workers: {elapsed:.1f} ms")
+            elapsed = median_ms(lambda: index.remove([row["user_id"] for row in rows[:100]]), 1)
+            print(f"Removal of 100 workers: {elapsed:.1f} ms")
+        finally:
+            conn.rollback()
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            conn.commit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
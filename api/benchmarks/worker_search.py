@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+"""
+Benchmark and query plans for GET /care-home/workers/search.
+
+Generates worker profiles server-side into a scratch schema
+(bench_worker_search, dropped afterwards) with the search indexes, then
+times typical searches - first page, a deep page reached through the
+cursor, and each filter - and prints the plan of each one.
+
+test_worker_search.py reuses populate() to assert the plans use the
+indexes at 1M profiles.
+
+Usage (from api/):
+    DATABASE_URL=postgresql://... python -m benchmarks.worker_search
+    DATABASE_URL=postgresql://... python -m benchmarks.worker_search --size 100000 --plans
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.database import engine, Base
+from app.core.pagination import encode_cursor
+from app.models.qualification import Qualification, SEED_QUALIFICATIONS
+from app.routers.care_home import worker_search_query
+from app.schemas.worker import WorkerSearchFilters
+
+SCHEMA = "bench_worker_search"
+
+CITIES = [
+    "London", "Birmingham", "Manchester", "Leeds", "Glasgow", "Sheffield", "Bradford", "Liverpool",
+    "Edinburgh", "Bristol", "Cardiff", "Leicester", "Coventry", "Nottingham", "Newcastle", "Belfast",
+    "Brighton", "Hull", "Plymouth", "Stoke-on-Trent", "Wolverhampton", "Derby", "Swansea", "Southampton",
+    "Salford", "Aberdeen", "Westminster", "Portsmouth", "York", "Peterborough", "Dundee", "Lancaster",
+    "Oxford", "Newport", "Preston", "St Albans", "Norwich", "Chester", "Cambridge", "Exeter",
+]
+
+SEARCHES = {
+    "first page": {},
+    "deep page (cursor)": {"cursor": "deep"},
+    "city": {"city": "york"},
+    "qualification": {"qualifications": ["FIRST_AID_LVL3"]},
+    "rare qualification": {"qualifications": ["NURSING_DEGREE"]},
+    "specialization + night shifts": {"specializations": ["palliative"], "shift_types": ["night"]},
+    "language": {"languages": ["polish"]},
+    "rare language": {"languages": ["gujarati"]},
+    "enhanced DBS + rate": {"dbs_status": ["enhanced"], "hourly_rate_min": 1100, "hourly_rate_max": 1300},
+    "everything": {
+        "city": "leeds", "dbs_status": ["enhanced"], "qualifications": ["MOVING_HANDLING"],
+        "specializations": ["dementia"], "available_days": ["sat"], "hourly_rate_max": 1400,
+    },
+}
+
+
+def pick(values: str, salt: str, modulo: int) -> str:
+    """SQL for an array of the words in `values` each kept with probability 1/modulo."""
+    return f"""ARRAY(
+        SELECT v FROM unnest('{{{values}}}'::text[]) AS v
+        WHERE abs(hashtext(u.email || '{salt}' || v)) % {modulo} = 0
+    )"""
+
+
+def populate(conn, size: int):
+    """
+    Insert `size` workers: about 60% complete, skewed like real profiles
+    (most speak English, few hold specialist qualifications, a few large
+    cities).
+    """
+    conn.execute(text("TRUNCATE worker_profiles, users, qualifications CASCADE"))
+    conn.execute(
+        Qualification.__table__.insert(),
+        [dict(q, category=q["category"].name) for q in SEED_QUALIFICATIONS],
+    )
+    conn.execute(text("""
+        INSERT INTO users (id, email, password_hash, role, email_verified, is_active, created_at, updated_at)
+        SELECT gen_random_uuid(), 'bench' || g || '@example.com', 'x', 'WORKER', true, g % 50 <> 0, now(), now()
+        FROM generate_series(1, :size) AS g
+    """), {"size": size})
+    conn.execute(text(f"""
+        INSERT INTO worker_profiles (
+            id, user_id, profile_completion_status, profile_completion_percentage, current_step,
+            first_name, last_name, city, dbs_status, qualifications,
+            specializations, languages, soft_skills, available_days, shift_types,
+            hourly_rate_min, hourly_rate_max, willing_to_travel, has_own_transport, created_at, updated_at
+        )
+        SELECT
+            gen_random_uuid(), u.id,
+            (CASE WHEN h % 10 < 6 THEN 'COMPLETE' ELSE 'IN_PROGRESS' END)::profilecompletionstatus,
+            CASE WHEN h % 10 < 6 THEN 100 ELSE 50 END, 4,
+            'Worker', 'Bench',
+            (:cities)[1 + floor(power(random(), 2) * :city_count)::int],
+            (ARRAY['ENHANCED', 'ENHANCED', 'ENHANCED', 'STANDARD', 'BASIC', 'PENDING'])[1 + h % 6]::dbsstatus,
+            (
+                SELECT coalesce(jsonb_agg(jsonb_build_object('code', q.code, 'expiry_date', '2027-01-01')), '[]')
+                FROM qualifications q
+                WHERE abs(hashtext(u.email || q.code)) % (
+                    CASE WHEN q.is_mandatory THEN 2 WHEN q.code = 'NURSING_DEGREE' THEN 2000
+                         WHEN q.code IN ('PEG_FEEDING', 'STOMA_CARE') THEN 200 ELSE 12 END
+                ) = 0
+            ),
+            {pick("elderly,dementia,palliative,learning_disabilities,mental_health,physical_disabilities", "s", 4)},
+            CASE WHEN h % 20 = 0 THEN ARRAY['english', 'polish'] WHEN h % 30 = 0 THEN ARRAY['english', 'romanian']
+                 WHEN h % 2999 = 0 THEN ARRAY['english', 'gujarati'] ELSE ARRAY['english'] END,
+            '{{}}',
+            {pick("mon,tue,wed,thu,fri,sat,sun", "d", 2)},
+            {pick("day,night,twilight,weekend", "t", 3)},
+            900 + (h % 8) * 50, 1100 + (h % 12) * 50,
+            true, h % 3 = 0,
+            now() - interval '2 years', now() - random() * interval '365 days'
+        FROM (SELECT u.*, abs(hashtext(u.email)) AS h FROM users u) AS u
+    """), {"cities": CITIES, "city_count": len(CITIES)})
+    conn.execute(text("ANALYZE"))
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN of a statement, keeping its bound parameters."""
+    inherit_cache = False
+    
+    def __init__(self, statement, options: str):
+        self.statement = statement
+        self.options = options
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element, compiler, **kw):
+    return f"EXPLAIN ({element.options}) " + compiler.process(element.statement, **kw)
+
+
+def search_filters(conn, search: dict) -> WorkerSearchFilters:
+    """WorkerSearchFilters for a SEARCHES entry."""
+    search = dict(search)
+    if search.get("cursor") == "deep":
+        # Key of a row ~90% down the newest-first listing
+        updated_at, id = conn.execute(text("""
+            SELECT updated_at, id FROM worker_profiles WHERE profile_completion_status = 'COMPLETE'
+            ORDER BY updated_at DESC, id DESC OFFSET (SELECT count(*) * 9 / 10 FROM worker_profiles
+            WHERE profile_completion_status = 'COMPLETE') LIMIT 1
+        """)).one()
+        search["cursor"] = encode_cursor(updated_at, id)
+    return WorkerSearchFilters(**search)
+
+
+def search_query(conn, search: dict):
+    """worker_search_query() for a SEARCHES entry."""
+    return worker_search_query(search_filters(conn, search))
+
+
+def explain(conn, query) -> dict:
+    """EXPLAIN (ANALYZE, FORMAT JSON) plan of `query`."""
+    return conn.execute(Explain(query, "ANALYZE, BUFFERS, FORMAT JSON")).scalar()[0]
+
+
+def plan_nodes(node: dict):
+    """Every node of an EXPLAIN JSON plan tree."""
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark worker search")
+    parser.add_argument("--size", type=int, default=1_000_000, help="worker profiles to generate")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--plans", action="store_true", help="print each search's query plan")
+    args = parser.parse_args()
+    
+    results = []
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        Base.metadata.create_all(bind=conn.execution_options(schema_translate_map={None: SCHEMA}))
+        conn.execute(text(f"SET search_path TO {SCHEMA}"))
+        conn.commit()
+        
+        try:
+            started = time.perf_counter()
+            populate(conn, args.size)
+            conn.commit()
+            print(f"Generated {args.size:,} worker profiles in {time.perf_counter() - started:.1f}s")
+            
+            for label, search in SEARCHES.items():
+                query = search_query(conn, search)
+                samples = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    rows = conn.execute(query).all()
+                    samples.append((time.perf_counter() - started) * 1000)
+                plan = explain(conn, query)
+                indexes = sorted({n["Index Name"] for n in plan_nodes(plan["Plan"]) if "Index Name" in n})
+                results.append((label, len(rows), statistics.median(samples), indexes))
+                if args.plans:
+                    print(f"\n-- {label}")
+                    for line in conn.execute(Explain(query, "ANALYZE")).scalars():
+                        print(line)
+        finally:
+            conn.rollback()
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            conn.commit()
+    
+    print(f"\n{'search':<32}{'rows':>6}{'median ms':>11}  indexes")
+    for label, rows, elapsed, indexes in results:
+        print(f"{label:<32}{rows:>6}{elapsed:>11.2f}  {', '.join(indexes)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Postcode index ingest for Vicarity.
+
+Builds the memory-mapped postcode index (POSTCODE_INDEX_PATH) from a
+postcode centroid CSV, e.g. the ONS Postcode Directory (ONSPD) or the
+National Statistics Postcode Lookup (NSPL): pcds/pcd, lat and long
+columns. Restart the API afterwards to pick up the new index.
+
+Optionally geocodes existing profiles whose postcode has no coordinates.
+
+Usage:
+    python ingest_postcodes.py ONSPD_MAY_2026_UK.csv
+    python ingest_postcodes.py ONSPD_MAY_2026_UK.csv --backfill
+"""
+
+import math
+import sys
+import time
+
+from sqlalchemy import bindparam, select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.geocoding import ingest, postcode_index
+from app.models.care_home_profile import CareHomeProfile
+from app.models.worker_profile import WorkerProfile
+
+
+def backfill(db) -> int:
+    """Geocode profiles with a postcode but no coordinates."""
+    geocoded = 0
+    for model in (WorkerProfile, CareHomeProfile):
+        table = model.__table__
+        rows = db.execute(select(table.c.id, table.c.postcode).where(
+            table.c.postcode.isnot(None), table.c.latitude.is_(None),
+        )).all()
+        latitudes, longitudes = postcode_index.lookup_many([row.postcode for row in rows])
+        found = [
+            {"_id": row.id, "_latitude": float(latitude), "_longitude": float(longitude)}
+            for row, latitude, longitude in zip(rows, latitudes, longitudes)
+            if not math.isnan(latitude)
+        ]
+        if found:
+            # updated_at is kept: geocoding is not an edit (and orders worker search)
+            db.execute(
+                table.update()
+                .where(table.c.id == bindparam("_id"))
+                .values(latitude=bindparam("_latitude"), longitude=bindparam("_longitude"), updated_at=table.c.updated_at),
+                found,
+            )
+        db.commit()
+        geocoded += len(found)
+    return geocoded
+
+
+def main():
+    """Ingest a postcode CSV."""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if len(args) != 1:
+        print(__doc__)
+        return 2
+    
+    print("=" * 60)
+    print("Vicarity Postcode Ingest")
+    print("=" * 60)
+    
+    try:
+        started = time.perf_counter()
+        count = ingest(args[0], settings.POSTCODE_INDEX_PATH)
+        print(f"\n✅ {count:,} postcodes written to {settings.POSTCODE_INDEX_PATH} "
+              f"in {time.perf_counter() - started:.1f}s")
+    except (OSError, ValueError) as e:
+        print(f"\n❌ Error ingesting postcodes: {e}")
+        return 1
+    
+    if "--backfill" in sys.argv[1:]:
+        db = SessionLocal()
+        try:
+            print(f"✅ Geocoded {backfill(db):,} profiles")
+        except Exception as e:
+            print(f"\n❌ Error geocoding profiles: {e}")
+            db.rollback()
+            return 1
+        finally:
+            db.close()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,57 +4,110 @@ Vicarity API - Main Application
 Complete authentication system with smart routing based on user type.
 """
 
+import logging
 import os
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List, Optional
 
-import redis
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.routers import auth, worker, care_home
+from app.core.database import engine, async_engine, SessionLocal, Base, warm_up_async_pool, warm_up_pool
+from app.core.cache import cache_stats
+from app.core.health_prober import health_prober
+from app.core.loop_monitor import loop_monitor
+from app.core.password_hashing import password_hasher
+from app.core.profiler import ProfileMiddleware
+from app.core.rate_limit import rate_limiter
+from app.core.redis_client import connect_redis, close_redis
+from app.core.request_logging import RequestLogMiddleware, configure_logging
+from app.core.request_metrics import MetricsMiddleware, request_metrics
+from app.core.worker_index import worker_index_updater
+from app.models.platform_counter import ensure_counters_initialized
 
+# Route handlers: async (asyncpg + AsyncSession) or sync (psycopg2 + threadpool)
+if settings.DB_ASYNC:
+    from app.routers.aio import admin, auth, worker, care_home, public
+else:
+    from app.routers import admin, auth, worker, care_home, public
 
-# Redis connection
-redis_client = None
+# JSON lines through a queue (before anything logs)
+configure_logging()
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application startup and shutdown events."""
-    global redis_client
-    
     # Startup
-    print(f"Starting Vicarity API in {settings.ENVIRONMENT} mode...")
+    logger.info(
+        "Starting Vicarity API in %s mode (database driver: %s)",
+        settings.ENVIRONMENT, "asyncpg (async)" if settings.DB_ASYNC else "psycopg2 (sync)",
+    )
     
     # Create database tables (in production, use Alembic migrations)
-    print("Checking database tables...")
     try:
         Base.metadata.create_all(bind=engine)
-        print("Database tables ready")
+        logger.info("Database tables ready")
     except Exception as e:
         # Tables likely already exist (this is fine)
-        print(f"Database tables check: {str(e)[:100]}")
-        print("Continuing with existing tables...")
+        logger.warning("Database tables check: %s; continuing with existing tables", str(e)[:100])
+    
+    # Backfill platform counters on first start (later starts are a no-op)
+    try:
+        db = SessionLocal()
+        try:
+            if ensure_counters_initialized(db):
+                logger.info("Platform counters backfilled")
+        finally:
+            db.close()
+    except Exception as e:
+        logger.warning("Platform counters check: %s", str(e)[:100])
     
+    # Open the pool's connections before serving (not behind a transaction pooler)
     try:
-        redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-        redis_client.ping()
-        print("Redis connected")
+        if settings.DB_ASYNC:
+            opened = await warm_up_async_pool()
+        else:
+            opened = await run_in_threadpool(warm_up_pool)
+        if opened:
+            logger.info("Database pool warmed up: %d connections", opened)
     except Exception as e:
-        print(f"Redis connection failed: {e}")
-        redis_client = None
+        logger.warning("Database pool warm-up: %s", str(e)[:100])
+    
+    connect_redis()
+    
+    # First results before serving, then every HEALTH_PROBE_INTERVAL_SECONDS
+    await run_in_threadpool(health_prober.probe_once)
+    health_prober.start()
+    
+    if settings.METRICS_ENABLED:
+        request_metrics.start()
+    
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    
+    # Built in the background; worker search uses SQL until it is ready
+    if settings.WORKER_INDEX_ENABLED:
+        worker_index_updater.start()
     
     yield
     
     # Shutdown
-    print("Shutting down Vicarity API...")
-    if redis_client:
-        redis_client.close()
+    logger.info("Shutting down Vicarity API")
+    await loop_monitor.stop()
+    await run_in_threadpool(worker_index_updater.stop)
+    await run_in_threadpool(request_metrics.stop)
+    await run_in_threadpool(health_prober.stop)
+    password_hasher.shutdown()
+    close_redis()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 # Create FastAPI app
@@ -75,6 +128,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# On-demand request profiles (not installed unless enabled: no per-request cost)
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfileMiddleware)
+
+# Request IDs and access lines (inside MetricsMiddleware, for its timings)
+app.add_middleware(RequestLogMiddleware)
+
+# Per-route latency, SQL, pool and Redis timings (served at /metrics)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 
 # Include routers
 app.include_router(auth.router)
@@ -82,9 +146,11 @@ app.include_router(worker.router)
 app.include_router(care_home.router)
 
 # Public API (no auth required)
-from app.routers import public
 app.include_router(public.router)
 
+# Diagnostics (admins only)
+app.include_router(admin.router)
+
 
 # Response models
 class EndpointStatus(BaseModel):
@@ -100,39 +166,31 @@ class HealthResponse(BaseModel):
     database: str
     redis: str
     endpoints: List[EndpointStatus]
+    event_loop_lag_ms: Optional[Dict[str, float]] = None
+    caches: Optional[Dict[str, Dict[str, int]]] = None
+    password_hashing: Optional[Dict[str, Any]] = None
+    rate_limits: Optional[Dict[str, int]] = None
+    checks: Optional[Dict[str, Dict[str, Any]]] = None
 
 
 class MessageResponse(BaseModel):
     message: str
 
 
+# Probe statuses as /health has always reported them
+HEALTH_STATUS = {"ok": "connected", "disconnected": "disconnected", None: "unknown"}
+
+
 # Health check endpoint
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """
     Health check endpoint for monitoring and load balancers.
-    Includes status of all API endpoints and services.
+    Includes status of all API endpoints and services, as of the last
+    background probes (see app/core/health_prober.py).
     """
-    # Check database
-    db_status = "connected"
-    try:
-        from app.core.database import SessionLocal
-        from sqlalchemy import text
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db.close()
-    except Exception as e:
-        db_status = "error"
-        print(f"Database health check error: {e}")
-    
-    # Check Redis
-    redis_status = "disconnected"
-    if redis_client:
-        try:
-            redis_client.ping()
-            redis_status = "connected"
-        except Exception:
-            redis_status = "error"
+    db_status = HEALTH_STATUS.get(health_prober.status("database"), "error")
+    redis_status = HEALTH_STATUS.get(health_prober.status("redis"), "error")
     
     # Check API endpoints (note: nginx adds /api prefix, so actual paths are /api/auth/*, etc.)
     endpoints = [
@@ -175,6 +233,48 @@ async def health_check():
         database=db_status,
         redis=redis_status,
         endpoints=endpoints,
+        event_loop_lag_ms=loop_monitor.percentiles() if settings.LOOP_MONITOR_ENABLED else None,
+        caches=cache_stats(),
+        password_hashing=password_hasher.stats(),
+        rate_limits=dict(rate_limiter.stats),
+        checks=health_prober.results(),
+    )
+
+
+@app.get("/health/live")
+async def liveness():
+    """
+    Liveness: the worker is serving requests. Never checks dependencies,
+    so an outage elsewhere doesn't get healthy workers restarted.
+    """
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    Readiness, from the last background probes: the database answered
+    recently and the pool has a free connection. 503 otherwise.
+    """
+    ready, reasons, pool = health_prober.readiness()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "reasons": reasons,
+                 "checks": health_prober.results(), "pool": pool},
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """
+    Prometheus metrics, merged across worker processes.
+    Scraped on the internal network; nginx does not expose it.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(
+        await run_in_threadpool(request_metrics.exposition),
+        media_type="text/plain; version=0.0.4",
     )
 
 
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Platform counter reconciliation for Vicarity.
+
+Recomputes the counters behind /public/stats from the users and profile
+tables and repairs any drift. Safe to run while the API is serving
+traffic; schedule it (e.g. nightly cron) to catch changes made outside
+the ORM.
+
+Usage:
+    python reconcile_counters.py            # Repair drift
+    python reconcile_counters.py --dry-run  # Report drift only
+"""
+
+import sys
+from app.core.database import SessionLocal
+from app.models.platform_counter import reconcile_counters
+
+
+def main():
+    """Reconcile platform counters."""
+    dry_run = "--dry-run" in sys.argv[1:]
+    
+    print("=" * 60)
+    print("Vicarity Counter Reconciliation" + (" (dry run)" if dry_run else ""))
+    print("=" * 60)
+    
+    db = SessionLocal()
+    
+    try:
+        drift = reconcile_counters(db, repair=not dry_run)
+        
+        if not drift:
+            print("\n✅ All counters match")
+        else:
+            for name, values in sorted(drift.items()):
+                print(f"  {name}: stored={values['stored']} actual={values['actual']}")
+            action = "found" if dry_run else "repaired"
+            print(f"\n⚠️  Drift {action} in {len(drift)} counters")
+        
+        return 0
+        
+    except Exception as e:
+        print(f"\n❌ Error reconciling counters: {e}")
+        db.rollback()
+        return 1
+        
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Email outbox sender for Vicarity.
+
+Delivers the transactional emails queued by the API (verification,
+welcome, password reset) in batches through Resend. Run it as its own
+long-lived process next to the API; several instances may run at once.
+
+Usage:
+    python send_emails.py          # Run until SIGTERM / Ctrl+C
+    python send_emails.py --once   # Send everything due, then exit
+    python send_emails.py --fake   # Don't call Resend (local development)
+"""
+
+import signal
+import sys
+import threading
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.email_sender import FakeTransport, OutboxSender, ResendTransport
+
+
+def main():
+    """Run the email outbox sender."""
+    once = "--once" in sys.argv[1:]
+    fake = "--fake" in sys.argv[1:]
+    
+    print("=" * 60)
+    print("Vicarity Email Sender" + (" (fake transport)" if fake else ""))
+    print("=" * 60)
+    
+    if not fake and not settings.RESEND_API_KEY:
+        # Never fall back to the fake transport: it would mark real emails sent
+        print("\n❌ RESEND_API_KEY is not set; refusing to start (use --fake for local development)")
+        return 1
+    
+    if fake:
+        transport = FakeTransport()
+    else:
+        transport = ResendTransport(
+            api_key=settings.RESEND_API_KEY,
+            base_url=settings.EMAIL_API_URL,
+            timeout=settings.EMAIL_SEND_TIMEOUT_SECONDS,
+        )
+    sender = OutboxSender(SessionLocal, transport)
+    
+    try:
+        if once:
+            sender.drain()
+        else:
+            stop = threading.Event()
+            signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+            signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+            print(f"\n📬 Polling the outbox every {settings.EMAIL_POLL_INTERVAL_SECONDS}s "
+                  f"(batches of {settings.EMAIL_BATCH_SIZE})")
+            sender.run(stop)
+        
+        stats = sender.stats
+        print(f"\n✅ Sent {stats['sent']} emails in {stats['batches']} batches "
+              f"({stats['retried']} retries scheduled, {stats['failed']} failed)")
+        return 0
+    
+    except Exception as e:
+        print(f"\n❌ Email sender error: {e}")
+        return 1
+    
+    finally:
+        transport.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Rejected credentials must never check out a pooled database connection,
+so unauthenticated traffic cannot exhaust the pool.
+"""
+
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app.core.database import engine, SessionLocal
+from app.core.security import create_token, create_refresh_token, TokenType
+from main import app
+
+
+client = TestClient(app)
+
+PROTECTED_PATHS = ["/auth/me", "/worker/profile", "/care-home/profile"]
+
+REJECTED_TOKENS = {
+    "garbage": "not-a-jwt",
+    "expired": create_token(str(uuid.uuid4()), TokenType.ACCESS, expires_delta=timedelta(minutes=-1)),
+    "refresh token": create_refresh_token(uuid.uuid4()),
+    "bad subject": create_token("not-a-uuid", TokenType.ACCESS),
+}
+
+
+@pytest.fixture
+def pool_checkouts():
+    """Record every connection checkout from the application pool."""
+    checkouts = []
+    
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts.append(connection_record)
+    
+    event.listen(engine, "checkout", on_checkout)
+    yield checkouts
+    event.remove(engine, "checkout", on_checkout)
+
+
+def test_checkouts_are_recorded(pool_checkouts):
+    """Sanity check for the fixture: a real query checks out once."""
+    with SessionLocal() as db:
+        db.execute(text("SELECT 1"))
+    
+    assert len(pool_checkouts) == 1
+
+
+@pytest.mark.parametrize("path", PROTECTED_PATHS)
+@pytest.mark.parametrize("token", list(REJECTED_TOKENS.values()), ids=list(REJECTED_TOKENS))
+def test_rejected_token_does_not_check_out(pool_checkouts, path, token):
+    response = client.get(path, headers={"Authorization": f"Bearer {token}"})
+    
+    assert response.status_code == 401
+    assert pool_checkouts == []
+
+
+@pytest.mark.parametrize("path", PROTECTED_PATHS)
+def test_missing_credentials_do_not_check_out(pool_checkouts, path):
+    response = client.get(path)
+    
+    assert response.status_code == 403
+    assert pool_checkouts == []
@@ -0,0 +1,79 @@
+"""
+Tests for the stale-while-revalidate cache.
+"""
+
+import fakeredis
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import StaleWhileRevalidateCache
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    """Shared fake Redis, as seen by every worker process."""
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(cache_module, "get_redis", lambda: client)
+    return client
+
+
+def expire(cache):
+    """Move an entry past its TTL (but keep it within the stale window)."""
+    cache._local["fresh_until"] = 0
+    client = cache_module.get_redis()
+    if client is not None:
+        entry = cache_module.json.loads(client.get(cache.key))
+        entry["fresh_until"] = 0
+        client.set(cache.key, cache_module.json.dumps(entry))
+
+
+def test_hit_after_first_compute(redis_server):
+    cache = StaleWhileRevalidateCache("test_hit", ttl=60, stale_ttl=60)
+    calls = []
+    
+    assert cache.get(lambda: calls.append(1) or {"n": 1}) == {"n": 1}
+    assert cache.get(lambda: calls.append(1) or {"n": 2}) == {"n": 1}
+    
+    assert len(calls) == 1
+    assert cache.stats["misses"] == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_only_one_worker_refreshes_stale_entry(redis_server):
+    """While one worker holds the refresh lock, others get the stale value."""
+    worker_a = StaleWhileRevalidateCache("test_swr", ttl=60, stale_ttl=60)
+    worker_b = StaleWhileRevalidateCache("test_swr", ttl=60, stale_ttl=60)
+    worker_a.get(lambda: {"n": 1})
+    expire(worker_a)
+    
+    lookup = worker_a.lookup()
+    assert lookup.refresh
+    
+    # Worker B sees the stale value and does not recompute
+    assert worker_b.get(lambda: pytest.fail("second refresh")) == {"n": 1}
+    assert worker_b.stats["stale_hits"] == 1
+    
+    worker_a.finish(lookup, {"n": 2})
+    assert worker_b.get(lambda: pytest.fail("entry is fresh")) == {"n": 2}
+
+
+def test_falls_back_to_process_cache_without_redis(monkeypatch):
+    monkeypatch.setattr(cache_module, "get_redis", lambda: None)
+    cache = StaleWhileRevalidateCache("test_local", ttl=60, stale_ttl=60)
+    
+    assert cache.get(lambda: {"n": 1}) == {"n": 1}
+    assert cache.get(lambda: {"n": 2}) == {"n": 1}
+    
+    expire(cache)
+    assert cache.get(lambda: {"n": 3}) == {"n": 3}
+
+
+def test_failed_refresh_serves_stale(redis_server):
+    cache = StaleWhileRevalidateCache("test_failure", ttl=60, stale_ttl=60)
+    cache.get(lambda: {"n": 1})
+    expire(cache)
+    
+    def broken():
+        raise RuntimeError("database down")
+    
+    assert cache.get(broken) == {"n": 1}
@@ -0,0 +1,57 @@
+"""
+Tests for incrementally maintained platform counters.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.models import User, UserRole, WorkerProfile, CareHomeProfile, VerificationStatus, CounterName
+from app.models.platform_counter import counter_deltas
+
+
+def persistent(session, obj):
+    """Attach an object as if it had been loaded from the database."""
+    make_transient_to_detached(obj)
+    session.add(obj)
+    return obj
+
+
+def test_worker_registration_deltas():
+    session = Session()
+    created_at = datetime(2026, 1, 31, 12, 0)
+    user = User(id=uuid.uuid4(), email="w@vicarity.co.uk", password_hash="x",
+                role=UserRole.WORKER, is_active=True, created_at=created_at)
+    session.add(user)
+    session.add(WorkerProfile(user_id=user.id, profile_completion_percentage=0))
+    
+    assert counter_deltas(session) == {
+        CounterName.WORKERS: 1,
+        CounterName.WORKER_PROFILES: 1,
+        "worker_signups:2026-01-31": 1,
+    }
+
+
+def test_completion_and_verification_changes():
+    session = Session()
+    profile = persistent(session, WorkerProfile(id=uuid.uuid4(), profile_completion_percentage=75))
+    care_home = persistent(session, CareHomeProfile(id=uuid.uuid4(), verification_status=VerificationStatus.PENDING))
+    
+    profile.profile_completion_percentage = 100
+    care_home.verification_status = VerificationStatus.VERIFIED
+    
+    assert counter_deltas(session) == {
+        CounterName.WORKER_COMPLETION_SUM: 25,
+        CounterName.COMPLETED_PROFILES: 1,
+        CounterName.VERIFIED_CARE_HOMES: 1,
+    }
+
+
+def test_deactivation_deltas():
+    session = Session()
+    user = persistent(session, User(id=uuid.uuid4(), role=UserRole.CARE_HOME_ADMIN, is_active=True))
+    
+    user.is_active = False
+    
+    assert counter_deltas(session) == {CounterName.CARE_HOMES: -1}
@@ -0,0 +1,70 @@
+"""
+Tests for the connection pool options, idle pre-ping and warm-up.
+"""
+
+import time
+
+from sqlalchemy import create_engine, text
+
+from app.core import database
+from app.core.database import engine, ping_idle_connections, pool_options, warm_up_pool
+from app.core.request_metrics import TimedNullPool, TimedQueuePool, instrument_engine, pool_metrics
+
+
+def test_pool_options_follow_the_mode(monkeypatch):
+    options = pool_options()
+    assert options["poolclass"] is TimedQueuePool
+    assert (options["pool_size"], options["max_overflow"], options["pool_pre_ping"]) == (5, 10, True)
+    
+    monkeypatch.setattr(database, "NULL_POOL", True)
+    assert pool_options() == {"poolclass": TimedNullPool}
+
+
+def test_null_pool_connects_per_checkout(tmp_path):
+    null_engine = create_engine(f"sqlite:///{tmp_path}/null.db", poolclass=TimedNullPool)
+    instrument_engine(null_engine, "test-null")
+    try:
+        for _ in range(3):
+            with null_engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        
+        stats = pool_metrics["test-null"].snapshot()
+        assert (stats["checkouts"], stats["connects"]) == (3, 3)
+        assert stats["gauges"] == {"checked_out": 0}
+        null_engine.dispose()
+        assert null_engine.pool.metrics_name == "test-null"  # Carried over to the new pool
+    finally:
+        pool_metrics.pop("test-null")
+
+
+def test_only_idle_connections_are_pinged(tmp_path, monkeypatch):
+    idle_engine = create_engine(f"sqlite:///{tmp_path}/idle.db", poolclass=TimedQueuePool, pool_size=1)
+    ping_idle_connections(idle_engine, idle_seconds=0.05)
+    pings = []
+    monkeypatch.setattr(idle_engine.dialect, "do_ping", lambda dbapi_connection: pings.append(dbapi_connection))
+    
+    for _ in range(2):
+        with idle_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    assert pings == []  # New, then just returned
+    
+    time.sleep(0.1)
+    
+    def fail(dbapi_connection):
+        pings.append(dbapi_connection)
+        raise OSError("server closed the connection")
+    
+    monkeypatch.setattr(idle_engine.dialect, "do_ping", fail)
+    with idle_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))  # Reconnected after the failed ping
+        assert conn.connection.dbapi_connection is not pings[0]
+    assert len(pings) == 1
+    idle_engine.dispose()
+
+
+def test_warm_up_fills_the_pool():
+    engine.dispose()
+    
+    assert warm_up_pool(3) == 3
+    assert engine.pool.checkedin() == 3 and engine.pool.checkedout() == 0
+    assert warm_up_pool(50) == 5  # Up to the pool size
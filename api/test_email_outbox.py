@@ -0,0 +1,141 @@
+"""
+Tests for the email outbox and its sender (fake transport, SQLite).
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.email import queue_email, queue_verification_email
+from app.core.email_sender import FakeTransport, OutboxSender, TransportError
+from app.models.email_outbox import EmailOutbox, EmailStatus
+import send_emails
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    EmailOutbox.__table__.create(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def queue(session_factory, count: int):
+    with session_factory() as db:
+        for i in range(count):
+            queue_verification_email(db, f"user{i}@vicarity.co.uk", f"token-{i}")
+        db.commit()
+
+
+def outbox(session_factory):
+    with session_factory() as db:
+        return db.scalars(select(EmailOutbox).order_by(EmailOutbox.to_email)).all()
+
+
+def make_due(session_factory):
+    """Skip the backoff / lease of every pending email."""
+    with session_factory() as db:
+        for row in db.scalars(select(EmailOutbox)):
+            row.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+
+
+def test_queued_email_is_rolled_back_with_its_transaction(session_factory):
+    with session_factory() as db:
+        queue_verification_email(db, "w@vicarity.co.uk", "token")
+        db.rollback()
+    
+    assert outbox(session_factory) == []
+    with pytest.raises(ValueError):
+        queue_email(None, "no_such_template", "w@vicarity.co.uk")
+
+
+def test_drain_sends_in_batches(session_factory):
+    queue(session_factory, 5)
+    transport = FakeTransport()
+    sender = OutboxSender(session_factory, transport, batch_size=2)
+    
+    assert sender.drain() == 5
+    
+    assert transport.calls == 3
+    assert sorted(message["to"][0] for message in transport.sent) == [f"user{i}@vicarity.co.uk" for i in range(5)]
+    assert "token-0" in next(m["html"] for m in transport.sent if m["to"] == ["user0@vicarity.co.uk"])
+    rows = outbox(session_factory)
+    assert {row.status for row in rows} == {EmailStatus.SENT}
+    assert all(row.provider_message_id.startswith("fake-") for row in rows)
+    assert sender.drain() == 0
+
+
+def test_retry_with_backoff_reuses_the_idempotency_key(session_factory):
+    queue(session_factory, 2)
+    transport = FakeTransport(failures=[TransportError("timeout"), TransportError("HTTP 503")])
+    sender = OutboxSender(session_factory, transport, backoff=30, max_attempts=3)
+    
+    assert sender.drain() == 2  # Fails; the retry is not due yet
+    [first, _] = outbox(session_factory)
+    assert first.status == EmailStatus.PENDING and first.attempts == 1
+    assert timedelta(seconds=25) < first.next_attempt_at - datetime.utcnow() <= timedelta(seconds=30)
+    
+    make_due(session_factory)
+    sender.drain()
+    [second, _] = outbox(session_factory)
+    assert second.attempts == 2
+    assert second.next_attempt_at - datetime.utcnow() > timedelta(seconds=55)  # Doubled
+    
+    make_due(session_factory)
+    sender.drain()
+    
+    assert transport.calls == 3
+    assert list(transport.batches) == [str(first.batch_id)]
+    assert {row.status for row in outbox(session_factory)} == {EmailStatus.SENT}
+
+
+def test_sender_crash_after_send_does_not_duplicate(session_factory):
+    queue(session_factory, 3)
+    transport = FakeTransport()
+    crashed = OutboxSender(session_factory, transport, lease_seconds=0)
+    
+    # Claimed and delivered, but the sender dies before recording it
+    with session_factory() as db:
+        batch_id, rows = crashed._claim(db)
+        _, _, messages = crashed._render(rows)
+        db.commit()
+    transport.send_batch(messages, str(batch_id))
+    
+    OutboxSender(session_factory, transport).drain()
+    
+    assert transport.calls == 2
+    assert len(transport.sent) == 3
+    assert {row.status for row in outbox(session_factory)} == {EmailStatus.SENT}
+
+
+def test_rejected_batch_is_split_and_fails_alone(session_factory):
+    queue(session_factory, 3)
+    transport = FakeTransport(failures=[
+        TransportError("HTTP 422", retryable=False),
+        TransportError("HTTP 422: invalid `to`", retryable=False),
+    ])
+    sender = OutboxSender(session_factory, transport)
+    
+    sender.drain()
+    
+    rows = outbox(session_factory)
+    assert [row.status for row in rows].count(EmailStatus.FAILED) == 1
+    assert [row.status for row in rows].count(EmailStatus.SENT) == 2
+    assert len({row.batch_id for row in rows}) == 3
+    assert sender.stats == {"batches": 4, "sent": 2, "retried": 3, "failed": 1}
+
+
+def test_sender_refuses_to_start_without_an_api_key(session_factory, monkeypatch):
+    queue(session_factory, 2)
+    monkeypatch.setattr(send_emails.settings, "RESEND_API_KEY", "")
+    monkeypatch.setattr(send_emails, "SessionLocal", session_factory)
+    monkeypatch.setattr(sys, "argv", ["send_emails.py", "--once"])
+    
+    assert send_emails.main() == 1
+    
+    assert {row.status for row in outbox(session_factory)} == {EmailStatus.PENDING}
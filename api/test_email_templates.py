@@ -0,0 +1,54 @@
+"""
+Tests for the precompiled email templates.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.core.email_templates import CompiledText, email_templates, render_many
+
+
+def test_templates_compile_with_only_per_recipient_fields():
+    assert {name: email_templates[name].fields for name in email_templates.templates} == {
+        "verification": ("first_name", "verification_token"),
+        "worker_welcome": ("first_name",),
+        "care_home_welcome": ("contact_name",),
+        "password_reset": ("reset_token",),
+    }
+
+
+def test_render_substitutes_and_escapes():
+    subject, html = email_templates["worker_welcome"].render(first_name="<Sam & Co>")
+    
+    assert subject == "Welcome to Vicarity, <Sam & Co>! Complete your profile to start finding work"
+    assert "Welcome to Vicarity, &lt;Sam &amp; Co&gt;!" in html
+    assert f'href="{settings.FRONTEND_URL}/complete-profile"' in html
+    assert ".steps {" in html and "$" not in html
+
+
+def test_render_defaults_and_missing_fields():
+    _, html = email_templates["verification"].render(verification_token="abc", first_name=None)
+    
+    assert "<p>Hi there,</p>" in html
+    assert html.count(f"{settings.FRONTEND_URL}/verify-email?token=abc") == 2
+    with pytest.raises(KeyError):
+        email_templates["password_reset"].render()
+
+
+def test_render_many_is_lazy():
+    def recipients():
+        yield {"reset_token": "t1"}
+        yield {"reset_token": "t2"}
+        raise AssertionError("consumed past the second recipient")
+    
+    rendered = render_many("password_reset", recipients())
+    
+    assert "token=t1" in next(rendered)[1]
+    assert "token=t2" in next(rendered)[1]
+
+
+def test_compiled_text_placeholders():
+    text = CompiledText("$$5 (10%) for ${name} at $url/x", {"url": "https://v.co/%"}, escape=False)
+    
+    assert text.fields == ("name",)
+    assert text.render({"name": "Sam"}) == "$5 (10%) for Sam at https://v.co/%/x"
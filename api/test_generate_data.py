@@ -0,0 +1,46 @@
+"""
+Tests for the synthetic data generator (benchmarks/generate_data.py).
+"""
+
+import json
+import random
+import uuid
+from datetime import date, datetime
+
+from app.models.worker_profile import DBSStatus
+from benchmarks.generate_data import (
+    CARE_HOME_COLUMNS, WORKER_COLUMNS, care_home_profile, copy_value, worker_profile,
+)
+
+
+def test_copy_value():
+    assert copy_value(None) == "\\N"
+    assert copy_value(True) == "t" and copy_value(False) == "f"
+    assert copy_value(["mon", "sat"]) == "{mon,sat}" and copy_value([]) == "{}"
+    assert copy_value(date(2026, 1, 31)) == "2026-01-31"
+    assert copy_value(datetime(2026, 1, 31, 9, 30)) == "2026-01-31T09:30:00"
+    assert copy_value("tab\there\nback\\slash") == "tab\\there\\nback\\\\slash"
+
+
+def test_worker_profiles_are_consistent():
+    rng = random.Random(3)
+    rows = [dict(zip(WORKER_COLUMNS, worker_profile(rng, uuid.uuid4(), datetime(2026, 1, 1)))) for _ in range(500)]
+    
+    assert {row["profile_completion_status"] for row in rows} == {"NOT_STARTED", "IN_PROGRESS", "COMPLETE"}
+    for row in rows:
+        DBSStatus[row["dbs_status"]]  # Enums by name, as stored
+        percentage = row["profile_completion_percentage"]
+        assert (percentage == 100) == (row["profile_completion_status"] == "COMPLETE")
+        assert (percentage == 0) == (row["profile_completion_status"] == "NOT_STARTED")
+        qualifications = json.loads(row["qualifications"])
+        assert all(q["code"] for q in qualifications)
+        if percentage == 100:
+            assert qualifications and row["available_days"] and row["latitude"] is not None
+
+
+def test_care_home_profiles():
+    rng = random.Random(3)
+    row = dict(zip(CARE_HOME_COLUMNS, care_home_profile(rng, uuid.uuid4(), datetime(2026, 1, 1))))
+    
+    assert row["business_name"] and row["postcode"] and row["care_home_type"].isupper()
+    assert int(row["profile_completion_percentage"]) >= 87  # Everything but maybe the description
@@ -0,0 +1,83 @@
+"""
+Tests for local postcode geocoding.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.core import geocoding
+from app.core.geocoding import (
+    PostcodeIndex, geocode_profile, haversine_miles, ingest, normalize_postcode, within_radius,
+)
+
+CSV = """pcd,pcds,doterm,lat,long
+YO1 7HH ,YO1 7HH,,53.962116,-1.081751
+EH1 1YZ ,EH1 1YZ,,55.952061,-3.188950
+SW1A1AA ,SW1A 1AA,,51.501009,-0.141588
+LS1 4AP ,LS1 4AP,,53.797090,-1.549260
+ZZ9 9ZZ ,ZZ9 9ZZ,,99.999999,0.000000
+LS1 4AP ,LS1 4AP,,53.797000,-1.549000
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    (tmp_path / "postcodes.csv").write_text(CSV)
+    assert ingest(str(tmp_path / "postcodes.csv"), str(tmp_path / "postcodes.idx")) == 4
+    return PostcodeIndex(str(tmp_path / "postcodes.idx"))
+
+
+def test_normalize_postcode():
+    assert normalize_postcode(" sw1a  1aa ") == "SW1A1AA"
+    assert normalize_postcode("YO17HH") == "YO17HH"
+    for invalid in (None, "", "YO1", "SW1A 1AAX", "YO1-7HH", "ÝO1 7HH"):
+        assert normalize_postcode(invalid) is None
+
+
+def test_lookup(index):
+    assert len(index) == 4
+    assert index.lookup("sw1a 1aa") == (51.501009, -0.141588)
+    assert index.lookup("LS14AP") == (53.797, -1.549)  # Last duplicate wins
+    assert index.lookup("ZZ9 9ZZ") is None  # No location in the source
+    assert index.lookup("AA1 1AA") is None and index.lookup("ZZ99 9ZZ") is None
+    
+    latitudes, longitudes = index.lookup_many(["EH1 1YZ", "nope", None, "yo1 7hh"])
+    assert latitudes[[0, 3]].tolist() == [55.952061, 53.962116]
+    assert np.isnan(latitudes[1:3]).all() and np.isnan(longitudes[1:3]).all()
+
+
+def test_missing_index_finds_nothing(tmp_path):
+    index = PostcodeIndex(str(tmp_path / "missing.idx"))
+    
+    assert not index.available and index.lookup("YO1 7HH") is None
+    assert np.isnan(index.lookup_many(["YO1 7HH"])[0]).all()
+
+
+def test_haversine_and_radius():
+    # York to Edinburgh and to London
+    distances = haversine_miles(53.962116, -1.081751, [55.952061, 51.501009], [-3.188950, -0.141588])
+    assert distances == pytest.approx([160.9, 174.5], abs=0.1)
+    
+    latitudes = np.array([53.797090, 55.952061, 51.501009, np.nan, 53.97])
+    longitudes = np.array([-1.549260, -3.188950, -0.141588, -1.08, -1.08])
+    # One radius, and one per worker (each worker's travel radius)
+    assert within_radius(53.962116, -1.081751, latitudes, longitudes, 30).tolist() == [
+        True, False, False, False, True,
+    ]
+    assert within_radius(53.962116, -1.081751, latitudes, longitudes, np.array([25, 200, 170, 50, np.nan])).tolist() == [
+        True, True, False, False, False,
+    ]
+
+
+def test_geocode_profile(index, monkeypatch):
+    monkeypatch.setattr(geocoding, "postcode_index", index)
+    profile = SimpleNamespace(postcode="yo1 7hh", latitude=None, longitude=None)
+    
+    geocode_profile(profile)
+    assert (profile.latitude, profile.longitude) == (53.962116, -1.081751)
+    
+    profile.postcode = "unknown"
+    geocode_profile(profile)
+    assert profile.latitude is None and profile.longitude is None
@@ -0,0 +1,82 @@
+"""
+Tests for the background health prober and the live/ready endpoints.
+"""
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import health_prober as health_prober_module
+from app.core.health_prober import HealthProber, health_prober
+from main import app
+
+
+@pytest.fixture
+def prober():
+    prober = HealthProber(interval=60, timeout=0.2, email_interval=60, stale_after=60)
+    yield prober
+    prober.stop()
+
+
+def test_probes_record_status_and_latency(prober):
+    prober.probe_once()
+    
+    results = prober.results()
+    assert results["database"]["status"] == "ok" and results["database"]["latency_ms"] >= 0
+    assert results["redis"]["status"] in ("ok", "disconnected")
+    assert results["email"]["status"] == "disabled"  # No RESEND_API_KEY
+    assert prober.readiness()[0]
+
+
+def test_failed_database_probe_means_not_ready(prober, monkeypatch, caplog):
+    prober.probe_once()
+    
+    def fail():
+        raise ConnectionError('connection to server at "db.internal" (10.0.0.5), port 5432 failed')
+    monkeypatch.setattr(prober, "_probe_database", fail)
+    
+    prober.probe_once()
+    
+    # Served (publicly, via /health): the exception class only; the text is logged
+    assert prober.results()["database"]["error"] == "ConnectionError"
+    assert "10.0.0.5" in caplog.text
+    ready, reasons, _ = prober.readiness()
+    assert not ready and reasons == ["database: error"]
+
+
+def test_hung_probe_times_out_and_is_not_restarted(prober, monkeypatch):
+    release = threading.Event()
+    calls = []
+    
+    def hang():
+        calls.append(1)
+        release.wait(5)
+    monkeypatch.setattr(prober, "_probe_redis", hang)
+    
+    prober.probe_once()
+    assert prober.status("redis") == "timeout"
+    prober.probe_once()
+    assert prober.results()["redis"]["error"] == "Previous probe still running"
+    assert len(calls) == 1
+    
+    release.set()
+    prober._pending["redis"].result(timeout=1)
+    prober.probe_once()
+    assert len(calls) == 2 and prober.status("redis") == "ok"
+
+
+def test_endpoints_answer_from_results(monkeypatch):
+    client = TestClient(app)
+    health_prober.probe_once()
+    
+    assert client.get("/health/live").json() == {"status": "alive"}
+    response = client.get("/health/ready")
+    assert response.status_code == 200 and response.json()["status"] == "ready"
+    assert client.get("/health").json()["database"] == "connected"
+    
+    saturated = {"sync": {"checked_out": 15, "saturated": True}, "async": {"checked_out": 15, "saturated": True}}
+    monkeypatch.setattr(health_prober_module, "pool_stats", lambda: saturated)
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["reasons"] == ["database pool saturated (15 connections checked out)"]
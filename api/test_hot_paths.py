@@ -0,0 +1,28 @@
+"""
+Tests for the hot path micro-benchmarks (benchmarks/hot_paths.py).
+"""
+
+import pytest
+
+from benchmarks import hot_paths
+from benchmarks.hot_paths import BENCHMARKS, check
+
+
+@pytest.mark.parametrize("name", [name for name in BENCHMARKS if not name.startswith("password: verify")])
+def test_benchmarks_run(name):
+    # Setups build their inputs without a database; the timed callable works
+    BENCHMARKS[name]()()
+
+
+def test_check_flags_regressions():
+    baseline = {"results": {"fast": 10.0, "slow": 10.0, "gone": 1.0}}
+    
+    assert check({"fast": 11.0, "slow": 13.0, "new": 5.0}, baseline, threshold=0.25) == 1
+    assert check({"fast": 11.0, "slow": 12.4}, baseline, threshold=0.25) == 0
+
+
+def test_baseline_covers_every_benchmark():
+    baseline = hot_paths.load_baseline()
+    
+    assert baseline is not None
+    assert set(BENCHMARKS) - {"password: verify argon2 (configured)"} <= set(baseline["results"])
@@ -0,0 +1,48 @@
+"""
+Tests for the event loop lag monitor.
+"""
+
+import asyncio
+import logging
+import time
+
+from app.core.loop_monitor import LoopLagMonitor
+
+
+def blocking_handler():
+    """Stands in for a sync DB call made from an async endpoint."""
+    time.sleep(0.3)
+
+
+def test_blocking_call_is_reported_with_stack(caplog):
+    """A blocking call on the loop is measured and its stack logged."""
+    monitor = LoopLagMonitor(interval=0.02, threshold=0.1)
+    
+    async def scenario():
+        monitor.start()
+        await asyncio.sleep(0.1)
+        blocking_handler()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+    
+    with caplog.at_level(logging.WARNING, logger="app.core.loop_monitor"):
+        asyncio.run(scenario())
+    
+    assert monitor.stalls == 1
+    assert monitor.percentiles()["max"] >= 200
+    assert "blocking_handler" in caplog.text
+
+
+def test_idle_loop_has_low_lag():
+    """No stalls are reported when nothing blocks the loop."""
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.1)
+    
+    async def scenario():
+        monitor.start()
+        await asyncio.sleep(0.2)
+        await monitor.stop()
+    
+    asyncio.run(scenario())
+    
+    assert monitor.stalls == 0
+    assert monitor.percentiles()["samples"] > 0
@@ -0,0 +1,94 @@
+"""
+Tests for worker-to-care-home match scoring.
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from app.core.matching import (
+    CARE_HOME_SPECIALIZATIONS, DEFAULT_TRAVEL_RADIUS_MILES, EXPERIENCE_BANDS, RATE_TOLERANCE, UNKNOWN, WEIGHTS,
+    distance_fit, rate_fit, top_k,
+)
+from app.core.worker_index import WorkerBitmapIndex
+from app.schemas.worker import WorkerMatchCriteria
+from test_worker_index import worker
+
+
+def reference_score(row, criteria: WorkerMatchCriteria):
+    """Per-row equivalent of WorkerBitmapIndex.match(): (score, miles) or None if excluded."""
+    def share(values, held):
+        return len(set(values) & set(held)) / len(set(values))
+    
+    components = {}
+    if criteria.qualifications:
+        components["qualifications"] = share(criteria.qualifications, row["qualifications"])
+    availability = [
+        share(values, row[attribute])
+        for attribute, values in (("available_days", criteria.available_days), ("shift_types", criteria.shift_types))
+        if values
+    ]
+    if availability:
+        components["availability"] = sum(availability) / len(availability)
+    if criteria.hourly_rate is not None:
+        rate_min = row["hourly_rate_min"]
+        components["rate"] = UNKNOWN if rate_min is None else min(1, max(0, 1 - (rate_min - criteria.hourly_rate) / rate_min / RATE_TOLERANCE))
+    experience = row["years_experience"]
+    components["experience"] = EXPERIENCE_BANDS.index(experience) / 3 if experience else 0
+    if criteria.care_home_type in CARE_HOME_SPECIALIZATIONS:
+        components["specialization"] = float(CARE_HOME_SPECIALIZATIONS[criteria.care_home_type] in row["specializations"])
+    
+    miles = None
+    if criteria.latitude is not None:
+        if row["latitude"] is None:
+            components["distance"] = UNKNOWN
+        else:
+            lat1, lat2 = math.radians(criteria.latitude), math.radians(row["latitude"])
+            a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(math.radians(row["longitude"] - criteria.longitude) / 2) ** 2
+            miles = 2 * 3958.8 * math.asin(math.sqrt(a))
+            radius = row["travel_radius_miles"] or DEFAULT_TRAVEL_RADIUS_MILES
+            if miles > radius:
+                return None
+            components["distance"] = 1 - miles / radius / 2
+    
+    score = sum(WEIGHTS.values()) + sum(WEIGHTS[name] * (value - 1) for name, value in components.items())
+    return score, miles
+
+
+@pytest.mark.parametrize("criteria", [
+    {},
+    {"qualifications": ["NVQ_LVL3", "PEG_FEEDING"], "hourly_rate": 1100},
+    {"care_home_type": "dementia", "latitude": 53.96, "longitude": -1.08, "available_days": ["sat", "sun"]},
+    {"latitude": 53.96, "longitude": -1.08, "shift_types": ["night"], "available_days": ["mon"], "hourly_rate": 900},
+])
+def test_match_scores_match_reference(criteria):
+    rng = random.Random(11)
+    rows = [worker(rng) for _ in range(3000)]
+    index = WorkerBitmapIndex("test_matching")
+    index.load(rows[:2500])
+    index.upsert(rows[2500:])
+    index.remove([row["user_id"] for row in rows[:100]])
+    criteria = WorkerMatchCriteria(**criteria)
+    
+    matches = index.match(criteria, 50)
+    
+    expected = {row["id"]: reference_score(row, criteria) for row in rows[100:]}
+    best = sorted((s[0] for s in expected.values() if s), reverse=True)[:50]
+    assert [score for _, score, _ in matches] == pytest.approx(best, abs=0.1)
+    for id, score, miles in matches:
+        assert score == pytest.approx(expected[id][0], abs=0.1)
+        assert miles == (None if expected[id][1] is None else pytest.approx(expected[id][1], abs=0.1))
+
+
+def test_components():
+    # Full marks at the worker's minimum, none 25% below it
+    assert rate_fit(1000, np.array([800, 1000, 1250, 1400, -1])).tolist() == pytest.approx([1, 1, 0.2, 0, UNKNOWN])
+    assert rate_fit(None, np.array([800, -1])).tolist() == [1, 1]
+    
+    fit = distance_fit(np.array([0, 5, 10, 11, np.nan, 10]), np.array([10, 10, 10, 10, 10, np.nan]))
+    assert fit.tolist() == [1, 0.75, 0.5, -np.inf, UNKNOWN, 0.5]
+    
+    assert top_k(np.array([0.5, -np.inf, 2, 1, -np.inf], dtype=np.float32), 4).tolist() == [2, 3, 0]
+    assert top_k(np.array([-np.inf]), 3).tolist() == []
@@ -0,0 +1,78 @@
+"""
+Tests for the admin memory diagnostics.
+"""
+
+import tracemalloc
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import SessionLocal
+from app.core.memory_diagnostics import heap_stats, memory_diagnostics, module_name
+from app.core.principal_cache import Principal, principal_cache
+from app.core.security import create_access_token
+from app.models import User, UserRole
+from main import app
+
+
+@pytest.fixture
+def tracing():
+    yield memory_diagnostics
+    memory_diagnostics.stop()
+
+
+def allocate_blocks():
+    return [bytes(1024) for _ in range(2000)]
+
+
+def test_module_names():
+    assert module_name(__file__) == "test_memory_diagnostics"
+    assert module_name(tracemalloc.__file__) == "tracemalloc"
+    import sqlalchemy.orm.identity
+    assert module_name(sqlalchemy.orm.identity.__file__) == "sqlalchemy.orm.identity"
+
+
+def test_diff_groups_growth_by_module(tracing):
+    assert tracing.take_baseline()["tracing"]
+    blocks = allocate_blocks()
+    
+    report = tracing.diff(group_by="module")
+    (group,) = [group for group in report["groups"] if group["module"] == "test_memory_diagnostics"]
+    assert group["size_bytes"] >= 2000 * 1024 and group["count"] >= 2000
+    assert group["sites"][0]["site"].startswith("test_memory_diagnostics:")
+    assert tracing.top(limit=5)["groups"][0]["size_bytes"] >= 2000 * 1024
+    del blocks
+
+
+def test_heap_stats_counts_sessions_and_instances():
+    db = SessionLocal()
+    db.add_all([User(email=f"{i}@vicarity.co.uk", role=UserRole.WORKER) for i in range(3)])
+    
+    stats = heap_stats()
+    
+    assert stats["orm_instances"]["User"] >= 3
+    assert stats["sessions"]["live"] >= 1
+    assert any(session["new"] == 3 for session in stats["sessions"]["largest"])
+    db.close()
+
+
+def test_admin_endpoints(tracing):
+    headers = {}
+    for role in (UserRole.ADMIN, UserRole.WORKER):
+        principal = Principal(id=uuid.uuid4(), email=f"{role.value}@vicarity.co.uk", role=role,
+                              is_active=True, email_verified=True)
+        principal_cache.set(principal)
+        headers[role] = {"Authorization": f"Bearer {create_access_token(principal.id, role.value)}"}
+    client = TestClient(app)
+    
+    assert client.get("/admin/memory", headers=headers[UserRole.WORKER]).status_code == 403
+    summary = client.get("/admin/memory", headers=headers[UserRole.ADMIN]).json()
+    assert summary["rss_bytes"] > 0 and "sync" in summary["pools"]
+    
+    assert client.get("/admin/memory/diff", headers=headers[UserRole.ADMIN]).status_code == 409
+    assert client.post("/admin/memory/snapshot", headers=headers[UserRole.ADMIN]).json()["tracing"]
+    response = client.get("/admin/memory/diff?group_by=caller&depth=2", headers=headers[UserRole.ADMIN])
+    assert response.status_code == 200 and "groups" in response.json()
+    assert client.get("/admin/memory/top?group_by=line", headers=headers[UserRole.ADMIN]).status_code == 422
+    assert not client.delete("/admin/memory/snapshot", headers=headers[UserRole.ADMIN]).json()["tracing"]
@@ -0,0 +1,106 @@
+"""
+Tests for the bounded password hashing executor.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import password_hashing, security
+from app.core.password_hashing import PasswordHasher
+from app.core.security import build_password_context
+
+
+@pytest.fixture
+def blocked_verify(monkeypatch):
+    """Make verification wait until the returned event is set."""
+    release = threading.Event()
+    
+    def slow_verify(plain_password, hashed_password):
+        release.wait(5)
+        return True
+    
+    monkeypatch.setattr(password_hashing, "verify_password", slow_verify)
+    yield release
+    release.set()
+
+
+def test_hash_and_verify_record_latency():
+    hasher = PasswordHasher("thread", workers=1, max_queue=1, queue_timeout=5, retry_after=2)
+    hashed = hasher.hash("Passw0rdX")
+    
+    assert hasher.verify("Passw0rdX", hashed)
+    assert not hasher.verify("wrong", hashed)
+    stats = hasher.stats()
+    assert stats["hash_ms"]["count"] == 1
+    assert stats["verify_ms"]["count"] == 2
+    assert stats["in_flight"] == 0
+    hasher.shutdown()
+
+
+def test_full_queue_rejects_with_retry_after(blocked_verify):
+    hasher = PasswordHasher("thread", workers=1, max_queue=0, queue_timeout=5, retry_after=3)
+    running = threading.Thread(target=hasher.verify, args=("a", "b"))
+    running.start()
+    
+    while hasher.in_flight == 0:
+        pass
+    with pytest.raises(HTTPException) as exc_info:
+        hasher.verify("a", "b")
+    
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "3"}
+    assert hasher.rejected == 1
+    
+    blocked_verify.set()
+    running.join()
+    hasher.shutdown()
+
+
+def test_queued_hash_times_out(blocked_verify):
+    hasher = PasswordHasher("thread", workers=1, max_queue=1, queue_timeout=0.05, retry_after=2)
+    running = threading.Thread(target=hasher.verify, args=("a", "b"))
+    running.start()
+    
+    while hasher.in_flight == 0:
+        pass
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(hasher.averify("a", "b"))
+    
+    assert exc_info.value.status_code == 503
+    assert hasher.timed_out == 1
+    
+    # The cancelled job gave its queue slot back; the running one completes
+    blocked_verify.set()
+    running.join()
+    assert hasher.in_flight == 0
+    assert hasher.stats()["verify_ms"]["count"] == 1
+    hasher.shutdown()
+
+
+def test_outdated_hash_is_upgraded(monkeypatch):
+    monkeypatch.setattr(security, "pwd_context", build_password_context(bcrypt_rounds=5))
+    hasher = PasswordHasher("thread", workers=1, max_queue=1, queue_timeout=5, retry_after=2)
+    old_hash = build_password_context(bcrypt_rounds=4).hash("Passw0rdX")
+    
+    is_valid, new_hash = hasher.verify_and_update("Passw0rdX", old_hash)
+    
+    assert is_valid
+    assert new_hash.startswith("$2b$05$")
+    assert hasher.verify_and_update("Passw0rdX", new_hash) == (True, None)
+    assert hasher.verify_and_update("wrong", old_hash) == (False, None)
+    hasher.shutdown()
+
+
+def test_bcrypt_hashes_migrate_to_argon2():
+    pytest.importorskip("argon2")
+    context = build_password_context(scheme="argon2", argon2_time_cost=1, argon2_memory_cost_kib=1024)
+    bcrypt_hash = build_password_context(bcrypt_rounds=4).hash("Passw0rdX")
+    
+    is_valid, new_hash = context.verify_and_update("Passw0rdX", bcrypt_hash)
+    
+    assert is_valid
+    assert new_hash.startswith("$argon2id$")
+    assert not context.needs_update(new_hash)
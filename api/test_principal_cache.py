@@ -0,0 +1,93 @@
+"""
+Tests for the two-tier principal cache.
+"""
+
+import uuid
+from datetime import datetime
+
+import fakeredis
+import pytest
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core import principal_cache as principal_cache_module
+from app.core.principal_cache import Principal, PrincipalCache, changed_principals
+from app.models import User, UserRole, WorkerProfile
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    """Shared fake Redis, as seen by every worker process."""
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(principal_cache_module, "get_redis", lambda: client)
+    return client
+
+
+def make_principal(**overrides):
+    fields = dict(id=uuid.uuid4(), email="w@vicarity.co.uk", role=UserRole.WORKER, is_active=True,
+                  email_verified=True, profile_complete=False, profile_completion_percentage=40)
+    fields.update(overrides)
+    return Principal(**fields)
+
+
+def test_json_round_trip():
+    principal = make_principal()
+    assert Principal.from_json(principal.to_json()) == principal
+
+
+def test_two_tiers_and_invalidation(redis_server):
+    cache = PrincipalCache("test_principals", local_ttl=60, ttl=60, max_entries=10)
+    principal = make_principal()
+    cache.set(principal)
+    
+    assert cache.get(principal.id) == principal
+    assert cache.stats["hits"] == 1
+    
+    # Another worker: empty in-process tier, shared Redis
+    other = PrincipalCache("test_principals_other", local_ttl=60, ttl=60, max_entries=10)
+    assert other.get(principal.id) == principal
+    assert other.stats["shared_hits"] == 1
+    
+    cache.invalidate([principal.id])
+    assert cache.get(principal.id) is None
+    
+    # A stale read that lands after the invalidation must not be cached
+    cache.set(principal)
+    cache.invalidate_local([principal.id])
+    assert cache.get_shared(principal.id) is None
+
+
+def test_local_tier_is_bounded_lru(redis_server):
+    cache = PrincipalCache("test_principals_lru", local_ttl=60, ttl=60, max_entries=2)
+    first, second, third = make_principal(), make_principal(), make_principal()
+    cache.set(first)
+    cache.set(second)
+    cache.get_local(first.id)  # first is now most recently used
+    cache.set(third)
+    
+    assert cache.get_local(first.id) == first
+    assert cache.get_local(second.id) is None
+    
+    expired = PrincipalCache("test_principals_ttl", local_ttl=0, ttl=60, max_entries=2)
+    expired.set(first)
+    assert expired.get_local(first.id) is None
+
+
+def test_changed_principals():
+    session = Session()
+    user = User(id=uuid.uuid4(), email="w@vicarity.co.uk", password_hash="x",
+                role=UserRole.WORKER, is_active=True, email_verified=False)
+    profile = WorkerProfile(id=uuid.uuid4(), user_id=user.id, profile_completion_percentage=20)
+    for obj in (user, profile):
+        make_transient_to_detached(obj)
+        session.add(obj)
+    
+    # Login only touches last_login_at
+    user.last_login_at = datetime.utcnow()
+    assert changed_principals(session) == set()
+    
+    user.email_verified = True
+    assert changed_principals(session) == {user.id}
+    
+    session.expunge(user)
+    profile.first_name = "Ada"
+    assert changed_principals(session) == {user.id}
@@ -0,0 +1,139 @@
+"""
+Tests for the on-demand request profiler.
+"""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+
+from app.core.config import settings
+from app.core.principal_cache import Principal, principal_cache
+from app.core.profiler import ProfileMiddleware, profile_store, profile_token, verify_profile_token
+from app.core.request_metrics import MetricsMiddleware
+from app.core.security import create_access_token
+from app.models.user import UserRole
+from main import app
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_store, "directory", str(tmp_path))
+    monkeypatch.setattr(profile_store, "max_profiles", 3)
+    return profile_store
+
+
+def busy_wait(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def slow_sql_engine():
+    engine = create_engine("sqlite://")
+    
+    @event.listens_for(engine, "connect")
+    def add_sleep(dbapi_connection, _):
+        dbapi_connection.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000))
+    
+    return engine
+
+
+def make_app(sample_rate: float = 0.0) -> FastAPI:
+    test_app = FastAPI()
+    test_app.add_middleware(ProfileMiddleware, sample_rate=sample_rate)
+    test_app.add_middleware(MetricsMiddleware)
+    engine = slow_sql_engine()
+    
+    @test_app.get("/sync")
+    def sync_route():
+        # Threadpool, like the sync routers
+        busy_wait(0.05)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT sleep_ms(50)"))
+        return {}
+    
+    @test_app.get("/async")
+    async def async_route():
+        busy_wait(0.05)  # On the event loop
+        await asyncio.sleep(0.05)  # Suspended
+        return {}
+    
+    return test_app
+
+
+def test_tokens():
+    assert verify_profile_token(profile_token())
+    assert not verify_profile_token(profile_token(int(time.time()) - 1))  # Expired
+    expires_at, signature = profile_token().split(".")
+    assert not verify_profile_token(f"{int(expires_at) + 60}.{signature}")  # Extended
+    assert not verify_profile_token("garbage")
+
+
+def test_only_triggered_requests_are_profiled(store):
+    client = TestClient(make_app())
+    
+    assert "x-profile-id" not in client.get("/async").headers
+    assert "x-profile-id" not in client.get("/async", headers={"X-Profile": "1.forged"}).headers
+    assert store.list() == []
+    
+    response = client.get("/async", headers={"X-Profile": profile_token()})
+    (summary,) = store.list()
+    assert summary["id"] == response.headers["x-profile-id"]
+    assert summary["trigger"] == "header" and summary["route"] == "GET /async" and summary["status"] == 200
+    
+    TestClient(make_app(sample_rate=1.0)).get("/async")
+    assert store.list()[0]["trigger"] == "sampled"
+
+
+def test_sync_route_stacks_include_threadpool_and_sql(store):
+    response = TestClient(make_app()).get("/sync", headers={"X-Profile": profile_token()})
+    
+    profile = store.get(response.headers["x-profile-id"])
+    assert profile["samples"] > 10
+    stacks = profile["collapsed"]
+    assert "GET /sync;[threadpool];" in stacks
+    assert "test_profiler:make_app.<locals>.sync_route;test_profiler:busy_wait" in stacks
+    assert "[sql] SELECT sleep_ms(50)" in stacks
+
+
+def test_async_route_stacks_include_loop_and_awaits(store):
+    response = TestClient(make_app()).get("/async", headers={"X-Profile": profile_token()})
+    
+    stacks = store.get(response.headers["x-profile-id"])["collapsed"]
+    assert "make_app.<locals>.async_route;test_profiler:busy_wait" in stacks  # Running
+    assert "make_app.<locals>.async_route;asyncio.tasks:sleep;[await]" in stacks  # Waiting
+
+
+def test_store_is_a_ring_buffer(store):
+    ids = [uuid.uuid4().hex[:16] for _ in range(5)]
+    for profile_id in ids:
+        store.save({"id": profile_id, "collapsed": "", "statements": []})
+    
+    assert [summary["id"] for summary in store.list()] == ids[:1:-1]
+    assert store.get(ids[0]) is None and store.get(ids[-1])["id"] == ids[-1]
+    assert store.get("../../etc/passwd") is None
+
+
+def test_admin_endpoints(store, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILER_ENABLED", True)
+    users = {}
+    for role in (UserRole.ADMIN, UserRole.WORKER):
+        principal = Principal(id=uuid.uuid4(), email=f"{role.value}@vicarity.co.uk", role=role,
+                              is_active=True, email_verified=True)
+        principal_cache.set(principal)
+        users[role] = {"Authorization": f"Bearer {create_access_token(principal.id, role.value)}"}
+    store.save({"id": "0123456789abcdef", "collapsed": "a;b 3\n", "statements": []})
+    client = TestClient(app)
+    
+    assert client.post("/admin/profiles/token", headers=users[UserRole.WORKER]).status_code == 403
+    token = client.post("/admin/profiles/token", headers=users[UserRole.ADMIN]).json()
+    assert token["header"] == "X-Profile" and verify_profile_token(token["value"])
+    assert client.get("/admin/profiles", headers=users[UserRole.ADMIN]).json() == [{"id": "0123456789abcdef"}]
+    response = client.get("/admin/profiles/0123456789abcdef/collapsed", headers=users[UserRole.ADMIN])
+    assert response.text == "a;b 3\n"
+    assert client.get("/admin/profiles/fedcba9876543210", headers=users[UserRole.ADMIN]).status_code == 404
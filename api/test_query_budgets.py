@@ -0,0 +1,107 @@
+"""
+Query budgets for the profile-bearing routes: each read is one SELECT
+(user and profile joined), and writes don't read back what they wrote.
+
+Needs PostgreSQL (the models use PostgreSQL types), so these only run
+when DATABASE_URL points at one (sync or DB_ASYNC mode):
+    
+    DATABASE_URL=postgresql://... python -m pytest test_query_budgets.py
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.password_hashing import password_hasher
+from app.core.principal_cache import principal_cache
+from app.core.request_metrics import query_budget
+from app.core.security import create_access_token, create_email_verification_token
+from app.models import CareHomeProfile, EmailOutbox, User, UserRole, WorkerProfile
+from main import app
+
+pytestmark = pytest.mark.skipif(engine.dialect.name != "postgresql", reason="DATABASE_URL is not PostgreSQL")
+
+PASSWORD = "BudgetPassw0rd"
+
+# Statements per request; every read is a single SELECT
+BUDGETS = {
+    "worker": {"verify": 3, "login": 2, "me": 1, "get profile": 1, "put profile": 3},
+    "care_home": {"verify": 3, "login": 2, "me": 1, "get profile": 1, "put profile": 2},
+}
+
+
+@pytest.fixture(scope="module")
+def client():
+    # One event loop for the module: pooled asyncpg connections (DB_ASYNC) are bound to it
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def accounts():
+    """An unverified worker and care home admin, deleted afterwards."""
+    Base.metadata.create_all(bind=engine)
+    tag = uuid.uuid4().hex[:8]
+    ids = {}
+    with SessionLocal() as db:
+        for user_type, role, profile in (
+            ("worker", UserRole.WORKER, WorkerProfile(profile_completion_percentage=0)),
+            ("care_home", UserRole.CARE_HOME_ADMIN, CareHomeProfile(profile_completion_percentage="0")),
+        ):
+            user = User(email=f"budget-{tag}-{user_type}@vicarity.co.uk", password_hash=password_hasher.hash(PASSWORD),
+                        role=role, email_verified=False)
+            db.add(user)
+            db.flush()
+            profile.user_id = user.id
+            db.add(profile)
+            ids[user_type] = (user.id, user.email, role)
+        db.commit()
+    
+    yield ids
+    
+    with SessionLocal() as db:
+        for user_id, email, _ in ids.values():
+            db.query(EmailOutbox).filter(EmailOutbox.to_email == email).delete()
+            for model in (WorkerProfile, CareHomeProfile):
+                for profile in db.query(model).filter(model.user_id == user_id):
+                    db.delete(profile)
+            db.delete(db.get(User, user_id))
+        db.commit()
+
+
+@pytest.mark.parametrize("user_type", list(BUDGETS))
+def test_route_query_budgets(client, accounts, user_type):
+    user_id, email, role = accounts[user_type]
+    budget = BUDGETS[user_type]
+    headers = {"Authorization": f"Bearer {create_access_token(user_id, role.value)}"}
+    path = "/worker/profile" if user_type == "worker" else "/care-home/profile"
+    field, value = ("first_name", "Sam") if user_type == "worker" else ("business_name", "Oak House")
+    
+    with query_budget(budget["verify"]):  # SELECT, welcome email INSERT, UPDATE
+        assert client.post("/auth/verify-email", json={"token": create_email_verification_token(user_id, email)}).status_code == 200
+    with query_budget(budget["login"]):  # SELECT, last_login_at UPDATE
+        assert client.post("/auth/login", json={"email": email, "password": PASSWORD}).status_code == 200
+    with query_budget(budget["me"]):
+        assert client.get("/auth/me", headers=headers).status_code == 200
+    
+    principal_cache.invalidate([user_id])
+    assert client.get(path, headers=headers).status_code == 200  # Caches the principal
+    with query_budget(budget["get profile"]):
+        assert client.get(path, headers=headers).status_code == 200
+    with query_budget(budget["put profile"]):  # SELECT, UPDATE (+ completion counters for workers)
+        response = client.put(path, json={field: value}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()[field] == value
+
+
+def test_stale_token_role_still_loads_profile(client, accounts):
+    user_id, _, _ = accounts["worker"]
+    headers = {"Authorization": f"Bearer {create_access_token(user_id, UserRole.CARE_HOME_ADMIN.value)}"}
+    
+    with query_budget(2):  # Care home profile joined, then reloaded for the actual role
+        response = client.get("/auth/me", headers=headers)
+    
+    assert response.status_code == 200
+    assert response.json()["worker_profile"] is not None
@@ -0,0 +1,94 @@
+"""
+Tests for the auth endpoint rate limiter.
+"""
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError
+
+from app.core import rate_limit
+from app.core.rate_limit import Limit, RateLimiter, parse_policy, rate_limiter
+from main import app
+
+
+POLICIES = {"login": [Limit("ip", 3, 60), Limit("email", 2, 60)]}
+
+
+class DownRedis:
+    """A client whose every call fails, like an unreachable server."""
+    
+    def register_script(self, script):
+        def call(keys, args):
+            raise ConnectionError("Redis is down")
+        call.registered_client = self
+        return call
+
+
+@pytest.fixture(params=["redis", "local", "redis down"])
+def limiter(request, monkeypatch):
+    """The same policy served by Redis, in-process, and after a Redis failure."""
+    client = {
+        "redis": fakeredis.FakeRedis(decode_responses=True),
+        "local": None,
+        "redis down": DownRedis(),
+    }[request.param]
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: client)
+    return RateLimiter(POLICIES)
+
+
+def test_parse_policy():
+    assert parse_policy("ip:30/minute, email:5/hour") == [Limit("ip", 30, 60), Limit("email", 5, 3600)]
+
+
+def test_burst_then_limited(limiter):
+    for _ in range(3):
+        assert limiter.check("login", ip="1.1.1.1") == 0
+    
+    retry_after = limiter.check("login", ip="1.1.1.1")
+    
+    assert 19 < retry_after <= 20  # One request every 60 / 3 seconds
+    assert limiter.check("login", ip="2.2.2.2") == 0
+    assert limiter.stats["limited"] == 1
+
+
+def test_denied_request_consumes_nothing(limiter):
+    assert limiter.check("login", ip="1.1.1.1", email="a@vicarity.co.uk") == 0
+    assert limiter.check("login", ip="1.1.1.1", email="a@vicarity.co.uk") == 0
+    
+    # Email exhausted: denied without using up the IP allowance
+    assert limiter.check("login", ip="1.1.1.1", email="A@Vicarity.co.uk ") > 0
+    assert limiter.check("login", ip="1.1.1.1", email="b@vicarity.co.uk") == 0
+    assert limiter.check("login", ip="1.1.1.1", email="c@vicarity.co.uk") > 0
+
+
+def test_login_returns_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_CLIENT_IP_HEADER", "X-Real-IP")
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: None)
+    monkeypatch.setattr(rate_limiter, "local", rate_limit.LocalGCRA())
+    monkeypatch.setitem(rate_limiter.policies, "login", [Limit("ip", 1, 60)])
+    rate_limiter.check("login", ip="203.0.113.9")
+    
+    response = TestClient(app).post(
+        "/auth/login",
+        json={"email": "w@vicarity.co.uk", "password": "Passw0rdX"},
+        headers={"X-Real-IP": "203.0.113.9"},
+    )
+    
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "60"
+
+
+def test_client_ip_header_is_ignored_unless_configured(monkeypatch):
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: None)
+    monkeypatch.setattr(rate_limiter, "local", rate_limit.LocalGCRA())
+    monkeypatch.setitem(rate_limiter.policies, "login", [Limit("ip", 1, 60)])
+    rate_limiter.check("login", ip="unknown")  # The socket peer's allowance is used up (TestClient has no peer address)
+    
+    response = TestClient(app).post(
+        "/auth/login",
+        json={"email": "w@vicarity.co.uk", "password": "Passw0rdX"},
+        headers={"X-Real-IP": "203.0.113.10"},  # A fresh address each time would dodge the limit
+    )
+    
+    assert response.status_code == 429
@@ -0,0 +1,87 @@
+"""
+Tests for structured request logging.
+"""
+
+import io
+import json
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.request_logging import (
+    RequestLogMiddleware, configure_logging, current_request_id, set_request_user, stop_logging,
+)
+from main import app
+
+
+@pytest.fixture
+def log_lines():
+    """Parsed JSON lines written while the test runs (call to collect them)."""
+    stream = io.StringIO()
+    configure_logging(stream)
+    
+    def collect():
+        stop_logging()  # Drains the queue
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+    
+    yield collect
+    configure_logging()
+
+
+def make_app(**options) -> FastAPI:
+    test_app = FastAPI()
+    test_app.add_middleware(RequestLogMiddleware, **options)
+    
+    @test_app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        # Sync route: runs in the threadpool, like the sync routers
+        set_request_user("user-1")
+        logging.getLogger("test.items").warning("Item %d requested", item_id)
+        return {"request_id": current_request_id()}
+    
+    return test_app
+
+
+def test_access_line_carries_request_fields(log_lines):
+    response = TestClient(app).get("/api/status", headers={"X-Request-ID": "0123abcd"})
+    
+    assert response.headers["x-request-id"] == "0123abcd"
+    (access,) = [line for line in log_lines() if line["logger"] == "app.access"]
+    assert access["message"] == "GET /api/status 200"
+    assert access["request_id"] == "0123abcd" and access["route"] == "GET /api/status"
+    assert access["status"] == 200 and access["duration_ms"] > 0
+    assert access["sql_statements"] == 0 and access["redis_ms"] == 0
+
+
+def test_lines_inside_requests_are_correlated(log_lines):
+    response = TestClient(make_app()).get("/items/7", headers={"X-Request-ID": "not a valid id!"})
+    
+    request_id = response.json()["request_id"]
+    assert request_id != "not a valid id!" and response.headers["x-request-id"] == request_id
+    item, access = [line for line in log_lines() if line["logger"] in ("test.items", "app.access")]
+    assert item["message"] == "Item 7 requested"
+    for line in (item, access):
+        assert (line["request_id"], line["route"], line["user_id"]) == (request_id, "GET /items/{item_id}", "user-1")
+
+
+def test_sampling():
+    middleware = RequestLogMiddleware(None, sample_rate=1.0, sample_rates="GET /health:0, GET /metrics:0.5", slow_ms=500)
+    
+    assert middleware.sample_rates == {"GET /health": 0.0, "GET /metrics": 0.5}
+    assert middleware.sampled("GET /auth/me", 200, 10)
+    assert not middleware.sampled("GET /health", 200, 10)
+    assert middleware.sampled("GET /health", 503, 10)  # Errors always
+    assert middleware.sampled("GET /health", 200, 800)  # Slow requests always
+
+
+def test_tracebacks_are_kept_separate(log_lines):
+    try:
+        raise ValueError("bad value")
+    except ValueError:
+        logging.getLogger("test.errors").exception("Failed to %s", "parse")
+    
+    (line,) = [line for line in log_lines() if line["logger"] == "test.errors"]
+    assert line["message"] == "Failed to parse" and line["level"] == "ERROR"
+    assert line["exception"].endswith("ValueError: bad value")
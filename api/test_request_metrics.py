@@ -0,0 +1,136 @@
+"""
+Tests for per-route request metrics and the /metrics endpoint.
+"""
+
+import json
+import os
+
+import fakeredis
+import pytest
+import redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core import request_metrics as metrics_module
+from app.core.database import SessionLocal
+from app.core.request_metrics import (
+    MetricsMiddleware, RequestMetrics, RequestTimings, TimedRedis, capture_requests, query_budget, request_metrics,
+)
+from main import app
+
+
+client = TestClient(app)
+
+# One statement on the app's (instrumented) engine per request
+db_app = FastAPI()
+db_app.add_middleware(MetricsMiddleware)
+
+
+@db_app.get("/ping")
+def ping():
+    with SessionLocal() as db:
+        db.execute(text("SELECT 1"))
+    return {}
+
+
+db_client = TestClient(db_app)
+
+
+@pytest.fixture
+def metrics_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(request_metrics, "directory", str(tmp_path / "1"))
+    return tmp_path / "1"
+
+
+def test_request_timings_by_route():
+    with capture_requests() as captured:
+        db_client.get("/ping")
+        db_client.get("/no-such-page")
+    
+    (ping, timings), (unmatched, _) = captured
+    assert (ping, unmatched) == ("GET /ping", "GET unmatched")
+    assert timings.sql_statements == 1 and timings.statements == ["SELECT 1"]
+    assert timings.sql_ms > 0 and timings.pool_wait_ms > 0
+
+
+def test_query_budget():
+    with query_budget(1):
+        db_client.get("/ping")
+    
+    with pytest.raises(AssertionError, match=r"expected 0 SQL statements, ran 1:\n  \[GET /ping\] SELECT 1"):
+        with query_budget(0):
+            db_client.get("/ping")
+
+
+def test_redis_round_trips_are_timed():
+    server = fakeredis.FakeServer()
+    pool = redis.ConnectionPool(connection_class=fakeredis.FakeConnection, server=server)
+    redis_client = TimedRedis(connection_pool=pool)
+    timings = RequestTimings()
+    token = metrics_module._current.set(timings)
+    try:
+        redis_client.set("a", 1)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get("a")
+        pipe.get("b")
+        assert pipe.execute() == [b"1", None]
+    finally:
+        metrics_module._current.reset(token)
+    
+    redis_client.get("a")  # Outside a request: not counted
+    assert timings.redis_calls == 2 and timings.redis_ms > 0
+
+
+def test_workers_are_merged(metrics_dir):
+    sibling = RequestMetrics("", 5)
+    timings = RequestTimings()
+    timings.sql_statements, timings.sql_ms = 2, 3.5
+    for status in (200, 200, 401):
+        sibling.record("GET /auth/me", status, 12.0, timings)
+    metrics_dir.mkdir()
+    (metrics_dir / "99999.json").write_text(json.dumps(sibling.snapshot()))
+    before = request_metrics.snapshot()["routes"].get("GET /auth/me", {}).get("requests", {})  # Other tests' requests
+    
+    request_metrics.record("GET /auth/me", 200, 30.0, timings)
+    text = client.get("/metrics").text
+    
+    assert f'vicarity_http_requests_total{{method="GET",route="/auth/me",status="200"}} {before.get("200", 0) + 3}' in text
+    assert f'vicarity_http_requests_total{{method="GET",route="/auth/me",status="401"}} {before.get("401", 0) + 1}' in text
+    assert 'vicarity_http_request_sql_statements_bucket{method="GET",route="/auth/me",le="2"}' in text
+    assert 'vicarity_http_request_duration_seconds_bucket{method="GET",route="/auth/me",le="0.025"}' in text
+    assert "# TYPE vicarity_http_request_pool_wait_seconds_total counter" in text
+    assert 'vicarity_db_pool_size{pool="sync"} 5\n' in text  # The exited worker's gauges are left out
+    assert {path.name for path in metrics_dir.iterdir()} == {"99999.json", f"{os.getpid()}.json"}
+
+
+def test_pool_checkouts_are_measured():
+    stats = metrics_module.pool_metrics["sync"]
+    before = stats.snapshot()
+    
+    db_client.get("/ping")
+    after = stats.snapshot()
+    
+    assert after["checkouts"] == before["checkouts"] + 1
+    assert after["wait_ms"]["sum"] > before["wait_ms"]["sum"]
+    assert after["gauges"]["checked_out"] == before["gauges"]["checked_out"]
+    text = metrics_module.render(request_metrics.snapshot())
+    assert f'vicarity_db_pool_checkouts_total{{pool="sync"}} {after["checkouts"]}' in text
+    assert 'vicarity_db_pool_checkout_wait_seconds_bucket{pool="sync",le="+Inf"}' in text
+
+
+def test_large_counters_keep_full_precision():
+    timings = RequestTimings()
+    timings.redis_calls, timings.sql_ms = 1234567, 98765432.1
+    sibling = RequestMetrics("", 5)
+    sibling.record("GET /big", 200, 98765432.1, timings)
+    
+    text = metrics_module.render(sibling.snapshot())
+    
+    assert 'vicarity_http_request_redis_calls_total{method="GET",route="/big"} 1234567\n' in text
+    sql_seconds = next(line for line in text.splitlines()
+                       if line.startswith('vicarity_http_request_sql_seconds_total{method="GET",route="/big"}'))
+    assert float(sql_seconds.split()[-1]) == 98765432.1 * 0.001
+    duration_sum = next(line for line in text.splitlines()
+                        if line.startswith('vicarity_http_request_duration_seconds_sum{method="GET",route="/big"}'))
+    assert float(duration_sum.split()[-1]) == 98765432.1 * 0.001
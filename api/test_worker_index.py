@@ -0,0 +1,150 @@
+"""
+Tests for the in-memory worker bitmap index.
+"""
+
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.worker_index import Term, WorkerBitmapIndex, search_filter
+from app.schemas.worker import WorkerSearchFilters
+
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def worker(rng: random.Random, **overrides) -> dict:
+    row = {
+        "id": uuid.UUID(int=rng.getrandbits(128)),
+        "user_id": uuid.UUID(int=rng.getrandbits(128)),
+        "updated_at": datetime(2026, 1, 1) + timedelta(seconds=rng.randrange(1000)),  # Plenty of ties
+        "dbs_status": rng.choice(["enhanced", "standard", "basic"]),
+        "qualifications": rng.sample(["NVQ_LVL2", "NVQ_LVL3", "PEG_FEEDING"], rng.randrange(3)),
+        "specializations": rng.sample(["elderly", "dementia", "palliative"], rng.randrange(3)),
+        "languages": ["english"] + (["polish"] if rng.random() < 0.2 else []),
+        "available_days": rng.sample(DAYS, rng.randrange(1, 7)),
+        "shift_types": rng.sample(["day", "night"], rng.randrange(1, 3)),
+        "hourly_rate_min": rng.choice([None, 1000, 1100, 1200]),
+        "hourly_rate_max": rng.choice([None, 1300, 1500]),
+        "city": rng.choice(["York", "Leeds", None]),
+        "years_experience": rng.choice(["0-1", "1-3", "3-5", "5+", None]),
+        "travel_radius_miles": rng.choice([5, 10, 25, None]),
+        "latitude": rng.choice([None, 53.8 + rng.random() * 0.4]),
+        "longitude": rng.uniform(-1.7, -0.9),
+    }
+    row.update(overrides)
+    return row
+
+
+def reference_search(rows, filters: WorkerSearchFilters, after=None):
+    """Brute-force equivalent of worker_search_query()."""
+    def matches(row):
+        if filters.dbs_status and row["dbs_status"] not in filters.dbs_status:
+            return False
+        for attribute in ("qualifications", "specializations", "languages", "available_days", "shift_types"):
+            if not set(getattr(filters, attribute) or ()) <= set(row[attribute]):
+                return False
+        if filters.hourly_rate_max is not None and not (row["hourly_rate_min"] or 10**9) <= filters.hourly_rate_max:
+            return False
+        if filters.hourly_rate_min is not None and not (row["hourly_rate_max"] or -1) >= filters.hourly_rate_min:
+            return False
+        if filters.city and (row["city"] or "").lower() != filters.city.lower():
+            return False
+        return after is None or (row["updated_at"], row["id"]) < after
+    
+    return sorted((r for r in rows if matches(r)), key=lambda r: (r["updated_at"], r["id"]), reverse=True)
+
+
+@pytest.fixture
+def rows():
+    rng = random.Random(7)
+    return [worker(rng) for _ in range(3000)]
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"dbs_status": ["enhanced", "standard"], "languages": ["polish"]},
+    {"qualifications": ["NVQ_LVL3", "PEG_FEEDING"], "available_days": ["sat", "sun"]},
+    {"specializations": ["dementia"], "shift_types": ["night"], "city": "YORK"},
+    {"hourly_rate_min": 1400, "hourly_rate_max": 1050},
+    {"languages": ["klingon"]},
+])
+def test_search_pages_match_reference(rows, filters):
+    index = WorkerBitmapIndex("test_worker_index")
+    index.load(rows)
+    filters = WorkerSearchFilters(limit=50, **filters)
+    expected = [r["id"] for r in reference_search(rows, filters)]
+    
+    found, after = [], None
+    while True:
+        page, after = index.search(filters, filters.limit, after)
+        found.extend(page)
+        if after is None:
+            break
+        assert len(page) == filters.limit
+    
+    assert found == expected
+
+
+def test_incremental_updates(rows):
+    index = WorkerBitmapIndex("test_worker_index")
+    index.load(rows[:1000])
+    polish = Term("languages", "polish")
+    
+    # New workers (past the initial capacity), changed and removed ones
+    changed = [dict(row, languages=["english", "polish"]) for row in rows[:100]]
+    index.upsert(rows[1000:] + changed)
+    removed = [row["user_id"] for row in rows[100:200]]
+    index.remove(removed)
+    
+    current = {row["user_id"]: row for row in rows + changed}
+    for user_id in removed:
+        del current[user_id]
+    assert index.stats["workers"] == len(current) == 2900
+    assert index.count(polish) == sum("polish" in row["languages"] for row in current.values())
+    assert index.count(Term("dbs_status", "enhanced") | polish) == sum(
+        row["dbs_status"] == "enhanced" or "polish" in row["languages"] for row in current.values()
+    )
+    
+    # Freed ordinals are reused
+    index.upsert(rows[100:150])
+    assert index.stats["workers"] == 2950 and len(index._free) == 50
+    filters = WorkerSearchFilters(limit=5000, languages=["polish"], city="leeds")
+    page, _ = index.search(filters, filters.limit)
+    expected = reference_search(list(current.values()) + rows[100:150], filters)
+    assert page == [row["id"] for row in expected]
+
+
+def test_walk_matches_reference_after_updates(rows, monkeypatch):
+    # Broad searches walk the load-time recency order; changed workers are out of it
+    monkeypatch.setattr("app.core.worker_index.EXTRACT_MAX_MATCHES", 0)
+    index = WorkerBitmapIndex("test_worker_index")
+    index.load(rows[:2000])
+    rng = random.Random(8)
+    changed = [dict(row, updated_at=datetime(2026, 1, 1, 0, 10)) for row in rng.sample(rows[:2000], 50)]
+    index.upsert(rows[2000:] + changed)
+    index.remove([row["user_id"] for row in rows[:20]])
+    current = {row["user_id"]: row for row in rows + changed}
+    for row in rows[:20]:
+        del current[row["user_id"]]
+    
+    for filters in ({}, {"shift_types": ["day"], "city": "york"}):
+        filters = WorkerSearchFilters(limit=25, **filters)
+        found, after = [], None
+        while True:
+            page, after = index.search(filters, filters.limit, after)
+            found.extend(page)
+            if after is None:
+                break
+        assert found == [r["id"] for r in reference_search(current.values(), filters)]
+
+
+def test_search_filter_shape():
+    filters = WorkerSearchFilters(dbs_status=["enhanced", "basic"], languages=["english", "polish"], city="York")
+    
+    expression = search_filter(filters)
+    
+    assert [type(f).__name__ for f in expression.filters] == ["Or", "Term", "Term"]
+    with pytest.raises(ValueError):
+        Term("city", "York")  # A column filter, not a bitmap
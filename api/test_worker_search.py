@@ -0,0 +1,127 @@
+"""
+Tests for worker search (GET /care-home/workers/search).
+
+The query plan tests need PostgreSQL and generate a million profiles, so
+they only run when WORKER_SEARCH_EXPLAIN_URL is set:
+    
+    WORKER_SEARCH_EXPLAIN_URL=postgresql://... python -m pytest test_worker_search.py
+
+WORKER_SEARCH_EXPLAIN_SIZE overrides the number of profiles.
+"""
+
+import os
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import Base
+from app.core.pagination import decode_cursor, encode_cursor
+from app.routers.care_home import worker_search_query
+from app.schemas.worker import WorkerSearchFilters, WorkerSearchResult
+
+EXPLAIN_URL = os.getenv("WORKER_SEARCH_EXPLAIN_URL")
+EXPLAIN_SIZE = int(os.getenv("WORKER_SEARCH_EXPLAIN_SIZE", "1000000"))
+
+
+def compiled(**filters) -> str:
+    query = worker_search_query(WorkerSearchFilters(**filters))
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_round_trip():
+    key = (datetime(2026, 10, 17, 12, 30, 5, 123456), uuid.uuid4())
+    
+    assert decode_cursor(encode_cursor(*key)) == key
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not-a-cursor")
+    assert error.value.status_code == 400
+
+
+def test_search_query_uses_index_predicates():
+    sql = compiled()
+    
+    # Literal, so the planner can match the partial indexes
+    assert "profile_completion_status = 'COMPLETE'" in sql
+    assert "ORDER BY worker_profiles.updated_at DESC, worker_profiles.id DESC" in sql
+    assert "OFFSET" not in sql
+
+
+def test_search_query_filters():
+    sql = compiled(
+        dbs_status=["enhanced"], qualifications=["NVQ_LVL3"], languages=["english"],
+        hourly_rate_min=1000, hourly_rate_max=1400, city="York",
+        cursor=encode_cursor(datetime(2026, 1, 1), uuid.uuid4()),
+    )
+    
+    assert "worker_profiles.dbs_status IN" in sql
+    assert "worker_profiles.qualifications @>" in sql
+    assert "worker_profiles.languages @>" in sql
+    assert "worker_profiles.hourly_rate_min <=" in sql and "worker_profiles.hourly_rate_max >=" in sql
+    assert "lower(worker_profiles.city) =" in sql
+    assert "(worker_profiles.updated_at, worker_profiles.id) <" in sql
+
+
+def test_search_result_hides_documents():
+    result = WorkerSearchResult.model_validate({
+        "id": uuid.uuid4(), "first_name": "Sam", "last_name": "Lee", "profile_picture_url": None,
+        "city": "York", "dbs_status": "enhanced", "dbs_expiry_date": None,
+        "qualifications": [{"code": "NVQ_LVL3", "expiry_date": None, "document_url": "https://files/x.pdf"}],
+        "years_experience": "5+", "specializations": [], "languages": [], "bio": None,
+        "available_days": [], "shift_types": [], "travel_radius_miles": 10,
+        "hourly_rate_min": 1100, "hourly_rate_max": 1300, "willing_to_travel": True, "has_own_transport": False,
+    })
+    
+    assert result.qualifications == [{"code": "NVQ_LVL3", "expiry_date": None}]
+    
+    # Legacy rows: bare codes and null elements
+    legacy = result.model_dump() | {"qualifications": ["CARE_CERT", None, {"code": "NVQ_LVL2"}]}
+    assert WorkerSearchResult.model_validate(legacy).qualifications == [
+        {"code": "CARE_CERT", "expiry_date": None}, {"code": "NVQ_LVL2", "expiry_date": None},
+    ]
+
+
+@pytest.fixture(scope="module")
+def explain_conn():
+    """Connection to a scratch schema holding EXPLAIN_SIZE generated profiles."""
+    from benchmarks.worker_search import SCHEMA, populate
+    
+    engine = create_engine(EXPLAIN_URL)
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        Base.metadata.create_all(bind=conn.execution_options(schema_translate_map={None: SCHEMA}))
+        conn.execute(text(f"SET search_path TO {SCHEMA}"))
+        populate(conn, EXPLAIN_SIZE)
+        conn.commit()
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            conn.commit()
+    engine.dispose()
+
+
+@pytest.mark.skipif(not EXPLAIN_URL, reason="WORKER_SEARCH_EXPLAIN_URL not set")
+@pytest.mark.parametrize("search, index", [
+    ("first page", "ix_worker_profiles_search_recent"),
+    ("deep page (cursor)", "ix_worker_profiles_search_recent"),
+    ("city", "ix_worker_profiles_search_city"),
+    ("enhanced DBS + rate", "ix_worker_profiles_search_recent"),
+    ("rare qualification", "ix_worker_profiles_qualifications_gin"),
+    ("rare language", "ix_worker_profiles_search_arrays_gin"),
+    ("everything", "ix_worker_profiles_search_city"),
+])
+def test_search_plan_uses_index(explain_conn, search, index):
+    from benchmarks.worker_search import SEARCHES, explain, plan_nodes, search_query
+    
+    plan = explain(explain_conn, search_query(explain_conn, SEARCHES[search]))
+    nodes = list(plan_nodes(plan["Plan"]))
+    
+    assert index in {node.get("Index Name") for node in nodes}
+    assert not [n for n in nodes if n["Node Type"] == "Seq Scan" and n["Relation Name"] == "worker_profiles"]
+    assert plan["Plan"]["Actual Rows"] == 21  # A full page (limit + 1)